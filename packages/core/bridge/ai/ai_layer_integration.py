@@ -268,6 +268,98 @@ class AICommandExecutor:
             logger.error(f"❌ Command execution failed: {e}")
             return error_record
 
+    async def execute_batch(
+        self,
+        commands: List[str],
+        context: Optional[Dict[str, Any]] = None,
+        stop_on_error: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Execute commands in order with one bridge request.
+
+        Returns an execution record per command the bridge ran; with
+        ``stop_on_error`` the commands after the first failure are skipped.
+        """
+        start_time = time.perf_counter()
+        batch_id = f"exec_{int(time.time())}_{len(self.execution_history)}"
+
+        try:
+            logger.info(f"Executing batch of {len(commands)} commands")
+
+            request_data = {
+                "commands": commands,
+                "source": "ai_layer",
+                "priority": context.get("priority", 5) if context else 5,
+                "stop_on_error": stop_on_error,
+                "context": context or {},
+            }
+
+            async with self.session.post(
+                f"{self.bridge_url}/commands/batch",
+                json=request_data,
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise BridgeError(
+                        message=f"Bridge API error: {response.status} - {error_text}",
+                        category=ErrorCategory.COMMUNICATION,
+                        severity=ErrorSeverity.MEDIUM,
+                    )
+                batch = await response.json()
+
+            execution_time = (time.perf_counter() - start_time) * 1000
+            if batch.get("error"):
+                raise BridgeError(
+                    message=f"Batch failed: {batch['error']}",
+                    category=ErrorCategory.EXECUTION,
+                    severity=ErrorSeverity.MEDIUM,
+                )
+
+            # The bridge times the batch as a whole; share it out per command
+            per_command = execution_time / max(1, len(batch["results"]))
+            records = []
+            for index, result in enumerate(batch["results"]):
+                record = {
+                    "execution_id": f"{batch_id}_{index}",
+                    "command": commands[index],
+                    "success": result["success"],
+                    "output": result.get("output", ""),
+                    "execution_time": per_command,
+                    "timestamp": time.time(),
+                    "context": context,
+                }
+                if result.get("error"):
+                    record["error"] = result["error"]
+                self._update_stats(per_command, result["success"])
+                self.execution_history.append(record)
+                records.append(record)
+
+            logger.info(
+                f"✅ Batch of {len(records)} commands executed in "
+                f"{execution_time:.2f}ms"
+            )
+            return records
+
+        except Exception as e:
+            execution_time = (time.perf_counter() - start_time) * 1000
+
+            error_record = {
+                "execution_id": batch_id,
+                "command": commands[0] if commands else "",
+                "success": False,
+                "error": str(e),
+                "execution_time": execution_time,
+                "timestamp": time.time(),
+                "context": context,
+            }
+
+            self._update_stats(execution_time, False)
+            self.execution_history.append(error_record)
+
+            logger.error(f"❌ Batch execution failed: {e}")
+            return [error_record]
+
     async def execute_commands(
         self,
         commands: List[str],
@@ -278,14 +370,9 @@ class AICommandExecutor:
         results = []
 
         if sequential:
-            # Execute commands sequentially
-            for command in commands:
-                result = await self.execute_command(command, context)
-                results.append(result)
-
-                # Stop on failure if configured
-                if not result["success"] and context.get("stop_on_error", True):
-                    break
+            # Execute commands in order as one batch
+            stop_on_error = (context or {}).get("stop_on_error", True)
+            results = await self.execute_batch(commands, context, stop_on_error)
         else:
             # Execute commands concurrently
             tasks = [self.execute_command(command, context) for command in commands]
@@ -820,23 +907,20 @@ class AILayerIntegration:
         self, interaction: AIInteraction, commands: List[str]
     ) -> List[Dict[str, Any]]:
         """Execute translated commands."""
-        results = []
-
         async with self.command_executor as executor:
-            for command in commands:
-                result = await executor.execute_command(command, interaction.context)
-                results.append(result)
-
-                # Update context with execution result
-                if result["success"]:
-                    self.context_manager.update_context(
-                        "emulator_state",
-                        {
-                            "last_command": command,
-                            "last_output": result["output"],
-                            "execution_time": result["execution_time"],
-                        },
-                    )
+            results = await executor.execute_commands(commands, interaction.context)
+
+        # Update context with execution results
+        for result in results:
+            if result["success"]:
+                self.context_manager.update_context(
+                    "emulator_state",
+                    {
+                        "last_command": result["command"],
+                        "last_output": result["output"],
+                        "execution_time": result["execution_time"],
+                    },
+                )
 
         return results
 
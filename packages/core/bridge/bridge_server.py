@@ -8,13 +8,15 @@ and output capture for seamless communication between all system layers.
 """
 
 import asyncio
+import functools
 import json
 import sys
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from pydantic import BaseModel, Field
@@ -24,6 +26,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from bridge.ai.ai_command_sender import AICommandSender  # noqa: E402
 from bridge.ai.ai_layer_integration import AILayerIntegration  # noqa: E402
+from bridge.core.command_history import CommandHistory  # noqa: E402
+from bridge.core.command_queue import CommandQueue, QueueFullError  # noqa: E402
+from bridge.core.emulator_pool import EmulatorPool  # noqa: E402
+from bridge.core.memory_stream import (  # noqa: E402
+    EmulatorSource,
+    MemoryStream,
+    PooledEmulatorSource,
+    serve_memory_stream,
+)
+from bridge.core.process_executor import EmulatorProcessExecutor  # noqa: E402
+from bridge.core.run_stream import RunStream  # noqa: E402
+from bridge.core.scheduler import EmulatorScheduler  # noqa: E402
+from bridge.core.sessions import SessionManager, SessionSnapshotStore  # noqa: E402
 from bridge.core.settings import get_settings  # noqa: E402
 from bridge.output.bridge_output_handler import (  # noqa: E402
     BridgeOutputHandler,
@@ -48,11 +63,144 @@ class CommandRequest(BaseModel):
     timeout: Optional[int] = Field(
         default=None, description="Custom timeout in seconds"
     )
+    include: List[str] = Field(
+        default_factory=list,
+        description='Extra result fields: "cpu_states" adds CPU register states',
+    )
+    context: Optional[Dict[str, Any]] = Field(
+        default_factory=dict, description="Additional context data"
+    )
+
+
+class BatchRequest(BaseModel):
+    """Request model for executing several BASIC lines in one request."""
+
+    commands: List[str] = Field(..., description="Commands to execute, in order")
+    source: str = Field(
+        default="frontend", description="Source of the commands (frontend, ai, manual)"
+    )
+    priority: int = Field(
+        default=1, description="Batch priority (1-10, higher = more priority)"
+    )
+    timeout: Optional[int] = Field(
+        default=None, description="Custom timeout in seconds for the whole batch"
+    )
+    stop_on_error: bool = Field(
+        default=True, description="Skip the remaining commands after a failure"
+    )
+    include: List[str] = Field(
+        default_factory=list,
+        description='Extra result fields: "cpu_states" adds CPU register states',
+    )
     context: Optional[Dict[str, Any]] = Field(
         default_factory=dict, description="Additional context data"
     )
 
 
+class BatchResponse(BaseModel):
+    """Response model for batch command execution."""
+
+    success: bool = Field(..., description="Whether every command succeeded")
+    results: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Per-command success, output and error, in order",
+    )
+    executed: int = Field(default=0, description="Number of commands executed")
+    failed_index: Optional[int] = Field(
+        default=None, description="Index of the first failed command"
+    )
+    cpu_state_deltas: Optional[List[Dict[str, int]]] = Field(
+        default=None,
+        description="CPU state after each command, changed registers only",
+    )
+    error: Optional[str] = Field(
+        default=None, description="Error message if the batch could not run"
+    )
+    execution_time: float = Field(..., description="Execution time in milliseconds")
+    timestamp: float = Field(..., description="Timestamp when the batch was executed")
+    command_id: str = Field(..., description="Unique identifier for this batch")
+
+
+class ExecuteRequest(BaseModel):
+    """Request model for running loaded machine code on the emulator."""
+
+    steps: int = Field(default=100, ge=1, description="Instructions to execute")
+    turbo: Optional[bool] = Field(
+        default=None,
+        description="Run in batched turbo mode (defaults to emulator setting)",
+    )
+    batch_size: Optional[int] = Field(
+        default=None, ge=1, description="Instructions per turbo batch"
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Run on the session's machine instead of the primary emulator",
+    )
+    priority: int = Field(
+        default=1,
+        ge=1,
+        le=10,
+        description="Share of emulator time while other runs compete (1-10)",
+    )
+    include: List[str] = Field(
+        default_factory=list,
+        description='Extra result fields: "cpu_states" adds CPU register states',
+    )
+
+
+class SpeedRequest(BaseModel):
+    """Request model for emulator speed control."""
+
+    multiplier: Optional[float] = Field(
+        default=None, description="Speed multiplier relative to cpu_speed"
+    )
+    throttled: Optional[bool] = Field(
+        default=None, description="Pace to real time (false runs unthrottled)"
+    )
+
+
+class ProfileRequest(BaseModel):
+    """Request model for switching the emulator profiler on or off."""
+
+    enabled: bool = Field(..., description="Start (true) or stop (false) profiling")
+    reset: bool = Field(
+        default=True, description="Clear earlier counters when profiling starts"
+    )
+
+
+class RecordRequest(BaseModel):
+    """Request model for starting or stopping session recording."""
+
+    enabled: bool = Field(..., description="Start (true) or stop (false) recording")
+    path: Optional[str] = Field(
+        default=None,
+        description="Recording file under the recordings directory (to start)",
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Session whose machine to record (default: primary emulator)",
+    )
+
+
+class ReplayRequest(BaseModel):
+    """Request model for replaying a recorded session."""
+
+    path: str = Field(..., description="Recording file under the recordings directory")
+    include_results: bool = Field(
+        default=False, description="Return the result of every replayed event"
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Session whose machine to replay on (default: primary emulator)",
+    )
+
+
+class KeyboardRequest(BaseModel):
+    """Request model for typing on the emulator keyboard device."""
+
+    text: str = Field(..., description="Keys to queue, newlines sent as RETURN")
+
+
 class CommandResponse(BaseModel):
     """Response model for command execution."""
 
@@ -116,6 +264,40 @@ class BridgeServer:
 
         # Initialize components
         self.emulator = M6502Emulator()
+        # Requests without a session share the primary emulator, one at a time
+        self.primary_lock = asyncio.Lock()
+        pool_settings = self.settings.bridge.performance
+        max_sessions = pool_settings.get("max_sessions", 256)
+        self.session_store = SessionSnapshotStore(
+            pool_settings.get("session_snapshot_dir"),
+            max_entries=max_sessions,
+            max_age=pool_settings.get("session_snapshot_ttl", 604800.0),
+        )
+        self.emulator_pool = EmulatorPool(
+            M6502Emulator,
+            max_size=pool_settings.get("emulator_pool_size", 4),
+            min_idle=pool_settings.get("emulator_pool_min_idle", 1),
+            idle_timeout=pool_settings.get("emulator_idle_timeout", 300.0),
+            snapshot_store=self.session_store,
+        )
+        self.sessions = SessionManager(
+            max_sessions=max_sessions,
+            idle_timeout=pool_settings.get("session_idle_timeout", 1800.0),
+            on_evict=self._evict_session,
+            is_busy=self.emulator_pool.is_session_leased,
+        )
+        self.process_executor: Optional[EmulatorProcessExecutor] = None
+        if pool_settings.get("execution_backend", "inline") == "process":
+            self.process_executor = EmulatorProcessExecutor(
+                workers=pool_settings.get("emulator_workers", 2),
+                max_sessions_per_worker=pool_settings.get(
+                    "emulator_sessions_per_worker", 64
+                ),
+            )
+        self.scheduler = EmulatorScheduler(
+            quantum_ms=pool_settings.get("scheduler_quantum_ms", 10.0)
+        )
+        self.recordings_dir = Path(pool_settings.get("recordings_dir", "recordings"))
         self.basic_engine = BASICM6502Engine()
         self.ai_sender = AICommandSender()
         self.ai_translator = AICommandTranslator()
@@ -124,9 +306,18 @@ class BridgeServer:
         self.is_running = False
         self.connected_clients: List[WebSocket] = []
 
-        # Command processing
-        self.command_queue: List[CommandRequest] = []
-        self.command_history: List[CommandResponse] = []
+        # Command processing: a priority queue served by worker tasks, and a
+        # bounded history
+        self.command_queue = CommandQueue(
+            workers=pool_settings.get("max_concurrent_requests", 10),
+            max_depth=pool_settings.get("command_queue_size", 1000),
+            source_limits=pool_settings.get("command_source_limits"),
+            default_timeout=pool_settings.get("request_timeout", 30),
+        )
+        self.command_history = CommandHistory(
+            capacity=pool_settings.get("command_history_size", 10000),
+            spill_path=pool_settings.get("command_history_spill"),
+        )
         self.current_command_id = 0
 
         # Performance tracking
@@ -192,9 +383,40 @@ class BridgeServer:
             }
 
         @self.app.post("/command", response_model=CommandResponse)
-        async def execute_command(request: CommandRequest):
+        async def execute_command(
+            request: CommandRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
             """Execute a command through the bridge."""
-            return await self._execute_command(request)
+            request.context = await self._open_request_session(
+                request.context, x_session_id
+            )
+            try:
+                return await self._submit_command(request)
+            except QueueFullError as e:
+                raise HTTPException(status_code=429, detail=str(e))
+
+        @self.app.post("/commands/batch", response_model=BatchResponse)
+        async def execute_command_batch(
+            request: BatchRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Execute several BASIC lines on one emulator lease."""
+            max_commands = self.settings.bridge.performance.get(
+                "max_batch_commands", 500
+            )
+            if not request.commands or len(request.commands) > max_commands:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"A batch holds 1 to {max_commands} commands",
+                )
+            request.context = await self._open_request_session(
+                request.context, x_session_id
+            )
+            try:
+                return await self._submit_command(request)
+            except QueueFullError as e:
+                raise HTTPException(status_code=429, detail=str(e))
 
         @self.app.post("/ai/process", response_model=AIResponse)
         async def process_ai_request(request: AIRequest):
@@ -215,40 +437,293 @@ class BridgeServer:
             return self.emulator.get_emulator_info()
 
         @self.app.get("/emulator/cpu")
-        async def get_cpu_state():
+        async def get_cpu_state(x_session_id: Optional[str] = Header(default=None)):
             """Get current CPU state."""
             if not self.emulator:
                 raise HTTPException(status_code=500, detail="Emulator not initialized")
 
-            return self.emulator.get_cpu_state()
+            session_id = await self._request_session_id(None, x_session_id)
+            return await self._run_emulator_job("get_cpu_state", session_id=session_id)
 
         @self.app.get("/emulator/memory")
-        async def get_memory_dump(start_addr: int = 0x8000, length: int = 256):
-            """Get memory dump from emulator."""
+        async def get_memory_dump(
+            start_addr: int = 0x8000,
+            length: int = 256,
+            encoding: str = "dict",
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Get memory dump from emulator (encoding: dict, hex or base64)."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            if encoding not in ("dict", "hex", "base64"):
+                raise HTTPException(
+                    status_code=400, detail=f"Unsupported encoding: {encoding}"
+                )
+
+            session_id = await self._request_session_id(None, x_session_id)
+            return await self._run_emulator_job(
+                "get_memory_dump", start_addr, length, encoding, session_id=session_id
+            )
+
+        @self.app.post("/emulator/execute")
+        async def execute_program(
+            request: ExecuteRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Execute loaded machine code on the emulator."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            context = await self._open_request_session(
+                {"session_id": request.session_id}, x_session_id
+            )
+            request.session_id = context.get("session_id")
+
+            options = {
+                "priority": request.priority,
+                "turbo": request.turbo,
+                "batch_size": request.batch_size,
+                "include": tuple(request.include),
+            }
+            if request.session_id is not None and self.process_executor:
+                # A worker job cannot be time-sliced or cancelled, so bound it
+                max_steps = self.settings.bridge.performance.get(
+                    "max_worker_steps", 1000000
+                )
+                if request.steps > max_steps:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"A worker run executes at most {max_steps} steps",
+                    )
+                return await self._run_emulator_job(
+                    "execute_program",
+                    request.steps,
+                    session_id=request.session_id,
+                    turbo=request.turbo,
+                    batch_size=request.batch_size,
+                    include=request.include,
+                )
+
+            async with self._machine_lease(request.session_id) as emulator:
+                return await self.scheduler.run(
+                    emulator, request.steps, session_id=request.session_id, **options
+                )
+
+        @self.app.get("/sessions")
+        async def get_sessions():
+            """Get the live sessions, most recently used first."""
+            await self.sessions.evict_idle()
+            return {
+                "sessions": self.sessions.get_sessions(),
+                "statistics": self.sessions.get_statistics(),
+                "snapshots": self.session_store.get_statistics(),
+            }
+
+        @self.app.delete("/sessions/{session_id}")
+        async def end_session(session_id: str):
+            """End a session and discard its machine state."""
+            closed = self.sessions.close(session_id)
+            self.scheduler.cancel_session(session_id)
+            closed = await self.emulator_pool.end_session(session_id) or closed
+            if self.process_executor:
+                closed = await self.process_executor.end_session(session_id) or closed
+            if not closed:
+                raise HTTPException(
+                    status_code=404, detail=f"No such session: {session_id}"
+                )
+            return {"session_id": session_id, "closed": True}
+
+        @self.app.get("/emulator/jobs")
+        async def get_emulator_jobs():
+            """Get the scheduled emulator runs and scheduler statistics."""
+            return {
+                "jobs": self.scheduler.get_jobs(),
+                "statistics": self.scheduler.get_statistics(),
+            }
+
+        @self.app.delete("/emulator/jobs/{job_id}")
+        async def cancel_emulator_job(job_id: str):
+            """Cancel a scheduled emulator run before its next quantum."""
+            if not self.scheduler.cancel(job_id):
+                raise HTTPException(status_code=404, detail=f"No such job: {job_id}")
+            return {"job_id": job_id, "cancelled": True}
+
+        @self.app.get("/emulator/output")
+        async def get_emulator_output(
+            drain: bool = True, x_session_id: Optional[str] = Header(default=None)
+        ):
+            """Get characters written to the display device."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            session_id = await self._request_session_id(None, x_session_id)
+            output = await self._run_emulator_job(
+                "get_display_output", drain=drain, session_id=session_id
+            )
+            return {"output": output}
+
+        @self.app.post("/emulator/keyboard")
+        async def send_emulator_keys(
+            request: KeyboardRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Queue key presses on the keyboard device."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            session_id = await self._request_session_id(None, x_session_id)
+            queued = await self._run_emulator_job(
+                "send_keys", request.text, session_id=session_id
+            )
+            return {"queued_keys": queued}
+
+        @self.app.get("/emulator/speed")
+        async def get_emulator_speed(
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Get achieved vs target emulator clock speed."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            session_id = await self._request_session_id(None, x_session_id)
+            async with self._session_emulator(session_id, "Speed control") as emulator:
+                return emulator.get_performance_stats()["speed_controller"]
+
+        @self.app.post("/emulator/speed")
+        async def set_emulator_speed(
+            request: SpeedRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Change the emulator speed multiplier or throttling mode."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            session_id = await self._request_session_id(None, x_session_id)
+            async with self._session_emulator(session_id, "Speed control") as emulator:
+                if request.multiplier is not None:
+                    emulator.set_speed_multiplier(request.multiplier)
+                if request.throttled is not None:
+                    emulator.set_throttled(request.throttled)
+
+                return emulator.get_performance_stats()["speed_controller"]
+
+        @self.app.get("/emulator/profile")
+        async def get_emulator_profile(
+            top: int = 20,
+            text: bool = False,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Get the hottest emulated addresses and subroutines."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            session_id = await self._request_session_id(None, x_session_id)
+            async with self._session_emulator(session_id, "Profiling") as emulator:
+                report = emulator.get_profile_report(top, text=text)
+            if report.get("error"):
+                raise HTTPException(status_code=404, detail=report["error"])
+            return report
+
+        @self.app.post("/emulator/profile")
+        async def set_emulator_profiling(
+            request: ProfileRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Start or stop the emulator profiler."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            session_id = await self._request_session_id(None, x_session_id)
+            async with self._session_emulator(session_id, "Profiling") as emulator:
+                if request.enabled:
+                    result = emulator.start_profiling(reset=request.reset)
+                else:
+                    result = emulator.stop_profiling()
+            if result["error"]:
+                raise HTTPException(status_code=409, detail=result["error"])
+            return result
+
+        @self.app.post("/emulator/record")
+        async def set_emulator_recording(
+            request: RecordRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Start or stop recording the session's input events."""
+            if not self.emulator:
+                raise HTTPException(status_code=500, detail="Emulator not initialized")
+
+            if request.enabled and not request.path:
+                raise HTTPException(
+                    status_code=400, detail="A recording path is required"
+                )
+
+            session_id = await self._request_session_id(
+                request.session_id, x_session_id
+            )
+            async with self._session_emulator(session_id, "Recording") as emulator:
+                if request.enabled:
+                    result = emulator.start_recording(
+                        str(self._recording_path(request.path))
+                    )
+                else:
+                    result = emulator.stop_recording()
+            if result["error"]:
+                raise HTTPException(status_code=409, detail=result["error"])
+            return result
+
+        @self.app.post("/emulator/replay")
+        async def replay_emulator_session(
+            request: ReplayRequest,
+            x_session_id: Optional[str] = Header(default=None),
+        ):
+            """Replay a recorded session at maximum speed."""
             if not self.emulator:
                 raise HTTPException(status_code=500, detail="Emulator not initialized")
 
-            return self.emulator.get_memory_dump(start_addr, length)
+            path = str(self._recording_path(request.path))
+            session_id = await self._request_session_id(
+                request.session_id, x_session_id
+            )
+            async with self._session_emulator(session_id, "Recording") as emulator:
+                result = await self._run_leased(emulator.replay_recording, path)
+            if result["error"] and not result.get("events_replayed"):
+                raise HTTPException(status_code=400, detail=result["error"])
+            if not request.include_results:
+                result.pop("results", None)
+            return result
 
         @self.app.post("/emulator/reset")
-        async def reset_emulator():
+        async def reset_emulator(x_session_id: Optional[str] = Header(default=None)):
             """Reset the emulator."""
             if not self.emulator:
                 raise HTTPException(status_code=500, detail="Emulator not initialized")
 
-            success = self.emulator.reset_emulator()
+            session_id = await self._request_session_id(None, x_session_id)
+            success = await self._run_emulator_job(
+                "reset_emulator", session_id=session_id
+            )
             if success:
                 return {"message": "Emulator reset successfully"}
             else:
                 raise HTTPException(status_code=500, detail="Failed to reset emulator")
 
         @self.app.get("/history")
-        async def get_command_history(limit: int = 100):
-            """Get command execution history."""
-            return {
-                "history": self.command_history[-limit:],
-                "total_commands": len(self.command_history),
-            }
+        async def get_command_history(
+            limit: int = 100, before: Optional[int] = None, after: Optional[int] = None
+        ):
+            """Get a page of command execution history."""
+            return self.command_history.page(limit, before=before, after=after)
+
+        @self.app.get("/history/{command_id}")
+        async def get_command_result(command_id: str):
+            """Get the history entry of one command."""
+            entry = self.command_history.get(command_id)
+            if entry is None:
+                raise HTTPException(
+                    status_code=404, detail=f"Command not in history: {command_id}"
+                )
+            return entry
 
         @self.app.get("/stats")
         async def get_statistics():
@@ -259,6 +734,19 @@ class BridgeServer:
                 "ai_stats": ai_stats,
                 "uptime": time.time() - self.stats["start_time"],
                 "connected_clients": len(self.connected_clients),
+                "emulator_pool": self.emulator_pool.get_statistics(),
+                "scheduler": self.scheduler.get_statistics(),
+                "command_queue": self.command_queue.get_statistics(),
+                "command_history": self.command_history.get_statistics(),
+                "sessions": {
+                    **self.sessions.get_statistics(),
+                    "snapshots": self.session_store.get_statistics(),
+                },
+                "process_executor": (
+                    self.process_executor.get_statistics()
+                    if self.process_executor
+                    else None
+                ),
             }
 
         @self.app.get("/ai/providers")
@@ -354,31 +842,81 @@ class BridgeServer:
             await websocket.accept()
             self.connected_clients.append(websocket)
 
+            # Each connection gets a session, or resumes the one it names
+            requested = websocket.query_params.get("session_id")
+            requested = requested or websocket.headers.get("x-session-id")
+            resumed = requested is not None and (
+                requested in self.sessions or requested in self.session_store
+            )
+            session = await self.sessions.connect(requested)
+
             # Add to output handler for real-time output streaming
             self.output_handler.add_websocket_client(websocket)
 
+            # Program runs streamed to this client
+            pool_settings = self.settings.bridge.performance
+            run_stream = RunStream(
+                websocket.send_text,
+                self.scheduler,
+                self._run_stream_lease,
+                initial_credits=pool_settings.get("run_stream_credits", 16),
+                max_credits=pool_settings.get("run_stream_max_credits", 256),
+                max_buffer=pool_settings.get("run_stream_buffer", 65536),
+            )
+
             try:
+                await websocket.send_text(
+                    json.dumps(
+                        {
+                            "type": "session",
+                            "session_id": session.session_id,
+                            "resumed": resumed,
+                        }
+                    )
+                )
+
                 while True:
                     # Receive command from client
                     data = await websocket.receive_text()
                     command_data = json.loads(data)
 
-                    # Process command
-                    request = CommandRequest(**command_data)
-                    response = await self._execute_command(request)
+                    # Run, ack and cancel messages drive streamed runs
+                    if command_data.get("type") in ("run", "ack", "cancel"):
+                        if not self.process_executor:
+                            command_data.setdefault("session_id", session.session_id)
+                        reply = await run_stream.handle(command_data)
+                        if reply is not None:
+                            await websocket.send_text(
+                                json.dumps({"type": "run_status", **reply})
+                            )
+                        continue
+
+                    # Process command, or a batch of them
+                    if command_data.get("type") == "batch":
+                        request = BatchRequest(**command_data)
+                    else:
+                        request = CommandRequest(**command_data)
+                    request.context = await self._open_request_session(
+                        request.context, session.session_id
+                    )
+                    try:
+                        response = await self._submit_command(request)
+                    except QueueFullError as e:
+                        response = self._failed_response(str(e))
 
                     # Send response back
                     await websocket.send_text(response.json())
 
                     # Capture command output for real-time streaming
-                    if response.success and response.output:
+                    output = getattr(response, "output", None)
+                    if response.success and output:
                         await self.output_handler.capture_output(
-                            response.output,
+                            output,
                             OutputType.RESULT,
                             OutputSeverity.INFO,
                             {
                                 "command": command_data.get("command", ""),
-                                "response_id": response.response_id,
+                                "response_id": response.command_id,
                             },
                         )
 
@@ -389,8 +927,28 @@ class BridgeServer:
                 if websocket in self.connected_clients:
                     self.connected_clients.remove(websocket)
             finally:
+                await run_stream.close()
+                self.sessions.disconnect(session.session_id)
                 self.output_handler.remove_websocket_client(websocket)
 
+        @self.app.websocket("/ws/memory")
+        async def memory_stream_endpoint(websocket: WebSocket):
+            """WebSocket endpoint streaming changes to subscribed memory ranges."""
+            await websocket.accept()
+            pool_settings = self.settings.bridge.performance
+            stream = MemoryStream(
+                websocket.send_text,
+                self._memory_stream_source(),
+                default_rate=pool_settings.get("memory_stream_rate", 30),
+                max_rate=pool_settings.get("memory_stream_max_rate", 60),
+            )
+            try:
+                await serve_memory_stream(stream, websocket.receive_text)
+            except WebSocketDisconnect:
+                pass
+            except Exception as e:
+                logger.error(f"Memory stream error: {e}")
+
     async def initialize(self) -> bool:
         """Initialize the bridge server components."""
         try:
@@ -403,6 +961,16 @@ class BridgeServer:
 
             logger.info("✅ Emulator initialized successfully")
 
+            # Warm up the emulator pool used for command execution
+            if not await self.emulator_pool.start():
+                logger.error("Failed to start emulator pool")
+                return False
+
+            # Start worker processes when emulator jobs run off the event loop
+            if self.process_executor and not await self.process_executor.start():
+                logger.error("Failed to start emulator worker processes")
+                return False
+
             # Initialize BASIC engine
             if not self.basic_engine.initialize():
                 logger.error("Failed to initialize BASIC engine")
@@ -438,32 +1006,115 @@ class BridgeServer:
                 await client.close()
             self.connected_clients.clear()
 
+            # Stop scheduled runs before resetting the emulators they use
+            await self.scheduler.shutdown()
+
             # Reset emulator
             if self.emulator:
                 self.emulator.reset_emulator()
 
+            await self.command_queue.shutdown()
+            await self.emulator_pool.shutdown()
+            self.command_history.close()
+            if self.process_executor:
+                self.process_executor.shutdown()
+
             logger.info("✅ Bridge server shut down successfully")
 
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
 
-    async def _execute_command(self, request: CommandRequest) -> CommandResponse:
-        """Execute a command through the bridge."""
+    async def _submit_command(
+        self, request: Union[CommandRequest, BatchRequest]
+    ) -> Union[CommandResponse, BatchResponse]:
+        """Queue a command or batch by priority and wait for its response.
+
+        Raises ``QueueFullError`` when the queue is at its depth limit. A
+        command that misses its deadline gets a failed response.
+        """
         start_time = time.perf_counter()
+        if isinstance(request, BatchRequest):
+            handler = self._execute_batch
+        else:
+            handler = self._execute_command
+        try:
+            return await self.command_queue.submit(request, handler)
+        except asyncio.TimeoutError:
+            timeout = request.timeout or self.command_queue.default_timeout
+            execution_time = (time.perf_counter() - start_time) * 1000
+            self._update_stats(execution_time, False)
+            response = self._failed_response(
+                f"Command timed out after {timeout}s", execution_time
+            )
+            self.command_history.append(response)
+            logger.error(f"❌ Command {response.command_id} timed out")
+            if isinstance(request, BatchRequest):
+                return BatchResponse(**response.dict(exclude={"result", "output"}))
+            return response
+
+    async def _open_request_session(
+        self, context: Optional[Dict[str, Any]], default_session: Optional[str]
+    ) -> Dict[str, Any]:
+        """Give a request context its session, opening the session.
+
+        A ``session_id`` in the context wins over the default, which comes
+        from the ``X-Session-ID`` header or the WebSocket's session.
+        """
+        context = dict(context or {})
+        if not context.get("session_id") and default_session:
+            context["session_id"] = default_session
+        if context.get("session_id"):
+            await self.sessions.open(context["session_id"])
+        else:
+            context.pop("session_id", None)
+        return context
+
+    async def _evict_session(self, session_id: str):
+        """Release an evicted session's emulator, keeping it if persisted."""
+        await self.emulator_pool.end_session(
+            session_id, save=self.session_store.persistent
+        )
+        if self.process_executor:
+            await self.process_executor.end_session(session_id)
+
+    def _next_command_id(self) -> str:
+        """Allocate a command id."""
         command_id = f"cmd_{self.current_command_id}_{int(time.time())}"
         self.current_command_id += 1
+        return command_id
+
+    def _failed_response(
+        self, error: str, execution_time: float = 0.0
+    ) -> CommandResponse:
+        """A response for a command that never produced a result."""
+        return CommandResponse(
+            success=False,
+            error=error,
+            execution_time=execution_time,
+            timestamp=time.time(),
+            command_id=self._next_command_id(),
+        )
+
+    async def _execute_command(self, request: CommandRequest) -> CommandResponse:
+        """Execute a command through the bridge."""
+        start_time = time.perf_counter()
+        command_id = self._next_command_id()
 
         try:
             logger.info(f"Executing command {command_id}: {request.command}")
 
-            # Add to command queue
-            self.command_queue.append(request)
+            # Commands from the same session share a pooled emulator
+            session_id = (request.context or {}).get("session_id")
 
             # Process the command based on source
             if request.source == "ai":
-                result = await self._execute_ai_generated_command(request.command)
+                result = await self._execute_ai_generated_command(
+                    request.command, session_id, request.include
+                )
             else:
-                result = await self._execute_direct_command(request.command)
+                result = await self._execute_direct_command(
+                    request.command, session_id, request.include
+                )
 
             # Calculate execution time
             execution_time = (time.perf_counter() - start_time) * 1000
@@ -485,10 +1136,6 @@ class BridgeServer:
             # Add to history
             self.command_history.append(response)
 
-            # Remove from queue
-            if request in self.command_queue:
-                self.command_queue.remove(request)
-
             logger.info(f"✅ Command {command_id} executed in {execution_time:.2f}ms")
             return response
 
@@ -508,11 +1155,87 @@ class BridgeServer:
             logger.error(f"❌ Command {command_id} failed: {e}")
             return error_response
 
-    async def _execute_direct_command(self, command: str) -> Dict[str, Any]:
+    async def _execute_batch(self, request: BatchRequest) -> BatchResponse:
+        """Execute a batch of BASIC lines on one emulator lease.
+
+        The batch is one job and one history entry; each line's result is
+        reduced to its success, output and error.
+        """
+        start_time = time.perf_counter()
+        command_id = self._next_command_id()
+        session_id = (request.context or {}).get("session_id")
+        logger.info(f"Executing batch {command_id}: {len(request.commands)} commands")
+
+        error = None
+        run = {"results": [], "executed": 0, "failed_index": None}
+        try:
+            run = await self._run_emulator_job(
+                "execute_basic_commands",
+                request.commands,
+                request.stop_on_error,
+                include=request.include,
+                session_id=session_id,
+            )
+        except Exception as e:
+            error = str(e)
+
+        results = [
+            {
+                "success": not result.get("error"),
+                "output": result.get("output", ""),
+                "error": result.get("error"),
+            }
+            for result in run["results"]
+        ]
+        success = error is None and run["failed_index"] is None
+        execution_time = (time.perf_counter() - start_time) * 1000
+        response = BatchResponse(
+            success=success,
+            results=results,
+            executed=run["executed"],
+            failed_index=run["failed_index"],
+            cpu_state_deltas=run.get("cpu_state_deltas"),
+            error=error,
+            execution_time=execution_time,
+            timestamp=time.time(),
+            command_id=command_id,
+        )
+
+        self._update_stats(execution_time, success)
+        self.command_history.append(
+            CommandResponse(
+                success=success,
+                result=results,
+                output="\n".join(r["output"] for r in results if r["output"]),
+                error=error or next((r["error"] for r in results if r["error"]), None),
+                execution_time=execution_time,
+                timestamp=response.timestamp,
+                command_id=command_id,
+            )
+        )
+
+        status = "✅" if success else "❌"
+        logger.info(
+            f"{status} Batch {command_id}: {run['executed']}/{len(request.commands)} "
+            f"commands in {execution_time:.2f}ms"
+        )
+        return response
+
+    async def _execute_direct_command(
+        self,
+        command: str,
+        session_id: Optional[str] = None,
+        include: Iterable[str] = (),
+    ) -> Dict[str, Any]:
         """Execute a direct command (from frontend or manual input)."""
         try:
-            # Parse and execute the command through the emulator
-            result = self.emulator.execute_basic_command(command)
+            # Parse and execute the command off the shared request path
+            result = await self._run_emulator_job(
+                "execute_basic_command",
+                command,
+                include=list(include),
+                session_id=session_id,
+            )
 
             if result.get("success"):
                 return {
@@ -529,12 +1252,111 @@ class BridgeServer:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    async def _execute_ai_generated_command(self, command: str) -> Dict[str, Any]:
+    async def _run_emulator_job(
+        self, method: str, *args, session_id: Optional[str] = None, **kwargs
+    ) -> Any:
+        """Run an emulator method on a session's machine or the primary one.
+
+        Session jobs run on a worker process or a leased emulator. Inline jobs
+        run on a thread, off the event loop; the lease keeps any other job off
+        the machine until the thread is done, even when the caller is cancelled.
+        """
+        if session_id is not None and self.process_executor:
+            return await self.process_executor.submit(
+                method, *args, session_id=session_id, **kwargs
+            )
+
+        async with self._machine_lease(session_id) as emulator:
+            return await self._run_leased(getattr(emulator, method), *args, **kwargs)
+
+    async def _run_leased(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call a leased emulator's method on a thread, off the event loop.
+
+        Await it inside the lease: a cancelled caller still waits for the
+        thread, so the lease is not released while the machine is in use.
+        """
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
+        try:
+            return await asyncio.shield(job)
+        except asyncio.CancelledError:
+            # The thread cannot be stopped, so hold the lease until it ends
+            while not job.done():
+                try:
+                    await asyncio.wait({job})
+                except asyncio.CancelledError:
+                    pass
+            raise
+
+    @asynccontextmanager
+    async def _machine_lease(self, session_id: Optional[str]):
+        """Hold a session's pooled emulator, or the primary one without a session."""
+        if session_id is None:
+            async with self.primary_lock:
+                yield self.emulator
+            return
+        async with self.emulator_pool.lease(session_id) as emulator:
+            yield emulator
+
+    @asynccontextmanager
+    async def _run_stream_lease(self, session_id: Optional[str]):
+        """The emulator a streamed run executes on, held for the whole run."""
+        if session_id is not None and self.process_executor:
+            # Session machines live in worker processes, out of the scheduler
+            raise ValueError("Streamed session runs need the inline backend")
+        async with self._machine_lease(session_id) as emulator:
+            yield emulator
+
+    def _memory_stream_source(self) -> EmulatorSource:
+        """Where memory subscriptions find the machine of their session."""
+        if self.process_executor:
+            # Session memory lives in worker processes
+            return EmulatorSource(self.emulator)
+        return PooledEmulatorSource(self.emulator_pool, self.emulator, self.sessions)
+
+    def _recording_path(self, name: str) -> Path:
+        """Resolve a recording name, refusing paths outside the recordings dir."""
+        root = self.recordings_dir.resolve()
+        path = (root / name).resolve()
+        if not path.is_relative_to(root) or path == root:
+            raise HTTPException(status_code=400, detail=f"Invalid recording: {name}")
+        return path
+
+    async def _request_session_id(
+        self, session_id: Optional[str], header: Optional[str]
+    ) -> Optional[str]:
+        """The session a request names in its body or header, opened."""
+        context = await self._open_request_session({"session_id": session_id}, header)
+        return context.get("session_id")
+
+    @asynccontextmanager
+    async def _session_emulator(self, session_id: Optional[str], feature: str):
+        """The in-process machine a request for ``session_id`` controls.
+
+        Without a session this is the primary emulator, which also runs the
+        commands that name no session. A session's commands run on its pooled
+        emulator, so its speed settings, profiler and recording live there too.
+        """
+        if session_id is not None and self.process_executor:
+            # Session machines live in worker processes
+            raise HTTPException(
+                status_code=409,
+                detail=f"{feature} of sessions needs the inline backend",
+            )
+        async with self._machine_lease(session_id) as emulator:
+            yield emulator
+
+    async def _execute_ai_generated_command(
+        self,
+        command: str,
+        session_id: Optional[str] = None,
+        include: Iterable[str] = (),
+    ) -> Dict[str, Any]:
         """Execute an AI-generated command with additional validation."""
         try:
             # AI commands might need additional processing
             # For now, treat them the same as direct commands
-            return await self._execute_direct_command(command)
+            return await self._execute_direct_command(command, session_id, include)
 
         except Exception as e:
             return {"success": False, "error": f"AI command execution failed: {e}"}
@@ -895,6 +1717,13 @@ class BridgeServer:
                 "websocket_clients": len(self.connected_clients),
                 "command_queue_size": len(self.command_queue),
             },
+            "emulator_pool": self.emulator_pool.get_statistics(),
+            "scheduler": self.scheduler.get_statistics(),
+            "process_executor": (
+                self.process_executor.get_statistics()
+                if self.process_executor
+                else None
+            ),
         }
 
 
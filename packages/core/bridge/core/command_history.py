@@ -0,0 +1,164 @@
+"""
+Command History Module
+
+This module keeps the bridge's command history in a fixed number of slots.
+Entries are stored as plain tuples rather than response models, each gets a
+sequence number, and entry ``n`` lives in slot ``n % capacity``, so adding an
+entry overwrites the oldest one once the ring is full. An index from command
+id to sequence number gives constant-time lookups. Evicted entries can be
+appended to a JSON lines segment file instead of being dropped; the segment
+is rotated once it reaches its size limit, keeping one previous segment.
+
+History pages are addressed by sequence number cursors, so a client walks
+back through the ring (or follows new entries) without copying it.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+# Fields of a history entry, in slot tuple order after the sequence number
+ENTRY_FIELDS = (
+    "command_id",
+    "success",
+    "result",
+    "output",
+    "error",
+    "execution_time",
+    "timestamp",
+)
+
+
+class CommandHistory:
+    """Bounded ring of command results indexed by command id."""
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        spill_path: Optional[Union[str, Path]] = None,
+        spill_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """Initialize an empty history of ``capacity`` slots."""
+        self.capacity = max(1, capacity)
+        self.slots: List[Optional[Tuple[Any, ...]]] = [None] * self.capacity
+        self.index: Dict[str, int] = {}
+        self.next_sequence = 0
+
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spill_max_bytes = spill_max_bytes
+        self._spill_file = None
+        self._spill_bytes = 0
+        self.spilled = 0
+
+    def __len__(self) -> int:
+        """Number of entries still held in the ring."""
+        return min(self.next_sequence, self.capacity)
+
+    @property
+    def oldest_sequence(self) -> int:
+        """Sequence number of the oldest entry held."""
+        return self.next_sequence - len(self)
+
+    def append(self, response: Any) -> int:
+        """Add a command response; returns its sequence number."""
+        sequence = self.next_sequence
+        slot = sequence % self.capacity
+        evicted = self.slots[slot]
+        if evicted is not None:
+            self.index.pop(evicted[1], None)
+            if self.spill_path:
+                self._spill(evicted)
+
+        self.slots[slot] = (sequence, *(getattr(response, f) for f in ENTRY_FIELDS))
+        self.index[response.command_id] = sequence
+        self.next_sequence += 1
+        return sequence
+
+    def get(self, command_id: str) -> Optional[Dict[str, Any]]:
+        """The entry for ``command_id``, if it is still held."""
+        sequence = self.index.get(command_id)
+        if sequence is None:
+            return None
+        return self._entry(self.slots[sequence % self.capacity])
+
+    def page(
+        self,
+        limit: int = 100,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """A page of entries in order, oldest first.
+
+        Without a cursor this is the newest ``limit`` entries. ``before``
+        pages back from the given sequence number (use the returned
+        ``next_cursor``); ``after`` follows entries added since.
+        """
+        limit = max(0, limit)
+        if after is not None:
+            start = max(after + 1, self.oldest_sequence)
+            stop = min(start + limit, self.next_sequence)
+            next_cursor = stop - 1 if stop > start else after
+        else:
+            stop = self.next_sequence
+            if before is not None:
+                stop = min(before, stop)
+            start = max(stop - limit, self.oldest_sequence)
+            stop = max(start, stop)
+            next_cursor = start if start > self.oldest_sequence else None
+
+        return {
+            "history": [
+                self._entry(self.slots[sequence % self.capacity])
+                for sequence in range(start, stop)
+            ],
+            "next_cursor": next_cursor,
+            "total_commands": self.next_sequence,
+            "retained": len(self),
+        }
+
+    def _entry(self, slot: Tuple[Any, ...]) -> Dict[str, Any]:
+        """The JSON form of a slot."""
+        entry = dict(zip(ENTRY_FIELDS, slot[1:]))
+        entry["sequence"] = slot[0]
+        return entry
+
+    def _spill(self, slot: Tuple[Any, ...]):
+        """Append an evicted entry to the segment file."""
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+                self._spill_bytes = self._spill_file.tell()
+            line = json.dumps(self._entry(slot), default=str) + "\n"
+            self._spill_file.write(line)
+            self._spill_bytes += len(line)
+            self.spilled += 1
+            if self._spill_bytes >= self.spill_max_bytes:
+                self._rotate()
+        except OSError as e:
+            logger.warning(f"Failed to spill command history, disabling: {e}")
+            self.spill_path = None
+
+    def _rotate(self):
+        """Start a new segment, keeping the previous one as ``.1``."""
+        self._spill_file.close()
+        self._spill_file = None
+        self.spill_path.replace(self.spill_path.with_name(self.spill_path.name + ".1"))
+
+    def close(self):
+        """Flush and close the segment file."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get history retention statistics."""
+        return {
+            "capacity": self.capacity,
+            "retained": len(self),
+            "total_commands": self.next_sequence,
+            "spilled": self.spilled,
+            "spill_path": str(self.spill_path) if self.spill_path else None,
+        }
@@ -0,0 +1,249 @@
+"""
+Command Queue Module
+
+This module queues bridge commands by priority. Commands wait in a heap
+ordered by ``CommandRequest.priority`` (10 first) and then by arrival, and a
+fixed set of worker tasks runs them. Sources can be capped to a number of
+commands running at once, so a burst of AI-generated commands cannot take
+every worker; a capped command stays queued, keeping its place, while
+commands from other sources go ahead. Each command has a deadline covering
+its time in the queue and its execution, and the queue rejects new commands
+once it holds ``max_depth`` of them.
+"""
+
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+MIN_PRIORITY = 1
+MAX_PRIORITY = 10
+
+
+class QueueFullError(Exception):
+    """Raised when a command arrives while the queue is at its depth limit."""
+
+
+@dataclass
+class QueuedCommand:
+    """A command waiting for, or running on, a worker."""
+
+    sequence: int
+    priority: int
+    source: str
+    request: Any
+    handler: Callable[[Any], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued: float
+    started: Optional[float] = None
+    abandoned: bool = False
+    task: Optional[asyncio.Task] = None
+
+
+class CommandQueue:
+    """Priority queue of commands served by worker tasks."""
+
+    def __init__(
+        self,
+        workers: int = 10,
+        max_depth: int = 1000,
+        source_limits: Optional[Dict[str, int]] = None,
+        default_timeout: Optional[float] = 30.0,
+    ):
+        """Initialize the queue (workers start with the first command)."""
+        self.worker_count = max(1, workers)
+        self.max_depth = max(1, max_depth)
+        self.source_limits = dict(source_limits or {})
+        self.default_timeout = default_timeout
+
+        self.heap: List[Tuple[int, int, QueuedCommand]] = []
+        self.depth = 0
+        self.running: Dict[str, int] = {}
+        self.workers: List[asyncio.Task] = []
+        self._condition = asyncio.Condition()
+        self._next_sequence = 0
+
+        self.stats = {
+            "submitted": 0,
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "max_depth_seen": 0,
+        }
+
+    def __len__(self) -> int:
+        """Number of commands waiting for a worker."""
+        return self.depth
+
+    def start(self):
+        """Start the worker tasks."""
+        if not self.workers:
+            self.workers = [
+                asyncio.create_task(self._worker()) for _ in range(self.worker_count)
+            ]
+
+    async def shutdown(self):
+        """Stop the workers; queued and running commands are cancelled."""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        for _, _, item in self.heap:
+            if not item.future.done():
+                item.future.cancel()
+        self.heap.clear()
+        self.depth = 0
+
+    async def submit(
+        self,
+        request: Any,
+        handler: Callable[[Any], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Queue ``handler(request)`` and wait for its result.
+
+        Raises ``QueueFullError`` if the queue is full and
+        ``asyncio.TimeoutError`` if the command misses its deadline, in which
+        case it is dropped from the queue or cancelled where it is running.
+        """
+        if self.depth >= self.max_depth:
+            self.stats["rejected"] += 1
+            raise QueueFullError(f"Command queue full ({self.max_depth} waiting)")
+        self.start()
+
+        priority = getattr(request, "priority", MIN_PRIORITY) or MIN_PRIORITY
+        item = QueuedCommand(
+            sequence=self._next_sequence,
+            priority=min(MAX_PRIORITY, max(MIN_PRIORITY, priority)),
+            source=getattr(request, "source", "") or "",
+            request=request,
+            handler=handler,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued=time.perf_counter(),
+        )
+        self._next_sequence += 1
+        async with self._condition:
+            heapq.heappush(self.heap, (-item.priority, item.sequence, item))
+            self.depth += 1
+            self.stats["submitted"] += 1
+            self.stats["max_depth_seen"] = max(self.stats["max_depth_seen"], self.depth)
+            self._condition.notify()
+
+        if timeout is None:
+            timeout = getattr(request, "timeout", None) or self.default_timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(item.future), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            self._abandon(item)
+            raise
+        except asyncio.CancelledError:
+            self._abandon(item)
+            raise
+
+    def _abandon(self, item: QueuedCommand):
+        """Drop a command whose caller stopped waiting."""
+        if item.abandoned or item.future.done():
+            return
+        item.abandoned = True
+        if item.started is None:
+            # Left in the heap and skipped when it reaches the top
+            self.depth -= 1
+        elif item.task is not None:
+            item.task.cancel()
+
+    def _next_item(self) -> Optional[QueuedCommand]:
+        """Pop the best command whose source has room to run another."""
+        deferred = []
+        chosen = None
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            item = entry[2]
+            if item.abandoned:
+                continue
+            limit = self.source_limits.get(item.source)
+            if limit is not None and self.running.get(item.source, 0) >= limit:
+                deferred.append(entry)
+                continue
+            chosen = item
+            break
+        for entry in deferred:
+            heapq.heappush(self.heap, entry)
+
+        if chosen is not None:
+            chosen.started = time.perf_counter()
+            self.depth -= 1
+            self.running[chosen.source] = self.running.get(chosen.source, 0) + 1
+        return chosen
+
+    async def _worker(self):
+        """Run queued commands one at a time."""
+        while True:
+            async with self._condition:
+                item = self._next_item()
+                while item is None:
+                    await self._condition.wait()
+                    item = self._next_item()
+            try:
+                await self._run(item)
+            finally:
+                self.running[item.source] -= 1
+                if item.source in self.source_limits:
+                    # A capped command may have been waiting for this slot
+                    async with self._condition:
+                        self._condition.notify_all()
+
+    async def _run(self, item: QueuedCommand):
+        """Run one command and hand its outcome to the caller."""
+        if item.abandoned:
+            return
+        wait_time = (item.started - item.enqueued) * 1000
+        self.stats["started"] += 1
+        self.stats["total_wait_time"] += wait_time
+        self.stats["max_wait_time"] = max(self.stats["max_wait_time"], wait_time)
+
+        item.task = asyncio.ensure_future(item.handler(item.request))
+        try:
+            await asyncio.wait([item.task])
+        except asyncio.CancelledError:
+            # The worker itself is shutting down
+            item.task.cancel()
+            raise
+        if item.task.cancelled():
+            if not item.future.done():
+                item.future.cancel()
+            return
+
+        error = item.task.exception()
+        if error is not None:
+            self.stats["failed"] += 1
+            logger.error(f"Queued command failed: {error}")
+            if not item.future.done():
+                item.future.set_exception(error)
+        else:
+            self.stats["completed"] += 1
+            if not item.future.done():
+                item.future.set_result(item.task.result())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get queue depth, wait time and throughput statistics."""
+        started = self.stats["started"]
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "workers": self.worker_count,
+            "running": sum(self.running.values()),
+            "running_by_source": {s: n for s, n in self.running.items() if n},
+            "source_limits": self.source_limits,
+            "average_wait_time": (
+                self.stats["total_wait_time"] / started if started else 0.0
+            ),
+            **self.stats,
+        }
@@ -0,0 +1,392 @@
+"""
+Emulator Pool Module
+
+This module provides a pool of pre-initialized 6502 emulator instances for the
+bridge server. Instances are leased per request, stay bound to a session while
+it is active, and are reset from a clean baseline snapshot when they change
+hands. Idle instances beyond the configured minimum are evicted.
+
+With a snapshot store, a session whose instance is reclaimed or evicted has
+its machine saved first, and its next lease restores it, so sessions outnumber
+instances without losing their state.
+
+A session can be pinned to its instance, for example while its memory is
+being watched. Pinned instances are never reclaimed or evicted; ending the
+session breaks the pin. At least one instance always stays unpinned, so pins
+cannot starve the sessions that hold none.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class PooledEmulator:
+    """An emulator instance managed by the pool."""
+
+    instance_id: int
+    emulator: Any
+    session_id: Optional[str] = None
+    leased: bool = False
+    lease_started: float = 0.0
+    last_used: float = field(default_factory=time.monotonic)
+    lease_count: int = 0
+
+
+class EmulatorPool:
+    """Pool of warm emulator instances with per-session leasing."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 4,
+        min_idle: int = 1,
+        idle_timeout: float = 300.0,
+        snapshot_store: Optional[Any] = None,
+    ):
+        """Initialize the pool (instances are created by ``start``)."""
+        self.factory = factory
+        self.snapshot_store = snapshot_store
+        self.max_size = max(1, max_size)
+        self.min_idle = max(0, min(min_idle, self.max_size))
+        self.idle_timeout = idle_timeout
+
+        self.instances: List[PooledEmulator] = []
+        self.sessions: Dict[str, PooledEmulator] = {}
+        # Pin counts of sessions that must keep their instance
+        self.pins: Dict[str, int] = {}
+        self.max_pinned = self.max_size - 1
+        self.baseline = None
+        self._condition = asyncio.Condition()
+        self._next_instance_id = 0
+        self._waiting = 0
+
+        self.stats = {
+            "instances_created": 0,
+            "instances_evicted": 0,
+            "leases": 0,
+            "session_hits": 0,
+            "resets": 0,
+            "sessions_saved": 0,
+            "sessions_resumed": 0,
+            "pins_refused": 0,
+            "waits": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "total_lease_time": 0.0,
+            "max_lease_time": 0.0,
+        }
+
+    async def start(self) -> bool:
+        """Create the minimum number of warm instances."""
+        try:
+            async with self._condition:
+                while len(self.instances) < max(1, self.min_idle):
+                    self._create_instance()
+
+            size = len(self.instances)
+            logger.info(f"✅ Emulator pool started with {size} instances")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Failed to start emulator pool: {e}")
+            return False
+
+    async def shutdown(self):
+        """Drop all instances and session bindings, saving idle sessions."""
+        async with self._condition:
+            for instance in self.instances:
+                if not instance.leased:
+                    self._unbind(instance)
+            self.instances.clear()
+            self.sessions.clear()
+            self.pins.clear()
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def lease(self, session_id: Optional[str] = None):
+        """Lease an emulator for the duration of an ``async with`` block."""
+        instance = await self.acquire(session_id)
+        try:
+            yield instance.emulator
+        finally:
+            await self.release(instance)
+
+    async def acquire(self, session_id: Optional[str] = None) -> PooledEmulator:
+        """Acquire an instance, waiting while the pool is exhausted."""
+        wait_start = time.perf_counter()
+        waited = False
+
+        async with self._condition:
+            while True:
+                self._evict_idle()
+                instance = self._find_instance(session_id)
+                if instance is not None:
+                    break
+                waited = True
+                self._waiting += 1
+                try:
+                    await self._condition.wait()
+                finally:
+                    self._waiting -= 1
+
+            instance.leased = True
+            instance.lease_started = time.perf_counter()
+            instance.lease_count += 1
+            if session_id is not None and instance.session_id != session_id:
+                instance.session_id = session_id
+                self.sessions[session_id] = instance
+                self._resume_session(instance)
+
+        wait_time = (time.perf_counter() - wait_start) * 1000
+        self.stats["leases"] += 1
+        if waited:
+            self.stats["waits"] += 1
+        self.stats["total_wait_time"] += wait_time
+        self.stats["max_wait_time"] = max(self.stats["max_wait_time"], wait_time)
+
+        return instance
+
+    async def release(self, instance: PooledEmulator):
+        """Return a leased instance to the pool."""
+        lease_time = (time.perf_counter() - instance.lease_started) * 1000
+        self.stats["total_lease_time"] += lease_time
+        self.stats["max_lease_time"] = max(self.stats["max_lease_time"], lease_time)
+
+        async with self._condition:
+            instance.leased = False
+            instance.last_used = time.monotonic()
+
+            # Anonymous leases never leak state into the next request
+            if instance.session_id is None:
+                self._reset_instance(instance)
+
+            self._condition.notify_all()
+
+    async def end_session(self, session_id: str, save: bool = False) -> bool:
+        """Unbind a session, resetting its instance if it is idle.
+
+        With ``save`` the session's machine is kept in the snapshot store for
+        a later lease; otherwise any stored state is discarded too.
+        """
+        async with self._condition:
+            stored = False
+            if self.snapshot_store is not None and not save:
+                stored = self.snapshot_store.delete(session_id)
+
+            instance = self.sessions.get(session_id)
+            if instance is None:
+                return stored
+
+            self._unbind(instance, save=save)
+            if not instance.leased:
+                self._reset_instance(instance)
+            self._condition.notify_all()
+            return True
+
+    async def pin(self, session_id: str) -> Optional[Any]:
+        """Bind a session to an instance and keep it there until ``unpin``.
+
+        Returns the session's emulator, or None when pinning another session
+        would leave no unpinned instance. While pinned the instance is neither
+        reclaimed by other sessions nor evicted when idle.
+        """
+        async with self._condition:
+            if self._pin_refused(session_id):
+                return None
+            instance = self.sessions.get(session_id)
+            if instance is not None:
+                # Bound already, possibly leased by a running job
+                self.pins[session_id] = self.pins.get(session_id, 0) + 1
+                return instance.emulator
+
+        # Bind (or resume) the session, pinning it before the lease ends
+        instance = await self.acquire(session_id)
+        try:
+            # Another session may have taken the last pin while this one waited
+            if self._pin_refused(session_id):
+                return None
+            self.pins[session_id] = self.pins.get(session_id, 0) + 1
+            return instance.emulator
+        finally:
+            await self.release(instance)
+
+    def _pin_refused(self, session_id: str) -> bool:
+        """Whether a new pin would leave every instance pinned."""
+        if session_id in self.pins or len(self.pins) < self.max_pinned:
+            return False
+        self.stats["pins_refused"] += 1
+        logger.warning(f"Pin of session {session_id} refused: pool fully pinned")
+        return True
+
+    async def unpin(self, session_id: str):
+        """Drop one pin of a session; the last one lets its instance go."""
+        async with self._condition:
+            count = self.pins.get(session_id, 0) - 1
+            if count > 0:
+                self.pins[session_id] = count
+                return
+            self.pins.pop(session_id, None)
+            # Sessions waiting for an instance may reclaim this one now
+            self._condition.notify_all()
+
+    def get_pinned_emulator(self, session_id: str) -> Optional[Any]:
+        """The emulator a session is pinned to, or None once the pin is broken."""
+        if session_id not in self.pins:
+            return None
+        return self.get_session_emulator(session_id)
+
+    def is_session_leased(self, session_id: str) -> bool:
+        """Whether a session's instance is leased right now."""
+        instance = self.sessions.get(session_id)
+        return instance is not None and instance.leased
+
+    def get_session_emulator(self, session_id: str) -> Optional[Any]:
+        """Get the emulator bound to a session, if any."""
+        instance = self.sessions.get(session_id)
+        return instance.emulator if instance else None
+
+    def _find_instance(self, session_id: Optional[str]) -> Optional[PooledEmulator]:
+        """Pick an instance for a lease, or None if the caller must wait."""
+        if session_id is not None and session_id in self.sessions:
+            instance = self.sessions[session_id]
+            if instance.leased:
+                # Requests within one session are serialized on its machine
+                return None
+            self.stats["session_hits"] += 1
+            return instance
+
+        free = [i for i in self.instances if not i.leased and i.session_id is None]
+        if free:
+            return free[0]
+
+        if len(self.instances) < self.max_size:
+            return self._create_instance()
+
+        # Reclaim the least recently used idle instance from another session,
+        # leaving machines that are pinned or being recorded to their sessions
+        bound = [
+            i
+            for i in self.instances
+            if not i.leased
+            and i.session_id not in self.pins
+            and not getattr(i.emulator, "recorder", None)
+        ]
+        if bound:
+            instance = min(bound, key=lambda i: i.last_used)
+            self._unbind(instance)
+            self._reset_instance(instance)
+            return instance
+
+        return None
+
+    def _create_instance(self) -> PooledEmulator:
+        """Create a warm emulator reset to the baseline image."""
+        emulator = self.factory()
+        if not emulator.initialize_emulator():
+            raise RuntimeError("Failed to initialize pooled emulator")
+
+        if self.baseline is None:
+            self.baseline = emulator.snapshot()
+        else:
+            emulator.restore(self.baseline, reset_devices=True)
+
+        instance = PooledEmulator(instance_id=self._next_instance_id, emulator=emulator)
+        self._next_instance_id += 1
+        self.instances.append(instance)
+        self.stats["instances_created"] += 1
+        return instance
+
+    def _reset_instance(self, instance: PooledEmulator):
+        """Reset an instance's machine, devices and tools to the clean baseline."""
+        if self.baseline is not None:
+            instance.emulator.restore(self.baseline, reset_devices=True)
+            self.stats["resets"] += 1
+
+    def _unbind(self, instance: PooledEmulator, save: bool = True):
+        """Remove an instance's session binding, storing its machine."""
+        if instance.session_id is not None:
+            if save and self.snapshot_store is not None:
+                self._save_session(instance)
+            self.sessions.pop(instance.session_id, None)
+            self.pins.pop(instance.session_id, None)
+            instance.session_id = None
+
+    def _save_session(self, instance: PooledEmulator):
+        """Put the machine of an instance's session in the snapshot store."""
+        try:
+            size = self.snapshot_store.save(
+                instance.session_id, instance.emulator.snapshot(), self.baseline
+            )
+            self.stats["sessions_saved"] += 1
+            logger.debug(f"Saved session {instance.session_id} ({size} bytes)")
+        except Exception as e:
+            logger.warning(f"Failed to save session {instance.session_id}: {e}")
+
+    def _resume_session(self, instance: PooledEmulator):
+        """Restore a newly bound session's stored machine, if it has one."""
+        if self.snapshot_store is None:
+            return
+        try:
+            snapshot = self.snapshot_store.load(instance.session_id, self.baseline)
+        except Exception as e:
+            # Unreadable, or saved against another baseline; start clean
+            logger.warning(f"Failed to load session {instance.session_id}: {e}")
+            self.snapshot_store.delete(instance.session_id)
+            return
+        if snapshot is not None and instance.emulator.restore(snapshot):
+            # The instance holds the live state now
+            self.snapshot_store.delete(instance.session_id)
+            self.stats["sessions_resumed"] += 1
+
+    def _evict_idle(self):
+        """Drop instances idle longer than ``idle_timeout`` down to ``min_idle``."""
+        now = time.monotonic()
+        expired = [
+            i
+            for i in self.instances
+            if not i.leased
+            and i.session_id not in self.pins
+            and now - i.last_used > self.idle_timeout
+        ]
+        expired.sort(key=lambda i: i.last_used)
+
+        for instance in expired:
+            if len(self.instances) <= self.min_idle:
+                # Keep the warm minimum, but release its session
+                self._unbind(instance)
+                self._reset_instance(instance)
+                instance.last_used = now
+                continue
+
+            self._unbind(instance)
+            self.instances.remove(instance)
+            self.stats["instances_evicted"] += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get pool occupancy, wait time and lease duration statistics."""
+        leased = sum(1 for i in self.instances if i.leased)
+        leases = self.stats["leases"]
+
+        return {
+            "size": len(self.instances),
+            "max_size": self.max_size,
+            "leased": leased,
+            "idle": len(self.instances) - leased,
+            "occupancy": leased / self.max_size,
+            "sessions": len(self.sessions),
+            "pinned_sessions": len(self.pins),
+            "waiters": self._waiting,
+            "average_wait_time": (
+                self.stats["total_wait_time"] / leases if leases else 0.0
+            ),
+            "average_lease_time": (
+                self.stats["total_lease_time"] / leases if leases else 0.0
+            ),
+            **self.stats,
+        }
@@ -0,0 +1,339 @@
+"""
+Memory Stream Module
+
+This module streams emulator memory changes to a WebSocket client. The client
+subscribes to address ranges; each subscription first receives the whole
+range, then once per frame only the bytes that changed, as (address, data)
+runs. Frames with no changes send nothing, and writes between two frames are
+coalesced into one message, so a live memory viewer costs bandwidth in
+proportion to what the program writes rather than to the size of the view.
+
+A subscription belongs to a session, not to an emulator instance. When the
+session loses its machine the subscription is closed before another frame
+goes out, so a pooled instance handed to another session is never watched.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+ENCODINGS = ("hex", "base64")
+
+
+def _encode(data: bytes, encoding: str) -> str:
+    """Encode bytes for a JSON message."""
+    if encoding == "base64":
+        return base64.b64encode(data).decode("ascii")
+    return data.hex()
+
+
+class EmulatorSource:
+    """Finds the emulator of a subscription's session and holds on to it.
+
+    This one only serves subscriptions without a session, which watch a
+    single emulator.
+    """
+
+    def __init__(self, emulator: Any = None):
+        """Serve ``emulator`` to sessionless subscriptions."""
+        self.emulator = emulator
+
+    async def acquire(self, session_id: Optional[str]) -> Optional[Any]:
+        """The emulator to watch for ``session_id``, kept until ``release``."""
+        return self.emulator if session_id is None else None
+
+    def current(self, session_id: Optional[str]) -> Optional[Any]:
+        """The emulator ``session_id`` still holds, or None if it lost it."""
+        return self.emulator if session_id is None else None
+
+    async def release(self, session_id: Optional[str]):
+        """Let the session's emulator go."""
+
+
+class PooledEmulatorSource(EmulatorSource):
+    """Session emulators from an emulator pool, pinned while watched."""
+
+    def __init__(self, pool: Any, emulator: Any = None, sessions: Any = None):
+        """Pin session machines of ``pool``.
+
+        With ``sessions``, only sessions it has open can be watched.
+        """
+        super().__init__(emulator)
+        self.pool = pool
+        self.sessions = sessions
+
+    async def acquire(self, session_id: Optional[str]) -> Optional[Any]:
+        """Pin the session to its instance and return its emulator."""
+        if session_id is None:
+            return self.emulator
+        if self.sessions is not None and session_id not in self.sessions:
+            return None
+        return await self.pool.pin(session_id)
+
+    def current(self, session_id: Optional[str]) -> Optional[Any]:
+        """The pinned emulator, or None once the session has ended."""
+        if session_id is None:
+            return self.emulator
+        return self.pool.get_pinned_emulator(session_id)
+
+    async def release(self, session_id: Optional[str]):
+        """Unpin the session."""
+        if session_id is not None:
+            await self.pool.unpin(session_id)
+
+
+@dataclass
+class MemorySubscription:
+    """An address range streamed to the client."""
+
+    subscription_id: str
+    session_id: Optional[str]
+    emulator: Any
+    watcher: Any
+    interval: float
+    encoding: str
+    next_frame: float = 0.0
+    frames: int = 0
+    messages: int = 0
+    bytes_sent: int = 0
+
+    def get_subscription_info(self) -> Dict[str, Any]:
+        """Get information about the subscription."""
+        return {
+            "subscription_id": self.subscription_id,
+            "rate": 1.0 / self.interval,
+            "encoding": self.encoding,
+            "frames": self.frames,
+            "messages": self.messages,
+            "bytes_sent": self.bytes_sent,
+            **self.watcher.get_watch_info(),
+        }
+
+
+class MemoryStream:
+    """Memory change subscriptions of one WebSocket connection."""
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        source: EmulatorSource,
+        default_rate: float = 30.0,
+        max_rate: float = 60.0,
+        max_subscriptions: int = 8,
+    ):
+        """Initialize the stream; ``send`` delivers one text message."""
+        self.send = send
+        self.source = source
+        self.max_rate = max(1.0, max_rate)
+        self.default_rate = min(self.max_rate, max(1.0, default_rate))
+        self.max_subscriptions = max_subscriptions
+        self.subscriptions: Dict[str, MemorySubscription] = {}
+        self._next_subscription_id = 0
+        self._wakeup = asyncio.Event()
+
+    async def subscribe(
+        self,
+        session_id: Optional[str],
+        start: int,
+        length: int,
+        rate: Optional[float] = None,
+        encoding: str = "hex",
+    ) -> Dict[str, Any]:
+        """Send the session's range in full, then stream its changes."""
+        if len(self.subscriptions) >= self.max_subscriptions:
+            return {"error": f"At most {self.max_subscriptions} subscriptions"}
+        if encoding not in ENCODINGS:
+            return {"error": f"Unsupported encoding: {encoding}"}
+        emulator = await self.source.acquire(session_id)
+        if emulator is None:
+            return {"error": "No emulator for this session"}
+        try:
+            watcher = emulator.watch_memory(start, length)
+        except ValueError as e:
+            await self.source.release(session_id)
+            return {"error": str(e)}
+
+        rate = min(self.max_rate, max(1.0, rate or self.default_rate))
+        subscription = MemorySubscription(
+            subscription_id=f"mem_{self._next_subscription_id}",
+            session_id=session_id,
+            emulator=emulator,
+            watcher=watcher,
+            interval=1.0 / rate,
+            encoding=encoding,
+        )
+        self._next_subscription_id += 1
+
+        # The full range goes out before the first diff can
+        try:
+            await self._send(subscription, self._snapshot_message(subscription))
+        except Exception:
+            watcher.close()
+            await self.source.release(session_id)
+            raise
+        subscription.next_frame = time.monotonic() + subscription.interval
+        self.subscriptions[subscription.subscription_id] = subscription
+        self._wakeup.set()
+        return subscription.get_subscription_info()
+
+    async def unsubscribe(self, subscription_id: str, release: bool = True) -> bool:
+        """Stop streaming a range.
+
+        ``release`` is False once the session has already lost its emulator.
+        """
+        subscription = self.subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return False
+        subscription.watcher.close()
+        if release:
+            await self.source.release(subscription.session_id)
+        return True
+
+    async def close(self):
+        """Drop every subscription."""
+        for subscription_id in list(self.subscriptions):
+            await self.unsubscribe(subscription_id)
+
+    async def run(self):
+        """Send frames until the connection goes away."""
+        while True:
+            now = time.monotonic()
+            for subscription in list(self.subscriptions.values()):
+                if subscription.next_frame > now:
+                    continue
+                # Skip missed frames rather than bursting to catch up
+                subscription.next_frame = max(
+                    subscription.next_frame + subscription.interval, now
+                )
+                await self._send_frame(subscription)
+
+            self._wakeup.clear()
+            if self.subscriptions:
+                delay = min(s.next_frame for s in self.subscriptions.values()) - now
+                delay = max(0.0, delay)
+            else:
+                delay = None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send_frame(self, subscription: MemorySubscription):
+        """Send the subscription's changes since its last frame, if any."""
+        subscription.frames += 1
+        if self.source.current(subscription.session_id) is not subscription.emulator:
+            # The session lost its machine, which may serve another session now
+            await self.unsubscribe(subscription.subscription_id, release=False)
+            message = {
+                "type": "memory_status",
+                "subscription_id": subscription.subscription_id,
+                "closed": True,
+                "error": "The session's emulator was released",
+            }
+            await self.send(json.dumps(message))
+            return
+
+        watcher = subscription.watcher
+        if watcher.memory is not subscription.emulator.memory:
+            # The emulator was re-initialized with new memory; start over
+            watcher.close()
+            subscription.watcher = subscription.emulator.watch_memory(
+                watcher.start, watcher.length
+            )
+            await self._send(subscription, self._snapshot_message(subscription))
+            return
+
+        runs = watcher.changes()
+        if not runs:
+            return
+        message = {
+            "type": "memory_diff",
+            "subscription_id": subscription.subscription_id,
+            "frame": subscription.frames,
+            "runs": [
+                [address, _encode(data, subscription.encoding)]
+                for address, data in runs
+            ],
+        }
+        await self._send(subscription, message)
+
+    def _snapshot_message(self, subscription: MemorySubscription) -> Dict[str, Any]:
+        """The message carrying the subscription's whole range."""
+        watcher = subscription.watcher
+        return {
+            "type": "memory_snapshot",
+            "subscription_id": subscription.subscription_id,
+            "start": watcher.start,
+            "length": watcher.length,
+            "rate": 1.0 / subscription.interval,
+            "encoding": subscription.encoding,
+            "data": _encode(watcher.read(), subscription.encoding),
+        }
+
+    async def _send(self, subscription: MemorySubscription, message: Dict[str, Any]):
+        """Send one message, counting its size."""
+        text = json.dumps(message, separators=(",", ":"))
+        await self.send(text)
+        subscription.messages += 1
+        subscription.bytes_sent += len(text)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get information about the stream's subscriptions."""
+        subscriptions = [s.get_subscription_info() for s in self.subscriptions.values()]
+        return {
+            "subscriptions": subscriptions,
+            "messages": sum(s["messages"] for s in subscriptions),
+            "bytes_sent": sum(s["bytes_sent"] for s in subscriptions),
+        }
+
+
+async def serve_memory_stream(
+    stream: MemoryStream, receive: Callable[[], Awaitable[str]]
+):
+    """Handle subscribe and unsubscribe requests until ``receive`` fails.
+
+    Requests are JSON objects with an ``action``. ``subscribe`` takes
+    ``start``, ``length`` and optional ``rate``, ``encoding`` and
+    ``session_id``; ``unsubscribe`` takes ``subscription_id``. Replies other
+    than the initial snapshot go out as ``memory_status`` messages.
+    """
+    runner = asyncio.create_task(stream.run())
+    try:
+        while True:
+            try:
+                request = json.loads(await receive())
+                action = request.get("action")
+                if action == "subscribe":
+                    reply = await stream.subscribe(
+                        request.get("session_id"),
+                        int(request["start"]),
+                        int(request["length"]),
+                        rate=request.get("rate"),
+                        encoding=request.get("encoding", "hex"),
+                    )
+                    if "error" not in reply:
+                        continue
+                elif action == "unsubscribe":
+                    subscription_id = request.get("subscription_id", "")
+                    unsubscribed = await stream.unsubscribe(subscription_id)
+                    reply = {
+                        "subscription_id": subscription_id,
+                        "unsubscribed": unsubscribed,
+                    }
+                elif action == "status":
+                    reply = stream.get_statistics()
+                else:
+                    reply = {"error": f"Unknown action: {action}"}
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                reply = {"error": f"Invalid memory stream request: {e}"}
+            await stream.send(json.dumps({"type": "memory_status", **reply}))
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        await stream.close()
+        logger.debug("Memory stream closed")
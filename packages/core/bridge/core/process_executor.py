@@ -0,0 +1,210 @@
+"""
+Process Executor Module
+
+This module runs CPU-bound emulator work outside the bridge's event loop. Each
+worker is a single-process executor that owns one 6502 emulator, so a long
+program only occupies its own worker. Sessions are routed to the same worker
+every time and their machine state is swapped in and out with snapshots, which
+lets several sessions share one worker without seeing each other's memory.
+"""
+
+import asyncio
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from engine.emulator import worker
+
+# Emulator methods that may be run as worker jobs
+WORKER_METHODS = frozenset(
+    {
+        "execute_basic_command",
+        "execute_basic_commands",
+        "execute_program",
+        "get_cpu_state",
+        "get_display_output",
+        "get_memory_dump",
+        "load_memory_image",
+        "reset_emulator",
+        "send_keys",
+    }
+)
+
+# Per-worker session state, populated by _init_worker inside the child process
+_worker_sessions: "OrderedDict[str, Any]" = OrderedDict()
+_worker_max_sessions = 64
+
+
+def _init_worker(max_sessions: int):
+    """Set up the worker's emulator and its session cache."""
+    global _worker_max_sessions
+
+    worker.init_worker_emulator()
+    _worker_max_sessions = max_sessions
+
+
+def _run_job(
+    session_id: Optional[str], method: str, args: tuple, kwargs: Dict[str, Any]
+) -> Any:
+    """Run one emulator method in the worker with the session's state loaded."""
+    emulator = worker.emulator
+    emulator.restore(_worker_sessions.get(session_id, worker.baseline))
+
+    try:
+        return getattr(emulator, method)(*args, **kwargs)
+    finally:
+        if session_id is not None:
+            _worker_sessions[session_id] = emulator.snapshot()
+            _worker_sessions.move_to_end(session_id)
+            while len(_worker_sessions) > _worker_max_sessions:
+                _worker_sessions.popitem(last=False)
+
+
+def _drop_session(session_id: str) -> bool:
+    """Forget a session's saved machine state."""
+    return _worker_sessions.pop(session_id, None) is not None
+
+
+class EmulatorProcessExecutor:
+    """Runs emulator jobs on worker processes with sticky session routing."""
+
+    def __init__(self, workers: int = 2, max_sessions_per_worker: int = 64):
+        """Initialize the executor (worker processes are started by ``start``)."""
+        self.worker_count = max(1, workers)
+        self.max_sessions_per_worker = max_sessions_per_worker
+        self.workers: List[ProcessPoolExecutor] = []
+
+        self.in_flight = [0] * self.worker_count
+        self.stats = {
+            "jobs_submitted": 0,
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "total_job_time": 0.0,
+            "max_job_time": 0.0,
+            "jobs_per_worker": [0] * self.worker_count,
+            "workers_restarted": 0,
+        }
+
+    async def start(self) -> bool:
+        """Start the worker processes and wait until each emulator is ready."""
+        try:
+            loop = asyncio.get_running_loop()
+            self.workers = [self._new_worker() for _ in range(self.worker_count)]
+
+            # Force every worker to spawn and build its emulator now
+            await asyncio.gather(
+                *(loop.run_in_executor(w, _drop_session, "") for w in self.workers)
+            )
+
+            logger.info(f"✅ Started {self.worker_count} emulator worker processes")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Failed to start emulator workers: {e}")
+            self.shutdown()
+            return False
+
+    def _new_worker(self) -> ProcessPoolExecutor:
+        """Create a single-process executor with its own emulator."""
+        return ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_init_worker,
+            initargs=(self.max_sessions_per_worker,),
+        )
+
+    def shutdown(self):
+        """Stop all worker processes."""
+        for executor in self.workers:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.workers = []
+
+    def get_worker_index(self, session_id: Optional[str]) -> int:
+        """Pick a worker: sticky by session, least loaded otherwise."""
+        if session_id is not None:
+            return zlib.crc32(session_id.encode("utf-8")) % self.worker_count
+
+        return min(range(self.worker_count), key=lambda i: self.in_flight[i])
+
+    async def submit(
+        self, method: str, *args, session_id: Optional[str] = None, **kwargs
+    ) -> Any:
+        """Run an emulator method on a worker and await its result."""
+        if method not in WORKER_METHODS:
+            raise ValueError(f"Emulator method not allowed in workers: {method}")
+        if not self.workers:
+            raise RuntimeError("Emulator process executor is not running")
+
+        index = self.get_worker_index(session_id)
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+
+        self.in_flight[index] += 1
+        self.stats["jobs_submitted"] += 1
+        self.stats["jobs_per_worker"][index] += 1
+
+        executor = self.workers[index]
+        try:
+            result = await loop.run_in_executor(
+                executor, _run_job, session_id, method, args, kwargs
+            )
+            self.stats["jobs_completed"] += 1
+            return result
+
+        except BrokenProcessPool:
+            self.stats["jobs_failed"] += 1
+            self._replace_worker(index, executor)
+            raise
+
+        except Exception:
+            self.stats["jobs_failed"] += 1
+            raise
+
+        finally:
+            self.in_flight[index] -= 1
+            job_time = (time.perf_counter() - start_time) * 1000
+            self.stats["total_job_time"] += job_time
+            self.stats["max_job_time"] = max(self.stats["max_job_time"], job_time)
+
+    def _replace_worker(self, index: int, broken: ProcessPoolExecutor):
+        """Swap a worker whose process died for a fresh one.
+
+        The sessions routed to it lose their saved machine state. Jobs that
+        fail on the same broken worker replace it only once.
+        """
+        if index >= len(self.workers) or self.workers[index] is not broken:
+            return
+        logger.warning(f"⚠️ Emulator worker {index} died, starting a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.workers[index] = self._new_worker()
+        self.stats["workers_restarted"] += 1
+
+    async def end_session(self, session_id: str) -> bool:
+        """Drop a session's saved state on its worker."""
+        if not self.workers:
+            return False
+
+        index = self.get_worker_index(session_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.workers[index], _drop_session, session_id
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get worker load and job timing statistics."""
+        finished = self.stats["jobs_completed"] + self.stats["jobs_failed"]
+
+        return {
+            "workers": self.worker_count,
+            "running": bool(self.workers),
+            "in_flight": list(self.in_flight),
+            "average_job_time": (
+                self.stats["total_job_time"] / finished if finished else 0.0
+            ),
+            **self.stats,
+            "jobs_per_worker": list(self.stats["jobs_per_worker"]),
+        }
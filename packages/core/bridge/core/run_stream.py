@@ -0,0 +1,316 @@
+"""
+Run Stream Module
+
+This module streams program runs to a WebSocket client while they execute.
+A run is a scheduler job whose output and progress are pushed as frames
+instead of being returned in one response when the program ends: output
+chunks written to the display, periodic progress frames with the steps
+executed and the program counter, and a final summary.
+
+Flow control is credit based. Each output or progress frame costs one
+credit; the client grants credits with ``ack`` messages as it consumes
+frames. While a run has no credits its output is buffered, coalescing into
+the next frame, and once the buffer reaches its limit the job is paused in
+the scheduler until credits arrive, so a slow client holds the program back
+instead of making the server buffer without bound. The final summary costs
+no credit, so a client always learns how a run ended.
+"""
+
+import asyncio
+import json
+import time
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class StreamedRun:
+    """A program run whose frames go to one client."""
+
+    run_id: str
+    credits: int
+    session_id: Optional[str] = None
+    job: Any = None
+    task: Optional[asyncio.Task] = None
+    output: List[str] = field(default_factory=list)
+    buffered: int = 0
+    sent_steps: int = -1
+    next_frame: float = 0.0
+    next_progress: float = 0.0
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    frames: int = 0
+    bytes_sent: int = 0
+    pauses: int = 0
+
+    def get_run_info(self) -> Dict[str, Any]:
+        """Get information about the run."""
+        info = {
+            "run_id": self.run_id,
+            "session_id": self.session_id,
+            "credits": self.credits,
+            "buffered": self.buffered,
+            "frames": self.frames,
+            "bytes_sent": self.bytes_sent,
+            "pauses": self.pauses,
+        }
+        if self.job is not None:
+            info.update(self.job.get_job_info())
+        return info
+
+
+class RunStream:
+    """Streamed program runs of one WebSocket connection."""
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        scheduler: Any,
+        lease: Callable[[Optional[str]], AbstractAsyncContextManager],
+        initial_credits: int = 16,
+        max_credits: int = 256,
+        frame_rate: float = 30.0,
+        progress_interval: float = 0.25,
+        max_buffer: int = 64 * 1024,
+        stall_timeout: float = 60.0,
+        max_runs: int = 4,
+    ):
+        """Initialize the stream.
+
+        ``send`` delivers one text message and ``lease`` gives the emulator
+        a session's runs execute on, for the duration of a run.
+        """
+        self.send = send
+        self.scheduler = scheduler
+        self.lease = lease
+        self.max_credits = max(1, max_credits)
+        self.initial_credits = min(self.max_credits, max(1, initial_credits))
+        self.frame_interval = 1.0 / max(1.0, frame_rate)
+        self.progress_interval = max(self.frame_interval, progress_interval)
+        self.max_buffer = max(1, max_buffer)
+        self.stall_timeout = stall_timeout
+        self.max_runs = max_runs
+        self.runs: Dict[str, StreamedRun] = {}
+        self._next_run_id = 0
+
+    async def handle(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Handle a ``run``, ``ack`` or ``cancel`` message.
+
+        Returns a reply for the client, or ``None`` when the run's own frames
+        answer the request.
+        """
+        kind = request.get("type")
+        try:
+            if kind == "run":
+                return self.start(
+                    int(request["steps"]),
+                    priority=int(request.get("priority", 1)),
+                    session_id=request.get("session_id"),
+                    credits=request.get("credits"),
+                    turbo=request.get("turbo"),
+                    batch_size=request.get("batch_size"),
+                )
+            if kind == "ack":
+                return self.ack(request["run_id"], int(request.get("credits", 1)))
+            if kind == "cancel":
+                return {
+                    "run_id": request.get("run_id"),
+                    "cancelled": self.cancel(request.get("run_id", "")),
+                }
+            return {"error": f"Unknown run message: {kind}"}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"error": f"Invalid run request: {e}"}
+
+    def start(
+        self,
+        steps: int,
+        priority: int = 1,
+        session_id: Optional[str] = None,
+        credits: Optional[int] = None,
+        turbo: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Start streaming a run of ``steps`` instructions."""
+        if len(self.runs) >= self.max_runs:
+            return {"error": f"At most {self.max_runs} runs per connection"}
+        if steps <= 0:
+            return {"error": "steps must be positive"}
+
+        run = StreamedRun(
+            run_id=f"run_{self._next_run_id}",
+            credits=min(self.max_credits, max(0, credits or self.initial_credits)),
+            session_id=session_id,
+        )
+        self._next_run_id += 1
+        self.runs[run.run_id] = run
+        run.task = asyncio.create_task(
+            self._serve(run, steps, priority, turbo, batch_size)
+        )
+        return None
+
+    def ack(self, run_id: str, credits: int) -> Optional[Dict[str, Any]]:
+        """Grant a run more credits."""
+        run = self.runs.get(run_id)
+        if run is None:
+            return {"run_id": run_id, "error": f"No such run: {run_id}"}
+        run.credits = min(self.max_credits, run.credits + max(0, credits))
+        run.wakeup.set()
+        return None
+
+    def cancel(self, run_id: str) -> bool:
+        """Stop a run; its summary reports it as cancelled."""
+        run = self.runs.get(run_id)
+        if run is None or run.job is None:
+            return False
+        return self.scheduler.cancel(run.job.job_id)
+
+    async def close(self):
+        """Cancel every run of the connection."""
+        runs = list(self.runs.values())
+        for run in runs:
+            run.task.cancel()
+        await asyncio.gather(*(run.task for run in runs), return_exceptions=True)
+
+    async def _serve(
+        self,
+        run: StreamedRun,
+        steps: int,
+        priority: int,
+        turbo: Optional[bool],
+        batch_size: Optional[int],
+    ):
+        """Run the job on a leased emulator and stream its frames."""
+        try:
+            async with self.lease(run.session_id) as emulator:
+                run.job = self.scheduler.submit(
+                    emulator,
+                    steps,
+                    priority=priority,
+                    session_id=run.session_id,
+                    turbo=turbo,
+                    batch_size=batch_size,
+                    listener=lambda job, result: self._on_quantum(run, result),
+                )
+                # Jobs cancelled between quanta end without a listener call
+                run.job.future.add_done_callback(lambda _: run.wakeup.set())
+                await self._send(
+                    run,
+                    {
+                        "type": "run_started",
+                        "run_id": run.run_id,
+                        "job_id": run.job.job_id,
+                        "steps": steps,
+                        "credits": run.credits,
+                    },
+                )
+                try:
+                    await self._pump(run)
+                finally:
+                    # A run that ends early takes its job with it
+                    self.scheduler.cancel(run.job.job_id)
+                summary = await self.scheduler.wait(run.job)
+
+            summary.pop("output", None)
+            await self._send(
+                run,
+                {
+                    "type": "run_complete",
+                    "run_id": run.run_id,
+                    "frames": run.frames,
+                    "pauses": run.pauses,
+                    **summary,
+                },
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Streamed run {run.run_id} failed: {e}")
+            try:
+                await self._send(
+                    run, {"type": "run_status", "run_id": run.run_id, "error": str(e)}
+                )
+            except Exception:
+                pass
+        finally:
+            self.runs.pop(run.run_id, None)
+
+    def _on_quantum(self, run: StreamedRun, result: Dict[str, Any]):
+        """Buffer a quantum's output, pausing the job once the buffer is full."""
+        output = result.get("output")
+        if output:
+            run.output.append(output)
+            run.buffered += len(output)
+            if run.buffered >= self.max_buffer and self.scheduler.pause(run.job.job_id):
+                run.pauses += 1
+        run.wakeup.set()
+
+    async def _pump(self, run: StreamedRun):
+        """Send frames until the job is done and its output delivered."""
+        while not (run.job.done and not run.output):
+            # Quanta wake a running job; without credits only an ack can help
+            timeout = None if run.credits else self.stall_timeout
+            try:
+                await asyncio.wait_for(run.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                # Out of credits for too long; give up on the client
+                logger.warning(f"Run {run.run_id} stalled without credits")
+                return
+            run.wakeup.clear()
+
+            # Coalesce whatever arrives before the next frame is due
+            delay = run.next_frame - time.monotonic()
+            if delay > 0 and not run.job.done:
+                await asyncio.sleep(delay)
+            run.next_frame = time.monotonic() + self.frame_interval
+            await self._flush(run)
+
+    async def _flush(self, run: StreamedRun):
+        """Send buffered output and a due progress frame, credits permitting."""
+        job = run.job
+        if run.output and run.credits:
+            data = "".join(run.output)
+            run.output.clear()
+            run.buffered = 0
+            await self._send_frame(run, {"type": "run_output", "data": data})
+
+        now = time.monotonic()
+        if (
+            run.credits
+            and now >= run.next_progress
+            and job.steps_executed != run.sent_steps
+            and not job.done
+        ):
+            run.next_progress = now + self.progress_interval
+            run.sent_steps = job.steps_executed
+            await self._send_frame(
+                run,
+                {
+                    "type": "run_progress",
+                    "steps": job.steps,
+                    "steps_executed": job.steps_executed,
+                    "pc": job.last_result.get("cpu_state", {}).get("pc"),
+                    "quanta": job.quanta,
+                    "run_time": job.run_time * 1000,
+                },
+            )
+
+        if job.paused and run.buffered < self.max_buffer:
+            self.scheduler.resume(job.job_id)
+
+    async def _send_frame(self, run: StreamedRun, frame: Dict[str, Any]):
+        """Send a frame, spending one of the run's credits."""
+        run.credits -= 1
+        run.frames += 1
+        await self._send(run, {**frame, "run_id": run.run_id, "seq": run.frames})
+
+    async def _send(self, run: StreamedRun, message: Dict[str, Any]):
+        """Send one message, counting its size."""
+        text = json.dumps(message, separators=(",", ":"))
+        await self.send(text)
+        run.bytes_sent += len(text)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get information about the stream's runs."""
+        return {"runs": [run.get_run_info() for run in self.runs.values()]}
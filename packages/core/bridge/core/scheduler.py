@@ -0,0 +1,375 @@
+"""
+Emulator Scheduler Module
+
+This module time-slices long emulator runs on the bridge's event loop. A job
+runs in short quanta of instructions and the scheduler yields to the loop
+between quanta, so a ten-million-step run on one session no longer blocks
+requests from the others. Quanta are sized from each job's measured speed to
+take about ``quantum_ms``, and the next quantum goes to the job that has had
+the least run time per unit of weight (stride scheduling). A job's weight is
+its request priority, so a priority 10 job gets ten times the CPU of a
+priority 1 job while both are runnable. Jobs on the same emulator run one at
+a time, in submission order, and any job can be cancelled between quanta.
+
+Emulators paced to real time are paced by the scheduler rather than by
+sleeping inside ``execute_program``: a job that is ahead of the wall clock
+is simply not runnable until it falls due, leaving the loop free meanwhile.
+
+A job can have a listener, called after each quantum with its result, to
+stream progress as the job runs; such a job hands its output to the listener
+instead of keeping it. A paused job keeps its place but gets no quanta until
+it is resumed, which lets a slow consumer hold a run back.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from engine.emulator.cpu_state import (
+    CpuState,
+    decode_cpu_state_deltas,
+    encode_cpu_state_deltas,
+)
+
+MIN_PRIORITY = 1
+MAX_PRIORITY = 10
+
+# Bounds on the instructions in one quantum
+MIN_QUANTUM_STEPS = 100
+MAX_QUANTUM_STEPS = 1000000
+
+JOB_STATES = ("queued", "running", "completed", "cancelled", "failed")
+
+
+@dataclass
+class ScheduledJob:
+    """A long ``execute_program`` run split into quanta."""
+
+    job_id: str
+    emulator: Any
+    steps: int
+    weight: int
+    session_id: Optional[str] = None
+    turbo: Optional[bool] = None
+    batch_size: Optional[int] = None
+    include: Tuple[str, ...] = ()
+    status: str = "queued"
+    steps_executed: int = 0
+    quanta: int = 0
+    run_time: float = 0.0
+    # Stride scheduling pass: run time divided by weight, plus the start offset
+    virtual_time: float = 0.0
+    quantum_steps: int = MIN_QUANTUM_STEPS
+    # Real-time pacing: wall time and cycle count at the first quantum
+    pace_start: float = 0.0
+    pace_cycles: int = 0
+    ready_at: float = 0.0
+    cancel_requested: bool = False
+    paused: bool = False
+    listener: Optional[Callable[["ScheduledJob", Dict[str, Any]], None]] = None
+    error: Optional[str] = None
+    output: List[str] = field(default_factory=list)
+    last_result: Dict[str, Any] = field(default_factory=dict)
+    cpu_states: List[CpuState] = field(default_factory=list)
+    submitted: float = field(default_factory=time.perf_counter)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    future: Optional[asyncio.Future] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, one way or another."""
+        return self.status in ("completed", "cancelled", "failed")
+
+    def get_result(self) -> Dict[str, Any]:
+        """The merged result of the job's quanta."""
+        end = self.finished or time.perf_counter()
+        result = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "steps_executed": self.steps_executed,
+            "cpu_state": self.last_result.get("cpu_state", {}),
+            "output": "".join(self.output),
+            "error": self.error,
+            "cancelled": self.status == "cancelled",
+            "quanta": self.quanta,
+            "run_time": self.run_time * 1000,
+            "wait_time": ((self.started or end) - self.submitted) * 1000,
+        }
+        if "cpu_states" in self.include:
+            result["cpu_state_deltas"] = encode_cpu_state_deltas(self.cpu_states)
+        return result
+
+    def get_job_info(self) -> Dict[str, Any]:
+        """Progress of the job, without its output."""
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "paused": self.paused,
+            "priority": self.weight,
+            "steps": self.steps,
+            "steps_executed": self.steps_executed,
+            "quanta": self.quanta,
+            "run_time": self.run_time * 1000,
+        }
+
+
+class EmulatorScheduler:
+    """Weighted fair, cooperative scheduler for emulator runs."""
+
+    def __init__(self, quantum_ms: float = 10.0):
+        """Initialize the scheduler (its loop starts with the first job)."""
+        self.quantum_ms = max(0.1, quantum_ms)
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._next_job_id = 0
+        self.virtual_time = 0.0
+
+        self.stats = {
+            "jobs_submitted": 0,
+            "jobs_completed": 0,
+            "jobs_cancelled": 0,
+            "jobs_failed": 0,
+            "quanta": 0,
+            "total_run_time": 0.0,
+            "max_quantum_time": 0.0,
+        }
+
+    def submit(
+        self,
+        emulator: Any,
+        steps: int,
+        priority: int = MIN_PRIORITY,
+        session_id: Optional[str] = None,
+        turbo: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        listener: Optional[Callable[[ScheduledJob, Dict[str, Any]], None]] = None,
+        include: Tuple[str, ...] = (),
+    ) -> ScheduledJob:
+        """Queue ``steps`` instructions on ``emulator``; ``wait`` gives the result.
+
+        With "cpu_states" in ``include`` the result carries the CPU states of
+        every quantum, delta-encoded in "cpu_state_deltas".
+        """
+        job = ScheduledJob(
+            job_id=f"job_{self._next_job_id}",
+            emulator=emulator,
+            steps=max(0, steps),
+            weight=min(MAX_PRIORITY, max(MIN_PRIORITY, priority)),
+            session_id=session_id,
+            turbo=turbo,
+            batch_size=batch_size,
+            include=tuple(include),
+            listener=listener,
+            # New jobs join at the current virtual time instead of catching up
+            virtual_time=self.virtual_time,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._next_job_id += 1
+        self.jobs[job.job_id] = job
+        self.stats["jobs_submitted"] += 1
+
+        # The loop exits when it runs out of jobs and is restarted here
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return job
+
+    async def run(self, *args, **kwargs) -> Dict[str, Any]:
+        """Submit a job and wait for its result."""
+        return await self.wait(self.submit(*args, **kwargs))
+
+    async def wait(self, job: ScheduledJob) -> Dict[str, Any]:
+        """Wait for a job; cancelling the waiter cancels the job."""
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            self.cancel(job.job_id)
+            raise
+
+    def cancel(self, job_id: str) -> bool:
+        """Stop a job before its next quantum."""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel_requested = True
+        self._wakeup.set()
+        return True
+
+    def pause(self, job_id: str) -> bool:
+        """Stop giving quanta to a job until it is resumed."""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.paused = True
+        return True
+
+    def resume(self, job_id: str) -> bool:
+        """Let a paused job run again."""
+        job = self.jobs.get(job_id)
+        if job is None or not job.paused:
+            return False
+        job.paused = False
+        # Like a new job, it does not catch up on the time it sat out
+        job.virtual_time = max(job.virtual_time, self.virtual_time)
+        self._wakeup.set()
+        return True
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel every unfinished job of a session."""
+        return sum(
+            self.cancel(job.job_id)
+            for job in list(self.jobs.values())
+            if job.session_id == session_id
+        )
+
+    async def shutdown(self):
+        """Cancel all jobs and stop the scheduler loop."""
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+        if self._runner is not None:
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    def _runnable(self) -> List[ScheduledJob]:
+        """The oldest unfinished job of each emulator."""
+        runnable = []
+        seen = set()
+        for job in self.jobs.values():
+            if id(job.emulator) not in seen:
+                seen.add(id(job.emulator))
+                runnable.append(job)
+        return runnable
+
+    async def _run(self):
+        """Give quanta to jobs until none are left."""
+        while True:
+            for job in [j for j in self.jobs.values() if j.cancel_requested]:
+                self._finish(job, "cancelled")
+
+            runnable = self._runnable()
+            if not runnable:
+                return
+
+            now = time.monotonic()
+            active = [job for job in runnable if not job.paused]
+            due = [job for job in active if job.ready_at <= now]
+            if not due:
+                # Every job is ahead of real time or paused; wait for the
+                # first one unless a job is submitted, resumed or cancelled
+                self._wakeup.clear()
+                delay = None
+                if active:
+                    delay = min(job.ready_at for job in active) - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._run_quantum(min(due, key=lambda job: job.virtual_time))
+
+            # Let other requests run before the next quantum
+            await asyncio.sleep(0)
+
+    def _run_quantum(self, job: ScheduledJob):
+        """Run one quantum of ``job`` and charge its time to it."""
+        emulator = job.emulator
+        pacer = emulator.speed_controller
+        if job.started is None:
+            job.started = time.perf_counter()
+            job.status = "running"
+            job.pace_start = time.monotonic()
+            job.pace_cycles = emulator.mpu.processorCycles
+
+        # Run the quantum unpaced; the scheduler delays the next one instead
+        paced = pacer.is_pacing()
+        steps = min(job.quantum_steps, job.steps - job.steps_executed)
+        start = time.perf_counter()
+        try:
+            with pacer.unthrottled():
+                result = emulator.execute_program(
+                    steps,
+                    turbo=job.turbo,
+                    batch_size=job.batch_size,
+                    include=job.include,
+                )
+        except Exception as e:
+            result = {"error": str(e), "steps_executed": 0}
+        elapsed = time.perf_counter() - start
+
+        if paced:
+            emulated = emulator.mpu.processorCycles - job.pace_cycles
+            job.ready_at = job.pace_start + emulated / pacer.get_effective_hz()
+
+        executed = result.get("steps_executed", 0)
+        job.steps_executed += executed
+        job.quanta += 1
+        job.run_time += elapsed
+        job.virtual_time += elapsed / job.weight
+        job.last_result = result
+        if result.get("cpu_state_deltas"):
+            job.cpu_states.extend(decode_cpu_state_deltas(result["cpu_state_deltas"]))
+        if job.listener is not None:
+            try:
+                job.listener(job, result)
+            except Exception as e:
+                logger.error(f"Job {job.job_id} listener failed: {e}")
+        elif result.get("output"):
+            job.output.append(result["output"])
+
+        # Virtual time only moves forward, so late joiners start level
+        active = [j for j in self._runnable() if not j.paused]
+        if active:
+            lowest = min(j.virtual_time for j in active)
+            self.virtual_time = max(self.virtual_time, lowest)
+        self.stats["quanta"] += 1
+        self.stats["total_run_time"] += elapsed * 1000
+        self.stats["max_quantum_time"] = max(
+            self.stats["max_quantum_time"], elapsed * 1000
+        )
+
+        # Size the next quantum to take about quantum_ms at this job's speed
+        if executed and elapsed > 0:
+            target = int(executed * self.quantum_ms / (elapsed * 1000))
+            job.quantum_steps = min(MAX_QUANTUM_STEPS, max(MIN_QUANTUM_STEPS, target))
+
+        if result.get("error"):
+            job.error = result["error"]
+            self._finish(job, "failed")
+        elif job.steps_executed >= job.steps or executed == 0:
+            self._finish(job, "completed")
+
+    def _finish(self, job: ScheduledJob, status: str):
+        """Complete a job and hand its result to the waiter."""
+        job.status = status
+        job.finished = time.perf_counter()
+        self.jobs.pop(job.job_id, None)
+        self.stats[f"jobs_{status}"] += 1
+        if status == "cancelled":
+            logger.info(f"Job {job.job_id} cancelled after {job.steps_executed} steps")
+        if not job.future.done():
+            job.future.set_result(job.get_result())
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Progress of the queued and running jobs."""
+        return [job.get_job_info() for job in self.jobs.values()]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get job counts and quantum timing statistics."""
+        quanta = self.stats["quanta"]
+        return {
+            "queued": sum(1 for job in self.jobs.values() if job.status == "queued"),
+            "running": sum(1 for job in self.jobs.values() if job.status == "running"),
+            "paused": sum(1 for job in self.jobs.values() if job.paused),
+            "quantum_ms": self.quantum_ms,
+            "average_quantum_time": (
+                self.stats["total_run_time"] / quanta if quanta else 0.0
+            ),
+            **self.stats,
+        }
@@ -0,0 +1,326 @@
+"""
+Sessions Module
+
+This module tracks the bridge's client sessions. A session is created when a
+WebSocket connects or when a request first names it in the ``X-Session-ID``
+header, and its commands run on the session's own pooled emulator. Sessions
+are kept in least recently used order: one idle for longer than the idle
+timeout is evicted, and opening a session beyond the live session cap evicts
+the least recently used one. Sessions with a connected WebSocket or a running
+request are never evicted.
+
+The snapshot store keeps the machine state of sessions that are not bound to
+an emulator, encoded as the pages that differ from the pool's baseline. It
+holds them in memory, or in a directory when snapshots are persisted, so a
+client reconnecting with its session id resumes where it left off instead of
+re-running its setup commands. The directory keeps at most as many snapshots
+as the memory store, and drops those not resumed within their maximum age.
+"""
+
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from loguru import logger
+
+from engine.emulator.snapshot import decode_snapshot, encode_snapshot
+
+
+@dataclass
+class SessionInfo:
+    """A live client session."""
+
+    session_id: str
+    origin: str
+    created: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    connections: int = 0
+
+    def get_session_info(self) -> Dict[str, Any]:
+        """Get information about the session."""
+        return {
+            "session_id": self.session_id,
+            "origin": self.origin,
+            "created": self.created,
+            "idle_time": time.monotonic() - self.last_seen,
+            "requests": self.requests,
+            "connections": self.connections,
+        }
+
+
+class SessionManager:
+    """Live sessions in least recently used order."""
+
+    def __init__(
+        self,
+        max_sessions: int = 256,
+        idle_timeout: float = 1800.0,
+        on_evict: Optional[Callable[[str], Awaitable[Any]]] = None,
+        is_busy: Optional[Callable[[str], bool]] = None,
+    ):
+        """Initialize the manager.
+
+        ``on_evict`` is awaited with the id of each evicted session, and
+        ``is_busy`` tells whether a session has a request in progress.
+        """
+        self.max_sessions = max(1, max_sessions)
+        self.idle_timeout = idle_timeout
+        self.on_evict = on_evict
+        self.is_busy = is_busy
+        self.sessions: "OrderedDict[str, SessionInfo]" = OrderedDict()
+
+        self.stats = {
+            "sessions_created": 0,
+            "sessions_closed": 0,
+            "evicted_idle": 0,
+            "evicted_lru": 0,
+        }
+
+    def __len__(self) -> int:
+        """Number of live sessions."""
+        return len(self.sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        """Whether a session is live."""
+        return session_id in self.sessions
+
+    async def open(
+        self, session_id: Optional[str] = None, origin: str = "header"
+    ) -> SessionInfo:
+        """Get a session, creating it (with a new id if none is given)."""
+        await self.evict_idle()
+
+        if session_id is None:
+            session_id = f"sess_{uuid.uuid4().hex}"
+        info = self.sessions.get(session_id)
+        if info is None:
+            info = SessionInfo(session_id=session_id, origin=origin)
+            self.sessions[session_id] = info
+            self.stats["sessions_created"] += 1
+            logger.debug(f"Session {session_id} created ({origin})")
+
+        self._touch(info)
+        info.requests += 1
+        await self._enforce_limit(keep=info)
+        return info
+
+    async def connect(self, session_id: Optional[str] = None) -> SessionInfo:
+        """Open a session for a WebSocket, which pins it until it disconnects."""
+        info = await self.open(session_id, origin="websocket")
+        info.connections += 1
+        return info
+
+    def disconnect(self, session_id: str):
+        """Release a WebSocket's pin; the idle timer starts now."""
+        info = self.sessions.get(session_id)
+        if info is not None:
+            info.connections = max(0, info.connections - 1)
+            self._touch(info)
+
+    def close(self, session_id: str) -> bool:
+        """Forget a session without evicting it."""
+        if self.sessions.pop(session_id, None) is None:
+            return False
+        self.stats["sessions_closed"] += 1
+        return True
+
+    async def evict_idle(self) -> int:
+        """Evict sessions idle longer than ``idle_timeout``."""
+        now = time.monotonic()
+        evicted = 0
+        for info in list(self.sessions.values()):
+            # Least recently used first, so the rest are newer still
+            if now - info.last_seen <= self.idle_timeout:
+                break
+            if self._busy(info):
+                self._touch(info)
+                continue
+            await self._evict(info, "idle")
+            evicted += 1
+        return evicted
+
+    def _touch(self, info: SessionInfo):
+        """Mark a session as just used."""
+        info.last_seen = time.monotonic()
+        self.sessions.move_to_end(info.session_id)
+
+    def _busy(self, info: SessionInfo) -> bool:
+        """Whether a session is pinned by a connection or a running request."""
+        if info.connections:
+            return True
+        return bool(self.is_busy and self.is_busy(info.session_id))
+
+    async def _enforce_limit(self, keep: SessionInfo):
+        """Evict least recently used sessions beyond ``max_sessions``."""
+        while len(self.sessions) > self.max_sessions:
+            victim = next(
+                (
+                    info
+                    for info in self.sessions.values()
+                    if info is not keep and not self._busy(info)
+                ),
+                None,
+            )
+            if victim is None:
+                # Every session is in use; let the cap be exceeded for now
+                return
+            await self._evict(victim, "lru")
+
+    async def _evict(self, info: SessionInfo, reason: str):
+        """Remove a session and let the owner release its state."""
+        self.sessions.pop(info.session_id, None)
+        self.stats[f"evicted_{reason}"] += 1
+        logger.info(f"Session {info.session_id} evicted ({reason})")
+        if self.on_evict is not None:
+            try:
+                await self.on_evict(info.session_id)
+            except Exception as e:
+                logger.error(f"Failed to release session {info.session_id}: {e}")
+
+    def get_sessions(self) -> List[Dict[str, Any]]:
+        """Information about the live sessions, most recently used first."""
+        return [info.get_session_info() for info in reversed(self.sessions.values())]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get session counts."""
+        return {
+            "live": len(self.sessions),
+            "connected": sum(1 for i in self.sessions.values() if i.connections),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout,
+            **self.stats,
+        }
+
+
+class SessionSnapshotStore:
+    """Encoded machine state of sessions, in memory or in a directory."""
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_entries: int = 256,
+        max_age: Optional[float] = None,
+    ):
+        """Keep up to ``max_entries`` snapshots in ``directory``, or in memory.
+
+        Snapshot files older than ``max_age`` seconds are dropped.
+        """
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max(1, max_entries)
+        self.max_age = max_age
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+        self.stats = {"saved": 0, "loaded": 0, "bytes_saved": 0, "pruned": 0}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Snapshots left behind by earlier runs
+            self.prune()
+
+    @property
+    def persistent(self) -> bool:
+        """Whether snapshots survive a bridge restart."""
+        return self.directory is not None
+
+    def save(self, session_id: str, snapshot: Any, base: Any = None) -> int:
+        """Store a session's snapshot; returns its encoded size."""
+        data = encode_snapshot(snapshot, base)
+        if self.directory is not None:
+            path = self._path(session_id)
+            partial = path.with_suffix(".tmp")
+            partial.write_bytes(data)
+            partial.replace(path)
+            self.prune()
+        else:
+            self.entries[session_id] = data
+            self.entries.move_to_end(session_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        self.stats["saved"] += 1
+        self.stats["bytes_saved"] += len(data)
+        return len(data)
+
+    def load(self, session_id: str, base: Any = None) -> Optional[Any]:
+        """A session's snapshot, if one is stored."""
+        if self.directory is not None:
+            path = self._path(session_id)
+            if not path.exists():
+                return None
+            if self._expired(path.stat().st_mtime):
+                path.unlink(missing_ok=True)
+                self.stats["pruned"] += 1
+                return None
+            data = path.read_bytes()
+        else:
+            data = self.entries.get(session_id)
+            if data is None:
+                return None
+
+        self.stats["loaded"] += 1
+        return decode_snapshot(data, base)
+
+    def delete(self, session_id: str) -> bool:
+        """Discard a session's snapshot."""
+        if self.directory is not None:
+            path = self._path(session_id)
+            if not path.exists():
+                return False
+            path.unlink()
+            return True
+        return self.entries.pop(session_id, None) is not None
+
+    def prune(self) -> int:
+        """Drop the oldest snapshot files beyond ``max_entries`` or ``max_age``."""
+        if self.directory is None:
+            return 0
+        files = []
+        for path in self.directory.glob("*.snap"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        files.sort(reverse=True)
+
+        pruned = 0
+        for index, (mtime, path) in enumerate(files):
+            if index >= self.max_entries or self._expired(mtime):
+                path.unlink(missing_ok=True)
+                pruned += 1
+        if pruned:
+            self.stats["pruned"] += pruned
+            logger.debug(f"Pruned {pruned} session snapshots")
+        return pruned
+
+    def _expired(self, saved_at: float) -> bool:
+        """Whether a snapshot saved at ``saved_at`` is past its maximum age."""
+        return self.max_age is not None and time.time() - saved_at > self.max_age
+
+    def __contains__(self, session_id: str) -> bool:
+        """Whether a snapshot is stored for a session."""
+        if self.directory is not None:
+            return self._path(session_id).exists()
+        return session_id in self.entries
+
+    def _path(self, session_id: str) -> Path:
+        """Snapshot file of a session; ids are hashed to safe file names."""
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.snap"
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get snapshot counts and sizes."""
+        if self.directory is not None:
+            stored = sum(1 for _ in self.directory.glob("*.snap"))
+        else:
+            stored = len(self.entries)
+        return {
+            "persistent": self.persistent,
+            "directory": str(self.directory) if self.directory else None,
+            "stored": stored,
+            "max_age": self.max_age,
+            **self.stats,
+        }
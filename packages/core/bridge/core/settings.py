@@ -106,6 +106,29 @@ class BridgeSettings(BaseModel):
             "max_concurrent_requests": 10,
             "request_timeout": 30,
             "connection_pool_size": 20,
+            "emulator_pool_size": 4,
+            "emulator_pool_min_idle": 1,
+            "emulator_idle_timeout": 300,
+            "execution_backend": "inline",
+            "emulator_workers": 2,
+            "emulator_sessions_per_worker": 64,
+            "max_worker_steps": 1000000,
+            "scheduler_quantum_ms": 10,
+            "memory_stream_rate": 30,
+            "memory_stream_max_rate": 60,
+            "command_history_size": 10000,
+            "command_history_spill": None,
+            "command_queue_size": 1000,
+            "command_source_limits": {"ai": 4},
+            "max_batch_commands": 500,
+            "run_stream_credits": 16,
+            "run_stream_max_credits": 256,
+            "run_stream_buffer": 65536,
+            "max_sessions": 256,
+            "session_idle_timeout": 1800,
+            "session_snapshot_dir": None,
+            "session_snapshot_ttl": 604800,
+            "recordings_dir": "recordings",
         },
         description="Performance configuration",
     )
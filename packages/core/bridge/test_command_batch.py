@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Command Batch Test Launcher
+
+This script provides a test suite for batched bridge commands, covering
+ordering on one emulator lease, stopping at the first error, the single
+history entry a batch leaves, batches that miss their deadline, the CPU
+states a command, batch or program run returns on request, jobs running
+off the event loop and cancelled jobs keeping their lease.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.bridge_server import (
+    BatchRequest,
+    BatchResponse,
+    BridgeServer,
+    CommandRequest,
+)
+from bridge.core.command_history import CommandHistory
+from bridge.core.command_queue import CommandQueue
+from bridge.core.emulator_pool import EmulatorPool
+from bridge.core.scheduler import EmulatorScheduler
+from engine.emulator.cpu_state import CpuState, decode_cpu_state_deltas
+from engine.emulator.m6502_emulator import M6502Emulator
+
+# $0600 LDX #$00; $0602 INX; JMP $0602
+COUNT_PROGRAM = bytes([0xA2, 0x00, 0xE8, 0x4C, 0x02, 0x06])
+
+
+def make_emulator() -> M6502Emulator:
+    """An initialized emulator."""
+    emulator = M6502Emulator()
+    emulator.initialize_emulator()
+    return emulator
+
+
+async def make_server(timeout: float = 30.0) -> BridgeServer:
+    """A bridge server with only the command path set up."""
+    server = object.__new__(BridgeServer)
+    server.emulator = make_emulator()
+    server.primary_lock = asyncio.Lock()
+    server.emulator_pool = EmulatorPool(make_emulator, max_size=2)
+    await server.emulator_pool.start()
+    server.process_executor = None
+    server.current_command_id = 0
+    server.stats = {
+        "commands_processed": 0,
+        "total_execution_time": 0.0,
+        "average_execution_time": 0.0,
+        "error_count": 0,
+    }
+    server.command_history = CommandHistory(capacity=100)
+    server.command_queue = CommandQueue(workers=2, default_timeout=timeout)
+    return server
+
+
+class CommandBatchTestSuite:
+    """Test suite for batched bridge commands."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Command Batch Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Command Batch Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all command batch tests."""
+        logger.info("🚀 Starting Command Batch Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_single_lease()
+        await self._test_stop_on_error()
+        await self._test_timeout()
+        await self._test_cpu_states()
+        await self._test_off_event_loop()
+        await self._test_cancel_keeps_lease()
+
+        return self._generate_test_report()
+
+    async def _test_single_lease(self):
+        """A batch runs in order on one lease and one queue slot."""
+        logger.info("\n📦 Testing Single Lease...")
+
+        try:
+            server = await make_server()
+            commands = [f"LET X = {n}" for n in range(50)] + ["PRINT X"]
+            context = {"session_id": "batch"}
+
+            start = time.perf_counter()
+            for command in commands:
+                await server._submit_command(
+                    CommandRequest(command=command, context=context)
+                )
+            single_time = (time.perf_counter() - start) * 1000
+            single_leases = server.emulator_pool.stats["leases"]
+
+            start = time.perf_counter()
+            response = await server._submit_command(
+                BatchRequest(commands=commands, context=context)
+            )
+            batch_time = (time.perf_counter() - start) * 1000
+            batch_leases = server.emulator_pool.stats["leases"] - single_leases
+            await server.command_queue.shutdown()
+
+            assert isinstance(response, BatchResponse)
+            assert response.success and response.executed == 51
+            assert response.results[-1] == {
+                "success": True,
+                "output": " 49",
+                "error": None,
+            }
+            assert single_leases == 51 and batch_leases == 1
+            assert server.command_queue.stats["submitted"] == 52
+            logger.info(
+                f"✅ 51 commands: {batch_time:.1f}ms batched, "
+                f"{single_time:.1f}ms one by one"
+            )
+            self._record_test_result("single_lease", True, "1 lease for 51 commands")
+
+        except Exception as e:
+            logger.error(f"❌ Single lease failed: {e}")
+            self._record_test_result("single_lease", False, str(e))
+
+    async def _test_stop_on_error(self):
+        """A failure stops the batch, which is one history entry."""
+        logger.info("\n🛑 Testing Stop on Error...")
+
+        try:
+            server = await make_server()
+            commands = ['PRINT "A"', "PRINT 1/0", 'PRINT "C"']
+
+            stopped = await server._submit_command(BatchRequest(commands=commands))
+            kept_going = await server._submit_command(
+                BatchRequest(commands=commands, stop_on_error=False)
+            )
+            await server.command_queue.shutdown()
+
+            assert not stopped.success and stopped.failed_index == 1
+            assert stopped.executed == 2
+            assert stopped.results[1]["error"] == "DIVISION BY ZERO ERROR"
+            assert kept_going.executed == 3 and kept_going.failed_index == 1
+            assert kept_going.results[2]["output"] == "C"
+
+            entry = server.command_history.get(stopped.command_id)
+            assert len(server.command_history) == 2
+            assert entry["output"] == "A"
+            assert entry["error"] == "DIVISION BY ZERO ERROR"
+            assert server.stats["commands_processed"] == 2
+            logger.info("✅ Batch stopped at index 1, one history entry each")
+            self._record_test_result("stop_on_error", True, "Stopped at failure")
+
+        except Exception as e:
+            logger.error(f"❌ Stop on error failed: {e}")
+            self._record_test_result("stop_on_error", False, str(e))
+
+    async def _test_timeout(self):
+        """A batch that misses its deadline gets a failed batch response."""
+        logger.info("\n⏱️ Testing Timeout...")
+
+        try:
+            server = await make_server(timeout=0.05)
+            # Hold the primary emulator so the batch has to wait
+            async with server.primary_lock:
+                response = await server._submit_command(
+                    BatchRequest(commands=['PRINT "LATE"'])
+                )
+            await server.command_queue.shutdown()
+
+            assert isinstance(response, BatchResponse)
+            assert not response.success and response.executed == 0
+            assert "timed out" in response.error
+            assert server.command_history.get(response.command_id)["success"] is False
+            logger.info("✅ Late batch answered with a failed batch response")
+            self._record_test_result("timeout", True, "Timed out")
+
+        except Exception as e:
+            logger.error(f"❌ Timeout failed: {e}")
+            self._record_test_result("timeout", False, str(e))
+
+    async def _test_cpu_states(self):
+        """Commands, batches and program runs return CPU states on request."""
+        logger.info("\n🧠 Testing CPU States...")
+
+        try:
+            server = await make_server()
+            plain = await server._submit_command(CommandRequest(command="LET X = 1"))
+            command = await server._submit_command(
+                CommandRequest(command="LET X = 2", include=["cpu_states"])
+            )
+            batch = await server._submit_command(
+                BatchRequest(
+                    commands=["LET X = 3", "PRINT X", "LET Y = X"],
+                    include=["cpu_states"],
+                )
+            )
+            await server.command_queue.shutdown()
+
+            assert "cpu_state" not in plain.result
+            state = command.result["cpu_state"]
+            assert set(CpuState._fields) <= set(state)
+            assert set(state["flags"]) >= {"carry", "zero", "negative"}
+            assert batch.success and len(batch.cpu_state_deltas) == 3
+            assert set(batch.cpu_state_deltas[0]) == set(CpuState._fields)
+
+            # /emulator/execute returns one state per step, delta-encoded
+            server.app = FastAPI()
+            server.scheduler = EmulatorScheduler()
+            server._setup_routes()
+            server.emulator.load_memory_image(COUNT_PROGRAM, 0x0600)
+            server.emulator.mpu.pc = 0x0600
+            response = TestClient(server.app).post(
+                "/emulator/execute",
+                json={"steps": 7, "turbo": False, "include": ["cpu_states"]},
+            )
+            deltas = response.json()["cpu_state_deltas"]
+            states = decode_cpu_state_deltas(deltas)
+
+            assert [s.x for s in states] == [0, 1, 1, 2, 2, 3, 3]
+            assert deltas[1] == {"pc": 0x0603, "x": 1, "status": states[1].status}
+            logger.info(f"✅ {len(deltas)} program states, {len(str(deltas))} chars")
+            self._record_test_result("cpu_states", True, "States returned")
+
+        except Exception as e:
+            logger.error(f"❌ CPU states failed: {e}")
+            self._record_test_result("cpu_states", False, str(e))
+
+    async def _test_off_event_loop(self):
+        """A long inline job leaves the event loop free for other clients."""
+        logger.info("\n🧵 Testing Off Event Loop...")
+
+        try:
+            server = await make_server()
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.001)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            start = time.perf_counter()
+            result = await server._run_emulator_job(
+                "execute_basic_command", "FOR I = 1 TO 50000: X = X + 1: NEXT I"
+            )
+            job_time = (time.perf_counter() - start) * 1000
+            ticker.cancel()
+            await asyncio.gather(ticker, return_exceptions=True)
+            await server.command_queue.shutdown()
+
+            assert result["success"], result
+            assert ticks >= 5, f"{ticks} ticks in {job_time:.0f}ms"
+            logger.info(
+                f"✅ Event loop ticked {ticks} times during a {job_time:.0f}ms job"
+            )
+            self._record_test_result("off_event_loop", True, f"{ticks} ticks")
+
+        except Exception as e:
+            logger.error(f"❌ Off event loop failed: {e}")
+            self._record_test_result("off_event_loop", False, str(e))
+
+    async def _test_cancel_keeps_lease(self):
+        """A cancelled inline job keeps the machine until its thread returns."""
+        logger.info("\n🔒 Testing Cancel Keeps Lease...")
+
+        try:
+            server = await make_server()
+            job = asyncio.create_task(
+                server._run_emulator_job(
+                    "execute_basic_command", "FOR I = 1 TO 50000: X = X + 1: NEXT I"
+                )
+            )
+            await asyncio.sleep(0.01)
+            job.cancel()
+            await asyncio.sleep(0)
+
+            # The lock only frees once the thread is off the emulator
+            async with server.primary_lock:
+                assert job.done() and job.cancelled()
+                printed = server.emulator.execute_basic_command("PRINT I")
+            await server.command_queue.shutdown()
+
+            assert printed["output"] == " 50001", printed
+            logger.info("✅ Cancelled job held the lease until it finished")
+            self._record_test_result("cancel_keeps_lease", True, "Lease held")
+
+        except Exception as e:
+            logger.error(f"❌ Cancel keeps lease failed: {e}")
+            self._record_test_result("cancel_keeps_lease", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = CommandBatchTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Command Batch Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Command Batch Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Command History Test Launcher
+
+This script provides a test suite for the bridge command history ring,
+covering eviction and the id index, cursor pagination, spilling evicted
+entries to disk and segment rotation.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.bridge_server import CommandResponse
+from bridge.core.command_history import CommandHistory
+
+
+def make_response(number: int) -> CommandResponse:
+    """A successful response for command ``number``."""
+    return CommandResponse(
+        success=True,
+        output=f"line {number}",
+        execution_time=0.5,
+        timestamp=1700000000.0 + number,
+        command_id=f"cmd_{number}",
+    )
+
+
+class CommandHistoryTestSuite:
+    """Test suite for the bridge command history."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Command History Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Command History Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all command history tests."""
+        logger.info("🚀 Starting Command History Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_ring_and_index()
+        await self._test_cursor_pagination()
+        await self._test_spill_and_rotation()
+
+        return self._generate_test_report()
+
+    async def _test_ring_and_index(self):
+        """The ring keeps the newest entries and forgets evicted ids."""
+        logger.info("\n💍 Testing Ring and Index...")
+
+        try:
+            history = CommandHistory(capacity=1000)
+            start = time.perf_counter()
+            for number in range(100_000):
+                history.append(make_response(number))
+            elapsed = (time.perf_counter() - start) * 1000
+
+            assert len(history) == 1000
+            assert len(history.index) == 1000
+            assert history.get("cmd_98999") is None
+            entry = history.get("cmd_99000")
+            assert entry["output"] == "line 99000"
+            assert entry["sequence"] == 99000
+            assert history.get_statistics()["total_commands"] == 100_000
+
+            logger.info(f"✅ 100k responses appended in {elapsed:.0f}ms")
+            self._record_test_result("ring_and_index", True, "1000 retained")
+
+        except Exception as e:
+            logger.error(f"❌ Ring and index failed: {e}")
+            self._record_test_result("ring_and_index", False, str(e))
+
+    async def _test_cursor_pagination(self):
+        """Pages walk back with ``before`` and follow with ``after``."""
+        logger.info("\n📄 Testing Cursor Pagination...")
+
+        try:
+            history = CommandHistory(capacity=25)
+            for number in range(40):
+                history.append(make_response(number))
+
+            newest = history.page(limit=10)
+            assert [e["sequence"] for e in newest["history"]] == list(range(30, 40))
+            assert newest["next_cursor"] == 30
+
+            sequences = []
+            cursor = None
+            while True:
+                page = history.page(limit=10, before=cursor)
+                sequences = [e["sequence"] for e in page["history"]] + sequences
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+            assert sequences == list(range(15, 40))
+
+            # Following from an evicted cursor resumes at the oldest entry
+            follow = history.page(limit=5, after=3)
+            assert [e["sequence"] for e in follow["history"]] == list(range(15, 20))
+            history.append(make_response(40))
+            tail = history.page(limit=5, after=39)
+            assert [e["command_id"] for e in tail["history"]] == ["cmd_40"]
+            assert history.page(after=40)["next_cursor"] == 40
+
+            logger.info("✅ Pages cover the ring exactly once")
+            self._record_test_result("cursor_pagination", True, "25 entries walked")
+
+        except Exception as e:
+            logger.error(f"❌ Cursor pagination failed: {e}")
+            self._record_test_result("cursor_pagination", False, str(e))
+
+    async def _test_spill_and_rotation(self):
+        """Evicted entries go to the segment file, which is rotated."""
+        logger.info("\n💾 Testing Spill and Rotation...")
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / "history" / "commands.jsonl"
+                history = CommandHistory(capacity=10, spill_path=path)
+                for number in range(30):
+                    history.append(make_response(number))
+                history.close()
+
+                lines = path.read_text().splitlines()
+                assert len(lines) == 20
+                assert json.loads(lines[0])["command_id"] == "cmd_0"
+
+                small = CommandHistory(capacity=1, spill_path=path, spill_max_bytes=500)
+                for number in range(20):
+                    small.append(make_response(number))
+                small.close()
+                rotated = path.with_name(path.name + ".1")
+                assert rotated.exists()
+                assert rotated.stat().st_size >= 500
+
+            logger.info("✅ 20 evicted entries spilled, segment rotated")
+            self._record_test_result("spill_and_rotation", True, "Spilled")
+
+        except Exception as e:
+            logger.error(f"❌ Spill and rotation failed: {e}")
+            self._record_test_result("spill_and_rotation", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = CommandHistoryTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Command History Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Command History Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Command Queue Test Launcher
+
+This script provides a test suite for the bridge command queue, covering
+priority order, per-source concurrency caps, deadlines, rejection when full
+and queue statistics.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.bridge_server import CommandRequest
+from bridge.core.command_queue import CommandQueue, QueueFullError
+
+
+class RecordingHandler:
+    """Command handler that records the order commands run in."""
+
+    def __init__(self, hold: float = 0.0):
+        """Hold each command for ``hold`` seconds."""
+        self.hold = hold
+        self.order = []
+        self.active = {}
+        self.peak = {}
+
+    async def __call__(self, request: CommandRequest) -> str:
+        """Run a command."""
+        source = request.source
+        self.active[source] = self.active.get(source, 0) + 1
+        self.peak[source] = max(self.peak.get(source, 0), self.active[source])
+        self.order.append(request.command)
+        try:
+            await asyncio.sleep(self.hold)
+        finally:
+            self.active[source] -= 1
+        return request.command
+
+
+class CommandQueueTestSuite:
+    """Test suite for the bridge command queue."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Command Queue Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Command Queue Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all command queue tests."""
+        logger.info("🚀 Starting Command Queue Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_priority_order()
+        await self._test_source_limits()
+        await self._test_timeouts()
+        await self._test_rejection()
+
+        return self._generate_test_report()
+
+    async def _test_priority_order(self):
+        """Higher priorities run first, equal priorities in arrival order."""
+        logger.info("\n🥇 Testing Priority Order...")
+
+        try:
+            queue = CommandQueue(workers=1)
+            handler = RecordingHandler(hold=0.01)
+            requests = [
+                CommandRequest(command="first", priority=1),
+                CommandRequest(command="low", priority=1),
+                CommandRequest(command="high", priority=9),
+                CommandRequest(command="mid-a", priority=5),
+                CommandRequest(command="mid-b", priority=5),
+            ]
+            tasks = []
+            for request in requests:
+                tasks.append(asyncio.create_task(queue.submit(request, handler)))
+                await asyncio.sleep(0)
+
+            results = await asyncio.gather(*tasks)
+            stats = queue.get_statistics()
+            await queue.shutdown()
+
+            assert results == [r.command for r in requests]
+            assert handler.order == ["first", "high", "mid-a", "mid-b", "low"]
+            assert stats["completed"] == 5 and stats["depth"] == 0
+            assert stats["max_depth_seen"] == 4
+            assert stats["max_wait_time"] >= 30
+            logger.info(f"✅ Order {handler.order}")
+            self._record_test_result("priority_order", True, "Heap order kept")
+
+        except Exception as e:
+            logger.error(f"❌ Priority order failed: {e}")
+            self._record_test_result("priority_order", False, str(e))
+
+    async def _test_source_limits(self):
+        """A capped source never exceeds its cap and does not block others."""
+        logger.info("\n🚦 Testing Source Limits...")
+
+        try:
+            queue = CommandQueue(workers=4, source_limits={"ai": 1})
+            handler = RecordingHandler(hold=0.02)
+            ai = [
+                queue.submit(CommandRequest(command=f"ai{i}", source="ai"), handler)
+                for i in range(3)
+            ]
+            frontend = [
+                queue.submit(CommandRequest(command=f"fe{i}", priority=1), handler)
+                for i in range(2)
+            ]
+
+            start = time.perf_counter()
+            await asyncio.gather(*ai, *frontend)
+            elapsed = (time.perf_counter() - start) * 1000
+            await queue.shutdown()
+
+            assert handler.peak["ai"] == 1
+            assert handler.peak["frontend"] == 2
+            # Frontend commands overtook the queued AI commands
+            assert handler.order.index("fe1") < handler.order.index("ai2")
+            assert elapsed >= 55
+            logger.info(f"✅ AI capped at 1, frontend ran alongside ({elapsed:.0f}ms)")
+            self._record_test_result("source_limits", True, "Cap honored")
+
+        except Exception as e:
+            logger.error(f"❌ Source limits failed: {e}")
+            self._record_test_result("source_limits", False, str(e))
+
+    async def _test_timeouts(self):
+        """Deadlines drop queued commands and cancel running ones."""
+        logger.info("\n⏱️ Testing Timeouts...")
+
+        try:
+            queue = CommandQueue(workers=1, default_timeout=5)
+            handler = RecordingHandler(hold=0.2)
+            slow = asyncio.create_task(
+                queue.submit(CommandRequest(command="slow", timeout=1), handler)
+            )
+            await asyncio.sleep(0)
+            queued = asyncio.create_task(
+                queue.submit(CommandRequest(command="queued"), handler, timeout=0.05)
+            )
+
+            results = await asyncio.gather(slow, queued, return_exceptions=True)
+            assert results[0] == "slow"
+            assert isinstance(results[1], asyncio.TimeoutError)
+            assert len(queue) == 0
+
+            running = queue.submit(CommandRequest(command="stuck"), handler, 0.05)
+            try:
+                await running
+                raise AssertionError("stuck command finished")
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.sleep(0.01)
+
+            stats = queue.get_statistics()
+            await queue.shutdown()
+            assert handler.order == ["slow", "stuck"]
+            assert handler.active["frontend"] == 0
+            assert stats["timed_out"] == 2 and stats["running"] == 0
+            logger.info("✅ Queued command dropped, running command cancelled")
+            self._record_test_result("timeouts", True, "2 timed out")
+
+        except Exception as e:
+            logger.error(f"❌ Timeouts failed: {e}")
+            self._record_test_result("timeouts", False, str(e))
+
+    async def _test_rejection(self):
+        """Commands beyond the depth limit are rejected at once."""
+        logger.info("\n🚫 Testing Rejection...")
+
+        try:
+            queue = CommandQueue(workers=1, max_depth=2)
+            handler = RecordingHandler(hold=0.02)
+            tasks = []
+            for i in range(3):
+                request = CommandRequest(command=f"c{i}")
+                tasks.append(asyncio.create_task(queue.submit(request, handler)))
+                await asyncio.sleep(0)
+
+            try:
+                await queue.submit(CommandRequest(command="extra"), handler)
+                raise AssertionError("extra command accepted")
+            except QueueFullError:
+                pass
+
+            await asyncio.gather(*tasks)
+            stats = queue.get_statistics()
+            await queue.shutdown()
+            assert stats["rejected"] == 1 and stats["completed"] == 3
+            logger.info("✅ Fourth command rejected while two were waiting")
+            self._record_test_result("rejection", True, "429 on full queue")
+
+        except Exception as e:
+            logger.error(f"❌ Rejection failed: {e}")
+            self._record_test_result("rejection", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = CommandQueueTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Command Queue Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Command Queue Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
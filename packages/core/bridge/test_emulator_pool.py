@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Emulator Pool Test Launcher
+
+This script provides a test suite for the bridge emulator pool, covering
+baseline resets of memory, devices and debugging tools, session affinity,
+exhaustion and waiting, idle eviction and pool statistics.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.core.emulator_pool import EmulatorPool
+from engine.emulator.m6502_emulator import M6502Emulator
+
+
+class EmulatorPoolTestSuite:
+    """Test suite for the bridge emulator pool."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Emulator Pool Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Emulator Pool Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all emulator pool tests."""
+        logger.info("🚀 Starting Emulator Pool Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_baseline_reset()
+        await self._test_device_reset()
+        await self._test_session_affinity()
+        await self._test_exhaustion_and_wait()
+        await self._test_idle_eviction()
+
+        return self._generate_test_report()
+
+    async def _test_baseline_reset(self):
+        """Anonymous leases must start from the clean baseline image."""
+        logger.info("\n🧼 Testing Baseline Reset...")
+
+        try:
+            pool = EmulatorPool(M6502Emulator, max_size=1)
+            assert await pool.start()
+
+            async with pool.lease() as emulator:
+                emulator.fill_memory(0x0200, 16, 0xAA)
+                emulator.mpu.a = 0x42
+
+            async with pool.lease() as emulator:
+                assert emulator.read_memory(0x0200, 16) == bytes(16)
+                assert emulator.mpu.a == 0
+
+            assert pool.get_statistics()["resets"] >= 1
+            logger.info("✅ Released instances are reset to baseline")
+            self._record_test_result("baseline_reset", True, "State cleared")
+
+        except Exception as e:
+            logger.error(f"❌ Baseline reset failed: {e}")
+            self._record_test_result("baseline_reset", False, str(e))
+
+    async def _test_device_reset(self):
+        """Output, keys, breakpoints and speed settings do not outlive a lease."""
+        logger.info("\n🔌 Testing Device Reset...")
+
+        try:
+            pool = EmulatorPool(M6502Emulator, max_size=1)
+            await pool.start()
+
+            async with pool.lease() as emulator:
+                first = emulator.send_basic_input("PRINT 12345\r")
+                emulator.send_keys("LIST\r")
+                emulator.debugger.add_breakpoint(0xC000)
+                emulator.set_speed_multiplier(4.0)
+                emulator.start_profiling()
+                assert emulator.basic_booted
+
+            async with pool.lease() as emulator:
+                assert emulator.get_display_output() == ""
+                assert not emulator.keyboard.keys
+                assert emulator.debugger.get_debugger_info()["breakpoints"] == []
+                assert not emulator.debugger.breakpoints[0xC000]
+                assert emulator.speed_controller.current_multiplier == 1.0
+                assert not emulator.profiling and not emulator.basic_booted
+
+                # BASIC boots again from the clean image
+                second = emulator.send_basic_input("PRINT 7\r")
+
+            assert "12345" in first["output"], first
+            assert not second["error"] and " 7" in second["output"], second
+            assert "12345" not in second["output"]
+            logger.info("✅ Next lease started with empty devices and no tools")
+            self._record_test_result("device_reset", True, "Devices cleared")
+
+        except Exception as e:
+            logger.error(f"❌ Device reset failed: {e}")
+            self._record_test_result("device_reset", False, str(e))
+
+    async def _test_session_affinity(self):
+        """Leases for one session keep using the same machine."""
+        logger.info("\n🔗 Testing Session Affinity...")
+
+        try:
+            pool = EmulatorPool(M6502Emulator, max_size=2)
+            await pool.start()
+
+            async with pool.lease("alice") as emulator:
+                emulator.fill_memory(0x0300, 4, 0x55)
+                first = emulator
+
+            async with pool.lease("alice") as emulator:
+                assert emulator is first
+                assert emulator.read_memory(0x0300, 4) == bytes([0x55] * 4)
+
+            async with pool.lease("bob") as emulator:
+                assert emulator is not first
+
+            assert await pool.end_session("alice")
+            assert pool.get_session_emulator("alice") is None
+            assert first.read_memory(0x0300, 4) == bytes(4)
+
+            stats = pool.get_statistics()
+            assert stats["session_hits"] == 1
+            logger.info("✅ Session state persisted and was reset on end")
+            self._record_test_result("session_affinity", True, "Affinity kept")
+
+        except Exception as e:
+            logger.error(f"❌ Session affinity failed: {e}")
+            self._record_test_result("session_affinity", False, str(e))
+
+    async def _test_exhaustion_and_wait(self):
+        """Callers wait when every instance is leased."""
+        logger.info("\n⏳ Testing Exhaustion and Wait...")
+
+        try:
+            pool = EmulatorPool(M6502Emulator, max_size=1)
+            await pool.start()
+
+            order = []
+
+            async def worker(name, hold):
+                async with pool.lease():
+                    order.append(name)
+                    await asyncio.sleep(hold)
+
+            await asyncio.gather(worker("first", 0.05), worker("second", 0))
+
+            stats = pool.get_statistics()
+            assert order == ["first", "second"]
+            assert stats["size"] == 1
+            assert stats["waits"] == 1
+            assert stats["max_wait_time"] >= 40
+            assert stats["leased"] == 0 and stats["occupancy"] == 0
+
+            logger.info(f"✅ Max wait {stats['max_wait_time']:.1f}ms")
+            self._record_test_result("exhaustion_and_wait", True, "Waiter served")
+
+        except Exception as e:
+            logger.error(f"❌ Exhaustion and wait failed: {e}")
+            self._record_test_result("exhaustion_and_wait", False, str(e))
+
+    async def _test_idle_eviction(self):
+        """Idle instances beyond the minimum are evicted."""
+        logger.info("\n🧹 Testing Idle Eviction...")
+
+        try:
+            pool = EmulatorPool(M6502Emulator, max_size=3, idle_timeout=0.01)
+            await pool.start()
+
+            holders = [await pool.acquire(f"s{i}") for i in range(3)]
+            for instance in holders:
+                await pool.release(instance)
+            assert pool.get_statistics()["size"] == 3
+
+            await asyncio.sleep(0.02)
+            async with pool.lease():
+                pass
+
+            stats = pool.get_statistics()
+            assert stats["size"] == 1
+            assert stats["sessions"] == 0
+            assert stats["instances_evicted"] == 2
+
+            logger.info("✅ Idle instances evicted down to the warm minimum")
+            self._record_test_result("idle_eviction", True, "Evicted 2")
+
+        except Exception as e:
+            logger.error(f"❌ Idle eviction failed: {e}")
+            self._record_test_result("idle_eviction", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = EmulatorPoolTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Emulator Pool Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Emulator Pool Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
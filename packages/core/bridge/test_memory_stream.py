@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Memory Stream Test Launcher
+
+This script provides a test suite for the bridge memory stream, covering the
+initial snapshot, coalesced diffs, bandwidth against full window polling,
+request errors, re-initialized emulators, session machines that the pool
+must not hand to another session and the limits on which sessions can pin.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.core.emulator_pool import EmulatorPool
+from bridge.core.sessions import SessionManager
+from bridge.core.memory_stream import (
+    EmulatorSource,
+    MemoryStream,
+    PooledEmulatorSource,
+    serve_memory_stream,
+)
+from engine.emulator.m6502_emulator import M6502Emulator
+
+
+class StreamClient:
+    """In-memory stand-in for a WebSocket connection."""
+
+    def __init__(self):
+        """Start with no requests queued and nothing received."""
+        self.requests = asyncio.Queue()
+        self.messages = []
+
+    async def send(self, text: str):
+        """Keep a message the server sent."""
+        self.messages.append(json.loads(text))
+
+    async def receive(self) -> str:
+        """Hand the server the next request; ``None`` disconnects."""
+        request = await self.requests.get()
+        if request is None:
+            raise ConnectionError("client disconnected")
+        return json.dumps(request)
+
+    def of_type(self, kind: str):
+        """Messages of one type, in the order they were sent."""
+        return [m for m in self.messages if m["type"] == kind]
+
+
+def make_emulator() -> M6502Emulator:
+    """An initialized emulator."""
+    emulator = M6502Emulator()
+    emulator.initialize_emulator()
+    return emulator
+
+
+class MemoryStreamTestSuite:
+    """Test suite for the bridge memory stream."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Memory Stream Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Memory Stream Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all memory stream tests."""
+        logger.info("🚀 Starting Memory Stream Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_snapshot_and_diffs()
+        await self._test_bandwidth()
+        await self._test_requests_and_errors()
+        await self._test_reinitialized_emulator()
+        await self._test_pinned_session()
+        await self._test_ended_session()
+        await self._test_pin_limits()
+
+        return self._generate_test_report()
+
+    async def _serve(self, client, emulator, rate=50, source=None):
+        """Start serving ``client`` against ``emulator``."""
+        stream = MemoryStream(
+            client.send, source or EmulatorSource(emulator), default_rate=rate
+        )
+        task = asyncio.create_task(serve_memory_stream(stream, client.receive))
+        return stream, task
+
+    async def _disconnect(self, client, task):
+        """Close the client connection and wait for the server to stop."""
+        await client.requests.put(None)
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _test_snapshot_and_diffs(self):
+        """A subscription gets the range once, then coalesced changes."""
+        logger.info("\n🧮 Testing Snapshot and Diffs...")
+
+        try:
+            emulator = make_emulator()
+            emulator.fill_memory(0x0300, 4, 0x11)
+            client = StreamClient()
+            _, task = await self._serve(client, emulator)
+
+            await client.requests.put(
+                {"action": "subscribe", "start": 0x0300, "length": 256}
+            )
+            await asyncio.sleep(0.01)
+            snapshot = client.of_type("memory_snapshot")[0]
+            assert bytes.fromhex(snapshot["data"])[:5] == bytes([0x11] * 4 + [0])
+
+            # Several writes inside one frame arrive as one message
+            emulator.load_memory_image(b"\x01\x02", 0x0310)
+            emulator.load_memory_image(b"\x03", 0x0312)
+            emulator.load_memory_image(b"\x09", 0x03F0)
+            await asyncio.sleep(0.05)
+
+            diffs = client.of_type("memory_diff")
+            assert len(diffs) == 1, f"{len(diffs)} diff messages"
+            assert diffs[0]["runs"] == [[0x0310, "010203"], [0x03F0, "09"]]
+
+            await asyncio.sleep(0.05)
+            assert len(client.of_type("memory_diff")) == 1
+
+            await self._disconnect(client, task)
+            assert not emulator.memory.tracked_pages[0x03]
+            logger.info("✅ Snapshot followed by one coalesced diff")
+            self._record_test_result("snapshot_and_diffs", True, "Diffs coalesced")
+
+        except Exception as e:
+            logger.error(f"❌ Snapshot and diffs failed: {e}")
+            self._record_test_result("snapshot_and_diffs", False, str(e))
+
+    async def _test_bandwidth(self):
+        """A running counter costs far less than polling the whole window."""
+        logger.info("\n📉 Testing Bandwidth...")
+
+        try:
+            emulator = make_emulator()
+            client = StreamClient()
+            _, task = await self._serve(client, emulator, rate=60)
+            await client.requests.put(
+                {"action": "subscribe", "start": 0x0200, "length": 1024}
+            )
+            await asyncio.sleep(0.01)
+
+            frames = 30
+            polled = 0
+            for count in range(frames):
+                emulator.load_memory_image(bytes([count]), 0x0280)
+                for page in range(0x0200, 0x0600, 0x100):
+                    polled += len(json.dumps(emulator.get_memory_dump(page, 256)))
+                await asyncio.sleep(1 / 60 + 0.002)
+
+            diff_bytes = sum(
+                len(json.dumps(m, separators=(",", ":")))
+                for m in client.of_type("memory_diff")
+            )
+            await self._disconnect(client, task)
+
+            ratio = polled / diff_bytes
+            assert ratio > 100, f"only {ratio:.0f}x smaller"
+            logger.info(f"✅ Diffs {diff_bytes}B vs polling {polled}B ({ratio:.0f}x)")
+            self._record_test_result("bandwidth", True, f"{ratio:.0f}x smaller")
+
+        except Exception as e:
+            logger.error(f"❌ Bandwidth failed: {e}")
+            self._record_test_result("bandwidth", False, str(e))
+
+    async def _test_requests_and_errors(self):
+        """Bad requests are reported and unsubscribing stops tracking."""
+        logger.info("\n📨 Testing Requests and Errors...")
+
+        try:
+            emulator = make_emulator()
+            client = StreamClient()
+            _, task = await self._serve(client, emulator)
+
+            for request in (
+                {"action": "subscribe", "start": 0xFFF0, "length": 64},
+                {"action": "subscribe", "start": 0, "length": 8, "encoding": "dict"},
+                {"action": "subscribe"},
+                {"action": "jump"},
+            ):
+                await client.requests.put(request)
+            await client.requests.put(
+                {
+                    "action": "subscribe",
+                    "start": 0x2000,
+                    "length": 16,
+                    "encoding": "base64",
+                }
+            )
+            await asyncio.sleep(0.01)
+
+            statuses = client.of_type("memory_status")
+            assert len(statuses) == 4
+            assert all(status["error"] for status in statuses)
+            snapshot = client.of_type("memory_snapshot")[0]
+            assert snapshot["data"] == "AAAAAAAAAAAAAAAAAAAAAA=="
+
+            subscription_id = snapshot["subscription_id"]
+            await client.requests.put(
+                {"action": "unsubscribe", "subscription_id": subscription_id}
+            )
+            await asyncio.sleep(0.01)
+            assert client.of_type("memory_status")[-1]["unsubscribed"] is True
+            assert not emulator.memory.tracked_pages[0x20]
+
+            await self._disconnect(client, task)
+            logger.info("✅ Errors reported, unsubscribe released the pages")
+            self._record_test_result("requests_and_errors", True, "4 errors")
+
+        except Exception as e:
+            logger.error(f"❌ Requests and errors failed: {e}")
+            self._record_test_result("requests_and_errors", False, str(e))
+
+    async def _test_reinitialized_emulator(self):
+        """New emulator memory restarts the subscription with a snapshot."""
+        logger.info("\n🔄 Testing Re-initialized Emulator...")
+
+        try:
+            emulator = make_emulator()
+            client = StreamClient()
+            _, task = await self._serve(client, emulator)
+            await client.requests.put(
+                {"action": "subscribe", "start": 0x0400, "length": 32}
+            )
+            await asyncio.sleep(0.01)
+
+            emulator.initialize_emulator()
+            emulator.load_memory_image(b"\x42", 0x0400)
+            await asyncio.sleep(0.05)
+
+            snapshots = client.of_type("memory_snapshot")
+            assert len(snapshots) == 2
+            assert snapshots[1]["data"].startswith("42")
+
+            await self._disconnect(client, task)
+            logger.info("✅ Subscription followed the new memory")
+            self._record_test_result("reinitialized_emulator", True, "Resynced")
+
+        except Exception as e:
+            logger.error(f"❌ Re-initialized emulator failed: {e}")
+            self._record_test_result("reinitialized_emulator", False, str(e))
+
+    async def _test_pinned_session(self):
+        """A watched session keeps its instance from other sessions."""
+        logger.info("\n📌 Testing Pinned Session...")
+
+        try:
+            pool = EmulatorPool(make_emulator, max_size=2)
+            await pool.start()
+            client = StreamClient()
+            stream, task = await self._serve(
+                client, None, source=PooledEmulatorSource(pool)
+            )
+            await client.requests.put(
+                {
+                    "action": "subscribe",
+                    "session_id": "alice",
+                    "start": 0x0300,
+                    "length": 4,
+                }
+            )
+            await asyncio.sleep(0.01)
+            assert pool.get_statistics()["pinned_sessions"] == 1
+
+            # With carol on the unpinned instance, bob cannot reclaim alice's
+            carol = await pool.acquire("carol")
+            bob = asyncio.create_task(pool.acquire("bob"))
+            await asyncio.sleep(0.05)
+            assert not bob.done()
+            assert not client.of_type("memory_diff")
+
+            # Dropping the subscription unpins alice, and bob gets the instance
+            await client.requests.put(
+                {"action": "unsubscribe", "subscription_id": "mem_0"}
+            )
+            instance = await asyncio.wait_for(bob, 1.0)
+            instance.emulator.load_memory_image(b"\x42", 0x0301)
+            await asyncio.sleep(0.05)
+            await pool.release(instance)
+            await pool.release(carol)
+
+            assert not client.of_type("memory_diff")
+            assert pool.get_statistics()["pinned_sessions"] == 0
+            assert not stream.subscriptions
+
+            await self._disconnect(client, task)
+            await pool.shutdown()
+            logger.info("✅ Other sessions waited for the watched instance")
+            self._record_test_result("pinned_session", True, "Not reclaimed")
+
+        except Exception as e:
+            logger.error(f"❌ Pinned session failed: {e}")
+            self._record_test_result("pinned_session", False, str(e))
+
+    async def _test_ended_session(self):
+        """Ending a watched session closes its subscriptions."""
+        logger.info("\n🛑 Testing Ended Session...")
+
+        try:
+            pool = EmulatorPool(make_emulator, max_size=2)
+            await pool.start()
+            client = StreamClient()
+            stream, task = await self._serve(
+                client, None, source=PooledEmulatorSource(pool)
+            )
+            await client.requests.put(
+                {
+                    "action": "subscribe",
+                    "session_id": "alice",
+                    "start": 0x0300,
+                    "length": 4,
+                }
+            )
+            await asyncio.sleep(0.01)
+
+            assert await pool.end_session("alice")
+            async with pool.lease("bob") as emulator:
+                emulator.load_memory_image(b"\x42", 0x0301)
+            await asyncio.sleep(0.05)
+
+            assert not client.of_type("memory_diff")
+            closed = [m for m in client.of_type("memory_status") if m.get("closed")]
+            assert closed and closed[0]["subscription_id"] == "mem_0"
+            assert not stream.subscriptions
+
+            await self._disconnect(client, task)
+            await pool.shutdown()
+            logger.info("✅ Subscription closed with its session")
+            self._record_test_result("ended_session", True, "Closed")
+
+        except Exception as e:
+            logger.error(f"❌ Ended session failed: {e}")
+            self._record_test_result("ended_session", False, str(e))
+
+    async def _test_pin_limits(self):
+        """Only open sessions can pin, and never the pool's last free instance."""
+        logger.info("\n🚧 Testing Pin Limits...")
+
+        try:
+            pool = EmulatorPool(make_emulator, max_size=2)
+            await pool.start()
+            sessions = SessionManager()
+            for session_id in ("alice", "bob"):
+                await sessions.open(session_id)
+            client = StreamClient()
+            stream, task = await self._serve(
+                client, None, source=PooledEmulatorSource(pool, sessions=sessions)
+            )
+            for session_id in ("made-up", "alice", "bob"):
+                await client.requests.put(
+                    {
+                        "action": "subscribe",
+                        "session_id": session_id,
+                        "start": 0x0300,
+                        "length": 4,
+                    }
+                )
+            await asyncio.sleep(0.05)
+
+            errors = [m["error"] for m in client.of_type("memory_status")]
+            assert errors == ["No emulator for this session"] * 2, errors
+            assert len(client.of_type("memory_snapshot")) == 1
+            stats = pool.get_statistics()
+            assert stats["pinned_sessions"] == 1 and stats["pins_refused"] == 1
+
+            # Sessions that pin nothing still get the unpinned instance
+            async with pool.lease("carol"):
+                pass
+
+            await self._disconnect(client, task)
+            await pool.shutdown()
+            logger.info("✅ Unknown sessions refused and one instance kept free")
+            self._record_test_result("pin_limits", True, "Pool not starved")
+
+        except Exception as e:
+            logger.error(f"❌ Pin limits failed: {e}")
+            self._record_test_result("pin_limits", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = MemoryStreamTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Memory Stream Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Memory Stream Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Emulator Process Executor Test Launcher
+
+This script provides a test suite for the process-pool execution backend,
+covering sticky session routing, per-session state isolation, event loop
+responsiveness while a worker runs a long program and replacement of a worker
+whose process dies.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrent.futures.process import BrokenProcessPool
+
+from bridge.core.process_executor import EmulatorProcessExecutor
+
+
+class ProcessExecutorTestSuite:
+    """Test suite for the emulator process executor."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.executor = None
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Process Executor Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Process Executor Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all process executor tests."""
+        logger.info("🚀 Starting Process Executor Test Suite")
+        logger.info("=" * 60)
+
+        self.executor = EmulatorProcessExecutor(workers=2)
+        if not await self.executor.start():
+            self._record_test_result("startup", False, "Workers failed to start")
+            return self._generate_test_report()
+
+        try:
+            await self._test_sticky_routing()
+            await self._test_session_isolation()
+            await self._test_event_loop_responsiveness()
+            await self._test_method_allowlist()
+            await self._test_dead_worker_replaced()
+        finally:
+            self.executor.shutdown()
+
+        return self._generate_test_report()
+
+    async def _test_sticky_routing(self):
+        """The same session always lands on the same worker."""
+        logger.info("\n📌 Testing Sticky Routing...")
+
+        try:
+            indexes = {self.executor.get_worker_index("alice") for _ in range(10)}
+            assert len(indexes) == 1
+
+            before = list(self.executor.stats["jobs_per_worker"])
+            for _ in range(3):
+                await self.executor.submit("get_cpu_state", session_id="alice")
+            after = self.executor.stats["jobs_per_worker"]
+
+            worker = indexes.pop()
+            assert after[worker] - before[worker] == 3
+
+            logger.info(f"✅ Session routed to worker {worker}")
+            self._record_test_result("sticky_routing", True, f"Worker {worker}")
+
+        except Exception as e:
+            logger.error(f"❌ Sticky routing failed: {e}")
+            self._record_test_result("sticky_routing", False, str(e))
+
+    async def _test_session_isolation(self):
+        """Sessions keep their own memory even when sharing a worker."""
+        logger.info("\n🔒 Testing Session Isolation...")
+
+        try:
+            await self.executor.submit(
+                "load_memory_image", b"\x11\x22", 0x0400, session_id="s1"
+            )
+            await self.executor.submit(
+                "load_memory_image", b"\x33\x44", 0x0400, session_id="s2"
+            )
+
+            dump1 = await self.executor.submit(
+                "get_memory_dump", 0x0400, 2, "hex", session_id="s1"
+            )
+            dump2 = await self.executor.submit(
+                "get_memory_dump", 0x0400, 2, "hex", session_id="s2"
+            )
+            anonymous = await self.executor.submit("get_memory_dump", 0x0400, 2, "hex")
+
+            assert dump1["data"] == "1122"
+            assert dump2["data"] == "3344"
+            assert anonymous["data"] == "0000"
+
+            assert await self.executor.end_session("s1")
+            dump1 = await self.executor.submit(
+                "get_memory_dump", 0x0400, 2, "hex", session_id="s1"
+            )
+            assert dump1["data"] == "0000"
+
+            logger.info("✅ Session memory isolated and cleared on end")
+            self._record_test_result("session_isolation", True, "Isolated")
+
+        except Exception as e:
+            logger.error(f"❌ Session isolation failed: {e}")
+            self._record_test_result("session_isolation", False, str(e))
+
+    async def _test_event_loop_responsiveness(self):
+        """The event loop keeps ticking while a worker runs a long program."""
+        logger.info("\n⚡ Testing Event Loop Responsiveness...")
+
+        try:
+            job = asyncio.create_task(
+                self.executor.submit("execute_program", 50000, session_id="long")
+            )
+
+            max_tick = 0.0
+            while not job.done():
+                tick_start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                max_tick = max(max_tick, time.perf_counter() - tick_start)
+
+            result = job.result()
+            assert result["steps_executed"] == 50000
+            assert max_tick < 0.1
+
+            logger.info(f"✅ Worst event loop tick {max_tick * 1000:.1f}ms")
+            self._record_test_result(
+                "event_loop_responsiveness", True, f"{max_tick * 1000:.1f}ms"
+            )
+
+        except Exception as e:
+            logger.error(f"❌ Event loop responsiveness failed: {e}")
+            self._record_test_result("event_loop_responsiveness", False, str(e))
+
+    async def _test_method_allowlist(self):
+        """Only allowlisted emulator methods may be submitted."""
+        logger.info("\n🛡️ Testing Method Allowlist...")
+
+        try:
+            raised = False
+            try:
+                await self.executor.submit("initialize_emulator")
+            except ValueError:
+                raised = True
+
+            assert raised
+            logger.info("✅ Unknown methods rejected")
+            self._record_test_result("method_allowlist", True, "Rejected")
+
+        except Exception as e:
+            logger.error(f"❌ Method allowlist failed: {e}")
+            self._record_test_result("method_allowlist", False, str(e))
+
+    async def _test_dead_worker_replaced(self):
+        """A worker whose process was killed is replaced by a fresh one."""
+        logger.info("\n💀 Testing Dead Worker Replacement...")
+
+        try:
+            index = self.executor.get_worker_index("carol")
+            await self.executor.submit("get_cpu_state", session_id="carol")
+            broken = self.executor.workers[index]
+            for pid in list(broken._processes):
+                os.kill(pid, signal.SIGKILL)
+
+            raised = False
+            try:
+                await self.executor.submit("get_cpu_state", session_id="carol")
+            except BrokenProcessPool:
+                raised = True
+
+            assert raised
+            assert self.executor.workers[index] is not broken
+            assert self.executor.stats["workers_restarted"] == 1
+
+            state = await self.executor.submit("get_cpu_state", session_id="carol")
+            assert "pc" in state
+
+            logger.info(f"✅ Worker {index} replaced after its process died")
+            self._record_test_result("dead_worker_replaced", True, "Replaced")
+
+        except Exception as e:
+            logger.error(f"❌ Dead worker replacement failed: {e}")
+            self._record_test_result("dead_worker_replaced", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = ProcessExecutorTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Process Executor Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Process Executor Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
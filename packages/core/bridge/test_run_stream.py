@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Run Stream Test Launcher
+
+This script provides a test suite for streamed program runs, covering output
+and progress frames, credit flow control with a slow client, cancellation
+and request errors.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.core.run_stream import RunStream
+from bridge.core.scheduler import EmulatorScheduler
+from engine.emulator.m6502_emulator import M6502Emulator
+
+# $0600 LDA #'A' / STA $2000 / LDX #0 / DEX / BNE *-1 / JMP $0600
+PRINT_PROGRAM = bytes(
+    [0xA9, 0x41, 0x8D, 0x00, 0x20, 0xA2, 0x00, 0xCA, 0xD0, 0xFD, 0x4C, 0x00, 0x06]
+)
+# Instructions per character printed
+STEPS_PER_CHAR = 3 + 2 * 256 + 1
+
+
+def make_emulator() -> M6502Emulator:
+    """An initialized emulator printing 'A' in a loop from $0600."""
+    emulator = M6502Emulator()
+    emulator.initialize_emulator()
+    emulator.load_memory_image(PRINT_PROGRAM, 0x0600)
+    emulator.mpu.pc = 0x0600
+    return emulator
+
+
+class RunClient:
+    """In-memory stand-in for a WebSocket connection."""
+
+    def __init__(self):
+        """Start with nothing received."""
+        self.messages = []
+        self.received = asyncio.Event()
+
+    async def send(self, text: str):
+        """Keep a message the server sent."""
+        self.messages.append(json.loads(text))
+        self.received.set()
+
+    def of_type(self, kind: str):
+        """Messages of one type, in the order they were sent."""
+        return [m for m in self.messages if m["type"] == kind]
+
+    def output(self) -> str:
+        """All output received so far."""
+        return "".join(m["data"] for m in self.of_type("run_output"))
+
+    async def wait_for(self, kind: str, timeout: float = 10.0):
+        """Wait for the first message of a type."""
+        deadline = time.monotonic() + timeout
+        while not self.of_type(kind):
+            self.received.clear()
+            await asyncio.wait_for(self.received.wait(), deadline - time.monotonic())
+        return self.of_type(kind)[0]
+
+
+def make_stream(client: RunClient, emulator: M6502Emulator, **options) -> RunStream:
+    """A stream whose runs execute on ``emulator``."""
+
+    @asynccontextmanager
+    async def lease(session_id):
+        yield emulator
+
+    scheduler = EmulatorScheduler(quantum_ms=1)
+    return RunStream(client.send, scheduler, lease, **options)
+
+
+class RunStreamTestSuite:
+    """Test suite for streamed program runs."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Run Stream Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Run Stream Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all run stream tests."""
+        logger.info("🚀 Starting Run Stream Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_frames()
+        await self._test_flow_control()
+        await self._test_cancellation()
+        await self._test_request_errors()
+
+        return self._generate_test_report()
+
+    async def _test_frames(self):
+        """Output and progress arrive while the program runs."""
+        logger.info("\n📺 Testing Frames...")
+
+        try:
+            client = RunClient()
+            stream = make_stream(client, make_emulator(), initial_credits=256)
+            chars = 300
+            reply = await stream.handle(
+                {"type": "run", "steps": chars * STEPS_PER_CHAR, "turbo": True}
+            )
+            assert reply is None
+
+            started = await client.wait_for("run_started")
+            summary = await client.wait_for("run_complete")
+            frames = client.of_type("run_output")
+            progress = client.of_type("run_progress")
+
+            assert started["run_id"] == summary["run_id"] == "run_0"
+            assert summary["status"] == "completed"
+            assert summary["steps_executed"] == chars * STEPS_PER_CHAR
+            assert "output" not in summary
+            assert client.output() == "A" * chars
+            assert len(frames) > 1, "output arrived in one piece"
+            assert progress and 0x0600 <= progress[0]["pc"] <= 0x060C
+            sequences = [m["seq"] for m in client.messages if "seq" in m]
+            assert sequences == list(range(1, len(sequences) + 1))
+            assert stream.runs == {}
+            logger.info(
+                f"✅ {len(frames)} output and {len(progress)} progress frames "
+                "before the summary"
+            )
+            self._record_test_result("frames", True, f"{len(frames)} output frames")
+
+        except Exception as e:
+            logger.error(f"❌ Frames failed: {e}")
+            self._record_test_result("frames", False, str(e))
+
+    async def _test_flow_control(self):
+        """A client without credits pauses the run; acks resume it."""
+        logger.info("\n🚰 Testing Flow Control...")
+
+        try:
+            client = RunClient()
+            stream = make_stream(
+                client, make_emulator(), initial_credits=2, max_buffer=50
+            )
+            chars = 400
+            await stream.handle(
+                {"type": "run", "steps": chars * STEPS_PER_CHAR, "turbo": True}
+            )
+            await client.wait_for("run_started")
+            run = stream.runs["run_0"]
+
+            await asyncio.sleep(0.3)
+            steps_paused = run.job.steps_executed
+            await asyncio.sleep(0.1)
+            assert run.job.paused and run.credits == 0
+            assert run.job.steps_executed == steps_paused
+            assert run.buffered < 60, f"{run.buffered} characters buffered"
+            assert stream.scheduler.get_statistics()["paused"] == 1
+
+            # A slow client granting one credit at a time still gets it all
+            acks = 0
+            while not client.of_type("run_complete"):
+                await stream.handle({"type": "ack", "run_id": "run_0", "credits": 1})
+                acks += 1
+                await asyncio.sleep(0.005)
+
+            summary = client.of_type("run_complete")[0]
+            assert summary["status"] == "completed"
+            assert summary["pauses"] >= 1
+            assert client.output() == "A" * chars
+            logger.info(
+                f"✅ Run paused at {steps_paused} steps with <60 chars buffered, "
+                f"finished after {acks} acks ({summary['pauses']} pauses)"
+            )
+            self._record_test_result("flow_control", True, "Buffer bounded")
+
+        except Exception as e:
+            logger.error(f"❌ Flow control failed: {e}")
+            self._record_test_result("flow_control", False, str(e))
+
+    async def _test_cancellation(self):
+        """Cancelled runs report it; closing the stream stops its runs."""
+        logger.info("\n🛑 Testing Cancellation...")
+
+        try:
+            client = RunClient()
+            stream = make_stream(client, make_emulator(), initial_credits=64)
+            await stream.handle({"type": "run", "steps": 50_000_000, "turbo": True})
+            await client.wait_for("run_started")
+            await asyncio.sleep(0.05)
+            reply = await stream.handle({"type": "cancel", "run_id": "run_0"})
+            summary = await client.wait_for("run_complete")
+
+            assert reply == {"run_id": "run_0", "cancelled": True}
+            assert summary["status"] == "cancelled"
+            assert 0 < summary["steps_executed"] < 50_000_000
+
+            # A run queued behind another job gets no quanta, yet still ends
+            # when cancelled while the pump waits with credits to spare
+            emulator = make_emulator()
+            client = RunClient()
+            stream = make_stream(client, emulator, initial_credits=64)
+            blocker = stream.scheduler.submit(emulator, 50_000_000, turbo=True)
+            await stream.handle({"type": "run", "steps": 50_000_000, "turbo": True})
+            await client.wait_for("run_started")
+            await asyncio.sleep(0.05)
+            assert stream.cancel("run_0")
+            summary = await client.wait_for("run_complete", timeout=2.0)
+            stream.scheduler.cancel(blocker.job_id)
+            assert summary["status"] == "cancelled"
+            assert summary["steps_executed"] == 0
+
+            await stream.handle({"type": "run", "steps": 50_000_000, "turbo": True})
+            await asyncio.sleep(0.05)
+            await stream.close()
+            await asyncio.sleep(0.01)
+            assert stream.runs == {}
+            assert stream.scheduler.jobs == {}
+            logger.info("✅ Cancel, queued cancel and close all stopped their runs")
+            self._record_test_result("cancellation", True, "Runs stopped")
+
+        except Exception as e:
+            logger.error(f"❌ Cancellation failed: {e}")
+            self._record_test_result("cancellation", False, str(e))
+
+    async def _test_request_errors(self):
+        """Bad run messages get an error reply."""
+        logger.info("\n📨 Testing Request Errors...")
+
+        try:
+            client = RunClient()
+            stream = make_stream(client, make_emulator(), max_runs=1)
+            replies = [
+                await stream.handle(request)
+                for request in (
+                    {"type": "run"},
+                    {"type": "run", "steps": 0},
+                    {"type": "run", "steps": "many"},
+                    {"type": "ack", "run_id": "run_9"},
+                    {"type": "rewind"},
+                )
+            ]
+            assert all(reply["error"] for reply in replies)
+
+            await stream.handle({"type": "run", "steps": 50_000_000, "turbo": True})
+            busy = await stream.handle({"type": "run", "steps": 10})
+            assert "At most 1 runs" in busy["error"]
+            await stream.close()
+            logger.info("✅ 6 bad requests answered with errors")
+            self._record_test_result("request_errors", True, "6 errors")
+
+        except Exception as e:
+            logger.error(f"❌ Request errors failed: {e}")
+            self._record_test_result("request_errors", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = RunStreamTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Run Stream Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Run Stream Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Emulator Scheduler Test Launcher
+
+This script provides a test suite for the bridge emulator scheduler, covering
+weighted fair share, responsiveness during long runs, cancellation and the
+ordering of runs on the same emulator.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.core.scheduler import EmulatorScheduler
+from engine.emulator.m6502_emulator import M6502Emulator
+
+# $0600 JMP $0600
+SPIN_PROGRAM = bytes([0x4C, 0x00, 0x06])
+
+
+def make_emulator(throttled: bool = False) -> M6502Emulator:
+    """An initialized emulator spinning at $0600."""
+    emulator = M6502Emulator()
+    emulator.initialize_emulator()
+    emulator.set_throttled(throttled)
+    emulator.load_memory_image(SPIN_PROGRAM, 0x0600)
+    emulator.mpu.pc = 0x0600
+    return emulator
+
+
+class SchedulerTestSuite:
+    """Test suite for the bridge emulator scheduler."""
+
+    def __init__(self):
+        """Initialize the test suite."""
+        self.test_results = []
+
+        # Configure logging
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="INFO",
+            format=(
+                "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
+                "<cyan>Scheduler Test</cyan> - <level>{message}</level>"
+            ),
+        )
+
+        logger.info("Scheduler Test Suite initialized")
+
+    async def run_all_tests(self):
+        """Run all scheduler tests."""
+        logger.info("🚀 Starting Scheduler Test Suite")
+        logger.info("=" * 60)
+
+        await self._test_weighted_share()
+        await self._test_responsiveness()
+        await self._test_cancellation()
+        await self._test_same_emulator_order()
+
+        return self._generate_test_report()
+
+    async def _test_weighted_share(self):
+        """Higher priority jobs get a proportionally larger share."""
+        logger.info("\n⚖️ Testing Weighted Share...")
+
+        try:
+            scheduler = EmulatorScheduler(quantum_ms=2)
+            low = scheduler.submit(make_emulator(), 10_000_000, priority=1)
+            high = scheduler.submit(make_emulator(), 10_000_000, priority=4)
+
+            await asyncio.sleep(0.4)
+            ratio = high.run_time / low.run_time
+            await scheduler.shutdown()
+
+            assert 2.5 < ratio < 6, f"share ratio {ratio:.2f}"
+            assert low.status == high.status == "cancelled"
+            logger.info(f"✅ Priority 4 vs 1 share ratio {ratio:.2f}")
+            self._record_test_result("weighted_share", True, f"Ratio {ratio:.2f}")
+
+        except Exception as e:
+            logger.error(f"❌ Weighted share failed: {e}")
+            self._record_test_result("weighted_share", False, str(e))
+
+    async def _test_responsiveness(self):
+        """Short runs finish promptly while a batch job is running."""
+        logger.info("\n⚡ Testing Responsiveness...")
+
+        try:
+            scheduler = EmulatorScheduler(quantum_ms=5)
+            batch = scheduler.submit(make_emulator(), 10_000_000)
+            await asyncio.sleep(0.05)
+
+            # A paced interactive session: 2000 steps take a few ms at 1 MHz
+            start = time.perf_counter()
+            result = await scheduler.run(make_emulator(throttled=True), 2000)
+            latency = (time.perf_counter() - start) * 1000
+
+            gaps = []
+            for _ in range(20):
+                tick = time.perf_counter()
+                await asyncio.sleep(0)
+                gaps.append((time.perf_counter() - tick) * 1000)
+            await scheduler.shutdown()
+
+            assert result["status"] == "completed"
+            assert result["steps_executed"] == 2000
+            assert batch.steps_executed < batch.steps
+            assert latency < 250, f"interactive run took {latency:.1f}ms"
+            assert max(gaps) < 50, f"loop blocked for {max(gaps):.1f}ms"
+            logger.info(f"✅ Interactive run done in {latency:.1f}ms beside batch")
+            self._record_test_result("responsiveness", True, f"Latency {latency:.1f}ms")
+
+        except Exception as e:
+            logger.error(f"❌ Responsiveness failed: {e}")
+            self._record_test_result("responsiveness", False, str(e))
+
+    async def _test_cancellation(self):
+        """Jobs stop between quanta when cancelled or their waiter goes away."""
+        logger.info("\n🛑 Testing Cancellation...")
+
+        try:
+            scheduler = EmulatorScheduler()
+            job = scheduler.submit(make_emulator(), 10_000_000, session_id="alice")
+            await asyncio.sleep(0.05)
+            assert scheduler.cancel_session("alice") == 1
+            result = await scheduler.wait(job)
+
+            assert result["cancelled"] is True
+            assert 0 < result["steps_executed"] < 10_000_000
+
+            waiter = asyncio.create_task(scheduler.run(make_emulator(), 10_000_000))
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            await asyncio.sleep(0.01)
+
+            stats = scheduler.get_statistics()
+            assert stats["jobs_cancelled"] == 2
+            assert not scheduler.get_jobs()
+            assert not scheduler.cancel(job.job_id)
+            logger.info(f"✅ Cancelled after {result['steps_executed']} steps")
+            self._record_test_result("cancellation", True, "Both jobs stopped")
+
+        except Exception as e:
+            logger.error(f"❌ Cancellation failed: {e}")
+            self._record_test_result("cancellation", False, str(e))
+
+    async def _test_same_emulator_order(self):
+        """Jobs on one emulator run one after another in submission order."""
+        logger.info("\n🔢 Testing Same Emulator Order...")
+
+        try:
+            scheduler = EmulatorScheduler(quantum_ms=1)
+            emulator = make_emulator()
+            first = scheduler.submit(emulator, 50_000)
+            second = scheduler.submit(emulator, 50_000, priority=10)
+
+            results = await asyncio.gather(
+                scheduler.wait(first), scheduler.wait(second)
+            )
+
+            assert [r["steps_executed"] for r in results] == [50_000, 50_000]
+            assert first.quanta > 1
+            assert second.started >= first.finished
+            logger.info(f"✅ Second job waited {results[1]['wait_time']:.1f}ms")
+            self._record_test_result("same_emulator_order", True, "Serialized")
+
+        except Exception as e:
+            logger.error(f"❌ Same emulator order failed: {e}")
+            self._record_test_result("same_emulator_order", False, str(e))
+
+    def _record_test_result(self, test_name: str, success: bool, message: str):
+        """Record a test result."""
+        self.test_results.append(
+            {
+                "test": test_name,
+                "success": success,
+                "message": message,
+                "timestamp": time.time(),
+            }
+        )
+
+    def _generate_test_report(self) -> bool:
+        """Log a summary of the test results."""
+        total_tests = len(self.test_results)
+        successful_tests = sum(1 for r in self.test_results if r["success"])
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 {successful_tests}/{total_tests} tests passed")
+
+        for result in self.test_results:
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            logger.info(f"  {status} {result['test']}: {result['message']}")
+
+        return successful_tests == total_tests
+
+
+async def main():
+    """Main test runner."""
+    test_suite = SchedulerTestSuite()
+
+    try:
+        success = await test_suite.run_all_tests()
+
+        if success:
+            logger.info("\n🎉 Scheduler Test Suite completed successfully!")
+            sys.exit(0)
+        else:
+            logger.error("\n❌ Scheduler Test Suite completed with failures!")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.info("\n⏹️ Test suite interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,11 +9,16 @@ communication between the AI layer and the emulator engine.
 import asyncio
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from loguru import logger
 
 from bridge.core.settings import get_settings
+from engine.emulator.cpu_state import (
+    CpuState,
+    encode_cpu_state_deltas,
+    expand_cpu_states,
+)
 
 
 class EmulatorIntegration:
@@ -45,14 +50,17 @@ class EmulatorIntegration:
         }
 
         # State management
-        self.last_cpu_state = {}
+        self.last_cpu_state: Optional[CpuState] = None
         self.last_memory_state = {}
         self.state_history = []
 
         logger.info("Emulator Integration initialized")
 
     async def execute_command_sequence(
-        self, commands: List[str], execution_context: Optional[Dict[str, Any]] = None
+        self,
+        commands: List[str],
+        execution_context: Optional[Dict[str, Any]] = None,
+        include: Iterable[str] = (),
     ) -> Dict[str, Any]:
         """
         Execute a sequence of BASIC commands through the emulator.
@@ -60,9 +68,13 @@ class EmulatorIntegration:
         Args:
             commands: List of BASIC commands to execute
             execution_context: Optional context information for execution
+            include: Optional extra result fields; "cpu_states" adds the full
+                CPU state after every successful command
 
         Returns:
-            Dictionary containing execution results and metadata
+            Dictionary containing execution results and metadata. The CPU
+            states are always returned delta-encoded in "cpu_state_deltas"
+            (the first state in full, then only the registers that changed).
         """
         execution_id = f"exec_{int(time.time())}_{len(self.execution_history)}"
         self.current_execution_id = execution_id
@@ -83,15 +95,20 @@ class EmulatorIntegration:
                 "commands_failed": 0,
                 "output": [],
                 "errors": [],
-                "cpu_states": [],
+                "cpu_state_deltas": [],
                 "execution_time": 0.0,
                 "timestamp": time.time(),
                 "context": execution_context or {},
             }
 
+            # CPU states stay compact tuples until the result is built
+            cpu_states: List[CpuState] = []
+
             # Execute each command
             for i, command in enumerate(commands):
-                command_result = await self._execute_single_command(command, i + 1)
+                command_result = await self._execute_single_command(
+                    command, i + 1, include
+                )
 
                 if command_result["success"]:
                     execution_result["commands_executed"] += 1
@@ -108,10 +125,8 @@ class EmulatorIntegration:
                         self.output_buffer.append(command_result["output"])
 
                     # Capture CPU state
-                    if command_result.get("cpu_state"):
-                        execution_result["cpu_states"].append(
-                            command_result["cpu_state"]
-                        )
+                    if self.last_cpu_state:
+                        cpu_states.append(self.last_cpu_state)
 
                 else:
                     execution_result["commands_failed"] += 1
@@ -131,6 +146,10 @@ class EmulatorIntegration:
                         execution_result["success"] = False
                         break
 
+            execution_result["cpu_state_deltas"] = encode_cpu_state_deltas(cpu_states)
+            if "cpu_states" in include:
+                execution_result["cpu_states"] = expand_cpu_states(cpu_states)
+
             # Calculate total execution time
             execution_result["execution_time"] = (
                 time.perf_counter() - self.execution_start_time
@@ -170,9 +189,13 @@ class EmulatorIntegration:
             return error_result
 
     async def _execute_single_command(
-        self, command: str, command_index: int
+        self, command: str, command_index: int, include: Iterable[str] = ()
     ) -> Dict[str, Any]:
-        """Execute a single BASIC command through the emulator."""
+        """Execute a single BASIC command through the emulator.
+
+        The CPU state after the command is kept in ``last_cpu_state``; the
+        result only carries it as a dict when ``include`` has "cpu_states".
+        """
         try:
             if not self.emulator:
                 return {
@@ -187,8 +210,8 @@ class EmulatorIntegration:
             # Capture CPU state
             cpu_state = None
             if result.get("success"):
-                cpu_state = self.emulator.get_cpu_state()
-                self.last_cpu_state = cpu_state
+                cpu_state = self.emulator.capture_cpu_state()
+            self.last_cpu_state = cpu_state
 
             # Determine if this is a critical error
             critical = False
@@ -199,14 +222,16 @@ class EmulatorIntegration:
                     for keyword in ["fatal", "crash", "memory", "stack"]
                 )
 
-            return {
+            command_result = {
                 "success": result.get("success", False),
                 "output": result.get("output"),
                 "error": result.get("error"),
-                "cpu_state": cpu_state,
                 "critical": critical,
                 "command_index": command_index,
             }
+            if "cpu_states" in include:
+                command_result["cpu_state"] = cpu_state._asdict() if cpu_state else None
+            return command_result
 
         except Exception as e:
             logger.error(f"Error executing command {command_index}: {e}")
@@ -221,34 +246,52 @@ class EmulatorIntegration:
         """
         Capture emulator output for a specified duration.
 
+        Characters written to the display region are pushed into the display
+        device's output ring as they happen, so this waits to be woken by the
+        device instead of polling display memory.
+
         Args:
             duration: Duration to capture output in seconds
 
         Returns:
-            List of captured output strings
+            List of captured output chunks, in the order they were written
         """
         if not self.capture_enabled or not self.emulator:
             return []
 
-        captured_output = []
-        start_time = time.perf_counter()
+        display = getattr(self.emulator, "display", None)
+        if display is None:
+            logger.warning("Emulator has no display device; output not captured")
+            return []
 
-        try:
-            while (time.perf_counter() - start_time) < duration:
-                # Get current CPU state for output detection
-                cpu_state = self.emulator.get_cpu_state()
+        captured_output = []
+        loop = asyncio.get_running_loop()
+        output_ready = asyncio.Event()
 
-                # Check for output in display memory (0x2000-0x20FF)
-                memory_dump = self.emulator.get_memory_dump(0x2000, 256)
+        # The emulator may run on another thread, so hop back onto the loop
+        def on_output():
+            loop.call_soon_threadsafe(output_ready.set)
 
-                for addr, value in memory_dump.items():
-                    if isinstance(value, int) and 32 <= value <= 126:  # Printable ASCII
-                        char = chr(value)
-                        if char not in captured_output:
-                            captured_output.append(char)
+        display.add_listener(on_output)
+        deadline = loop.time() + duration
 
-                # Small delay to prevent excessive CPU usage
-                await asyncio.sleep(0.01)
+        try:
+            while True:
+                chunk = display.drain()
+                if chunk:
+                    captured_output.append(chunk)
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                output_ready.clear()
+                if display.pending():
+                    continue
+                try:
+                    await asyncio.wait_for(output_ready.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
 
             # Add captured output to buffer
             if captured_output:
@@ -265,6 +308,9 @@ class EmulatorIntegration:
             logger.error(f"Error capturing emulator output: {e}")
             return []
 
+        finally:
+            display.remove_listener(on_output)
+
     def get_emulator_state(self) -> Dict[str, Any]:
         """Get comprehensive emulator state information."""
         if not self.emulator:
@@ -348,7 +394,7 @@ class EmulatorIntegration:
             if success:
                 # Clear integration state
                 self.output_buffer.clear()
-                self.last_cpu_state = {}
+                self.last_cpu_state = None
                 self.last_memory_state = {}
 
                 logger.info("✅ Emulator state reset successfully")
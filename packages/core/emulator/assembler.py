@@ -0,0 +1,870 @@
+"""
+M6502 Assembler Module
+
+This module provides a cross-assembler for the MACRO-10 dialect that
+src/m6502.asm is written in. It implements the part of MACRO-10 the BASIC
+source relies on (DEFINE, REPEAT and IRPC macros, the IFE/IFN/IF1/IF2/IFDEF/
+IFDIF conditionals, RADIX and ORG, six-character symbols) together with the
+conventions of the M6502 macro library the source SEARCHes: addressing-mode
+suffixes on mnemonics (LDAI, LDADY, JMPD), ADR words and DC strings. Source is
+assembled in repeated passes until every symbol keeps its value.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# MACRO-10 symbols are significant to six characters
+SYMBOL_LENGTH = 6
+SYMBOL_PATTERN = re.compile(r"[A-Z.$%][A-Z0-9.$%]*")
+LABEL_PATTERN = re.compile(r"\s*([A-Z.$%][A-Z0-9.$%]*)\s*::?!?")
+ASSIGNMENT_PATTERN = re.compile(r"\s*([A-Z.$%][A-Z0-9.$%]*)\s*(==|=:|=)(.*)")
+INDEX_PATTERN = re.compile(r"(.*?)\s*,\s*([XY])$")
+NUMBER_PATTERN = re.compile(r"([0-9]+)(\.?)")
+
+MAX_PASSES = 8
+ADDRESS_SPACE = 0x10000
+
+# Opcodes by addressing mode for every NMOS 6502 instruction
+OPCODES: Dict[str, Dict[str, int]] = {
+    "ADC": {"imm": 0x69, "zp": 0x65, "zpx": 0x75, "abs": 0x6D, "absx": 0x7D,
+            "absy": 0x79, "indx": 0x61, "indy": 0x71},
+    "AND": {"imm": 0x29, "zp": 0x25, "zpx": 0x35, "abs": 0x2D, "absx": 0x3D,
+            "absy": 0x39, "indx": 0x21, "indy": 0x31},
+    "ASL": {"acc": 0x0A, "zp": 0x06, "zpx": 0x16, "abs": 0x0E, "absx": 0x1E},
+    "BCC": {"rel": 0x90},
+    "BCS": {"rel": 0xB0},
+    "BEQ": {"rel": 0xF0},
+    "BIT": {"zp": 0x24, "abs": 0x2C},
+    "BMI": {"rel": 0x30},
+    "BNE": {"rel": 0xD0},
+    "BPL": {"rel": 0x10},
+    "BRK": {"imp": 0x00},
+    "BVC": {"rel": 0x50},
+    "BVS": {"rel": 0x70},
+    "CLC": {"imp": 0x18},
+    "CLD": {"imp": 0xD8},
+    "CLI": {"imp": 0x58},
+    "CLV": {"imp": 0xB8},
+    "CMP": {"imm": 0xC9, "zp": 0xC5, "zpx": 0xD5, "abs": 0xCD, "absx": 0xDD,
+            "absy": 0xD9, "indx": 0xC1, "indy": 0xD1},
+    "CPX": {"imm": 0xE0, "zp": 0xE4, "abs": 0xEC},
+    "CPY": {"imm": 0xC0, "zp": 0xC4, "abs": 0xCC},
+    "DEC": {"zp": 0xC6, "zpx": 0xD6, "abs": 0xCE, "absx": 0xDE},
+    "DEX": {"imp": 0xCA},
+    "DEY": {"imp": 0x88},
+    "EOR": {"imm": 0x49, "zp": 0x45, "zpx": 0x55, "abs": 0x4D, "absx": 0x5D,
+            "absy": 0x59, "indx": 0x41, "indy": 0x51},
+    "INC": {"zp": 0xE6, "zpx": 0xF6, "abs": 0xEE, "absx": 0xFE},
+    "INX": {"imp": 0xE8},
+    "INY": {"imp": 0xC8},
+    "JMP": {"abs": 0x4C, "ind": 0x6C},
+    "JSR": {"abs": 0x20},
+    "LDA": {"imm": 0xA9, "zp": 0xA5, "zpx": 0xB5, "abs": 0xAD, "absx": 0xBD,
+            "absy": 0xB9, "indx": 0xA1, "indy": 0xB1},
+    "LDX": {"imm": 0xA2, "zp": 0xA6, "zpy": 0xB6, "abs": 0xAE, "absy": 0xBE},
+    "LDY": {"imm": 0xA0, "zp": 0xA4, "zpx": 0xB4, "abs": 0xAC, "absx": 0xBC},
+    "LSR": {"acc": 0x4A, "zp": 0x46, "zpx": 0x56, "abs": 0x4E, "absx": 0x5E},
+    "NOP": {"imp": 0xEA},
+    "ORA": {"imm": 0x09, "zp": 0x05, "zpx": 0x15, "abs": 0x0D, "absx": 0x1D,
+            "absy": 0x19, "indx": 0x01, "indy": 0x11},
+    "PHA": {"imp": 0x48},
+    "PHP": {"imp": 0x08},
+    "PLA": {"imp": 0x68},
+    "PLP": {"imp": 0x28},
+    "ROL": {"acc": 0x2A, "zp": 0x26, "zpx": 0x36, "abs": 0x2E, "absx": 0x3E},
+    "ROR": {"acc": 0x6A, "zp": 0x66, "zpx": 0x76, "abs": 0x6E, "absx": 0x7E},
+    "RTI": {"imp": 0x40},
+    "RTS": {"imp": 0x60},
+    "SBC": {"imm": 0xE9, "zp": 0xE5, "zpx": 0xF5, "abs": 0xED, "absx": 0xFD,
+            "absy": 0xF9, "indx": 0xE1, "indy": 0xF1},
+    "SEC": {"imp": 0x38},
+    "SED": {"imp": 0xF8},
+    "SEI": {"imp": 0x78},
+    "STA": {"zp": 0x85, "zpx": 0x95, "abs": 0x8D, "absx": 0x9D, "absy": 0x99,
+            "indx": 0x81, "indy": 0x91},
+    "STX": {"zp": 0x86, "zpy": 0x96, "abs": 0x8E},
+    "STY": {"zp": 0x84, "zpx": 0x94, "abs": 0x8C},
+    "TAX": {"imp": 0xAA},
+    "TAY": {"imp": 0xA8},
+    "TSX": {"imp": 0xBA},
+    "TXA": {"imp": 0x8A},
+    "TXS": {"imp": 0x9A},
+    "TYA": {"imp": 0x98},
+}  # fmt: skip
+
+# M6502 library mnemonic suffixes that select an addressing mode
+MODE_SUFFIXES = {"I": "imm", "DY": "indy", "DX": "indx", "D": "ind"}
+
+# Operand sizes by addressing mode
+OPERAND_SIZES = {
+    "imp": 0, "acc": 0, "imm": 1, "zp": 1, "zpx": 1, "zpy": 1, "indx": 1,
+    "indy": 1, "rel": 1, "abs": 2, "absx": 2, "absy": 2, "ind": 2,
+}  # fmt: skip
+
+# Listing and cross-reference controls with no effect on the image
+IGNORED_PSEUDO_OPS = frozenset(
+    {
+        "TITLE",
+        "SUBTTL",
+        "SEARCH",
+        "SALL",
+        "LALL",
+        "XALL",
+        "PAGE",
+        "LIST",
+        "XLIST",
+        ".XCREF",
+        ".CREF",
+        "PURGE",
+    }
+)
+
+# Conditional assembly on the value of an expression
+CONDITIONS = {
+    "IFE": lambda value: value == 0,
+    "IFN": lambda value: value != 0,
+    "IFG": lambda value: value > 0,
+    "IFGE": lambda value: value >= 0,
+    "IFL": lambda value: value < 0,
+    "IFLE": lambda value: value <= 0,
+}
+
+
+class AssemblyError(ValueError):
+    """Raised when source cannot be assembled."""
+
+    def __init__(self, message: str, line: Optional[int] = None):
+        self.message = message
+        self.line = line
+        super().__init__(f"{message} in line {line}" if line else message)
+
+
+@dataclass(frozen=True)
+class Macro:
+    """A DEFINE'd macro: dummy argument names and the body text."""
+
+    name: str
+    params: Tuple[str, ...]
+    body: str
+
+
+@dataclass(frozen=True)
+class AssemblyResult:
+    """Output of a successful assembly."""
+
+    segments: Tuple[Tuple[int, bytes], ...]
+    symbols: Dict[str, int]
+    start_address: Optional[int]
+    passes: int
+    messages: Tuple[str, ...] = ()
+    # Symbols defined as labels rather than by assignment
+    labels: FrozenSet[str] = frozenset()
+    assembly_time: float = 0.0
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def size(self) -> int:
+        """Total number of assembled bytes."""
+        return sum(len(data) for _, data in self.segments)
+
+    def image(self, start: int, end: int) -> bytes:
+        """The assembled bytes in ``start``..``end`` (exclusive), zero filled."""
+        image = bytearray(end - start)
+        for address, data in self.segments:
+            low = max(address, start)
+            high = min(address + len(data), end)
+            if low < high:
+                image[low - start : high - start] = data[low - address : high - address]
+        return bytes(image)
+
+    def get_assembly_info(self) -> Dict[str, Any]:
+        """Get information about the assembly."""
+        return {
+            "segments": [
+                {"start": f"0x{start:04X}", "size": len(data)}
+                for start, data in self.segments
+            ],
+            "size": self.size,
+            "symbols": len(self.symbols),
+            "start_address": self.start_address,
+            "passes": self.passes,
+            "assembly_time": self.assembly_time,
+        }
+
+
+def symbol_name(name: str) -> str:
+    """Truncate a symbol to its significant characters."""
+    return name.upper()[:SYMBOL_LENGTH]
+
+
+def _strip_comment(text: str) -> str:
+    """Drop a ``;`` comment from a line of code."""
+    index = text.find(";")
+    return text if index < 0 else text[:index]
+
+
+def _split_arguments(text: str) -> List[str]:
+    """Split on commas outside ``<>`` groups, parentheses and quotes."""
+    arguments = []
+    depth = 0
+    quoted = False
+    start = 0
+    for index, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char in "<(":
+            depth += 1
+        elif char in ">)":
+            depth -= 1
+        elif char == "," and depth == 0:
+            arguments.append(text[start:index])
+            start = index + 1
+    arguments.append(text[start:])
+    return [argument.strip() for argument in arguments]
+
+
+def _unwrap(argument: str) -> str:
+    """Remove one pair of enclosing ``<>`` from a macro argument."""
+    if argument.startswith("<") and argument.endswith(">"):
+        depth = 0
+        for index, char in enumerate(argument):
+            depth += char == "<"
+            depth -= char == ">"
+            if depth == 0:
+                if index == len(argument) - 1:
+                    return argument[1:-1]
+                break
+    return argument
+
+
+def _substitute(body: str, values: Dict[str, str]) -> str:
+    """Replace dummy arguments in a macro body, inside quotes too."""
+    if not values:
+        return body
+    pattern = re.compile(
+        r"(?<![A-Z0-9.$%])("
+        + "|".join(re.escape(name) for name in sorted(values, key=len, reverse=True))
+        + r")(?![A-Z0-9.$%])"
+    )
+    return pattern.sub(lambda match: values[match.group(1)], body)
+
+
+class Assembler:
+    """Multi-pass assembler for MACRO-10 style M6502 source.
+
+    ``predefined`` symbols are fixed before the first pass and later
+    assignments to them are ignored, which is how a build selects a
+    configuration (``REALIO``, ``ROMLOC`` and friends) without editing the
+    source.
+    """
+
+    def __init__(self, predefined: Optional[Dict[str, int]] = None):
+        """Initialize the assembler with optional locked symbol values."""
+        self.predefined = {
+            symbol_name(name): value for name, value in (predefined or {}).items()
+        }
+
+    def assemble(self, source: str) -> AssemblyResult:
+        """Assemble ``source`` and return its segments and symbol table."""
+        start_time = time.perf_counter()
+        text = source.upper().replace("\r\n", "\n").replace("\f", " ")
+
+        previous: Dict[str, int] = {}
+        for pass_number in range(1, MAX_PASSES + 1):
+            self._start_pass(pass_number, previous)
+            self._process(text, 1)
+            if pass_number > 1 and self.symbols == previous:
+                break
+            previous = dict(self.symbols)
+        else:
+            raise AssemblyError(f"Symbols did not settle after {MAX_PASSES} passes")
+
+        if self.errors:
+            message, line = self.errors[0]
+            raise AssemblyError(message, line)
+
+        return AssemblyResult(
+            segments=self._segments(),
+            symbols={**self.symbols, **self.predefined},
+            start_address=self.start_address,
+            passes=pass_number,
+            messages=tuple(self.messages),
+            labels=frozenset(self.labels),
+            assembly_time=time.perf_counter() - start_time,
+        )
+
+    def _start_pass(self, pass_number: int, previous: Dict[str, int]):
+        """Reset per-pass state."""
+        self.pass_number = pass_number
+        self.previous = previous
+        self.symbols: Dict[str, int] = {}
+        self.labels = set()
+        self.macros: Dict[str, Macro] = {}
+        self.radix = 10
+        self.location = 0
+        self.statement_location = 0
+        self.start_address: Optional[int] = None
+        self.ended = False
+        self.line = 0
+        self.track_lines = True
+        self.image = bytearray(ADDRESS_SPACE)
+        self.written = bytearray(ADDRESS_SPACE)
+        self.errors: List[Tuple[str, int]] = []
+        if pass_number == 1:
+            self.messages: List[str] = []
+
+    def _segments(self) -> Tuple[Tuple[int, bytes], ...]:
+        """Contiguous runs of assembled bytes."""
+        segments = []
+        address = 0
+        while address < ADDRESS_SPACE:
+            start = self.written.find(1, address)
+            if start < 0:
+                break
+            end = self.written.find(0, start)
+            if end < 0:
+                end = ADDRESS_SPACE
+            segments.append((start, bytes(self.image[start:end])))
+            address = end
+        return tuple(segments)
+
+    # Source processing
+
+    def _process(self, text: str, line: int):
+        """Assemble ``text``, whose first character is on source line ``line``."""
+        position = 0
+        while position < len(text) and not self.ended:
+            if self.track_lines:
+                self.line = line
+            next_position = self._statement(text, position)
+            line += text.count("\n", position, next_position)
+            position = next_position
+
+    def _expand(self, text: str):
+        """Assemble generated text, reporting errors at the current line."""
+        track_lines = self.track_lines
+        self.track_lines = False
+        try:
+            self._process(text, self.line)
+        finally:
+            self.track_lines = track_lines
+
+    def _statement(self, text: str, position: int) -> int:
+        """Assemble the statement at ``position``; returns where the next starts."""
+        end = text.find("\n", position)
+        if end < 0:
+            end = len(text)
+        code = _strip_comment(text[position:end])
+        offset = 0
+
+        # Labels
+        while True:
+            match = LABEL_PATTERN.match(code, offset)
+            if not match:
+                break
+            self._define(match.group(1), self.location, label=True)
+            offset = match.end()
+
+        # Assignments
+        match = ASSIGNMENT_PATTERN.match(code, offset)
+        if match:
+            value = self._evaluate(match.group(3))
+            self._define(match.group(1), value)
+            return end + 1
+
+        statement = code[offset:].lstrip()
+        if not statement:
+            return end + 1
+        self.statement_location = self.location
+        match = SYMBOL_PATTERN.match(code, len(code) - len(statement))
+        if not match:
+            self._data(statement)
+            return end + 1
+
+        name = match.group(0)
+        operands = position + match.end()
+        rest = code[match.end() :]
+
+        if name in self.macros:
+            self._call_macro(self.macros[name], rest)
+        elif name in IGNORED_PSEUDO_OPS:
+            pass
+        elif name == "PRINTX":
+            if self.pass_number == 1:
+                self.messages.append(rest.strip())
+        elif name in CONDITIONS:
+            return self._conditional(name, text, operands)
+        elif name in ("IF1", "IF2"):
+            return self._pass_conditional(name, text, operands)
+        elif name in ("IFDEF", "IFNDEF"):
+            return self._defined_conditional(name, text, operands)
+        elif name in ("IFDIF", "IFIDN"):
+            return self._compare_conditional(name, text, operands)
+        elif name == "DEFINE":
+            return self._define_macro(text, operands)
+        elif name == "REPEAT":
+            return self._repeat(text, operands)
+        elif name == "COMMENT":
+            return self._comment(text, operands)
+        elif name == "RADIX":
+            self.radix = int(rest.strip())
+        elif name == "ORG":
+            self.location = self._require(rest)
+        elif name == "BLOCK":
+            self.location += self._require(rest)
+        elif name == "END":
+            if rest.strip():
+                self.start_address = self._evaluate(rest)
+            self.ended = True
+        elif name == "EXP":
+            self._data(rest)
+        elif name == "XWD":
+            # The simulator's opcode-only words: emit the right half
+            self._emit(self._evaluate(_split_arguments(rest)[-1]))
+        elif name == "ADR":
+            self._address(rest)
+        elif name == "DC":
+            self._string(rest)
+        elif name in OPCODES:
+            self._instruction(name, None, rest)
+        elif name[:3] in OPCODES and name[3:] in MODE_SUFFIXES:
+            self._instruction(name[:3], MODE_SUFFIXES[name[3:]], rest)
+        else:
+            self._data(statement)
+        return end + 1
+
+    # Symbols and expressions
+
+    def _define(self, name: str, value: Optional[int], label: bool = False):
+        """Set a symbol; locked predefined symbols keep their value."""
+        name = symbol_name(name)
+        if name in self.predefined or value is None:
+            return
+        if label and name in self.labels and self.symbols[name] != value:
+            self._error(f"Multiply defined label {name}")
+        if label:
+            self.labels.add(name)
+        self.symbols[name] = value
+
+    def _lookup(self, name: str) -> Optional[int]:
+        """Value of a symbol; forward references use the previous pass."""
+        if name == ".":
+            return self.statement_location
+        name = symbol_name(name)
+        for table in (self.predefined, self.symbols, self.previous):
+            if name in table:
+                return table[name]
+        if self.pass_number == 1:
+            return None
+        raise AssemblyError(f"Undefined symbol {name}", self.line)
+
+    def _is_defined(self, name: str) -> bool:
+        """Whether a symbol has a value yet in this pass."""
+        name = symbol_name(name)
+        return name in self.predefined or name in self.symbols
+
+    def _evaluate(self, expression: str) -> Optional[int]:
+        """Evaluate an expression; ``None`` while a forward reference is unknown."""
+        parser = _ExpressionParser(expression, self)
+        value = parser.parse()
+        if parser.position < len(parser.text.rstrip()):
+            raise AssemblyError(f"Bad expression {expression.strip()!r}", self.line)
+        return value
+
+    def _require(self, expression: str) -> int:
+        """Evaluate an expression that must be known in every pass."""
+        value = self._evaluate(expression)
+        if value is None:
+            raise AssemblyError(
+                f"Expression {expression.strip()!r} uses a forward reference", self.line
+            )
+        return value
+
+    def _error(self, message: str):
+        """Record an error; only errors in the final pass are reported."""
+        self.errors.append((message, self.line))
+
+    # Code generation
+
+    def _emit(self, value: Optional[int]):
+        """Emit one byte at the location counter."""
+        if self.location >= ADDRESS_SPACE:
+            raise AssemblyError("Location counter beyond 64K", self.line)
+        self.image[self.location] = (value or 0) & 0xFF
+        self.written[self.location] = 1
+        self.location += 1
+
+    def _data(self, text: str):
+        """Emit one byte per comma-separated expression."""
+        for expression in _split_arguments(text):
+            if expression:
+                self._emit(self._evaluate(expression))
+
+    def _address(self, text: str):
+        """Emit little-endian words."""
+        text = text.strip()
+        if text.startswith("(") and text.endswith(")"):
+            text = text[1:-1]
+        for expression in _split_arguments(text):
+            value = self._evaluate(expression) or 0
+            self._emit(value)
+            self._emit(value >> 8)
+
+    def _string(self, text: str):
+        """Emit a DC string: ASCII with the high bit set on the last byte."""
+        text = text.strip()
+        if text.startswith("(") and text.endswith(")"):
+            text = text[1:-1].strip()
+        if len(text) < 2 or text[0] != '"' or text[-1] != '"':
+            raise AssemblyError(f"Bad string {text!r}", self.line)
+        data = text[1:-1].encode("ascii")
+        for index, value in enumerate(data):
+            self._emit(value | (0x80 if index == len(data) - 1 else 0))
+
+    def _instruction(self, name: str, mode: Optional[str], operand: str):
+        """Assemble one machine instruction."""
+        modes = OPCODES[name]
+        operand = operand.strip()
+        if operand.endswith(","):
+            operand = operand[:-1].rstrip()
+
+        value = None
+        if mode is None:
+            if not operand or operand == "A":
+                mode = "acc" if "acc" in modes else "imp"
+            elif "rel" in modes:
+                mode = "rel"
+                target = self._evaluate(operand)
+                if target is not None:
+                    value = target - (self.statement_location + 2)
+                    if not -128 <= value <= 127:
+                        self._error(f"Branch out of range to {operand}")
+            else:
+                index = ""
+                match = INDEX_PATTERN.match(operand)
+                if match:
+                    operand, index = match.group(1), match.group(2).lower()
+                value = self._evaluate(operand)
+                zero_page, absolute = "zp" + index, "abs" + index
+                if zero_page in modes and value is not None and 0 <= value < 0x100:
+                    mode = zero_page
+                elif absolute in modes:
+                    mode = absolute
+                else:
+                    mode = zero_page
+        else:
+            value = self._evaluate(operand)
+
+        if mode not in modes:
+            raise AssemblyError(f"{name} does not support {mode} addressing", self.line)
+        size = OPERAND_SIZES[mode]
+        if value is not None and mode in ("imm", "zp", "zpx", "zpy", "indx", "indy"):
+            if not -0x100 < value < 0x100:
+                self._error(f"Operand {operand} out of range for {name}")
+
+        self._emit(modes[mode])
+        if size:
+            self._emit(value)
+        if size == 2:
+            self._emit((value or 0) >> 8)
+
+    # Macros, repetition and conditionals
+
+    def _bracket(self, text: str, position: int) -> Tuple[str, int]:
+        """Body of the ``<...>`` group opening at or after ``position``.
+
+        Returns the body and the index just past the closing bracket. ``;``
+        comments are skipped, so brackets inside them do not count.
+        """
+        position = self._skip(text, position)
+        if position >= len(text) or text[position] != "<":
+            raise AssemblyError("Expected <", self.line)
+        depth = 0
+        index = position
+        while index < len(text):
+            char = text[index]
+            if char == ";":
+                newline = text.find("\n", index)
+                index = len(text) if newline < 0 else newline
+                continue
+            if char == "<":
+                depth += 1
+            elif char == ">":
+                depth -= 1
+                if depth == 0:
+                    return text[position + 1 : index], index + 1
+            index += 1
+        raise AssemblyError("Unterminated <", self.line)
+
+    @staticmethod
+    def _skip(text: str, position: int, separator: bool = False) -> int:
+        """Skip blanks (and one comma when ``separator`` is set)."""
+        while position < len(text) and text[position] in " \t":
+            position += 1
+        if separator and position < len(text) and text[position] == ",":
+            position = Assembler._skip(text, position + 1)
+        return position
+
+    def _condition_operand(self, text: str, position: int) -> Tuple[str, int]:
+        """The expression before the comma that precedes a conditional body."""
+        depth = 0
+        index = position
+        while index < len(text) and text[index] != "\n":
+            char = text[index]
+            if char == "<":
+                depth += 1
+            elif char == ">":
+                depth -= 1
+            elif char == "," and depth == 0:
+                return text[position:index], index + 1
+            index += 1
+        raise AssemblyError("Expected , in conditional", self.line)
+
+    def _assemble_if(self, condition: bool, text: str, position: int) -> int:
+        """Assemble the bracketed body at ``position`` when ``condition`` holds."""
+        body, next_position = self._bracket(text, position)
+        if condition:
+            self._process(body, self.line)
+        return next_position
+
+    def _conditional(self, name: str, text: str, position: int) -> int:
+        """IFE/IFN/IFG/IFL and friends."""
+        expression, position = self._condition_operand(text, position)
+        value = self._evaluate(expression)
+        if value is None:
+            value = 0
+        return self._assemble_if(CONDITIONS[name](value), text, position)
+
+    def _pass_conditional(self, name: str, text: str, position: int) -> int:
+        """IF1/IF2: assemble only in the first or only in later passes."""
+        position = self._skip(text, position, separator=True)
+        first = self.pass_number == 1
+        return self._assemble_if(first if name == "IF1" else not first, text, position)
+
+    def _defined_conditional(self, name: str, text: str, position: int) -> int:
+        """IFDEF/IFNDEF on whether a symbol has been defined."""
+        expression, position = self._condition_operand(text, position)
+        defined = self._is_defined(expression.strip())
+        return self._assemble_if(defined == (name == "IFDEF"), text, position)
+
+    def _compare_conditional(self, name: str, text: str, position: int) -> int:
+        """IFDIF/IFIDN on two bracketed strings."""
+        first, position = self._bracket(text, position)
+        second, position = self._bracket(text, position)
+        position = self._skip(text, position, separator=True)
+        identical = first == second
+        return self._assemble_if(identical == (name == "IFIDN"), text, position)
+
+    def _define_macro(self, text: str, position: int) -> int:
+        """DEFINE name(dummies),<body>."""
+        position = self._skip(text, position)
+        match = SYMBOL_PATTERN.match(text, position)
+        if not match:
+            raise AssemblyError("DEFINE without a macro name", self.line)
+        name = match.group(0)
+        position = self._skip(text, match.end())
+        params: Tuple[str, ...] = ()
+        if text.startswith("(", position):
+            close = text.index(")", position)
+            params = tuple(
+                param.strip()
+                for param in text[position + 1 : close].split(",")
+                if param.strip()
+            )
+            position = close + 1
+        body, position = self._bracket(text, self._skip(text, position, True))
+        self.macros[name] = Macro(name=name, params=params, body=body)
+        return position
+
+    def _repeat(self, text: str, position: int) -> int:
+        """REPEAT count,<body>."""
+        expression, position = self._condition_operand(text, position)
+        count = self._require(expression)
+        body, position = self._bracket(text, position)
+        for _ in range(max(0, count)):
+            self._expand(body)
+        return position
+
+    def _comment(self, text: str, position: int) -> int:
+        """COMMENT x ... x: skip text up to the matching delimiter."""
+        position = self._skip(text, position)
+        close = text.find(text[position], position + 1)
+        if close < 0:
+            raise AssemblyError("Unterminated COMMENT", self.line)
+        return close + 1
+
+    def _call_macro(self, macro: Macro, rest: str):
+        """Expand a macro call with arguments in parentheses or to end of line."""
+        rest = rest.strip()
+        if rest.startswith("("):
+            depth = 0
+            for index, char in enumerate(rest):
+                depth += char == "("
+                depth -= char == ")"
+                if depth == 0:
+                    rest = rest[1:index]
+                    break
+        arguments = [_unwrap(argument) for argument in _split_arguments(rest)]
+        values = {
+            param: arguments[index] if index < len(arguments) else ""
+            for index, param in enumerate(macro.params)
+        }
+        self._expand(self._expand_body(macro.body, values))
+
+    def _expand_body(self, body: str, values: Dict[str, str]) -> str:
+        """Substitute arguments, expanding IRPC loops one character at a time."""
+        parts = []
+        position = 0
+        pattern = re.compile(r"\bIRPC\s+([A-Z.$%][A-Z0-9.$%]*)\s*,")
+        for match in pattern.finditer(body):
+            if match.start() < position:
+                continue
+            parts.append(_substitute(body[position : match.start()], values))
+            inner, position = self._bracket(body, match.end())
+            param = match.group(1)
+            for char in values.get(param, param):
+                parts.append(_substitute(inner, {param: char}) + "\n")
+        parts.append(_substitute(body[position:], values))
+        return "".join(parts)
+
+
+class _ExpressionParser:
+    """Recursive-descent evaluator for MACRO-10 expressions.
+
+    Operators bind as in MACRO-10: unary minus and the ``^O``/``^D``/``^B``
+    radix prefixes, then ``&`` and ``!`` (and, or), then ``*`` and ``/``,
+    then ``+`` and ``-``. ``<...>`` groups, ``"c"`` is a character code and
+    ``.`` is the location counter.
+    """
+
+    RADIX_PREFIXES = {"O": 8, "D": 10, "B": 2}
+
+    def __init__(self, text: str, assembler: Assembler):
+        self.text = text
+        self.position = 0
+        self.assembler = assembler
+        self.radix = assembler.radix
+
+    def parse(self) -> Optional[int]:
+        """Parse the whole text as an expression."""
+        return self._sum()
+
+    def _peek(self) -> str:
+        """Next non-blank character."""
+        while self.position < len(self.text) and self.text[self.position] in " \t":
+            self.position += 1
+        return self.text[self.position] if self.position < len(self.text) else ""
+
+    def _sum(self) -> Optional[int]:
+        value = self._product()
+        while self._peek() in ("+", "-"):
+            operator = self.text[self.position]
+            self.position += 1
+            right = self._product()
+            value = _combine(value, right, operator)
+        return value
+
+    def _product(self) -> Optional[int]:
+        value = self._logical()
+        while self._peek() in ("*", "/"):
+            operator = self.text[self.position]
+            self.position += 1
+            right = self._logical()
+            if operator == "/" and right == 0:
+                raise AssemblyError("Division by zero", self.assembler.line)
+            value = _combine(value, right, operator)
+        return value
+
+    def _logical(self) -> Optional[int]:
+        value = self._unary()
+        while self._peek() in ("&", "!"):
+            operator = self.text[self.position]
+            self.position += 1
+            right = self._unary()
+            value = _combine(value, right, operator)
+        return value
+
+    def _unary(self) -> Optional[int]:
+        char = self._peek()
+        if char == "-":
+            self.position += 1
+            value = self._unary()
+            return None if value is None else -value
+        if char == "+":
+            self.position += 1
+            return self._unary()
+        if char == "^":
+            prefix = self.text[self.position + 1 : self.position + 2]
+            if prefix not in self.RADIX_PREFIXES:
+                raise AssemblyError(f"Bad radix ^{prefix}", self.assembler.line)
+            self.position += 2
+            radix = self.radix
+            self.radix = self.RADIX_PREFIXES[prefix]
+            try:
+                return self._unary()
+            finally:
+                self.radix = radix
+        return self._primary()
+
+    def _primary(self) -> Optional[int]:
+        char = self._peek()
+        text = self.text
+        if char == "<":
+            self.position += 1
+            value = self._sum()
+            if self._peek() != ">":
+                raise AssemblyError("Expected >", self.assembler.line)
+            self.position += 1
+            return value
+        if char == '"':
+            close = text.find('"', self.position + 1)
+            if close < 0:
+                raise AssemblyError("Unterminated string", self.assembler.line)
+            value = 0
+            for letter in text[self.position + 1 : close]:
+                value = (value << 7) | (ord(letter) & 0x7F)
+            self.position = close + 1
+            return value
+        if char.isdigit():
+            match = NUMBER_PATTERN.match(text, self.position)
+            self.position = match.end()
+            digits, decimal = match.groups()
+            # Like MACRO-10, digits beyond the radix are accepted as is
+            radix = 10 if decimal else self.radix
+            value = 0
+            for digit in digits:
+                value = value * radix + int(digit)
+            return value
+        match = SYMBOL_PATTERN.match(text, self.position)
+        if match:
+            self.position = match.end()
+            return self.assembler._lookup(match.group(0))
+        raise AssemblyError(f"Bad expression {text.strip()!r}", self.assembler.line)
+
+
+def _combine(left: Optional[int], right: Optional[int], operator: str) -> Optional[int]:
+    """Apply a binary operator, propagating unknown values."""
+    if left is None or right is None:
+        return None
+    if operator == "+":
+        return left + right
+    if operator == "-":
+        return left - right
+    if operator == "*":
+        return left * right
+    if operator == "/":
+        return int(left / right)
+    if operator == "&":
+        return left & right
+    return left | right
+
+
+def assemble(
+    source: str, predefined: Optional[Dict[str, int]] = None
+) -> AssemblyResult:
+    """Assemble ``source`` with optional locked symbol values."""
+    return Assembler(predefined).assemble(source)
@@ -0,0 +1,792 @@
+"""
+BASIC Compiler Module
+
+This module provides the tokenizer and compiler for BASIC-M6502 programs. A
+numbered program is tokenized and parsed once into a flat list of statements
+whose operands are pre-parsed expression trees, plus a line-number index and
+the program's DATA values. Compiled programs and single statements are cached
+by content, so repeated runs of the same source skip parsing entirely.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Reserved words recognized by the tokenizer
+KEYWORDS = frozenset(
+    {
+        "PRINT",
+        "LET",
+        "FOR",
+        "TO",
+        "STEP",
+        "NEXT",
+        "IF",
+        "THEN",
+        "GOTO",
+        "GOSUB",
+        "ON",
+        "RETURN",
+        "END",
+        "STOP",
+        "REM",
+        "DATA",
+        "READ",
+        "RESTORE",
+        "DIM",
+        "INPUT",
+        "AND",
+        "OR",
+        "NOT",
+        "MOD",
+    }
+)
+
+# Keywords that may begin a statement, each parsed by ``_Parser.parse_<name>``
+STATEMENT_KEYWORDS = frozenset(
+    {
+        "PRINT",
+        "LET",
+        "FOR",
+        "NEXT",
+        "IF",
+        "GOTO",
+        "GOSUB",
+        "ON",
+        "RETURN",
+        "END",
+        "STOP",
+        "REM",
+        "DATA",
+        "READ",
+        "RESTORE",
+        "DIM",
+        "INPUT",
+    }
+)
+
+# Built-in functions callable from expressions
+FUNCTIONS = frozenset(
+    {
+        "ABS",
+        "INT",
+        "SGN",
+        "SQR",
+        "RND",
+        "SIN",
+        "COS",
+        "TAN",
+        "ATN",
+        "EXP",
+        "LOG",
+        "LEN",
+        "VAL",
+        "ASC",
+        "STR$",
+        "CHR$",
+        "LEFT$",
+        "RIGHT$",
+        "MID$",
+    }
+)
+
+RELATIONAL_OPERATORS = frozenset({"=", "<>", "<", ">", "<=", ">="})
+
+# Highest usable line number, as in Microsoft BASIC
+MAX_LINE_NUMBER = 63999
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<string>"[^"]*"?)
+      | (?P<number>(?:\d+\.?\d*|\.\d+)(?:E[-+]?\d+)?)
+      | (?P<word>[A-Z][A-Z0-9_]*\$?)
+      | (?P<op><>|<=|>=|[-+*/^=<>(),;:?])
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+LINE_NUMBER_PATTERN = re.compile(r"\s*(\d+)\s?")
+
+# Constant folding for arithmetic on two literal numbers
+FOLDABLE_OPERATORS = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+}
+
+
+class BasicSyntaxError(ValueError):
+    """Raised when BASIC source cannot be compiled."""
+
+    def __init__(self, message: str, line: Optional[int] = None):
+        self.message = message
+        self.line = line
+        super().__init__(f"{message} in line {line}" if line else message)
+
+
+@dataclass(frozen=True)
+class Statement:
+    """A single compiled BASIC statement.
+
+    ``op`` is the statement keyword (implicit assignments compile to ``LET``)
+    and ``args`` holds its pre-parsed operands. Expressions are nested tuples
+    such as ``("binop", "+", ("var", "X"), ("num", 1))``.
+    """
+
+    op: str
+    args: Tuple[Any, ...]
+    line: int = 0
+    text: str = ""
+
+
+@dataclass(frozen=True)
+class CompiledProgram:
+    """A numbered BASIC program compiled to a flat statement list."""
+
+    source_hash: str
+    statements: Tuple[Statement, ...]
+    line_index: Dict[int, int]
+    line_numbers: Tuple[int, ...]
+    data: Tuple[Any, ...]
+    data_index: Dict[int, int]
+    compile_time: float = 0.0
+    timestamp: float = field(default_factory=time.time)
+
+    def get_program_info(self) -> Dict[str, Any]:
+        """Get information about the compiled program."""
+        return {
+            "source_hash": self.source_hash,
+            "lines": len(self.line_numbers),
+            "statements": len(self.statements),
+            "data_values": len(self.data),
+            "compile_time": self.compile_time,
+        }
+
+
+def tokenize(text: str) -> List[Tuple[str, Any, int]]:
+    """Split one line of BASIC into ``(kind, value, position)`` tokens.
+
+    Kinds are ``num``, ``str``, ``kw``, ``id`` and ``op``. Keywords and names
+    are uppercased; string literals keep their case. The remainder of a REM
+    statement becomes a single ``rem`` token and the body of a DATA statement
+    a single ``data`` token.
+    """
+    tokens: List[Tuple[str, Any, int]] = []
+    position = 0
+    length = len(text)
+
+    while position < length:
+        match = TOKEN_PATTERN.match(text, position)
+        if not match:
+            if text[position:].strip():
+                raise BasicSyntaxError(f"Unexpected character {text[position]!r}")
+            break
+
+        kind = match.lastgroup
+        start = match.start(kind)
+        value = match.group(kind)
+        position = match.end()
+
+        if kind == "string":
+            tokens.append(("str", value[1:].rstrip('"'), start))
+        elif kind == "number":
+            number = float(value)
+            if number.is_integer() and "." not in value and "E" not in value.upper():
+                number = int(value)
+            tokens.append(("num", number, start))
+        elif kind == "word":
+            word = value.upper()
+            if word in KEYWORDS:
+                tokens.append(("kw", word, start))
+                if word == "REM":
+                    tokens.append(("rem", text[position:].strip(), position))
+                    break
+                if word == "DATA":
+                    end = _find_statement_end(text, position)
+                    tokens.append(("data", text[position:end], position))
+                    position = end
+            else:
+                tokens.append(("id", word, start))
+        else:
+            tokens.append(("op", value, start))
+
+    return tokens
+
+
+def _find_statement_end(text: str, position: int) -> int:
+    """Index of the next ``:`` outside a string literal, or the line end."""
+    quoted = False
+    for index in range(position, len(text)):
+        char = text[index]
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            return index
+    return len(text)
+
+
+def _parse_data_values(body: str) -> Tuple[Any, ...]:
+    """Split a DATA body into numbers and strings."""
+    values = []
+    for raw in re.findall(r'\s*("[^"]*"?|[^,]*)\s*(?:,|$)', body)[:-1]:
+        raw = raw.strip()
+        if raw.startswith('"'):
+            values.append(raw[1:].rstrip('"'))
+            continue
+        try:
+            number = float(raw)
+        except ValueError:
+            values.append(raw)
+            continue
+        integral = number.is_integer() and "." not in raw and "E" not in raw.upper()
+        values.append(int(number) if integral else number)
+    return tuple(values)
+
+
+class _Parser:
+    """Recursive-descent parser over the tokens of one BASIC line."""
+
+    def __init__(self, text: str, line: int = 0):
+        self.text = text
+        self.line = line
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def error(self, message: str) -> BasicSyntaxError:
+        """Build a syntax error for the current line."""
+        return BasicSyntaxError(message, self.line)
+
+    def peek(self) -> Tuple[str, Any, int]:
+        """The current token, or an ``end`` token."""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", None, len(self.text))
+
+    def advance(self) -> Tuple[str, Any, int]:
+        """Consume and return the current token."""
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def accept(self, kind: str, value: Any = None) -> bool:
+        """Consume the current token if it matches."""
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind: str, value: Any = None) -> Any:
+        """Consume a matching token or raise a syntax error."""
+        token = self.peek()
+        if token[0] != kind or (value is not None and token[1] != value):
+            wanted = value if value is not None else kind
+            found = token[1] if token[0] != "end" else "end of line"
+            raise self.error(f"Expected {wanted}, found {found}")
+        self.position += 1
+        return token[1]
+
+    def at_statement_end(self) -> bool:
+        """Whether the current token ends a statement."""
+        kind, value, _ = self.peek()
+        return kind == "end" or (kind == "op" and value == ":")
+
+    # Statements
+
+    def parse_line(self) -> List[Statement]:
+        """Parse every ``:``-separated statement on the line."""
+        statements = []
+        while True:
+            if self.peek()[0] == "end":
+                break
+            if self.accept("op", ":"):
+                continue
+            statements.extend(self.parse_statement())
+            if not self.at_statement_end():
+                raise self.error(f"Unexpected {self.peek()[1]}")
+        return statements
+
+    def parse_statement(self) -> List[Statement]:
+        """Parse one statement (an IF consumes the rest of the line)."""
+        kind, value, start = self.peek()
+
+        if kind == "op" and value == "?":
+            self.advance()
+            op, args = "PRINT", self.parse_print()
+        elif kind == "id":
+            op, args = "LET", self.parse_let()
+        elif kind == "kw":
+            self.advance()
+            if value not in STATEMENT_KEYWORDS:
+                raise self.error(f"Unexpected {value}")
+            op, args = value, getattr(self, f"parse_{value.lower()}")()
+        else:
+            found = value if kind != "end" else "end of line"
+            raise self.error(f"Expected statement, found {found}")
+
+        text = self.text[start : self.peek()[2]].strip()
+        return [Statement(op, args, self.line, text)]
+
+    def parse_print(self) -> Tuple[Any, ...]:
+        """PRINT [expr | ; | ,]..."""
+        items = []
+        while not self.at_statement_end():
+            if self.accept("op", ";"):
+                items.append(";")
+            elif self.accept("op", ","):
+                items.append(",")
+            else:
+                items.append(self.parse_expression())
+        return (tuple(items),)
+
+    def parse_let(self) -> Tuple[Any, ...]:
+        """[LET] target = expr"""
+        target = self.parse_target()
+        self.expect("op", "=")
+        return (target, self.parse_expression())
+
+    def parse_for(self) -> Tuple[Any, ...]:
+        """FOR name = start TO end [STEP step]"""
+        name = self.expect("id")
+        self.expect("op", "=")
+        start = self.parse_expression()
+        self.expect("kw", "TO")
+        end = self.parse_expression()
+        step = self.parse_expression() if self.accept("kw", "STEP") else None
+        return (name, start, end, step)
+
+    def parse_next(self) -> Tuple[Any, ...]:
+        """NEXT [name [, name]...]"""
+        names = []
+        if not self.at_statement_end():
+            names.append(self.expect("id"))
+            while self.accept("op", ","):
+                names.append(self.expect("id"))
+        return (tuple(names),)
+
+    def parse_if(self) -> Tuple[Any, ...]:
+        """IF expr THEN line | IF expr THEN statements | IF expr GOTO line"""
+        condition = self.parse_expression()
+
+        if self.accept("kw", "GOTO"):
+            target = self.parse_line_number()
+            branch = (Statement("GOTO", (target,), self.line, f"GOTO {target}"),)
+            return (condition, branch)
+
+        self.expect("kw", "THEN")
+        if self.peek()[0] == "num":
+            target = self.parse_line_number()
+            branch = (Statement("GOTO", (target,), self.line, f"GOTO {target}"),)
+            return (condition, branch)
+
+        # Everything after THEN, including later ':' statements, is conditional
+        branch = []
+        while self.peek()[0] != "end":
+            if self.accept("op", ":"):
+                continue
+            branch.extend(self.parse_statement())
+            if not self.at_statement_end():
+                raise self.error(f"Unexpected {self.peek()[1]}")
+        return (condition, tuple(branch))
+
+    def parse_goto(self) -> Tuple[Any, ...]:
+        """GOTO line"""
+        return (self.parse_line_number(),)
+
+    parse_gosub = parse_goto
+
+    def parse_on(self) -> Tuple[Any, ...]:
+        """ON expr GOTO|GOSUB line [, line]..."""
+        selector = self.parse_expression()
+        kind, value, _ = self.advance()
+        if kind != "kw" or value not in ("GOTO", "GOSUB"):
+            raise self.error("Expected GOTO or GOSUB")
+        targets = [self.parse_line_number()]
+        while self.accept("op", ","):
+            targets.append(self.parse_line_number())
+        return (selector, value, tuple(targets))
+
+    def parse_return(self) -> Tuple[Any, ...]:
+        """RETURN"""
+        return ()
+
+    parse_end = parse_return
+    parse_stop = parse_return
+
+    def parse_rem(self) -> Tuple[Any, ...]:
+        """REM comment"""
+        kind, value, _ = self.peek()
+        if kind == "rem":
+            self.advance()
+            return (value,)
+        return ("",)
+
+    def parse_data(self) -> Tuple[Any, ...]:
+        """DATA value [, value]..."""
+        kind, value, _ = self.peek()
+        if kind == "data":
+            self.advance()
+            return (_parse_data_values(value),)
+        return ((),)
+
+    def parse_read(self) -> Tuple[Any, ...]:
+        """READ target [, target]..."""
+        targets = [self.parse_target()]
+        while self.accept("op", ","):
+            targets.append(self.parse_target())
+        return (tuple(targets),)
+
+    def parse_restore(self) -> Tuple[Any, ...]:
+        """RESTORE [line]"""
+        if self.peek()[0] == "num":
+            return (self.parse_line_number(),)
+        return (None,)
+
+    def parse_dim(self) -> Tuple[Any, ...]:
+        """DIM name(size [, size]...) [, ...]"""
+        arrays = []
+        while True:
+            name = self.expect("id")
+            self.expect("op", "(")
+            arrays.append((name, self.parse_arguments()))
+            if not self.accept("op", ","):
+                break
+        return (tuple(arrays),)
+
+    def parse_input(self) -> Tuple[Any, ...]:
+        """INPUT ["prompt";] target [, target]..."""
+        prompt = None
+        if self.peek()[0] == "str":
+            prompt = self.advance()[1]
+            self.expect("op", ";")
+        targets = [self.parse_target()]
+        while self.accept("op", ","):
+            targets.append(self.parse_target())
+        return (prompt, tuple(targets))
+
+    def parse_line_number(self) -> int:
+        """A literal line number operand."""
+        value = self.expect("num")
+        if not isinstance(value, int) or not 0 <= value <= MAX_LINE_NUMBER:
+            raise self.error(f"Invalid line number {value}")
+        return value
+
+    def parse_target(self) -> Tuple[Any, ...]:
+        """An assignable variable or array element."""
+        name = self.expect("id")
+        if self.accept("op", "("):
+            return ("elem", name, self.parse_arguments())
+        return ("var", name)
+
+    def parse_arguments(self) -> Tuple[Any, ...]:
+        """Comma-separated expressions up to a closing parenthesis."""
+        arguments = [self.parse_expression()]
+        while self.accept("op", ","):
+            arguments.append(self.parse_expression())
+        self.expect("op", ")")
+        return tuple(arguments)
+
+    # Expressions, lowest precedence first
+
+    def parse_expression(self) -> Tuple[Any, ...]:
+        """OR"""
+        left = self.parse_and()
+        while self.accept("kw", "OR"):
+            left = ("binop", "OR", left, self.parse_and())
+        return left
+
+    def parse_and(self) -> Tuple[Any, ...]:
+        """AND"""
+        left = self.parse_not()
+        while self.accept("kw", "AND"):
+            left = ("binop", "AND", left, self.parse_not())
+        return left
+
+    def parse_not(self) -> Tuple[Any, ...]:
+        """NOT"""
+        if self.accept("kw", "NOT"):
+            return ("not", self.parse_not())
+        return self.parse_relation()
+
+    def parse_relation(self) -> Tuple[Any, ...]:
+        """=, <>, <, >, <=, >="""
+        left = self.parse_additive()
+        while True:
+            kind, value, _ = self.peek()
+            if kind != "op" or value not in RELATIONAL_OPERATORS:
+                return left
+            self.advance()
+            left = ("binop", value, left, self.parse_additive())
+
+    def parse_additive(self) -> Tuple[Any, ...]:
+        """+, -"""
+        left = self.parse_term()
+        while True:
+            kind, value, _ = self.peek()
+            if kind != "op" or value not in ("+", "-"):
+                return left
+            self.advance()
+            left = _binop(value, left, self.parse_term())
+
+    def parse_term(self) -> Tuple[Any, ...]:
+        """*, /, MOD"""
+        left = self.parse_unary()
+        while True:
+            kind, value, _ = self.peek()
+            if value not in ("*", "/", "MOD") or kind == "str":
+                return left
+            self.advance()
+            left = _binop(value, left, self.parse_unary())
+
+    def parse_unary(self) -> Tuple[Any, ...]:
+        """Unary - and +"""
+        if self.accept("op", "-"):
+            operand = self.parse_unary()
+            if operand[0] == "num":
+                return ("num", -operand[1])
+            return ("neg", operand)
+        if self.accept("op", "+"):
+            return self.parse_unary()
+        return self.parse_power()
+
+    def parse_power(self) -> Tuple[Any, ...]:
+        """^ (left associative, binding tighter than unary minus)"""
+        left = self.parse_atom()
+        while self.accept("op", "^"):
+            if self.accept("op", "-"):
+                right = ("neg", self.parse_atom())
+            else:
+                right = self.parse_atom()
+            left = ("binop", "^", left, right)
+        return left
+
+    def parse_atom(self) -> Tuple[Any, ...]:
+        """Literal, variable, array element, function call or parentheses."""
+        kind, value, _ = self.advance()
+
+        if kind == "num":
+            return ("num", value)
+        if kind == "str":
+            return ("str", value)
+        if kind == "id":
+            if self.accept("op", "("):
+                arguments = self.parse_arguments()
+                if value in FUNCTIONS:
+                    return ("call", value, arguments)
+                return ("elem", value, arguments)
+            return ("var", value)
+        if kind == "op" and value == "(":
+            expression = self.parse_expression()
+            self.expect("op", ")")
+            return expression
+
+        found = value if kind != "end" else "end of line"
+        raise self.error(f"Expected expression, found {found}")
+
+
+def _binop(operator: str, left: Tuple[Any, ...], right: Tuple[Any, ...]):
+    """Build a binary node, folding arithmetic on two literal numbers."""
+    fold = FOLDABLE_OPERATORS.get(operator)
+    if fold and left[0] == "num" and right[0] == "num":
+        return ("num", fold(left[1], right[1]))
+    return ("binop", operator, left, right)
+
+
+def canonical_statement_text(statement: Statement) -> str:
+    """Statement source with its keyword spelled out.
+
+    Implicit assignments gain ``LET`` and the ``?`` shorthand becomes
+    ``PRINT``.
+    """
+    text = statement.text
+    if statement.op == "LET" and not text[:3].upper() == "LET":
+        return f"LET {text}"
+    if statement.op == "PRINT" and text.startswith("?"):
+        return f"PRINT {text[1:].lstrip()}"
+    return text
+
+
+def compile_statement(text: str) -> Tuple[Statement, ...]:
+    """Compile a direct-mode (unnumbered) line into its statements."""
+    return tuple(_Parser(text).parse_line())
+
+
+def compile_program(source: str) -> CompiledProgram:
+    """Compile a numbered BASIC program.
+
+    Lines are ordered by line number; a repeated line number replaces the
+    earlier line, as when typing a program in.
+    """
+    start_time = time.perf_counter()
+    lines: Dict[int, str] = {}
+
+    for raw_line in source.splitlines():
+        if not raw_line.strip():
+            continue
+        match = LINE_NUMBER_PATTERN.match(raw_line)
+        if not match:
+            raise BasicSyntaxError(f"Missing line number: {raw_line.strip()}")
+        number = int(match.group(1))
+        if number > MAX_LINE_NUMBER:
+            raise BasicSyntaxError(f"Invalid line number {number}")
+        lines[number] = raw_line[match.end() :]
+
+    statements: List[Statement] = []
+    line_index: Dict[int, int] = {}
+    data: List[Any] = []
+    data_index: Dict[int, int] = {}
+
+    for number in sorted(lines):
+        line_index[number] = len(statements)
+        data_index[number] = len(data)
+        for statement in _Parser(lines[number], number).parse_line():
+            statements.append(statement)
+            if statement.op == "DATA":
+                data.extend(statement.args[0])
+
+    return CompiledProgram(
+        source_hash=hash_source(source),
+        statements=tuple(statements),
+        line_index=line_index,
+        line_numbers=tuple(sorted(lines)),
+        data=tuple(data),
+        data_index=data_index,
+        compile_time=time.perf_counter() - start_time,
+    )
+
+
+def hash_source(source: str) -> str:
+    """Content hash used to key compiled programs."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class _CachedSyntaxError(NamedTuple):
+    """A compile failure remembered by the statement cache."""
+
+    message: str
+    line: Optional[int]
+
+
+class BasicCompiler:
+    """Compiles BASIC programs and statements, caching results by content.
+
+    The compiler is shared by executor threads: cache lookups, stores and
+    stats are taken under a lock, while parsing itself runs outside it.
+    """
+
+    def __init__(self, cache_size: int = 128):
+        """Initialize the compiler with LRU caches of ``cache_size`` entries."""
+        self.cache_size = max(1, cache_size)
+        self.lock = threading.Lock()
+        self.program_cache: "OrderedDict[str, CompiledProgram]" = OrderedDict()
+        self.statement_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+        self.stats = {
+            "program_hits": 0,
+            "program_misses": 0,
+            "statement_hits": 0,
+            "statement_misses": 0,
+            "compile_time": 0.0,
+        }
+
+    def compile_program(self, source: str) -> CompiledProgram:
+        """Compile a numbered program, reusing the cached result if any."""
+        key = hash_source(source)
+        with self.lock:
+            program = self.program_cache.get(key)
+            if program is not None:
+                self.program_cache.move_to_end(key)
+                self.stats["program_hits"] += 1
+                return program
+
+        program = compile_program(source)
+        with self.lock:
+            self.stats["program_misses"] += 1
+            self.stats["compile_time"] += program.compile_time
+            self._store(self.program_cache, key, program)
+        return program
+
+    def compile_statement(self, text: str) -> Tuple[Statement, ...]:
+        """Compile a direct-mode line, reusing the cached result if any.
+
+        Syntax errors are cached too, as their message and line, so a bad
+        command is not re-parsed; each lookup raises a fresh error.
+        """
+        key = text.strip()
+        with self.lock:
+            cached = self.statement_cache.get(key)
+            if cached is not None:
+                self.statement_cache.move_to_end(key)
+                self.stats["statement_hits"] += 1
+
+        if cached is None:
+            start_time = time.perf_counter()
+            try:
+                cached = compile_statement(key)
+            except BasicSyntaxError as e:
+                cached = _CachedSyntaxError(e.message, e.line)
+            with self.lock:
+                self.stats["statement_misses"] += 1
+                self.stats["compile_time"] += time.perf_counter() - start_time
+                self._store(self.statement_cache, key, cached)
+
+        if isinstance(cached, _CachedSyntaxError):
+            raise BasicSyntaxError(cached.message, cached.line)
+        return cached
+
+    def _store(self, cache: OrderedDict, key: str, value: Any):
+        """Insert into an LRU cache, evicting the oldest entry when full.
+
+        Callers hold ``self.lock``.
+        """
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop every cached program and statement."""
+        with self.lock:
+            self.program_cache.clear()
+            self.statement_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self.lock:
+            stats = dict(self.stats)
+            programs = len(self.program_cache)
+            statements = len(self.statement_cache)
+        program_lookups = stats["program_hits"] + stats["program_misses"]
+        statement_lookups = stats["statement_hits"] + stats["statement_misses"]
+        return {
+            "programs": programs,
+            "statements": statements,
+            "program_hit_rate": (
+                stats["program_hits"] / program_lookups if program_lookups else 0.0
+            ),
+            "statement_hit_rate": (
+                stats["statement_hits"] / statement_lookups
+                if statement_lookups
+                else 0.0
+            ),
+            **stats,
+        }
+
+
+# Global compiler instance shared by the engine and emulators
+_compiler: Optional[BasicCompiler] = None
+_compiler_lock = threading.Lock()
+
+
+def get_compiler() -> BasicCompiler:
+    """Get the shared BASIC compiler instance."""
+    global _compiler
+    with _compiler_lock:
+        if _compiler is None:
+            _compiler = BasicCompiler()
+    return _compiler
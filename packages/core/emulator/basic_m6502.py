@@ -12,6 +12,26 @@ from typing import Any, Dict
 from loguru import logger
 
 from bridge.core.settings import get_settings
+from engine.basic_compiler import (
+    BasicSyntaxError,
+    CompiledProgram,
+    Statement,
+    canonical_statement_text,
+    get_compiler,
+)
+
+# Parsed command type reported for each compiled statement keyword
+COMMAND_TYPES = {
+    "PRINT": "print",
+    "LET": "assignment",
+    "FOR": "loop_start",
+    "NEXT": "loop_end",
+    "IF": "conditional",
+    "GOTO": "goto",
+    "GOSUB": "gosub",
+    "RETURN": "return",
+    "END": "end",
+}
 
 
 class BASICM6502Engine:
@@ -30,6 +50,9 @@ class BASICM6502Engine:
         self.version = self.settings.engine.basic_m6502["version"]
         self.timeout = self.settings.engine.basic_m6502["timeout_seconds"]
 
+        # Tokenizer/compiler with a content-hash cache shared process-wide
+        self.compiler = get_compiler()
+
         logger.info(f"BASIC-M6502 Engine initialized (v{self.version})")
 
     def load_source_file(self, filename: str) -> str:
@@ -45,59 +68,80 @@ class BASICM6502Engine:
         logger.info(f"Loaded source file: {filename} ({len(content)} bytes)")
         return content
 
+    def compile_program(self, source: str) -> CompiledProgram:
+        """Compile a numbered BASIC program, reusing a cached compilation.
+
+        Raises BasicSyntaxError if the program does not parse.
+        """
+        program = self.compiler.compile_program(source)
+        logger.debug(
+            f"Compiled program {program.source_hash[:12]} "
+            f"({len(program.statements)} statements)"
+        )
+        return program
+
     def parse_basic_command(self, command: str) -> Dict[str, Any]:
-        """Parse a BASIC command into executable components."""
-        command = command.strip().upper()
+        """Parse a BASIC command into executable components.
+
+        The command is compiled once and cached; the parsed form is derived
+        from the first compiled statement.
+        """
+        try:
+            statement = self.compiler.compile_statement(command)[0]
+        except (BasicSyntaxError, IndexError):
+            return {"type": "unknown", "command": command.strip().upper(), "args": {}}
 
-        # Basic command parsing
-        if command.startswith("PRINT"):
+        return self._describe_statement(statement)
+
+    def _describe_statement(self, statement: Statement) -> Dict[str, Any]:
+        """Build the parsed command description of a compiled statement."""
+        command = canonical_statement_text(statement).upper()
+        command_type = COMMAND_TYPES.get(statement.op, "unknown")
+
+        if command_type == "print":
             return {
                 "type": "print",
                 "command": command,
                 "args": self._parse_print_args(command),
             }
-        elif command.startswith("LET"):
+        elif command_type == "assignment":
             return {
                 "type": "assignment",
                 "command": command,
                 "args": self._parse_let_args(command),
             }
-        elif command.startswith("FOR"):
+        elif command_type == "loop_start":
             return {
                 "type": "loop_start",
                 "command": command,
                 "args": self._parse_for_args(command),
             }
-        elif command.startswith("NEXT"):
+        elif command_type == "loop_end":
             return {
                 "type": "loop_end",
                 "command": command,
                 "args": self._parse_next_args(command),
             }
-        elif command.startswith("IF"):
+        elif command_type == "conditional":
             return {
                 "type": "conditional",
                 "command": command,
                 "args": self._parse_if_args(command),
             }
-        elif command.startswith("GOTO"):
+        elif command_type == "goto":
             return {
                 "type": "goto",
                 "command": command,
                 "args": self._parse_goto_args(command),
             }
-        elif command.startswith("GOSUB"):
+        elif command_type == "gosub":
             return {
                 "type": "gosub",
                 "command": command,
                 "args": self._parse_gosub_args(command),
             }
-        elif command.startswith("RETURN"):
-            return {"type": "return", "command": command, "args": {}}
-        elif command.startswith("END"):
-            return {"type": "end", "command": command, "args": {}}
         else:
-            return {"type": "unknown", "command": command, "args": {}}
+            return {"type": command_type, "command": command, "args": {}}
 
     def _parse_print_args(self, command: str) -> Dict[str, Any]:
         """Parse PRINT command arguments."""
@@ -151,6 +195,14 @@ class BASICM6502Engine:
         line_number = command[5:].strip()
         return {"line_number": line_number}
 
+    def validate_program(self, source: str) -> Dict[str, Any]:
+        """Check that a numbered program compiles."""
+        try:
+            program = self.compile_program(source)
+            return {"valid": True, **program.get_program_info()}
+        except BasicSyntaxError as e:
+            return {"valid": False, "error": str(e), "line": e.line}
+
     def validate_command(self, command: str) -> bool:
         """Validate a BASIC command for syntax correctness."""
         try:
@@ -182,6 +234,7 @@ class BASICM6502Engine:
                 "DATA",
                 "READ",
             ],
+            "compiler": self.compiler.get_cache_stats(),
         }
 
     def _get_source_size(self) -> int:
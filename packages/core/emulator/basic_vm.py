@@ -0,0 +1,790 @@
+"""
+BASIC Virtual Machine Module
+
+This module provides the interpreter that executes compiled BASIC-M6502
+programs. When a program is loaded, every statement and expression tree is
+turned into a Python closure once, so the run loop only dispatches pre-bound
+handlers. The machine keeps a variable table, arrays, a line-number index into
+the statement list, FOR and GOSUB stacks and a DATA pointer. It runs under an
+optional statement budget and time limit.
+"""
+
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from engine.basic_compiler import CompiledProgram, Statement
+
+# Width of the print zones used by the ',' separator
+PRINT_ZONE_WIDTH = 10
+
+# Size of each dimension of an array used before it is DIMensioned
+DEFAULT_ARRAY_SIZE = 10
+
+# Statements executed between time limit checks
+TIME_CHECK_INTERVAL = 1024
+
+# Distinct direct-mode commands kept compiled
+MAX_DIRECT_COMMANDS = 256
+
+# Longest string a variable, INPUT value or concatenation may hold
+MAX_STRING_LENGTH = 255
+
+# Array elements allowed in one array and across all arrays of a machine,
+# roughly what the emulated 64K would hold
+MAX_ARRAY_ELEMENTS = 16384
+MAX_TOTAL_ARRAY_ELEMENTS = 65536
+
+# Nested GOSUB calls before OUT OF MEMORY
+MAX_GOSUB_DEPTH = 256
+
+# Characters on a print line before it wraps
+MAX_LINE_LENGTH = 255
+
+# Python errors raised by handlers, reported as BASIC errors
+RUNTIME_ERRORS = {
+    ZeroDivisionError: "DIVISION BY ZERO",
+    TypeError: "TYPE MISMATCH",
+    ValueError: "ILLEGAL QUANTITY",
+    OverflowError: "OVERFLOW",
+    IndexError: "BAD SUBSCRIPT",
+}
+
+
+class BasicRuntimeError(RuntimeError):
+    """Raised when a BASIC program fails while running."""
+
+    def __init__(self, message: str, line: Optional[int] = None):
+        self.message = message
+        self.line = line
+        super().__init__(f"{message} in line {line}" if line else message)
+
+
+def format_number(value: Any) -> str:
+    """Format a number the way PRINT shows it, with a sign position."""
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e9:
+            text = str(int(value))
+        else:
+            text = f"{value:.9g}".upper()
+    else:
+        text = str(value)
+    return text if value < 0 else f" {text}"
+
+
+def _val(text: str) -> Any:
+    """Numeric value of the leading number in a string (VAL)."""
+    text = text.strip()
+    for end in range(len(text), 0, -1):
+        try:
+            number = float(text[:end])
+        except ValueError:
+            continue
+        return int(number) if number.is_integer() else number
+    return 0
+
+
+def _relation(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], int]:
+    """Relational operator returning BASIC truth values (-1 / 0).
+
+    A string compared with a number raises TypeError (TYPE MISMATCH).
+    """
+
+    def relation(a: Any, b: Any) -> int:
+        if isinstance(a, str) != isinstance(b, str):
+            raise TypeError("string compared with number")
+        return -1 if compare(a, b) else 0
+
+    return relation
+
+
+def _string_argument(value: Any, low: int) -> int:
+    """Position or length argument of LEFT$, RIGHT$ and MID$.
+
+    Strings raise TypeError and values outside ``low``..255 ValueError.
+    """
+    if isinstance(value, str):
+        raise TypeError("string used as a number")
+    count = int(value)
+    if not low <= count <= 255:
+        raise ValueError(f"{count} out of range")
+    return count
+
+
+def _left(text: str, count: Any) -> str:
+    """The first ``count`` characters of a string (LEFT$)."""
+    return text[: _string_argument(count, 0)]
+
+
+def _right(text: str, count: Any) -> str:
+    """The last ``count`` characters of a string (RIGHT$)."""
+    count = _string_argument(count, 0)
+    return text[len(text) - count :] if count else ""
+
+
+def _mid(text: str, start: Any, count: Any = 255) -> str:
+    """Up to ``count`` characters from 1-based position ``start`` (MID$)."""
+    start = _string_argument(start, 1)
+    return text[start - 1 :][: _string_argument(count, 0)]
+
+
+def _checked_string(text: str) -> str:
+    """Reject strings longer than ``MAX_STRING_LENGTH`` (STRING TOO LONG)."""
+    if len(text) > MAX_STRING_LENGTH:
+        raise BasicRuntimeError("STRING TOO LONG")
+    return text
+
+
+def _add(a: Any, b: Any) -> Any:
+    """``+``, concatenating strings up to ``MAX_STRING_LENGTH``."""
+    result = a + b
+    return _checked_string(result) if isinstance(result, str) else result
+
+
+def _multiply(a: Any, b: Any) -> Any:
+    """``*``; Python string repetition raises TypeError (TYPE MISMATCH)."""
+    if isinstance(a, str) or isinstance(b, str):
+        raise TypeError("string used as a number")
+    return a * b
+
+
+def _power(base: Any, exponent: Any) -> float:
+    """Floating point ``^``; results beyond a float raise OverflowError."""
+    result = float(base) ** exponent
+    if isinstance(result, complex):
+        # Fractional power of a negative number
+        raise ValueError("negative base")
+    return result
+
+
+BINARY_OPERATORS = {
+    "+": _add,
+    "-": lambda a, b: a - b,
+    "*": _multiply,
+    "/": lambda a, b: a / b,
+    "^": _power,
+    "MOD": lambda a, b: int(a) % int(b),
+    "AND": lambda a, b: int(a) & int(b),
+    "OR": lambda a, b: int(a) | int(b),
+    "=": _relation(lambda a, b: a == b),
+    "<>": _relation(lambda a, b: a != b),
+    "<": _relation(lambda a, b: a < b),
+    ">": _relation(lambda a, b: a > b),
+    "<=": _relation(lambda a, b: a <= b),
+    ">=": _relation(lambda a, b: a >= b),
+}
+
+
+class BasicVM:
+    """Interpreter for compiled BASIC programs."""
+
+    def __init__(self, seed: int = 0, max_output_lines: int = 10000):
+        """Initialize an empty machine.
+
+        ``seed`` makes RND reproducible; ``max_output_lines`` bounds the
+        output kept for a single run.
+        """
+        self.program: Optional[CompiledProgram] = None
+        self.program_code: List[Callable[[], Any]] = []
+        self.code: List[Callable[[], Any]] = []
+        self.pc = 0
+        self.halted = False
+
+        # Machine state
+        self.variables: Dict[str, Any] = {}
+        self.arrays: Dict[str, Tuple[Tuple[int, ...], List[Any]]] = {}
+        self.for_stack: List[Tuple[Any, ...]] = []
+        self.gosub_stack: List[Tuple[List[Callable[[], Any]], int]] = []
+        self.data_pointer = 0
+        self.input_queue = deque()
+        self.random = random.Random(seed)
+
+        # Output of the current run
+        self.output = deque(maxlen=max_output_lines)
+        self.line_buffer = ""
+
+        # Compiled direct-mode statements
+        self.direct_code: Dict[Tuple[Statement, ...], List[Callable[[], Any]]] = {}
+
+        self.functions = self._build_functions()
+        self.stats = {
+            "runs": 0,
+            "statements_executed": 0,
+            "total_run_time": 0.0,
+            "errors": 0,
+        }
+
+    # Loading and state
+
+    def load(self, program: CompiledProgram):
+        """Load a compiled program and clear variables, like RUN."""
+        self.program = program
+        self.program_code = [self._compile_statement(s) for s in program.statements]
+        self.direct_code.clear()
+        self.clear()
+        self.code = self.program_code
+        self.pc = 0
+
+    def clear(self):
+        """Clear variables, arrays, stacks and the DATA pointer."""
+        self.variables.clear()
+        self.arrays.clear()
+        self.for_stack.clear()
+        self.gosub_stack.clear()
+        self.data_pointer = 0
+        self.halted = False
+
+    def save_state(self) -> Dict[str, Any]:
+        """Copy the program and variables for a later ``load_state``."""
+        return {
+            "program": self.program,
+            "variables": dict(self.variables),
+            "arrays": {
+                name: (dims, list(values))
+                for name, (dims, values) in self.arrays.items()
+            },
+            "data_pointer": self.data_pointer,
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        """Restore a state captured by ``save_state``."""
+        if state["program"] is not self.program:
+            if state["program"] is None:
+                self.program = None
+                self.program_code = []
+            else:
+                self.load(state["program"])
+        self.clear()
+        self.code = self.program_code
+        self.pc = len(self.code)
+        self.variables.update(state["variables"])
+        for name, (dims, values) in state["arrays"].items():
+            self.arrays[name] = (dims, list(values))
+        self.data_pointer = state["data_pointer"]
+
+    def push_input(self, *values: str):
+        """Queue values for INPUT statements."""
+        self.input_queue.extend(values)
+
+    # Execution
+
+    def run(
+        self,
+        max_statements: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        restart: bool = True,
+    ) -> Dict[str, Any]:
+        """Run the loaded program until it ends, fails or exceeds its budget.
+
+        With ``restart`` the program starts from its first line with
+        variables cleared; otherwise execution continues where it stopped.
+        """
+        if self.program is None:
+            return {"error": "No program loaded", "status": "error"}
+
+        if restart:
+            self.clear()
+            self.code = self.program_code
+            self.pc = 0
+        return self._execute(max_statements, time_limit)
+
+    def execute(
+        self,
+        statements: Tuple[Statement, ...],
+        max_statements: Optional[int] = None,
+        time_limit: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Execute direct-mode statements against the current state.
+
+        A GOTO or GOSUB into the loaded program continues running it.
+        """
+        code = self.direct_code.get(statements)
+        if code is None:
+            if len(self.direct_code) >= MAX_DIRECT_COMMANDS:
+                self.direct_code.clear()
+            code = [self._compile_statement(s) for s in statements]
+            self.direct_code[statements] = code
+
+        self.halted = False
+        self.code = code
+        self.pc = 0
+        return self._execute(max_statements, time_limit)
+
+    def _execute(
+        self, max_statements: Optional[int], time_limit: Optional[float]
+    ) -> Dict[str, Any]:
+        """Dispatch handlers from ``self.code`` starting at ``self.pc``."""
+        start_time = time.perf_counter()
+        deadline = start_time + time_limit if time_limit else None
+        limit = max_statements if max_statements is not None else float("inf")
+
+        self.output.clear()
+        self.line_buffer = ""
+        results = {
+            "output": [],
+            "statements_executed": 0,
+            "status": "completed",
+            "error": None,
+            "line": None,
+        }
+
+        code = self.code
+        executed = 0
+        try:
+            while self.pc < len(code):
+                if executed >= limit:
+                    results["status"] = "budget_exhausted"
+                    break
+                if deadline and not executed % TIME_CHECK_INTERVAL:
+                    if time.perf_counter() > deadline:
+                        results["status"] = "timeout"
+                        break
+
+                handler = code[self.pc]
+                self.pc += 1
+                executed += 1
+                if handler():
+                    # Control transferred, possibly into another code list
+                    code = self.code
+                    if self.halted:
+                        results["status"] = "ended"
+                        break
+
+        except BasicRuntimeError as e:
+            results["status"] = "error"
+            results["error"] = e.message
+        except tuple(RUNTIME_ERRORS) as e:
+            results["status"] = "error"
+            results["error"] = next(
+                message
+                for error_type, message in RUNTIME_ERRORS.items()
+                if isinstance(e, error_type)
+            )
+
+        if results["error"]:
+            results["line"] = self.current_line()
+            self.stats["errors"] += 1
+            self.pc = len(self.code)
+
+        if self.line_buffer:
+            self._emit_line()
+        results["output"] = list(self.output)
+        results["statements_executed"] = executed
+        results["execution_time"] = time.perf_counter() - start_time
+
+        self.stats["runs"] += 1
+        self.stats["statements_executed"] += executed
+        self.stats["total_run_time"] += results["execution_time"]
+        return results
+
+    def current_line(self) -> Optional[int]:
+        """Line number of the statement executed last."""
+        if self.code is self.program_code and 0 < self.pc <= len(self.code):
+            return self.program.statements[self.pc - 1].line
+        return None
+
+    def _emit_line(self):
+        """Move the current print line to the output."""
+        self.output.append(self.line_buffer.rstrip())
+        self.line_buffer = ""
+
+    def _set_line(self, text: str):
+        """Make ``text`` the print line, wrapping it at ``MAX_LINE_LENGTH``."""
+        while len(text) > MAX_LINE_LENGTH:
+            self.output.append(text[:MAX_LINE_LENGTH])
+            text = text[MAX_LINE_LENGTH:]
+        self.line_buffer = text
+
+    # Control transfer helpers
+
+    def _jump(self, line: int) -> bool:
+        """Continue at the first statement of ``line``."""
+        if self.program is None or line not in self.program.line_index:
+            raise BasicRuntimeError("UNDEF'D STATEMENT", self.current_line())
+        self.code = self.program_code
+        self.pc = self.program.line_index[line]
+        return True
+
+    def _gosub(self, line: int) -> bool:
+        """Push the return point and jump."""
+        if len(self.gosub_stack) >= MAX_GOSUB_DEPTH:
+            raise BasicRuntimeError("OUT OF MEMORY", self.current_line())
+        self.gosub_stack.append((self.code, self.pc))
+        return self._jump(line)
+
+    # Statement compilation
+
+    def _compile_statement(self, statement: Statement) -> Callable[[], Any]:
+        """Bind a statement to a handler; handlers return True on a jump."""
+        compile_handler = getattr(self, f"_compile_{statement.op.lower()}")
+        return compile_handler(*statement.args)
+
+    def _compile_print(self, items: Tuple[Any, ...]) -> Callable[[], Any]:
+        """PRINT"""
+        parts = []
+        for item in items:
+            if item == ";":
+                continue
+            if item == ",":
+                parts.append(None)
+            else:
+                parts.append(self._compile_expression(item))
+        newline = not items or items[-1] not in (";", ",")
+
+        def handler():
+            text = self.line_buffer
+            for part in parts:
+                if part is None:
+                    text += " " * (PRINT_ZONE_WIDTH - len(text) % PRINT_ZONE_WIDTH)
+                    continue
+                value = part()
+                text += value if isinstance(value, str) else format_number(value) + " "
+            self._set_line(text)
+            if newline:
+                self._emit_line()
+
+        return handler
+
+    def _compile_let(self, target: Tuple[Any, ...], expression) -> Callable[[], Any]:
+        """LET"""
+        assign = self._compile_assignment(target)
+        evaluate = self._compile_expression(expression)
+        return lambda: assign(evaluate())
+
+    def _compile_for(self, name: str, start, end, step) -> Callable[[], Any]:
+        """FOR"""
+        evaluate_start = self._compile_expression(start)
+        evaluate_end = self._compile_expression(end)
+        evaluate_step = self._compile_expression(step) if step else (lambda: 1)
+        variables = self.variables
+        for_stack = self.for_stack
+
+        def handler():
+            variables[name] = evaluate_start()
+            # Re-entering a loop discards it and any loops nested inside it
+            for index in range(len(for_stack) - 1, -1, -1):
+                if for_stack[index][0] == name:
+                    del for_stack[index:]
+                    break
+            for_stack.append(
+                (name, evaluate_end(), evaluate_step(), self.code, self.pc)
+            )
+
+        return handler
+
+    def _compile_next(self, names: Tuple[str, ...]) -> Callable[[], Any]:
+        """NEXT"""
+        variables = self.variables
+        for_stack = self.for_stack
+        names = names or (None,)
+
+        def handler():
+            for name in names:
+                while for_stack and name is not None and for_stack[-1][0] != name:
+                    for_stack.pop()
+                if not for_stack:
+                    raise BasicRuntimeError("NEXT WITHOUT FOR", self.current_line())
+
+                loop_name, end, step, code, pc = for_stack[-1]
+                value = variables[loop_name] + step
+                variables[loop_name] = value
+                if (value <= end) if step >= 0 else (value >= end):
+                    self.code = code
+                    self.pc = pc
+                    return True
+                for_stack.pop()
+            return False
+
+        return handler
+
+    def _compile_if(self, condition, branch: Tuple[Statement, ...]):
+        """IF ... THEN"""
+        evaluate = self._compile_expression(condition)
+        handlers = [self._compile_statement(s) for s in branch]
+
+        def handler():
+            if evaluate():
+                for branch_handler in handlers:
+                    if branch_handler():
+                        return True
+            return False
+
+        return handler
+
+    def _compile_goto(self, line: int) -> Callable[[], Any]:
+        """GOTO"""
+        return lambda: self._jump(line)
+
+    def _compile_gosub(self, line: int) -> Callable[[], Any]:
+        """GOSUB"""
+        return lambda: self._gosub(line)
+
+    def _compile_on(self, selector, kind: str, lines: Tuple[int, ...]):
+        """ON ... GOTO / ON ... GOSUB"""
+        evaluate = self._compile_expression(selector)
+        transfer = self._gosub if kind == "GOSUB" else self._jump
+
+        def handler():
+            index = int(evaluate())
+            if index < 0 or index > 255:
+                raise BasicRuntimeError("ILLEGAL QUANTITY", self.current_line())
+            if 1 <= index <= len(lines):
+                return transfer(lines[index - 1])
+            return False
+
+        return handler
+
+    def _compile_return(self) -> Callable[[], Any]:
+        """RETURN"""
+
+        def handler():
+            if not self.gosub_stack:
+                raise BasicRuntimeError("RETURN WITHOUT GOSUB", self.current_line())
+            self.code, self.pc = self.gosub_stack.pop()
+            return True
+
+        return handler
+
+    def _compile_end(self) -> Callable[[], Any]:
+        """END"""
+
+        def handler():
+            self.halted = True
+            self.pc = len(self.code)
+            return True
+
+        return handler
+
+    _compile_stop = _compile_end
+
+    def _compile_rem(self, comment: str) -> Callable[[], Any]:
+        """REM"""
+        return lambda: None
+
+    def _compile_data(self, values: Tuple[Any, ...]) -> Callable[[], Any]:
+        """DATA (values are collected at compile time)"""
+        return lambda: None
+
+    def _compile_read(self, targets: Tuple[Any, ...]) -> Callable[[], Any]:
+        """READ"""
+        assignments = [self._compile_assignment(target) for target in targets]
+
+        def handler():
+            data = self.program.data if self.program else ()
+            for assign in assignments:
+                if self.data_pointer >= len(data):
+                    raise BasicRuntimeError("OUT OF DATA", self.current_line())
+                assign(data[self.data_pointer])
+                self.data_pointer += 1
+
+        return handler
+
+    def _compile_restore(self, line: Optional[int]) -> Callable[[], Any]:
+        """RESTORE"""
+
+        def handler():
+            if line is None:
+                self.data_pointer = 0
+            elif self.program and line in self.program.data_index:
+                self.data_pointer = self.program.data_index[line]
+            else:
+                raise BasicRuntimeError("UNDEF'D STATEMENT", self.current_line())
+
+        return handler
+
+    def _compile_dim(self, arrays: Tuple[Any, ...]) -> Callable[[], Any]:
+        """DIM"""
+        declarations = [
+            (name, [self._compile_expression(size) for size in sizes])
+            for name, sizes in arrays
+        ]
+
+        def handler():
+            for name, sizes in declarations:
+                if name in self.arrays:
+                    raise BasicRuntimeError("REDIM'D ARRAY", self.current_line())
+                self._create_array(name, tuple(int(size()) + 1 for size in sizes))
+
+        return handler
+
+    def _compile_input(self, prompt: Optional[str], targets: Tuple[Any, ...]):
+        """INPUT (values come from the input queue)"""
+        assignments = [
+            (self._compile_assignment(target), target[1].endswith("$"))
+            for target in targets
+        ]
+
+        def handler():
+            self._set_line(f"{self.line_buffer}{prompt or ''}? ")
+            for assign, is_string in assignments:
+                if not self.input_queue:
+                    raise BasicRuntimeError("OUT OF INPUT", self.current_line())
+                value = _checked_string(str(self.input_queue.popleft()))
+                self._set_line(self.line_buffer + value)
+                assign(value if is_string else _val(value))
+            self._emit_line()
+
+        return handler
+
+    # Variables and arrays
+
+    def _compile_assignment(self, target: Tuple[Any, ...]) -> Callable[[Any], None]:
+        """Build a setter for a variable or array element."""
+        name = target[1]
+        is_string = name.endswith("$")
+
+        def check(value):
+            if isinstance(value, str) != is_string:
+                raise BasicRuntimeError("TYPE MISMATCH", self.current_line())
+            if is_string:
+                _checked_string(value)
+
+        if target[0] == "var":
+            variables = self.variables
+
+            def assign(value):
+                check(value)
+                variables[name] = value
+
+            return assign
+
+        indices = [self._compile_expression(index) for index in target[2]]
+
+        def assign_element(value):
+            check(value)
+            dims, values = self._get_array(name, len(indices))
+            values[self._flat_index(dims, indices)] = value
+
+        return assign_element
+
+    def _create_array(self, name: str, dims: Tuple[int, ...]):
+        """Allocate an array with ``dims`` elements per dimension.
+
+        Arrays beyond ``MAX_ARRAY_ELEMENTS``, or that would take the machine
+        past ``MAX_TOTAL_ARRAY_ELEMENTS``, raise OUT OF MEMORY unallocated.
+        """
+        size = 1
+        for dim in dims:
+            size *= dim
+        allocated = sum(len(values) for _, values in self.arrays.values())
+        if size > MAX_ARRAY_ELEMENTS or allocated + size > MAX_TOTAL_ARRAY_ELEMENTS:
+            raise BasicRuntimeError("OUT OF MEMORY", self.current_line())
+        default = "" if name.endswith("$") else 0
+        self.arrays[name] = (dims, [default] * size)
+
+    def _get_array(self, name: str, rank: int):
+        """Get an array, auto-dimensioning it on first use."""
+        array = self.arrays.get(name)
+        if array is None:
+            self._create_array(name, (DEFAULT_ARRAY_SIZE + 1,) * rank)
+            array = self.arrays[name]
+        if len(array[0]) != rank:
+            raise BasicRuntimeError("BAD SUBSCRIPT", self.current_line())
+        return array
+
+    def _flat_index(self, dims: Tuple[int, ...], indices) -> int:
+        """Row-major offset of an element, with bounds checking."""
+        offset = 0
+        for dim, index in zip(dims, indices):
+            value = int(index())
+            if not 0 <= value < dim:
+                raise BasicRuntimeError("BAD SUBSCRIPT", self.current_line())
+            offset = offset * dim + value
+        return offset
+
+    def get_variables(self) -> Dict[str, Any]:
+        """Get a copy of the scalar variable table."""
+        return dict(self.variables)
+
+    # Expressions
+
+    def _compile_expression(self, node: Tuple[Any, ...]) -> Callable[[], Any]:
+        """Turn an expression tree into a closure."""
+        kind = node[0]
+
+        if kind in ("num", "str"):
+            value = node[1]
+            return lambda: value
+
+        if kind == "var":
+            name = node[1]
+            default = "" if name.endswith("$") else 0
+            variables = self.variables
+            return lambda: variables.get(name, default)
+
+        if kind == "binop":
+            operator = BINARY_OPERATORS[node[1]]
+            left = self._compile_expression(node[2])
+            right = self._compile_expression(node[3])
+            return lambda: operator(left(), right())
+
+        if kind == "neg":
+            operand = self._compile_expression(node[1])
+            return lambda: -operand()
+
+        if kind == "not":
+            operand = self._compile_expression(node[1])
+            return lambda: ~int(operand())
+
+        if kind == "call":
+            function = self.functions[node[1]]
+            arguments = [self._compile_expression(a) for a in node[2]]
+            if len(arguments) == 1:
+                argument = arguments[0]
+                return lambda: function(argument())
+            return lambda: function(*[argument() for argument in arguments])
+
+        if kind == "elem":
+            name = node[1]
+            indices = [self._compile_expression(index) for index in node[2]]
+
+            def element():
+                dims, values = self._get_array(name, len(indices))
+                return values[self._flat_index(dims, indices)]
+
+            return element
+
+        raise BasicRuntimeError(f"Unknown expression {kind}")
+
+    def _build_functions(self) -> Dict[str, Callable[..., Any]]:
+        """Built-in functions available to expressions."""
+
+        def rnd(argument):
+            if argument < 0:
+                self.random.seed(argument)
+            return self.random.random()
+
+        return {
+            "ABS": abs,
+            "INT": math.floor,
+            "SGN": lambda x: (x > 0) - (x < 0),
+            "SQR": math.sqrt,
+            "RND": rnd,
+            "SIN": math.sin,
+            "COS": math.cos,
+            "TAN": math.tan,
+            "ATN": math.atan,
+            "EXP": math.exp,
+            "LOG": math.log,
+            "LEN": len,
+            "VAL": _val,
+            "ASC": lambda s: ord(s[0]),
+            "STR$": format_number,
+            "CHR$": lambda x: chr(int(x)),
+            "LEFT$": _left,
+            "RIGHT$": _right,
+            "MID$": _mid,
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get interpreter statistics."""
+        runs = self.stats["runs"]
+        return {
+            **self.stats,
+            "average_run_time": self.stats["total_run_time"] / runs if runs else 0.0,
+            "variables": len(self.variables),
+            "arrays": len(self.arrays),
+            "program": self.program.get_program_info() if self.program else None,
+        }
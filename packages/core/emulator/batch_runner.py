@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+AI Vintage OS - Batch Program Runner
+
+This script runs many BASIC programs headless across a pool of worker
+processes and streams one JSON line per program as results come in. Each
+worker owns one emulator and restores it from a clean snapshot before every
+program, so programs never see each other's variables or memory. Programs run
+on the BASIC interpreter by default, or on ROM BASIC with ``--engine rom``,
+and each one stops at its instruction budget or time limit.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.basic_compiler import BasicSyntaxError, get_compiler  # noqa: E402
+from engine.emulator import worker  # noqa: E402
+from engine.emulator.m6502_emulator import M6502Emulator  # noqa: E402
+
+ENGINES = ("vm", "rom")
+
+# Statements for the interpreter, CPU instructions for ROM BASIC
+DEFAULT_MAX_INSTRUCTIONS = {"vm": 1000000, "rom": 50000000}
+DEFAULT_TIME_LIMIT = 10.0
+
+# ROM BASIC error report, e.g. "?SN ERROR IN  110"
+ROM_ERROR_REPORT = re.compile(r"(\?[A-Z/0]{2} ERROR)(?: IN +(\d+))?")
+
+# Statuses that count as a passing program
+SUCCESS_STATUSES = frozenset({"completed", "ended"})
+
+# Engine of the worker's programs, set by _init_worker inside the child process
+_worker_engine = "vm"
+
+
+def _init_worker(engine: str, log_level: Optional[str] = "WARNING"):
+    """Set up the worker's unthrottled emulator for programs on ``engine``."""
+    global _worker_engine
+
+    worker.init_worker_emulator(
+        log_level=log_level, throttled=False, boot_basic=engine == "rom"
+    )
+    _worker_engine = engine
+
+
+def run_program_file(
+    path: str, max_instructions: int, time_limit: Optional[float]
+) -> Dict[str, Any]:
+    """Run one program on the worker's emulator and describe the outcome."""
+    result = {
+        "path": path,
+        "status": "error",
+        "output": [],
+        "error": None,
+        "line": None,
+        "instructions": 0,
+        "execution_time": 0.0,
+    }
+    start_time = time.perf_counter()
+
+    try:
+        source = Path(path).read_text()
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+
+    emulator = worker.emulator
+    emulator.restore(worker.baseline)
+    if _worker_engine == "rom":
+        emulator.keyboard.reset()
+        _run_on_rom(emulator, source, max_instructions, time_limit, result)
+    else:
+        _run_on_vm(emulator, source, max_instructions, time_limit, result)
+
+    result["execution_time"] = time.perf_counter() - start_time
+    return result
+
+
+def _run_on_vm(
+    emulator: M6502Emulator,
+    source: str,
+    max_instructions: int,
+    time_limit: Optional[float],
+    result: Dict[str, Any],
+):
+    """Compile and run a program on the BASIC interpreter."""
+    try:
+        program = get_compiler().compile_program(source)
+    except BasicSyntaxError as e:
+        result.update(status="syntax_error", error=e.message, line=e.line)
+        return
+
+    run = emulator.run_basic_program(
+        program, max_statements=max_instructions, time_limit=time_limit
+    )
+    result.update(
+        status=run["status"],
+        output=run.get("output", []),
+        error=run.get("error"),
+        line=run.get("line"),
+        instructions=run.get("statements_executed", 0),
+    )
+
+
+def _run_on_rom(
+    emulator: M6502Emulator,
+    source: str,
+    max_instructions: int,
+    time_limit: Optional[float],
+    result: Dict[str, Any],
+):
+    """Type a program into ROM BASIC and RUN it on the emulated CPU."""
+    if not emulator.load_basic_program(source):
+        result.update(status="syntax_error", error="ROM BASIC rejected the program")
+        return
+
+    run = emulator.send_basic_input("RUN\r", max_instructions, time_limit)
+    lines = run["output"].replace("\r\n", "\n").split("\n")
+    # Drop the echoed RUN and, once BASIC is back at its prompt, the OK line
+    if lines and lines[0] == "RUN":
+        lines = lines[1:]
+    while lines and lines[-1] == "":
+        lines.pop()
+    finished = bool(run["waiting_for_input"] and lines and lines[-1] == "OK")
+    if finished:
+        lines.pop()
+        while lines and lines[-1] == "":
+            lines.pop()
+
+    errors = ROM_ERROR_REPORT.findall(run["output"])
+    line = None
+    if run.get("error"):
+        status, error = "error", run["error"]
+    elif errors:
+        status, error = "error", errors[-1][0]
+        line = int(errors[-1][1]) if errors[-1][1] else None
+    elif run["timed_out"]:
+        status, error = "timeout", None
+    elif not run["waiting_for_input"]:
+        status, error = "budget_exhausted", None
+    elif not finished:
+        status, error = "waiting_for_input", None
+    else:
+        status, error = "completed", None
+
+    result.update(
+        status=status,
+        output=lines,
+        error=error,
+        line=line,
+        instructions=run["steps_executed"],
+    )
+
+
+def collect_programs(patterns: Iterable[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of ``.bas`` files.
+
+    Directories are searched recursively; a path given twice is run once.
+    """
+    found = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            found.update(str(match) for match in path.rglob("*.bas"))
+        elif path.is_file():
+            found.add(str(path))
+        else:
+            found.update(glob.glob(pattern, recursive=True))
+    return sorted(found)
+
+
+class BatchRunner:
+    """Runs BASIC programs on a pool of isolated worker emulators."""
+
+    def __init__(
+        self,
+        engine: str = "vm",
+        workers: Optional[int] = None,
+        max_instructions: Optional[int] = None,
+        time_limit: Optional[float] = DEFAULT_TIME_LIMIT,
+        log_level: str = "WARNING",
+    ):
+        """Initialize the runner; zero workers runs programs in this process.
+
+        The emulators log to stderr at ``log_level``, keeping stdout free for
+        results.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+
+        self.engine = engine
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_instructions = max_instructions or DEFAULT_MAX_INSTRUCTIONS[engine]
+        self.time_limit = time_limit
+        self.log_level = log_level
+        self.stats = {"programs": 0, "passed": 0, "failed": 0, "statuses": {}}
+
+    def run(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Run ``paths`` and yield each program's result as it finishes."""
+        start_time = time.perf_counter()
+        if self.workers <= 0 or len(paths) <= 1:
+            results = self._run_inline(paths)
+        else:
+            results = self._run_pool(paths)
+
+        for result in results:
+            self._record(result)
+            yield result
+
+        self.stats["wall_time"] = time.perf_counter() - start_time
+
+    def _run_inline(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Run programs one after another in this process."""
+        if worker.emulator is None or _worker_engine != self.engine:
+            _init_worker(self.engine, log_level=self.log_level)
+        for path in paths:
+            yield run_program_file(path, self.max_instructions, self.time_limit)
+
+    def _run_pool(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Run programs across worker processes, yielding in completion order."""
+        workers = min(self.workers, len(paths))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.engine, self.log_level),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    run_program_file, path, self.max_instructions, self.time_limit
+                ): path
+                for path in paths
+            }
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield {
+                        "path": futures[future],
+                        "status": "error",
+                        "output": [],
+                        "error": f"Worker failed: {e}",
+                        "line": None,
+                        "instructions": 0,
+                        "execution_time": 0.0,
+                    }
+
+    def _record(self, result: Dict[str, Any]):
+        """Add a result to the run statistics."""
+        stats = self.stats
+        stats["programs"] += 1
+        if result["status"] in SUCCESS_STATUSES:
+            stats["passed"] += 1
+        else:
+            stats["failed"] += 1
+        stats["statuses"][result["status"]] = (
+            stats["statuses"].get(result["status"], 0) + 1
+        )
+
+
+def main():
+    """Main entry point for the batch runner."""
+    parser = argparse.ArgumentParser(
+        description="AI Vintage OS - Batch BASIC Program Runner",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python batch_runner.py test_programs/
+  python batch_runner.py "corpus/**/*.bas" --workers 8 --output results.jsonl
+  python batch_runner.py test_programs/ --engine rom --max-instructions 2000000
+        """,
+    )
+
+    parser.add_argument(
+        "paths", nargs="+", help="BASIC files, directories or glob patterns"
+    )
+
+    parser.add_argument(
+        "--engine",
+        "-e",
+        choices=ENGINES,
+        default="vm",
+        help="Run on the BASIC interpreter or on ROM BASIC (default: vm)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        help="Worker processes (default: CPU count, 0 runs in this process)",
+    )
+
+    parser.add_argument(
+        "--max-instructions",
+        type=int,
+        help=(
+            "Per-program budget: statements for vm, CPU instructions for rom "
+            "(default: 1000000 / 50000000)"
+        ),
+    )
+
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=DEFAULT_TIME_LIMIT,
+        help=f"Per-program time limit in seconds (default: {DEFAULT_TIME_LIMIT})",
+    )
+
+    parser.add_argument(
+        "--output", "-o", type=str, help="Write JSON lines to a file instead of stdout"
+    )
+
+    args = parser.parse_args()
+
+    log_level = "WARNING"
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+
+    paths = collect_programs(args.paths)
+    if not paths:
+        logger.error("No BASIC programs found")
+        sys.exit(1)
+
+    runner = BatchRunner(
+        engine=args.engine,
+        workers=args.workers,
+        max_instructions=args.max_instructions,
+        time_limit=args.time_limit,
+        log_level=log_level,
+    )
+
+    stream = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in runner.run(paths):
+            stream.write(json.dumps(result) + "\n")
+            stream.flush()
+    finally:
+        if args.output:
+            stream.close()
+
+    stats = runner.stats
+    print(
+        f"{stats['programs']} programs: {stats['passed']} passed, "
+        f"{stats['failed']} failed in {stats['wall_time']:.2f}s",
+        file=sys.stderr,
+    )
+    sys.exit(1 if stats["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
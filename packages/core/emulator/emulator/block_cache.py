@@ -0,0 +1,399 @@
+"""
+Basic Block Cache Module
+
+This module provides an optional execution engine layered on the Py65 MPU.
+Straight-line runs of 6502 instructions are decoded once into basic blocks and
+compiled into a single Python function per block. Common loads, stores,
+register transfers, flag operations, compares, jumps and branches are inlined
+with their operands resolved at compile time; everything else calls the Py65
+instruction handler directly, skipping the opcode fetch and table lookups done
+by ``MPU.step()``. Blocks are cached by start address and invalidated when
+memory on one of their code pages is written, as reported by the memory bus.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from engine.emulator.memory_bus import MemoryBus
+
+PAGE_SHIFT = 8
+PAGE_COUNT = 0x100
+ADDRESS_MASK = 0xFFFF
+
+# Longest run of instructions compiled into a single block
+MAX_BLOCK_INSTRUCTIONS = 32
+
+# Instruction sizes by Py65 addressing mode
+MODE_LENGTHS = {
+    "imp": 1,
+    "acc": 1,
+    "imm": 2,
+    "zpg": 2,
+    "zpx": 2,
+    "zpy": 2,
+    "inx": 2,
+    "iny": 2,
+    "rel": 2,
+    "abs": 3,
+    "abx": 3,
+    "aby": 3,
+    "ind": 3,
+}
+
+# Instructions that transfer control and therefore end a basic block
+BLOCK_TERMINATORS = frozenset({"JMP", "JSR", "RTS", "RTI", "BRK"})
+
+# Instructions that may write memory (and so may overwrite cached code)
+MEMORY_WRITERS = frozenset(
+    {"STA", "STX", "STY", "INC", "DEC", "ASL", "LSR", "ROL", "ROR", "PHA", "PHP"}
+)
+
+# Addressing modes whose Py65 helpers read ``mpu.addcycles``
+PAGE_CROSSING_MODES = frozenset({"abx", "aby", "iny"})
+
+# Branch opcode -> (status flag, taken when the flag is set)
+BRANCHES = {
+    0x10: (0x80, False),  # BPL
+    0x30: (0x80, True),  # BMI
+    0x50: (0x40, False),  # BVC
+    0x70: (0x40, True),  # BVS
+    0x90: (0x01, False),  # BCC
+    0xB0: (0x01, True),  # BCS
+    0xD0: (0x02, False),  # BNE
+    0xF0: (0x02, True),  # BEQ
+}
+
+# Register targets of inlined loads, stores, logic ops and compares
+LOAD_REGISTERS = {"LDA": "a", "LDX": "x", "LDY": "y"}
+STORE_REGISTERS = {"STA": "a", "STX": "x", "STY": "y"}
+COMPARE_REGISTERS = {"CMP": "a", "CPX": "x", "CPY": "y"}
+LOGIC_OPERATORS = {"AND": "&", "ORA": "|", "EOR": "^"}
+
+# Implied instructions computing ``value`` and storing it in a register
+REGISTER_UPDATES = {
+    "INX": ("x", "(mpu.x + 1) & 0xFF"),
+    "INY": ("y", "(mpu.y + 1) & 0xFF"),
+    "DEX": ("x", "(mpu.x - 1) & 0xFF"),
+    "DEY": ("y", "(mpu.y - 1) & 0xFF"),
+    "TAX": ("x", "mpu.a"),
+    "TAY": ("y", "mpu.a"),
+    "TXA": ("a", "mpu.x"),
+    "TYA": ("a", "mpu.y"),
+    "TSX": ("x", "mpu.sp"),
+}
+
+# Implied instructions that only touch the status register
+FLAG_UPDATES = {
+    "CLC": "mpu.p &= 0xFE",
+    "SEC": "mpu.p |= 0x01",
+    "CLI": "mpu.p &= 0xFB",
+    "SEI": "mpu.p |= 0x04",
+    "CLD": "mpu.p &= 0xF7",
+    "SED": "mpu.p |= 0x08",
+    "CLV": "mpu.p &= 0xBF",
+}
+
+# Set N and Z from ``value`` the way Py65's FlagsNZ does
+SET_NZ = "mpu.p = (mpu.p & 0x7D) | ((value & 0x80) if value else 0x02)"
+
+
+class CompiledBlock:
+    """A basic block compiled to a Python function."""
+
+    __slots__ = ("start", "function", "length", "pages", "source")
+
+    def __init__(
+        self,
+        start: int,
+        function: Callable,
+        length: int,
+        pages: Tuple[int, ...],
+        source: str,
+    ):
+        self.start = start
+        self.function = function
+        self.length = length
+        self.pages = pages
+        self.source = source
+
+
+class BlockCache:
+    """Decodes, compiles, caches and executes 6502 basic blocks."""
+
+    def __init__(self, mpu: Any, memory: MemoryBus):
+        """Attach the cache to an MPU whose memory is ``memory``."""
+        self.mpu = mpu
+        self.memory = memory
+        self.blocks: Dict[int, CompiledBlock] = {}
+        self.page_blocks: List[Set[int]] = [set() for _ in range(PAGE_COUNT)]
+
+        # Bumped on every invalidation so a running block can notice
+        # that it just overwrote its own code
+        self.generation = 0
+        self.last_steps = 0
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "blocks_compiled": 0,
+            "instructions_compiled": 0,
+            "instructions_inlined": 0,
+        }
+
+        memory.on_code_write = self.invalidate_page
+
+    def compile_block(self, start: int) -> CompiledBlock:
+        """Decode and compile the block starting at ``start`` and cache it."""
+        mpu = self.mpu
+        memory = self.memory
+        handlers: Dict[str, Callable] = {}
+        body: List[str] = []
+        pages: Set[int] = set()
+
+        addr = start
+        cycles = 0
+        count = 0
+        inlined = 0
+        uses_excycles = False
+        checks_generation = False
+
+        def exit_lines(pc: Any, total_cycles: int) -> List[str]:
+            """Lines that leave the block at ``pc`` after ``count`` steps."""
+            excycles = " + mpu.excycles" if uses_excycles else ""
+            return [
+                f"mpu.pc = {pc}",
+                f"mpu.processorCycles += {total_cycles}{excycles}",
+                f"return {count}",
+            ]
+
+        while True:
+            opcode = memory[addr]
+            name, mode = mpu.disassemble[opcode]
+            # Py65 treats unimplemented opcodes as two-byte no-ops
+            length = MODE_LENGTHS[mode] if name != "???" else 2
+            next_addr = (addr + length) & ADDRESS_MASK
+            operand = memory[(addr + 1) & ADDRESS_MASK]
+            word = operand | (memory[(addr + 2) & ADDRESS_MASK] << 8)
+
+            pages.add(addr >> PAGE_SHIFT)
+            pages.add(((addr + length - 1) & ADDRESS_MASK) >> PAGE_SHIFT)
+
+            cycles += mpu.cycletime[opcode]
+            count += 1
+
+            lines = self._inline_instruction(opcode, name, mode, operand, word)
+            if lines is not None:
+                inlined += 1
+                body.extend(lines)
+            elif opcode in BRANCHES:
+                flag, taken_when_set = BRANCHES[opcode]
+                offset = operand - 0x100 if operand & 0x80 else operand
+                target = (next_addr + offset) & ADDRESS_MASK
+                crossed = (next_addr >> PAGE_SHIFT) != (target >> PAGE_SHIFT)
+                condition = "!=" if taken_when_set else "=="
+
+                inlined += 1
+                body.append(f"if mpu.p & 0x{flag:02X} {condition} 0:")
+                body.extend(
+                    "    " + line
+                    for line in exit_lines(f"0x{target:04X}", cycles + 1 + crossed)
+                )
+                body.extend(exit_lines(f"0x{next_addr:04X}", cycles))
+                break
+            elif opcode == 0x4C:  # JMP absolute
+                inlined += 1
+                body.extend(exit_lines(f"0x{word:04X}", cycles))
+                break
+            else:
+                handler = f"h{count}"
+                handlers[handler] = mpu.instruct[opcode]
+                uses_excycles = True
+                body.append(f"mpu.pc = 0x{(addr + 1) & ADDRESS_MASK:04X}")
+                if mode in PAGE_CROSSING_MODES:
+                    body.append(f"mpu.addcycles = {mpu.extracycles[opcode]}")
+                body.append(f"{handler}(mpu)")
+
+                if name in BLOCK_TERMINATORS:
+                    body.extend(exit_lines("mpu.pc & 0xFFFF", cycles))
+                    break
+
+            if name in MEMORY_WRITERS and mode != "acc":
+                checks_generation = True
+                body.append("if cache.generation != generation:")
+                body.extend(
+                    "    " + line for line in exit_lines(f"0x{next_addr:04X}", cycles)
+                )
+
+            if count >= MAX_BLOCK_INSTRUCTIONS:
+                body.extend(exit_lines(f"0x{next_addr:04X}", cycles))
+                break
+            addr = next_addr
+
+        header = []
+        if checks_generation:
+            header.append("generation = cache.generation")
+        if uses_excycles:
+            header.append("mpu.excycles = 0")
+
+        source = "def block(mpu, memory, cache):\n" + "".join(
+            f"    {line}\n" for line in header + body
+        )
+        namespace = dict(handlers)
+        exec(compile(source, f"<block ${start:04X}>", "exec"), namespace)
+
+        block = CompiledBlock(
+            start, namespace["block"], count, tuple(sorted(pages)), source
+        )
+        self.blocks[start] = block
+        for page in block.pages:
+            self.page_blocks[page].add(start)
+            memory.set_code_page(page, True)
+
+        self.stats["blocks_compiled"] += 1
+        self.stats["instructions_compiled"] += count
+        self.stats["instructions_inlined"] += inlined
+        return block
+
+    def _inline_instruction(
+        self, opcode: int, name: str, mode: str, operand: int, word: int
+    ) -> Optional[List[str]]:
+        """Python source for a straight-line instruction, or None to call Py65."""
+        if mode == "imm":
+            source = str(operand)
+        elif mode == "zpg":
+            source = f"memory[0x{operand:02X}]"
+        elif mode == "abs":
+            source = f"memory[0x{word:04X}]"
+        else:
+            source = None
+
+        if name in LOAD_REGISTERS and source is not None:
+            register = LOAD_REGISTERS[name]
+            return [f"value = {source}", f"mpu.{register} = value", SET_NZ]
+
+        if name in LOGIC_OPERATORS and source is not None:
+            operator = LOGIC_OPERATORS[name]
+            return [f"value = mpu.a {operator} {source}", "mpu.a = value", SET_NZ]
+
+        if name in COMPARE_REGISTERS and source is not None:
+            register = COMPARE_REGISTERS[name]
+            return [
+                f"register = mpu.{register}",
+                f"operand = {source}",
+                "status = mpu.p & 0x7C",
+                "if register == operand:",
+                "    status |= 0x03",
+                "elif register > operand:",
+                "    status |= 0x01",
+                "mpu.p = status | ((register - operand) & 0x80)",
+            ]
+
+        if name in STORE_REGISTERS:
+            register = STORE_REGISTERS[name]
+            if mode == "zpg":
+                return [f"memory[0x{operand:02X}] = mpu.{register}"]
+            if mode == "abs":
+                return [f"memory[0x{word:04X}] = mpu.{register}"]
+            if mode in ("abx", "aby") and name == "STA":
+                index = mode[-1]
+                return [f"memory[(0x{word:04X} + mpu.{index}) & 0xFFFF] = mpu.a"]
+            return None
+
+        if name in REGISTER_UPDATES:
+            register, expression = REGISTER_UPDATES[name]
+            return [f"value = {expression}", f"mpu.{register} = value", SET_NZ]
+
+        if name in FLAG_UPDATES:
+            return [FLAG_UPDATES[name]]
+        if name == "TXS":
+            return ["mpu.sp = mpu.x"]
+        if name == "NOP":
+            return []
+
+        return None
+
+    def invalidate_page(self, page: int):
+        """Drop every cached block with code on ``page``."""
+        for start in list(self.page_blocks[page]):
+            block = self.blocks.pop(start)
+            # Unregister the block from every page it spans
+            for other in block.pages:
+                self.page_blocks[other].discard(start)
+                if not self.page_blocks[other]:
+                    self.memory.set_code_page(other, False)
+
+        self.generation += 1
+        self.stats["invalidations"] += 1
+
+    def invalidate_all(self):
+        """Drop the whole cache."""
+        self.blocks.clear()
+        for starts in self.page_blocks:
+            starts.clear()
+        self.memory.clear_code_pages()
+        self.generation += 1
+        self.stats["invalidations"] += 1
+
+    def run(self, max_steps: int) -> int:
+        """Execute up to ``max_steps`` instructions from the current PC.
+
+        Returns the number of instructions executed. A budget that ends inside
+        a block is finished with ``MPU.step()``. If an instruction raises, the
+        count up to the start of the failing block is left in ``last_steps``.
+        """
+        mpu = self.mpu
+        memory = self.memory
+        blocks = self.blocks
+        stats = self.stats
+        steps = 0
+
+        try:
+            while steps < max_steps:
+                block = blocks.get(mpu.pc)
+                if block is None:
+                    block = self.compile_block(mpu.pc)
+                    stats["misses"] += 1
+                else:
+                    stats["hits"] += 1
+
+                if block.length <= max_steps - steps:
+                    steps += block.function(mpu, memory, self)
+                    continue
+
+                step = mpu.step
+                while steps < max_steps:
+                    step()
+                    steps += 1
+
+            return steps
+
+        finally:
+            self.last_steps = steps
+
+    def get_block_source(self, start: int) -> Optional[str]:
+        """Get the generated Python source of a cached block."""
+        block = self.blocks.get(start)
+        return block.source if block else None
+
+    def get_hit_rate(self) -> float:
+        """Fraction of block lookups served from the cache."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics."""
+        compiled = self.stats["instructions_compiled"]
+        return {
+            "blocks": len(self.blocks),
+            "code_pages": sum(self.memory.code_pages),
+            "hit_rate": self.get_hit_rate(),
+            "inline_ratio": (
+                self.stats["instructions_inlined"] / compiled if compiled else 0.0
+            ),
+            **self.stats,
+        }
+
+    def reset_stats(self):
+        """Reset hit and compile counters."""
+        for key in self.stats:
+            self.stats[key] = 0
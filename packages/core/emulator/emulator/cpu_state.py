@@ -0,0 +1,81 @@
+"""
+CPU State Module
+
+This module keeps 6502 register states as compact tuples. Capturing a state
+copies six integers; the JSON form with its flag breakdown is only built when
+a response asks for it. Sequences of states can be delta-encoded, so each
+state after the first lists only the registers that changed.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+# Status register bits in the order get_cpu_state reports them
+FLAG_BITS = (
+    ("carry", 0x01),
+    ("zero", 0x02),
+    ("interrupt", 0x04),
+    ("decimal", 0x08),
+    ("break", 0x10),
+    ("overflow", 0x40),
+    ("negative", 0x80),
+)
+
+
+class CpuState(NamedTuple):
+    """Registers of the 6502 at one point in time."""
+
+    pc: int
+    a: int
+    x: int
+    y: int
+    sp: int
+    status: int
+
+    @classmethod
+    def capture(cls, mpu) -> "CpuState":
+        """Copy the registers of ``mpu``."""
+        return cls(mpu.pc, mpu.a, mpu.x, mpu.y, mpu.sp, mpu.p)
+
+    def to_dict(self, flags: bool = True) -> Dict[str, Any]:
+        """The JSON form, with the status flags broken out unless ``flags`` is off."""
+        state: Dict[str, Any] = self._asdict()
+        if flags:
+            state["flags"] = {name: bool(self.status & bit) for name, bit in FLAG_BITS}
+        return state
+
+
+def expand_cpu_states(
+    states: Iterable[CpuState], flags: bool = True
+) -> List[Dict[str, Any]]:
+    """The JSON form of every state."""
+    return [state.to_dict(flags) for state in states]
+
+
+def encode_cpu_state_deltas(states: Iterable[CpuState]) -> List[Dict[str, int]]:
+    """Delta-encode states: the first in full, then only changed registers."""
+    deltas = []
+    previous = None
+    for state in states:
+        if previous is None:
+            deltas.append(state._asdict())
+        else:
+            deltas.append(
+                {
+                    name: value
+                    for name, value, old in zip(CpuState._fields, state, previous)
+                    if value != old
+                }
+            )
+        previous = state
+    return deltas
+
+
+def decode_cpu_state_deltas(deltas: Iterable[Dict[str, int]]) -> List[CpuState]:
+    """Rebuild the states from ``encode_cpu_state_deltas`` output."""
+    states: List[CpuState] = []
+    for delta in deltas:
+        if states:
+            states.append(states[-1]._replace(**delta))
+        else:
+            states.append(CpuState(**delta))
+    return states
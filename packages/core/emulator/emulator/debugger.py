@@ -0,0 +1,400 @@
+"""
+Emulator Debugger Module
+
+This module provides breakpoints, watchpoints and run-until execution for the
+6502 emulator. Breakpoints and watchpoints are kept as 64K address bitmaps, so
+checking one costs a single byte lookup per instruction. Write watchpoints are
+reported by the memory bus for the watched pages only. Read watchpoints decode
+each instruction's effective address before it runs, and that decoding is
+skipped entirely while no read watchpoint is armed. Conditions are small
+expressions over the registers, flags and memory, such as ``a == $10 and z``,
+compiled once into Python functions.
+"""
+
+import ast
+import re
+from typing import Any, Callable, Dict, Optional
+
+from py65.devices import mpu6502
+
+ADDRESS_SPACE = 0x10000
+PAGE_SHIFT = 8
+
+WATCH_KINDS = ("read", "write", "access")
+
+# Mnemonics whose memory operand is read (stores and jumps are not)
+READ_MNEMONICS = frozenset(
+    {
+        "ADC", "AND", "ASL", "BIT", "CMP", "CPX", "CPY", "DEC", "EOR", "INC",
+        "LDA", "LDX", "LDY", "LSR", "ORA", "ROL", "ROR", "SBC",
+    }
+)  # fmt: skip
+MEMORY_MODES = frozenset({"zpg", "zpx", "zpy", "abs", "abx", "aby", "inx", "iny"})
+
+# Addressing mode of each opcode that reads memory, None for the rest
+READ_MODES = tuple(
+    mode if name in READ_MNEMONICS and mode in MEMORY_MODES else None
+    for name, mode in mpu6502.MPU.disassemble
+)
+
+# Names usable in conditions and the Python they compile to
+CONDITION_REGISTERS = {
+    "pc": "mpu.pc",
+    "a": "mpu.a",
+    "x": "mpu.x",
+    "y": "mpu.y",
+    "sp": "mpu.sp",
+    "p": "mpu.p",
+    "cycles": "mpu.processorCycles",
+}
+CONDITION_FLAGS = {"n": 7, "v": 6, "b": 4, "d": 3, "i": 2, "z": 1, "c": 0}
+
+CONDITION_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.Invert,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.BitXor,
+    ast.LShift,
+    ast.RShift,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Subscript,
+)
+
+HEX_NUMBER = re.compile(r"\$([0-9A-Fa-f]+)")
+
+
+class ConditionError(ValueError):
+    """Raised when a condition expression cannot be compiled."""
+
+
+class _ConditionCompiler(ast.NodeTransformer):
+    """Checks a parsed condition and rewrites names to MPU attributes."""
+
+    def generic_visit(self, node):
+        if not isinstance(node, CONDITION_NODES):
+            raise ConditionError(f"Unsupported syntax: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if type(node.value) is not int:
+            raise ConditionError(f"Only integers are allowed: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id in CONDITION_REGISTERS:
+            return ast.parse(CONDITION_REGISTERS[node.id], mode="eval").body
+        if node.id in CONDITION_FLAGS:
+            return ast.parse(
+                f"(mpu.p >> {CONDITION_FLAGS[node.id]} & 1)", mode="eval"
+            ).body
+        raise ConditionError(f"Unknown name: {node.id}")
+
+    def visit_Subscript(self, node):
+        if not isinstance(node.value, ast.Name) or node.value.id != "mem":
+            raise ConditionError("Only mem[...] can be indexed")
+        index = self.visit(node.slice)
+        return ast.parse(f"memory[({ast.unparse(index)}) & 0xFFFF]", mode="eval").body
+
+
+def compile_condition(text: str) -> Callable[[Any, Any], bool]:
+    """Compile a condition into a function of ``(mpu, memory)``.
+
+    Conditions use the registers ``pc a x y sp p cycles``, the flags
+    ``n v b d i z c``, ``mem[address]`` and integer arithmetic, comparisons
+    and ``and``/``or``/``not``. ``$FF`` is read as hexadecimal.
+    """
+    source = HEX_NUMBER.sub(r"0x\1", text.strip()).lower()
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(f"Invalid condition {text!r}: {e.msg}") from None
+
+    body = _ConditionCompiler().visit(tree).body
+    code = f"lambda mpu, memory: ({ast.unparse(body)})"
+    return eval(compile(code, "<condition>", "eval"), {"__builtins__": {}})
+
+
+class Debugger:
+    """Breakpoints, watchpoints and run-until execution for one MPU."""
+
+    def __init__(self, mpu, memory):
+        """Create empty breakpoint and watchpoint bitmaps."""
+        self.mpu = mpu
+        self.memory = memory
+        self.breakpoints = bytearray(ADDRESS_SPACE)
+        self.breakpoint_conditions: Dict[int, Callable[[Any, Any], bool]] = {}
+        self.breakpoint_info: Dict[int, Dict[str, Any]] = {}
+        self.read_watch = bytearray(ADDRESS_SPACE)
+        self.write_watch = bytearray(ADDRESS_SPACE)
+        self.watchpoints: Dict[tuple, Dict[str, Any]] = {}
+        self.conditions: Dict[str, Callable[[Any, Any], bool]] = {}
+        self.write_hit: Optional[tuple] = None
+
+    # Breakpoints
+
+    def add_breakpoint(
+        self, address: int, condition: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stop before the instruction at ``address`` (when ``condition`` holds)."""
+        if not 0 <= address < ADDRESS_SPACE:
+            return {"error": f"Address out of range: {address}"}
+        try:
+            check = compile_condition(condition) if condition else None
+        except ConditionError as e:
+            return {"error": str(e)}
+
+        self.breakpoints[address] = 1
+        if check:
+            self.breakpoint_conditions[address] = check
+        else:
+            self.breakpoint_conditions.pop(address, None)
+        self.breakpoint_info[address] = {
+            "address": f"0x{address:04X}",
+            "condition": condition,
+            "hits": 0,
+        }
+        return {"error": None, **self.breakpoint_info[address]}
+
+    def remove_breakpoint(self, address: int) -> bool:
+        """Remove the breakpoint at ``address``."""
+        if address not in self.breakpoint_info:
+            return False
+        self.breakpoints[address] = 0
+        self.breakpoint_conditions.pop(address, None)
+        del self.breakpoint_info[address]
+        return True
+
+    # Watchpoints
+
+    def add_watchpoint(
+        self, start: int, end: Optional[int] = None, kind: str = "write"
+    ) -> Dict[str, Any]:
+        """Stop after an instruction reads or writes ``start``..``end``."""
+        end = start if end is None else end
+        if kind not in WATCH_KINDS:
+            return {"error": f"Unknown watchpoint kind: {kind}"}
+        if not 0 <= start <= end < ADDRESS_SPACE:
+            return {"error": f"Invalid address range: {start}..{end}"}
+
+        self.watchpoints[(start, end, kind)] = {
+            "start": f"0x{start:04X}",
+            "end": f"0x{end:04X}",
+            "kind": kind,
+            "hits": 0,
+        }
+        self._rebuild_watch_bitmaps()
+        return {"error": None, **self.watchpoints[(start, end, kind)]}
+
+    def remove_watchpoint(
+        self, start: int, end: Optional[int] = None, kind: str = "write"
+    ) -> bool:
+        """Remove a watchpoint added with the same arguments."""
+        key = (start, start if end is None else end, kind)
+        if self.watchpoints.pop(key, None) is None:
+            return False
+        self._rebuild_watch_bitmaps()
+        return True
+
+    def _rebuild_watch_bitmaps(self):
+        """Recompute the read and write bitmaps from the watchpoint list."""
+        self.read_watch = bytearray(ADDRESS_SPACE)
+        self.write_watch = bytearray(ADDRESS_SPACE)
+        for start, end, kind in self.watchpoints:
+            length = end - start + 1
+            if kind in ("read", "access"):
+                self.read_watch[start : end + 1] = b"\x01" * length
+            if kind in ("write", "access"):
+                self.write_watch[start : end + 1] = b"\x01" * length
+
+    def clear(self):
+        """Remove every breakpoint and watchpoint."""
+        self.breakpoints = bytearray(ADDRESS_SPACE)
+        self.breakpoint_conditions.clear()
+        self.breakpoint_info.clear()
+        self.watchpoints.clear()
+        self._rebuild_watch_bitmaps()
+
+    def _on_write(self, address: int, value: int):
+        """Note a CPU write to a watched address."""
+        if self.write_watch[address] and self.write_hit is None:
+            self.write_hit = (address, value)
+
+    def read_address(self) -> Optional[int]:
+        """Address the instruction at PC will read, if it reads memory."""
+        mpu = self.mpu
+        memory = self.memory
+        pc = mpu.pc
+        mode = READ_MODES[memory[pc]]
+        if mode is None:
+            return None
+
+        operand = memory[(pc + 1) & 0xFFFF]
+        if mode == "zpg":
+            return operand
+        if mode == "zpx":
+            return (operand + mpu.x) & 0xFF
+        if mode == "zpy":
+            return (operand + mpu.y) & 0xFF
+        if mode == "inx":
+            pointer = (operand + mpu.x) & 0xFF
+            return memory[pointer] | memory[(pointer + 1) & 0xFF] << 8
+        if mode == "iny":
+            base = memory[operand] | memory[(operand + 1) & 0xFF] << 8
+            return (base + mpu.y) & 0xFFFF
+
+        word = operand | memory[(pc + 2) & 0xFFFF] << 8
+        if mode == "abx":
+            return (word + mpu.x) & 0xFFFF
+        if mode == "aby":
+            return (word + mpu.y) & 0xFFFF
+        return word
+
+    # Execution
+
+    def run_until(
+        self,
+        condition: Optional[str] = None,
+        max_cycles: int = 1000000,
+        step: Optional[Callable[[], None]] = None,
+    ) -> Dict[str, Any]:
+        """Run until a breakpoint, watchpoint or ``condition`` hits.
+
+        The instruction at the starting PC always runs, so a run can continue
+        from the breakpoint it stopped at. Stops once ``max_cycles`` cycles
+        have passed otherwise. ``step`` replaces ``MPU.step`` (for tracing).
+        """
+        mpu = self.mpu
+        memory = self.memory
+        results = {
+            "stop_reason": "cycle_limit",
+            "steps_executed": 0,
+            "cycles_executed": 0,
+            "pc": mpu.pc,
+            "hit": None,
+            "error": None,
+        }
+
+        try:
+            check = self._condition(condition) if condition else None
+        except ConditionError as e:
+            return {**results, "stop_reason": "error", "error": str(e)}
+
+        watch_writes = any(self.write_watch)
+        if watch_writes and memory.on_write not in (None, self._on_write):
+            return {
+                **results,
+                "stop_reason": "error",
+                "error": "Memory writes are already observed (trace with writes?)",
+            }
+
+        step = step or mpu.step
+        breakpoints = self.breakpoints
+        breakpoint_conditions = self.breakpoint_conditions
+        read_watch = self.read_watch if any(self.read_watch) else None
+        start_cycles = mpu.processorCycles
+        limit = start_cycles + max_cycles
+
+        self.write_hit = None
+        if watch_writes:
+            pages = {
+                page
+                for start, end, kind in self.watchpoints
+                if kind != "read"
+                for page in range(start >> PAGE_SHIFT, (end >> PAGE_SHIFT) + 1)
+            }
+            memory.set_write_observer(self._on_write, pages)
+
+        steps = 0
+        try:
+            while mpu.processorCycles < limit:
+                read = None
+                if read_watch is not None:
+                    address = self.read_address()
+                    if address is not None and read_watch[address]:
+                        read = address
+
+                step()
+                steps += 1
+
+                if self.write_hit is not None:
+                    address, value = self.write_hit
+                    results["stop_reason"] = "watchpoint"
+                    results["hit"] = self._watch_hit("write", address, value)
+                    break
+                if read is not None:
+                    results["stop_reason"] = "watchpoint"
+                    results["hit"] = self._watch_hit("read", read, memory[read])
+                    break
+
+                pc = mpu.pc
+                if breakpoints[pc]:
+                    check_breakpoint = breakpoint_conditions.get(pc)
+                    if check_breakpoint is None or check_breakpoint(mpu, memory):
+                        info = self.breakpoint_info[pc]
+                        info["hits"] += 1
+                        results["stop_reason"] = "breakpoint"
+                        results["hit"] = dict(info)
+                        break
+
+                if check is not None and check(mpu, memory):
+                    results["stop_reason"] = "condition"
+                    results["hit"] = {"condition": condition}
+                    break
+        except Exception as e:
+            results["stop_reason"] = "error"
+            results["error"] = str(e)
+        finally:
+            if watch_writes:
+                memory.set_write_observer(None)
+
+        results["steps_executed"] = steps
+        results["cycles_executed"] = mpu.processorCycles - start_cycles
+        results["pc"] = mpu.pc
+        return results
+
+    def _condition(self, text: str) -> Callable[[Any, Any], bool]:
+        """Compile ``text``, reusing earlier compilations."""
+        check = self.conditions.get(text)
+        if check is None:
+            check = self.conditions[text] = compile_condition(text)
+        return check
+
+    def _watch_hit(self, access: str, address: int, value: int) -> Dict[str, Any]:
+        """Describe a watchpoint hit and count it on matching watchpoints."""
+        for (start, end, kind), info in self.watchpoints.items():
+            if start <= address <= end and kind in (access, "access"):
+                info["hits"] += 1
+        return {
+            "access": access,
+            "address": f"0x{address:04X}",
+            "value": value,
+        }
+
+    def get_debugger_info(self) -> Dict[str, Any]:
+        """List the breakpoints and watchpoints."""
+        return {
+            "breakpoints": list(self.breakpoint_info.values()),
+            "watchpoints": list(self.watchpoints.values()),
+        }
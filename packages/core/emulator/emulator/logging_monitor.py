@@ -2,17 +2,110 @@
 Emulator Logging and Performance Monitoring Module
 
 This module provides comprehensive logging and performance monitoring
-for the 6502 emulator with configurable speed controls.
+for the 6502 emulator with configurable speed controls. Timings are kept in
+streaming latency histograms, so long-running emulators report percentiles
+without holding on to every sample.
 """
 
+import math
 import time
 from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from loguru import logger
 
+# Histogram buckets per power of two; values land within about 3% of a bucket
+HISTOGRAM_SUB_BUCKETS = 16
+
+# Bucket for zero (and clamped negative) durations, below every other bucket
+ZERO_BUCKET = -(1 << 30)
+
+
+class LatencyHistogram:
+    """Constant-memory histogram of durations in milliseconds.
+
+    Buckets are log-linear like an HDR histogram: each power of two is split
+    into ``HISTOGRAM_SUB_BUCKETS`` equal buckets, so memory depends on the
+    range of values seen rather than on how many were recorded. Count, total,
+    minimum and maximum are exact; percentiles are bucket midpoints.
+    """
+
+    def __init__(self, values: Iterable[float] = ()):
+        """Create a histogram, optionally pre-filled with ``values``."""
+        self.reset()
+        for value in values:
+            self.record(value)
+
+    def reset(self):
+        """Forget every recorded value."""
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.started = time.monotonic()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, value: float, count: int = 1):
+        """Add one duration, or ``count`` samples of the same duration."""
+        if value > 0:
+            mantissa, exponent = math.frexp(value)
+            index = exponent * HISTOGRAM_SUB_BUCKETS + int(
+                (mantissa - 0.5) * 2 * HISTOGRAM_SUB_BUCKETS
+            )
+        else:
+            value = 0.0
+            index = ZERO_BUCKET
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> float:
+        """Approximate value below which ``percent`` of durations fall."""
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_midpoint(index), self.min), self.max)
+        return self.max
+
+    @staticmethod
+    def _bucket_midpoint(index: int) -> float:
+        """Middle of the value range covered by bucket ``index``."""
+        if index == ZERO_BUCKET:
+            return 0.0
+        exponent, sub_bucket = divmod(index, HISTOGRAM_SUB_BUCKETS)
+        mantissa = 0.5 + (sub_bucket + 0.5) / (2 * HISTOGRAM_SUB_BUCKETS)
+        return math.ldexp(mantissa, exponent)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Count, mean, percentiles, maximum and recording rate."""
+        elapsed = time.monotonic() - self.started
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+            "rate_per_sec": self.count / elapsed if elapsed > 0 else 0.0,
+            "buckets": len(self.buckets),
+        }
+
 
 class EmulatorLogger:
     """Enhanced logging system for the emulator."""
@@ -26,10 +119,16 @@ class EmulatorLogger:
         # Setup logging
         self._setup_logging()
 
-        # Performance tracking
-        self.instruction_times = []
-        self.memory_access_times = []
-        self.basic_command_times = []
+        # Performance tracking, in milliseconds
+        self.instruction_timing = self.performance_config.get(
+            "instruction_timing", True
+        )
+        self.memory_access_timing = self.performance_config.get(
+            "memory_access_timing", False
+        )
+        self.instruction_times = LatencyHistogram()
+        self.memory_access_times = LatencyHistogram()
+        self.basic_command_times = LatencyHistogram()
 
         logger.info("Emulator logger initialized")
 
@@ -95,10 +194,34 @@ class EmulatorLogger:
 
         logger.debug(f"Memory {operation}: 0x{address:04X} = 0x{value:02X}")
 
+    def log_instructions(self, count: int, duration: float):
+        """Record ``count`` instructions that ran in ``duration`` milliseconds.
+
+        Each instruction is recorded at the run's mean, so callers time a
+        whole slice or batch instead of every instruction.
+        """
+        if self.instruction_timing and count > 0:
+            self.instruction_times.record(duration / count, count)
+
+    @contextmanager
+    def time_memory_access(self):
+        """Time one bulk memory operation if memory access timing is enabled."""
+        if not self.memory_access_timing:
+            yield
+            return
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.memory_access_times.record((time.perf_counter() - start_time) * 1000)
+
     def log_basic_command(
         self, command: str, result: Dict[str, Any], execution_time: float = 0.0
     ):
         """Log BASIC command execution."""
+        if execution_time > 0:
+            self.basic_command_times.record(execution_time)
         if not self.logging_config.get("log_basic_commands", True):
             return
 
@@ -128,37 +251,39 @@ class EmulatorLogger:
             )
 
     def get_performance_stats(self) -> Dict[str, Any]:
-        """Get performance statistics."""
+        """Get performance statistics, with latency distributions per kind."""
+        instructions = self.instruction_times.get_stats()
+        memory_accesses = self.memory_access_times.get_stats()
+        basic_commands = self.basic_command_times.get_stats()
         stats = {
-            "instruction_count": len(self.instruction_times),
-            "memory_access_count": len(self.memory_access_times),
-            "basic_command_count": len(self.basic_command_times),
+            "instruction_count": instructions["count"],
+            "memory_access_count": memory_accesses["count"],
+            "basic_command_count": basic_commands["count"],
+            "latency": {
+                "instruction": instructions,
+                "memory_access": memory_accesses,
+                "basic_command": basic_commands,
+            },
         }
 
-        if self.instruction_times:
-            stats["avg_instruction_time_ms"] = sum(self.instruction_times) / len(
-                self.instruction_times
-            )
-            stats["max_instruction_time_ms"] = max(self.instruction_times)
-            stats["min_instruction_time_ms"] = min(self.instruction_times)
+        if instructions["count"]:
+            stats["avg_instruction_time_ms"] = instructions["mean_ms"]
+            stats["max_instruction_time_ms"] = instructions["max_ms"]
+            stats["min_instruction_time_ms"] = instructions["min_ms"]
 
-        if self.memory_access_times:
-            stats["avg_memory_access_time_ms"] = sum(self.memory_access_times) / len(
-                self.memory_access_times
-            )
+        if memory_accesses["count"]:
+            stats["avg_memory_access_time_ms"] = memory_accesses["mean_ms"]
 
-        if self.basic_command_times:
-            stats["avg_basic_command_time_ms"] = sum(self.basic_command_times) / len(
-                self.basic_command_times
-            )
+        if basic_commands["count"]:
+            stats["avg_basic_command_time_ms"] = basic_commands["mean_ms"]
 
         return stats
 
     def reset_performance_stats(self):
         """Reset performance statistics."""
-        self.instruction_times.clear()
-        self.memory_access_times.clear()
-        self.basic_command_times.clear()
+        self.instruction_times.reset()
+        self.memory_access_times.reset()
+        self.basic_command_times.reset()
         logger.info("Performance statistics reset")
 
 
@@ -176,12 +301,32 @@ class SpeedController:
         self.min_multiplier = self.speed_config.get("min_speed_multiplier", 0.1)
         self.current_multiplier = 1.0
 
+        # Cycle-accurate pacing
+        self.target_hz = settings.get("cpu_speed", 1000000)
+        self.slice_ms = self.speed_config.get("slice_ms", 10.0)
+        self.max_lag_ms = self.speed_config.get("max_lag_ms", 50.0)
+        self.throttled = self.speed_config.get("throttled", True)
+        self._pace_start = 0.0
+        self._pace_base_cycles = 0
+        self._window_start = 0.0
+        self._window_base_cycles = 0
+        self._window_cycles = 0
+        self._window_seconds = 0.0
+        self.pacing_stats = {
+            "slices": 0,
+            "sleeps": 0,
+            "resyncs": 0,
+            "total_jitter_ms": 0.0,
+            "max_jitter_ms": 0.0,
+        }
+
         logger.info(f"Speed controller initialized (enabled: {self.enabled})")
 
     def set_speed_multiplier(self, multiplier: float):
         """Set the speed multiplier."""
         multiplier = max(self.min_multiplier, min(multiplier, self.max_multiplier))
         self.current_multiplier = multiplier
+        self._reanchor()
 
         if self.enabled:
             logger.info(f"Speed multiplier set to {multiplier:.2f}x")
@@ -214,6 +359,121 @@ class SpeedController:
             if delay > 0:
                 time.sleep(delay)
 
+    def set_throttled(self, throttled: bool):
+        """Enable or disable real-time throttling (unthrottled runs flat out)."""
+        self.throttled = throttled
+        self._reanchor()
+        logger.info(f"Speed throttling {'enabled' if throttled else 'disabled'}")
+
+    @contextmanager
+    def unthrottled(self):
+        """Suspend throttling for the block, restoring the setting after it.
+
+        For callers that pace a run themselves, such as the bridge scheduler.
+        """
+        throttled = self.throttled
+        self.throttled = False
+        try:
+            yield
+        finally:
+            self.throttled = throttled
+
+    def reset_speed(self):
+        """Return the multiplier and throttling to their configured defaults."""
+        self.current_multiplier = 1.0
+        self.throttled = self.speed_config.get("throttled", True)
+        self._reanchor()
+
+    def is_pacing(self) -> bool:
+        """Check whether execution is paced against the target clock."""
+        return self.enabled and self.throttled
+
+    def get_effective_hz(self) -> float:
+        """Get the target clock rate after applying the speed multiplier."""
+        return self.target_hz * self.current_multiplier
+
+    def get_slice_cycles(self) -> int:
+        """Get the number of emulated cycles in one pacing time slice."""
+        return max(1, int(self.get_effective_hz() * self.slice_ms / 1000.0))
+
+    def start_pacing(self, cycles: int):
+        """Anchor the pacing clock at the given emulated cycle count."""
+        now = time.monotonic()
+        self._pace_start = self._window_start = now
+        self._pace_base_cycles = self._window_base_cycles = cycles
+        self._window_cycles = 0
+        self._window_seconds = 0.0
+
+    def pace(self, cycles: int):
+        """Sleep until wall time catches up with the emulated cycle count.
+
+        Called once per time slice with the absolute cycle counter. The
+        deadline is derived from the anchor so sleep overshoot does not
+        accumulate; if emulation falls more than ``max_lag_ms`` behind, the
+        anchor is moved forward instead of bursting to catch up.
+        """
+        self.pacing_stats["slices"] += 1
+        now = time.monotonic()
+
+        if self.is_pacing():
+            deadline = (
+                self._pace_start
+                + (cycles - self._pace_base_cycles) / self.get_effective_hz()
+            )
+            delay = deadline - now
+
+            if delay > 0:
+                time.sleep(delay)
+                now = time.monotonic()
+                jitter_ms = (now - deadline) * 1000.0
+                self.pacing_stats["sleeps"] += 1
+                self.pacing_stats["total_jitter_ms"] += jitter_ms
+                self.pacing_stats["max_jitter_ms"] = max(
+                    self.pacing_stats["max_jitter_ms"], jitter_ms
+                )
+            elif -delay * 1000.0 > self.max_lag_ms:
+                self.pacing_stats["resyncs"] += 1
+                self._pace_start = now
+                self._pace_base_cycles = cycles
+
+        self._window_cycles = cycles - self._window_base_cycles
+        self._window_seconds = now - self._window_start
+
+    def get_achieved_hz(self) -> float:
+        """Get the emulated clock rate achieved in the last pacing window."""
+        if self._window_seconds <= 0:
+            return 0.0
+        return self._window_cycles / self._window_seconds
+
+    def get_pacing_stats(self) -> Dict[str, Any]:
+        """Get pacing statistics including achieved vs target clock rate."""
+        sleeps = self.pacing_stats["sleeps"]
+        return {
+            "pacing": self.is_pacing(),
+            "throttled": self.throttled,
+            "slice_ms": self.slice_ms,
+            "target_mhz": self.get_effective_hz() / 1e6,
+            "achieved_mhz": self.get_achieved_hz() / 1e6,
+            "slices": self.pacing_stats["slices"],
+            "sleeps": sleeps,
+            "resyncs": self.pacing_stats["resyncs"],
+            "avg_jitter_ms": (
+                self.pacing_stats["total_jitter_ms"] / sleeps if sleeps else 0.0
+            ),
+            "max_jitter_ms": self.pacing_stats["max_jitter_ms"],
+        }
+
+    def reset_pacing_stats(self):
+        """Reset pacing statistics."""
+        self.pacing_stats.update(
+            slices=0, sleeps=0, resyncs=0, total_jitter_ms=0.0, max_jitter_ms=0.0
+        )
+
+    def _reanchor(self):
+        """Restart the pacing deadline after a rate change."""
+        self._pace_start = time.monotonic()
+        self._pace_base_cycles = self._window_base_cycles + self._window_cycles
+
 
 class PerformanceMonitor:
     """Performance monitoring for the emulator."""
@@ -235,6 +495,7 @@ class PerformanceMonitor:
         # Performance tracking
         self.start_times = {}
         self.total_times = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
 
         logger.info(
             f"Performance monitor initialized (enabled: {self.monitoring_enabled})"
@@ -257,6 +518,10 @@ class PerformanceMonitor:
             self.total_times[operation_name] = (
                 self.total_times.get(operation_name, 0) + duration
             )
+            histogram = self.histograms.get(operation_name)
+            if histogram is None:
+                histogram = self.histograms[operation_name] = LatencyHistogram()
+            histogram.record(duration)
 
     def time_function(self, operation_name: str):
         """Decorator for timing functions."""
@@ -283,6 +548,10 @@ class PerformanceMonitor:
             "monitoring_enabled": True,
             "total_operations": len(self.total_times),
             "operation_times": dict(self.total_times),
+            "operations": {
+                name: histogram.get_stats()
+                for name, histogram in self.histograms.items()
+            },
         }
 
         if self.total_times:
@@ -296,6 +565,7 @@ class PerformanceMonitor:
         """Reset performance data."""
         self.start_times.clear()
         self.total_times.clear()
+        self.histograms.clear()
         logger.info("Performance data reset")
 
 
@@ -6,19 +6,80 @@ It handles emulator initialization, BASIC-M6502 program loading, execution, and
 communication with the Python bridge layer.
 """
 
+import base64
+import re
 import time
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from loguru import logger
 from py65.devices import mpu6502
 
 from bridge.core.settings import get_settings
+from engine.basic_compiler import (
+    BasicSyntaxError,
+    CompiledProgram,
+    Statement,
+    canonical_statement_text,
+    get_compiler,
+)
+from engine.assembler import AssemblyError
+from engine.basic_vm import BasicVM
+from engine.emulator.block_cache import BlockCache
+from engine.emulator.cpu_state import CpuState, encode_cpu_state_deltas
+from engine.emulator.debugger import Debugger
 from engine.emulator.logging_monitor import (
     create_emulator_logger,
     create_performance_monitor,
     create_speed_controller,
 )
+from engine.emulator.memory_bus import (
+    KEY_READY,
+    KEYBOARD_STATUS,
+    DisplayDevice,
+    KeyboardDevice,
+    MemoryBus,
+    RomDevice,
+    TimerDevice,
+)
+from engine.emulator.memory_watch import MemoryWatcher
+from engine.emulator.profiler import Profiler, format_report
+from engine.emulator.recording import (
+    SessionRecorder,
+    SessionRecording,
+    replay_session,
+    state_digest,
+)
+from engine.emulator.snapshot import (
+    EmulatorSnapshot,
+    capture_snapshot,
+    restore_snapshot,
+)
+from engine.emulator.trace import DEFAULT_CHUNK_RECORDS, TraceRecorder
+from engine.rom_image import RomImage, load_rom_image
+
+# Size of the 6502 address space
+ADDRESS_SPACE = 0x10000
+
+# Instructions run between checks for ROM BASIC waiting on the keyboard
+INPUT_POLL_STEPS = 1000
+
+# Short-form error report printed by ROM BASIC, e.g. "?SN ERROR"
+ROM_ERROR_PATTERN = re.compile(r"\?[A-Z/0]{2} ERROR")
+
+# Parsed command type for compiled statement keywords
+STATEMENT_TYPES = {
+    "FOR": "loop_start",
+    "NEXT": "loop_end",
+    "IF": "conditional",
+    "GOTO": "goto",
+    "GOSUB": "gosub",
+    "RETURN": "return",
+    "REM": "comment",
+    "DATA": "data",
+    "READ": "read",
+}
 
 
 class M6502Emulator:
@@ -37,7 +98,18 @@ class M6502Emulator:
 
         # Initialize emulator components
         self.mpu = None
+        self.memory = None
+        self.block_cache: Optional[BlockCache] = None
+        self.trace_recorder: Optional[TraceRecorder] = None
+        self.profiler: Optional[Profiler] = None
+        self.profiling = False
+        self.debugger: Optional[Debugger] = None
+        self.recorder: Optional[SessionRecorder] = None
+        self.display: Optional[DisplayDevice] = None
+        self.keyboard: Optional[KeyboardDevice] = None
+        self.timer: Optional[TimerDevice] = None
         self.is_running = False
+        self.last_snapshot: Optional[EmulatorSnapshot] = None
 
         # Initialize logging and performance monitoring
         self.emulator_logger = create_emulator_logger(self.settings.engine.emulator)
@@ -46,17 +118,45 @@ class M6502Emulator:
             self.settings.engine.emulator
         )
 
+        # Execution configuration
+        execution_config = self.settings.engine.emulator.get("execution", {})
+        self.turbo_mode = execution_config.get("turbo_mode", False)
+        self.turbo_batch_size = execution_config.get("turbo_batch_size", 10000)
+        self.block_cache_enabled = execution_config.get("block_cache", False)
+
+        # BASIC ROM assembled from src/m6502.asm and mapped read-only
+        rom_config = self.settings.engine.emulator.get("rom", {})
+        self.rom_enabled = rom_config.get("enabled", True)
+        cache_dir = rom_config.get("cache_dir")
+        self.rom_cache_dir = self.engine_path / cache_dir if cache_dir else None
+        self.rom: Optional[RomImage] = None
+        self.basic_booted = False
+
         # BASIC-M6502 specific settings
         self.basic_start_address = 0x8000  # Starting address for BASIC programs
         self.basic_end_address = 0xFFFF  # Ending address for BASIC programs
+        self.basic_compiler = get_compiler()
+        self.basic_vm = BasicVM()
+        self.basic_timeout = self.settings.engine.basic_m6502["timeout_seconds"]
 
         logger.info("6502 Emulator initialized")
 
     def initialize_emulator(self) -> bool:
         """Initialize the emulator components."""
         try:
-            # Create MPU6502 processor with default memory
-            self.mpu = mpu6502.MPU()
+            # Create MPU6502 processor backed by a flat 64K memory bus so
+            # memory can be loaded, filled and dumped with bulk slice copies
+            # while CPU writes reach the memory-mapped devices
+            self.memory = MemoryBus(ADDRESS_SPACE)
+            self.display = self.memory.attach(DisplayDevice())
+            self.keyboard = self.memory.attach(KeyboardDevice())
+            self.timer = self.memory.attach(TimerDevice(cpu_speed=self.cpu_speed))
+            self.mpu = mpu6502.MPU(memory=self.memory)
+            self.debugger = Debugger(self.mpu, self.memory)
+
+            # Cached basic-block execution for turbo mode
+            if self.block_cache_enabled:
+                self.block_cache = BlockCache(self.mpu, self.memory)
 
             # Set up memory regions
             self._setup_memory_regions()
@@ -78,18 +178,60 @@ class M6502Emulator:
         # BASIC program area (0x8000-0xFFFF) - Our BASIC programs
 
         # Initialize memory with zeros
-        for addr in range(0x10000):
-            self.mpu.memory[addr] = 0x00
+        self.fill_memory(0x0000, ADDRESS_SPACE, 0x00)
+
+        # BASIC ROM (0xC000 up) - the real interpreter, write protected
+        if self.rom_enabled:
+            self._map_rom()
 
         logger.info("Memory regions configured")
 
+    def _map_rom(self):
+        """Map the BASIC ROM image with one bulk copy.
+
+        The image comes from the on-disk cache unless the source changed; an
+        image that cannot be built leaves the emulator running without it.
+        """
+        self.basic_booted = False
+        try:
+            self.rom = load_rom_image(cache_dir=self.rom_cache_dir)
+        except (OSError, AssemblyError) as e:
+            logger.error(f"Failed to load BASIC ROM: {e}")
+            self.rom = None
+            return
+
+        self.memory.attach(RomDevice(self.rom.rom_start, self.rom.rom))
+        logger.info(
+            f"BASIC ROM mapped at 0x{self.rom.rom_start:04X}-0x{self.rom.rom_end:04X}"
+        )
+
     def load_basic_program(self, program: str) -> bool:
-        """Load a BASIC program into emulator memory."""
+        """Load a BASIC program into emulator memory.
+
+        With the BASIC ROM mapped, program text is typed into ROM BASIC
+        after a NEW. An empty program loads the built-in display demo.
+
+        ROM BASIC runs on the CPU and is separate from the interpreter behind
+        ``execute_basic_command``: the program is RUN with
+        ``send_basic_input("RUN\r")``, and variables are not shared between
+        the two.
+        """
+        # Recorded as one event; loading the demo also moves the PC
+        self._record("load_basic_program", program)
+        recorder, self.recorder = self.recorder, None
         try:
-            # Convert BASIC program to assembly or bytecode
-            # For now, we'll simulate loading a simple program
+            return self._load_basic_program(program)
+        finally:
+            self.recorder = recorder
+
+    def _load_basic_program(self, program: str) -> bool:
+        """Load a program without recording the steps it takes."""
+        try:
+            if program.strip() and self.rom is not None:
+                return self._type_basic_program(program)
 
             # Place a simple "Hello World" program at BASIC start address
+
             hello_program = [
                 0xA9,
                 0x48,  # LDA #$48 ('H')
@@ -122,8 +264,7 @@ class M6502Emulator:
             ]
 
             # Load program into memory
-            for i, byte in enumerate(hello_program):
-                self.mpu.memory[self.basic_start_address + i] = byte
+            self.load_memory_image(bytes(hello_program), self.basic_start_address)
 
             # Set program counter to start address
             self.mpu.pc = self.basic_start_address
@@ -137,8 +278,162 @@ class M6502Emulator:
             logger.error(f"Failed to load BASIC program: {e}")
             return False
 
-    def execute_program(self, steps: int = 100) -> Dict[str, Any]:
-        """Execute the loaded program for a specified number of steps."""
+    def _type_basic_program(self, program: str) -> bool:
+        """Type a numbered program into ROM BASIC, replacing the old one."""
+        lines = [line.strip() for line in program.splitlines() if line.strip()]
+        result = self.send_basic_input("NEW\r" + "".join(f"{line}\r" for line in lines))
+        if result.get("error") or not result["waiting_for_input"]:
+            logger.error(f"Failed to type BASIC program: {result.get('error')}")
+            return False
+
+        errors = ROM_ERROR_PATTERN.findall(result["output"])
+        if errors:
+            logger.error(f"ROM BASIC rejected program lines: {', '.join(errors)}")
+            return False
+
+        logger.info(f"BASIC program typed into ROM BASIC ({len(lines)} lines)")
+        return True
+
+    def boot_basic(self, max_steps: int = 5000000) -> Dict[str, Any]:
+        """Cold-start ROM BASIC and answer its start-up questions.
+
+        The memory size answer is the ROM start, so program memory ends where
+        the ROM begins; the terminal width keeps BASIC's default.
+        """
+        if self.rom is None:
+            return {"error": "BASIC ROM not mapped"}
+
+        for start, data in self.rom.ram_segments:
+            self.memory[start : start + len(data)] = data
+        self.keyboard.reset()
+        self.keyboard.push_keys(f"{self.rom.rom_start}\r\r")
+        self.mpu.pc = self.rom.entry_point
+
+        result = self.run_until_input(max_steps)
+        self.basic_booted = result["waiting_for_input"] and not result["error"]
+        if self.basic_booted:
+            logger.info(f"ROM BASIC started in {result['steps_executed']} steps")
+        else:
+            result["error"] = result["error"] or "ROM BASIC did not reach its prompt"
+            logger.error(f"Failed to start ROM BASIC: {result['error']}")
+        return result
+
+    def send_basic_input(
+        self,
+        text: str,
+        max_steps: int = 5000000,
+        time_limit: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Type ``text`` into ROM BASIC and run until it waits for more input.
+
+        BASIC is started first if it is not running yet.
+        """
+        self._record("send_basic_input", text, max_steps, time_limit)
+        if not self.basic_booted:
+            boot = self.boot_basic()
+            if boot["error"]:
+                return boot
+
+        self.keyboard.push_keys(text)
+        return self.run_until_input(max_steps, time_limit)
+
+    def run_until_input(
+        self, max_steps: int = 5000000, time_limit: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run ROM BASIC until it waits on the keyboard with no key queued.
+
+        Execution is paced like ``execute_program`` and uses the block cache
+        when enabled. Stops early after ``max_steps`` instructions or, with a
+        ``time_limit``, once that many seconds have passed.
+        """
+        if self.rom is None:
+            return {"error": "BASIC ROM not mapped"}
+
+        mpu = self.mpu
+        memory = self.memory
+        keys = self.keyboard.keys
+        block_cache = self._instruction_hook() or self.block_cache
+        poll_start = self.rom.symbols["GETCH"]
+        poll_end = self.rom.symbols["GETKEY"]
+        output_mark = self.display.total_written
+
+        results = {
+            "steps_executed": 0,
+            "output": "",
+            "waiting_for_input": False,
+            "timed_out": False,
+            "error": None,
+        }
+        deadline = time.perf_counter() + time_limit if time_limit else None
+
+        pacer = self.speed_controller
+        pacer.start_pacing(mpu.processorCycles)
+        self.is_running = True
+        with self.performance_monitor.time_operation("basic_execution"):
+            while True:
+                if (
+                    poll_start <= mpu.pc < poll_end
+                    and not keys
+                    and not memory[KEYBOARD_STATUS] & KEY_READY
+                ):
+                    results["waiting_for_input"] = True
+                    break
+                batch = min(INPUT_POLL_STEPS, max_steps - results["steps_executed"])
+                if batch <= 0:
+                    break
+
+                executed = 0
+                batch_start = time.perf_counter()
+                try:
+                    if block_cache:
+                        executed = block_cache.run(batch)
+                    else:
+                        for executed in range(1, batch + 1):
+                            mpu.step()
+                except Exception as e:
+                    executed = block_cache.last_steps if block_cache else executed - 1
+                    results["error"] = str(e)
+
+                self._log_slice(executed, batch_start)
+                results["steps_executed"] += executed
+                memory.tick(mpu.processorCycles)
+                pacer.pace(mpu.processorCycles)
+                if results["error"]:
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    results["timed_out"] = True
+                    break
+
+        self.is_running = False
+        results["output"] = self.display.read_since(output_mark)
+        return results
+
+    def execute_program(
+        self,
+        steps: int = 100,
+        turbo: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        include: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """Execute the loaded program for a specified number of steps.
+
+        Execution is paced against ``cpu_speed`` once per time slice. When
+        ``turbo`` is enabled (or ``turbo_mode`` is set in the execution
+        settings) the program runs in batches of ``batch_size`` instructions
+        with no per-step logging or state capture.
+
+        With "cpu_states" in ``include`` the result also carries
+        "cpu_state_deltas": the state after every step, or after every batch
+        in turbo mode, delta-encoded.
+        """
+        self._record("execute_program", steps, turbo, batch_size)
+        if turbo is None:
+            turbo = self.turbo_mode
+        if turbo:
+            return self._execute_program_turbo(
+                steps, batch_size or self.turbo_batch_size, include
+            )
+
         try:
             if not self.is_running:
                 self.is_running = True
@@ -151,273 +446,771 @@ class M6502Emulator:
                 "error": None,
             }
 
+            # Output is whatever the display device receives during the run
+            display = self.display
+            output_mark = display.total_written
+
+            # Pace execution in time slices against the emulated cycle count
+            pacer = self.speed_controller
+            pacer.start_pacing(self.mpu.processorCycles)
+            slice_cycles = pacer.get_slice_cycles()
+            next_slice = self.mpu.processorCycles + slice_cycles
+            hook = self._instruction_hook()
+            step_mpu = hook.step if hook else self.mpu.step
+            log_states = self.emulator_logger.logging_config.get("log_cpu_state", True)
+            cpu_state = None
+            cpu_states: Optional[List[CpuState]] = (
+                [] if "cpu_states" in include else None
+            )
+            slice_start = time.perf_counter()
+            slice_mark = 0
+
             # Execute program steps
             for step in range(steps):
                 try:
-                    # Apply speed control delay
-                    self.speed_controller.delay_step()
+                    if self.mpu.processorCycles >= next_slice:
+                        self._log_slice(step - slice_mark, slice_start)
+                        slice_start = time.perf_counter()
+                        slice_mark = step
+                        self.memory.tick(self.mpu.processorCycles)
+                        pacer.pace(self.mpu.processorCycles)
+                        next_slice = self.mpu.processorCycles + slice_cycles
 
                     # Execute one instruction with performance monitoring
                     with self.performance_monitor.time_operation(
                         "instruction_execution"
                     ):
-                        self.mpu.step()
+                        step_mpu()
                         results["steps_executed"] += 1
 
-                    # Capture CPU state
-                    cpu_state = {
-                        "pc": self.mpu.pc,
-                        "a": self.mpu.a,
-                        "x": self.mpu.x,
-                        "y": self.mpu.y,
-                        "sp": self.mpu.sp,
-                        "status": self.mpu.p,
-                    }
-                    results["cpu_state"] = cpu_state
+                    # Capture CPU state as a tuple; the dict is built once
+                    cpu_state = CpuState.capture(self.mpu)
+                    if cpu_states is not None:
+                        cpu_states.append(cpu_state)
 
                     # Log CPU state if enabled
-                    self.emulator_logger.log_cpu_state(cpu_state, f"step_{step}")
-
-                    # Check for output in display memory (0x2000-0x20FF)
-                    if 0x2000 <= self.mpu.pc <= 0x20FF:
-                        char_code = self.mpu.memory[self.mpu.pc]
-                        if 32 <= char_code <= 126:  # Printable ASCII
-                            results["output"] += chr(char_code)
-                            # Log memory access
-                            self.emulator_logger.log_memory_access(
-                                self.mpu.pc, char_code, "read"
-                            )
+                    if log_states:
+                        self.emulator_logger.log_cpu_state(
+                            cpu_state._asdict(), f"step_{step}"
+                        )
 
                 except Exception as e:
                     results["error"] = str(e)
                     break
 
-            logger.info(f"Program executed {results['steps_executed']} steps")
+            self._log_slice(results["steps_executed"] - slice_mark, slice_start)
+            self.memory.tick(self.mpu.processorCycles)
+            pacer.pace(self.mpu.processorCycles)
+            if cpu_state is not None:
+                results["cpu_state"] = cpu_state.to_dict(flags=False)
+            if cpu_states is not None:
+                results["cpu_state_deltas"] = encode_cpu_state_deltas(cpu_states)
+            results["output"] = display.read_since(output_mark)
+
+            logger.debug(f"Program executed {results['steps_executed']} steps")
             return results
 
         except Exception as e:
             logger.error(f"Failed to execute program: {e}")
             return {"error": str(e)}
 
-    def execute_basic_command(self, command: str) -> Dict[str, Any]:
-        """Execute a single BASIC command."""
-        start_time = time.perf_counter()
+    def _execute_program_turbo(
+        self, steps: int, batch_size: int, include: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """Execute the loaded program in batches with no per-step overhead.
 
+        CPU state and timing are only materialized at batch boundaries.
+        With the block cache enabled, batches replay pre-decoded basic blocks
+        instead of stepping the MPU one opcode at a time.
+        """
         try:
-            # Parse the BASIC command
-            parsed_command = self._parse_basic_command(command)
-
-            result = None
-            if parsed_command["type"] == "print":
-                result = self._execute_print_command(parsed_command)
-            elif parsed_command["type"] == "assignment":
-                result = self._execute_assignment_command(parsed_command)
-            elif parsed_command["type"] == "end":
-                result = self._execute_end_command(parsed_command)
-            elif parsed_command["type"] == "comment":
-                result = self._execute_comment_command(parsed_command)
-            elif parsed_command["type"] == "loop_start":
-                result = self._execute_loop_start_command(parsed_command)
-            elif parsed_command["type"] == "loop_end":
-                result = self._execute_loop_end_command(parsed_command)
-            elif parsed_command["type"] == "conditional":
-                result = self._execute_conditional_command(parsed_command)
-            elif parsed_command["type"] == "goto":
-                result = self._execute_goto_command(parsed_command)
-            elif parsed_command["type"] == "gosub":
-                result = self._execute_gosub_command(parsed_command)
-            elif parsed_command["type"] == "return":
-                result = self._execute_return_command(parsed_command)
-            elif parsed_command["type"] == "data":
-                result = self._execute_data_command(parsed_command)
-            elif parsed_command["type"] == "read":
-                result = self._execute_read_command(parsed_command)
-            else:
-                result = {
-                    "error": f"Unsupported command type: {parsed_command['type']}"
-                }
+            if not self.is_running:
+                self.is_running = True
+
+            results = {
+                "steps_executed": 0,
+                "cpu_state": {},
+                "memory_dump": {},
+                "output": "",
+                "error": None,
+                "turbo": True,
+                "batches": 0,
+            }
+
+            mpu = self.mpu
+            step = mpu.step
+            block_cache = self._instruction_hook() or self.block_cache
+            display = self.display
+            output_mark = display.total_written
+            batch_size = max(1, batch_size)
+            remaining = steps
+            cpu_states: Optional[List[CpuState]] = (
+                [] if "cpu_states" in include else None
+            )
+
+            # When pacing, size batches to fit one time slice using the
+            # cycles-per-instruction observed in the previous batch.
+            pacer = self.speed_controller
+            pacer.start_pacing(mpu.processorCycles)
+            pacing = pacer.is_pacing()
+            slice_cycles = pacer.get_slice_cycles()
+            cycles_per_instruction = 4.0
+
+            while remaining > 0:
+                batch = min(batch_size, remaining)
+                if pacing:
+                    slice_steps = int(slice_cycles / cycles_per_instruction)
+                    batch = min(batch, max(1, slice_steps))
+                executed = 0
+                batch_start_cycles = mpu.processorCycles
+                batch_start = time.perf_counter()
+
+                with self.performance_monitor.time_operation("batch_execution"):
+                    try:
+                        if block_cache:
+                            executed = block_cache.run(batch)
+                        else:
+                            for executed in range(1, batch + 1):
+                                step()
+                    except Exception as e:
+                        if block_cache:
+                            executed = block_cache.last_steps
+                        else:
+                            executed -= 1
+                        results["error"] = str(e)
+
+                self._log_slice(executed, batch_start)
+                results["steps_executed"] += executed
+                results["batches"] += 1
+                remaining -= executed
+
+                if executed:
+                    cycles_per_instruction = (
+                        mpu.processorCycles - batch_start_cycles
+                    ) / executed
+                self.memory.tick(mpu.processorCycles)
+                pacer.pace(mpu.processorCycles)
+
+                # Materialize state at the batch boundary only
+                state = CpuState.capture(mpu)
+                if cpu_states is not None:
+                    cpu_states.append(state)
+                cpu_state = state._asdict()
+                results["cpu_state"] = cpu_state
+                self.emulator_logger.log_cpu_state(
+                    cpu_state, f"batch_{results['batches']}"
+                )
+
+                if results["error"]:
+                    break
+
+            if cpu_states is not None:
+                results["cpu_state_deltas"] = encode_cpu_state_deltas(cpu_states)
+            results["output"] = display.read_since(output_mark)
+
+            logger.debug(
+                f"Program executed {results['steps_executed']} steps "
+                f"in {results['batches']} turbo batch(es)"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to execute program: {e}")
+            return {"error": str(e)}
 
-            # Calculate execution time
-            execution_time = (
-                time.perf_counter() - start_time
-            ) * 1000  # Convert to milliseconds
+    def execute_basic_command(
+        self, command: str, include: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """Execute a BASIC command in direct mode.
+
+        The command is compiled once (repeats hit the compiler cache) and run
+        by the interpreter against the variables left by earlier commands.
+        This is the Python interpreter, not ROM BASIC on the CPU, so it does
+        not see programs typed with ``load_basic_program`` or
+        ``send_basic_input``; its dialect and error messages can differ too.
+
+        With "cpu_states" in ``include`` the result carries the CPU state
+        after the command in "cpu_state".
+        """
+        self._record("execute_basic_command", command)
+        start_time = time.perf_counter()
+        try:
+            statements = self.basic_compiler.compile_statement(command)
+        except BasicSyntaxError as e:
+            result = {"type": "unknown", "error": f"SYNTAX ERROR: {e}"}
+            self._log_basic_command(command, result, start_time)
+        else:
+            result = self._execute_statements(command, statements, start_time)
 
-            # Log the command execution
-            self.emulator_logger.log_basic_command(command, result, execution_time)
+        if "cpu_states" in include:
+            result["cpu_state"] = CpuState.capture(self.mpu).to_dict()
+        return result
 
+    def execute_basic_commands(
+        self,
+        commands: List[str],
+        stop_on_error: bool = True,
+        include: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """Execute BASIC commands in order, by default stopping at the first error.
+
+        With "cpu_states" in ``include`` the result carries the CPU state
+        after every executed command, delta-encoded in "cpu_state_deltas".
+        """
+        results = []
+        cpu_states: Optional[List[CpuState]] = [] if "cpu_states" in include else None
+        failed_index = None
+        for index, command in enumerate(commands):
+            result = self.execute_basic_command(command)
+            results.append(result)
+            if cpu_states is not None:
+                cpu_states.append(CpuState.capture(self.mpu))
+            if result.get("error") and failed_index is None:
+                failed_index = index
+                if stop_on_error:
+                    break
+        run = {
+            "success": failed_index is None,
+            "results": results,
+            "executed": len(results),
+            "failed_index": failed_index,
+        }
+        if cpu_states is not None:
+            run["cpu_state_deltas"] = encode_cpu_state_deltas(cpu_states)
+        return run
+
+    def execute_basic_statement(self, statement: Statement) -> Dict[str, Any]:
+        """Execute one statement of a compiled BASIC program in direct mode."""
+        return self._execute_statements(
+            statement.text, (statement,), time.perf_counter()
+        )
+
+    def _execute_statements(
+        self, command: str, statements: Tuple[Statement, ...], start_time: float
+    ) -> Dict[str, Any]:
+        """Run compiled statements on the interpreter and describe the result."""
+        try:
+            if not statements:
+                result = {"type": "unknown", "error": "Empty command"}
+                self._log_basic_command(command, result, start_time)
+                return result
+
+            run = self.basic_vm.execute(statements, time_limit=self.basic_timeout)
+            first = statements[0]
+
+            result = {
+                "type": self._describe_statement(first)["type"],
+                "success": run["error"] is None,
+                "output": "\n".join(run["output"]),
+                "statements_executed": run["statements_executed"],
+            }
+            if run["error"]:
+                line = f" IN {run['line']}" if run["line"] else ""
+                result["error"] = f"{run['error']} ERROR{line}"
+            elif first.op == "LET" and first.args[0][0] == "var":
+                variable = first.args[0][1]
+                result["variable"] = variable
+                result["value"] = self.basic_vm.variables.get(variable)
+            elif run["status"] == "ended":
+                self.is_running = False
+                result["message"] = "Program ended"
+
+            self._log_basic_command(command, result, start_time)
             return result
 
         except Exception as e:
-            execution_time = (time.perf_counter() - start_time) * 1000
             error_result = {"error": str(e)}
-            self.emulator_logger.log_basic_command(
-                command, error_result, execution_time
-            )
+            self._log_basic_command(command, error_result, start_time)
             logger.error(f"Failed to execute BASIC command: {e}")
             return error_result
 
+    def _log_basic_command(
+        self, command: str, result: Dict[str, Any], start_time: float
+    ):
+        """Log a BASIC command with its execution time in milliseconds."""
+        execution_time = (time.perf_counter() - start_time) * 1000
+        self.emulator_logger.log_basic_command(command, result, execution_time)
+
+    def run_basic_program(
+        self,
+        program: CompiledProgram,
+        max_statements: Optional[int] = None,
+        time_limit: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Load a compiled BASIC program into the interpreter and RUN it."""
+        self.basic_vm.load(program)
+        self.is_running = True
+        try:
+            return self.basic_vm.run(
+                max_statements=max_statements,
+                time_limit=time_limit if time_limit is not None else self.basic_timeout,
+            )
+        finally:
+            self.is_running = False
+
     def _parse_basic_command(self, command: str) -> Dict[str, Any]:
         """Parse a BASIC command for execution."""
-        command = command.strip().upper()
-
-        if command.startswith("PRINT"):
-            content = command[5:].strip()
-            return {"type": "print", "content": content}
-        elif command.startswith("LET"):
-            parts = command[3:].strip().split("=", 1)
-            if len(parts) == 2:
-                return {
-                    "type": "assignment",
-                    "variable": parts[0].strip(),
-                    "value": parts[1].strip(),
-                }
-        elif command.startswith("FOR"):
-            return {"type": "loop_start", "command": command}
-        elif command.startswith("NEXT"):
-            return {"type": "loop_end", "command": command}
-        elif command.startswith("IF"):
-            return {"type": "conditional", "command": command}
-        elif command.startswith("GOTO"):
-            return {"type": "goto", "command": command}
-        elif command.startswith("GOSUB"):
-            return {"type": "gosub", "command": command}
-        elif command.startswith("RETURN"):
-            return {"type": "return", "command": command}
-        elif command.startswith("REM"):
-            return {"type": "comment", "command": command}
-        elif command.startswith("DATA"):
-            return {"type": "data", "command": command}
-        elif command.startswith("READ"):
-            return {"type": "read", "command": command}
-        elif command.startswith("END"):
+        try:
+            statement = self.basic_compiler.compile_statement(command)[0]
+        except (BasicSyntaxError, IndexError):
+            return {"type": "unknown", "command": command.strip().upper()}
+
+        return self._describe_statement(statement)
+
+    def _describe_statement(self, statement: Statement) -> Dict[str, Any]:
+        """Build the parsed command description of a compiled statement."""
+        command = canonical_statement_text(statement).upper()
+        op = statement.op
+
+        if op == "PRINT":
+            return {"type": "print", "content": command[5:].strip()}
+        elif op == "LET":
+            variable, value = command[3:].split("=", 1)
+            return {
+                "type": "assignment",
+                "variable": variable.strip(),
+                "value": value.strip(),
+            }
+        elif op == "END":
             return {"type": "end"}
 
-        return {"type": "unknown", "command": command}
+        return {"type": STATEMENT_TYPES.get(op, "unknown"), "command": command}
+
+    def get_cpu_state(self) -> Dict[str, Any]:
+        """Get current CPU state."""
+        if not self.mpu:
+            return {"error": "MPU not initialized"}
+
+        return CpuState.capture(self.mpu).to_dict()
 
-    def _execute_print_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a PRINT command."""
-        content = parsed["content"]
+    def capture_cpu_state(self) -> Optional[CpuState]:
+        """Get the current registers as a compact tuple (None if uninitialized).
 
-        # Remove quotes and process content
-        if content.startswith('"') and content.endswith('"'):
-            content = content[1:-1]
+        Use this when collecting many states; ``CpuState.to_dict`` builds the
+        ``get_cpu_state`` form only when it is needed.
+        """
+        if not self.mpu:
+            return None
+        return CpuState.capture(self.mpu)
 
-        return {"type": "print", "output": content, "success": True}
+    def get_memory_dump(
+        self, start_addr: int = 0x8000, length: int = 256, encoding: str = "dict"
+    ) -> Dict[str, Any]:
+        """Get a memory dump from specified address.
 
-    def _execute_assignment_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a LET command."""
-        variable = parsed["variable"]
-        value = parsed["value"]
+        The default ``dict`` encoding maps each formatted address to its byte
+        value; ``hex`` and ``base64`` return the region as a single blob.
+        """
+        if not self.mpu:
+            return {"error": "MPU not initialized"}
 
-        # Simple variable assignment simulation
         try:
-            # Try to evaluate the value
-            if value.isdigit():
-                numeric_value = int(value)
-            else:
-                numeric_value = 0
+            if encoding != "dict":
+                return self.dump_memory(start_addr, length, encoding)
 
+            data = self.read_memory(start_addr, length)
             return {
-                "type": "assignment",
-                "variable": variable,
-                "value": numeric_value,
-                "success": True,
+                f"0x{addr:04X}": value
+                for addr, value in zip(range(start_addr, start_addr + length), data)
             }
-        except Exception as e:
-            return {"type": "assignment", "error": str(e), "success": False}
 
-    def _execute_end_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute an END command."""
-        self.is_running = False
-        return {"type": "end", "success": True, "message": "Program ended"}
-
-    def _execute_comment_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a REM command (comment)."""
-        return {"type": "comment", "success": True, "message": "Comment ignored"}
+        except ValueError as e:
+            return {"error": str(e)}
 
-    def _execute_loop_start_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a FOR command."""
-        return {"type": "loop_start", "success": True, "message": "Loop started"}
+    def read_memory(self, start_addr: int, length: int) -> bytes:
+        """Read a memory region as raw bytes."""
+        self._check_memory_range(start_addr, length)
+        with self.emulator_logger.time_memory_access():
+            return bytes(self.memory[start_addr : start_addr + length])
 
-    def _execute_loop_end_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a NEXT command."""
-        return {"type": "loop_end", "success": True, "message": "Loop ended"}
+    def dump_memory(
+        self, start_addr: int, length: int, encoding: str = "hex"
+    ) -> Dict[str, Any]:
+        """Dump a memory region as a raw, hex or base64 blob."""
+        data = self.read_memory(start_addr, length)
+
+        if encoding == "raw":
+            blob = data
+        elif encoding == "hex":
+            blob = data.hex()
+        elif encoding == "base64":
+            blob = base64.b64encode(data).decode("ascii")
+        else:
+            raise ValueError(f"Unsupported memory dump encoding: {encoding}")
 
-    def _execute_conditional_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute an IF command."""
         return {
-            "type": "conditional",
-            "success": True,
-            "message": "Conditional executed",
+            "start": start_addr,
+            "length": length,
+            "encoding": encoding,
+            "data": blob,
         }
 
-    def _execute_goto_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a GOTO command."""
-        return {"type": "goto", "success": True, "message": "Jump executed"}
+    def load_memory_image(self, data: bytes, start_addr: int = 0x0000) -> int:
+        """Copy a binary image into memory with a single slice assignment."""
+        self._check_memory_range(start_addr, len(data))
+        self._record("load_memory_image", data, start_addr)
+        with self.emulator_logger.time_memory_access():
+            self.memory[start_addr : start_addr + len(data)] = data
+        return len(data)
+
+    def fill_memory(self, start_addr: int, length: int, value: int = 0x00):
+        """Fill a memory region with a single byte value."""
+        self._check_memory_range(start_addr, length)
+        self._record("fill_memory", start_addr, length, value)
+        with self.emulator_logger.time_memory_access():
+            self.memory[start_addr : start_addr + length] = (
+                bytes((value & 0xFF,)) * length
+            )
 
-    def _execute_gosub_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a GOSUB command."""
-        return {"type": "gosub", "success": True, "message": "Subroutine called"}
+    def copy_memory(self, src_addr: int, dst_addr: int, length: int):
+        """Copy a memory region; overlapping regions are handled correctly."""
+        self._check_memory_range(src_addr, length)
+        self._check_memory_range(dst_addr, length)
+        self._record("copy_memory", src_addr, dst_addr, length)
+        with self.emulator_logger.time_memory_access():
+            self.memory[dst_addr : dst_addr + length] = self.memory[
+                src_addr : src_addr + length
+            ]
 
-    def _execute_return_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a RETURN command."""
-        return {
-            "type": "return",
-            "success": True,
-            "message": "Returned from subroutine",
-        }
+    def send_keys(self, text: str) -> int:
+        """Queue key presses on the keyboard device; returns keys waiting."""
+        if self.keyboard is None:
+            raise RuntimeError("Emulator not initialized")
+        self._record("send_keys", text)
+        return self.keyboard.push_keys(text)
+
+    def get_display_output(self, drain: bool = True) -> str:
+        """Get display output not yet drained, optionally consuming it."""
+        if self.display is None:
+            return ""
+        if drain:
+            return self.display.drain()
+        return self.display.read_since(self.display.read_cursor)
+
+    def watch_memory(self, start_addr: int, length: int) -> MemoryWatcher:
+        """Track a memory region for changes; close the watcher when done."""
+        self._check_memory_range(start_addr, length)
+        return MemoryWatcher(self.memory, start_addr, length)
+
+    def _check_memory_range(self, start_addr: int, length: int):
+        """Validate that a region lies inside the 64K address space."""
+        if self.memory is None:
+            raise ValueError("Memory not initialized")
+        if start_addr < 0 or length < 0 or start_addr + length > ADDRESS_SPACE:
+            raise ValueError(
+                f"Memory range 0x{start_addr:04X}+{length} outside address space"
+            )
 
-    def _execute_data_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a DATA command."""
-        return {"type": "data", "success": True, "message": "Data defined"}
+    def snapshot(self) -> EmulatorSnapshot:
+        """Capture registers, memory, BASIC variables and devices as a snapshot.
 
-    def _execute_read_command(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a READ command."""
-        return {"type": "read", "success": True, "message": "Data read"}
+        Pages unchanged since the previous snapshot are shared with it, so
+        repeated checkpoints of a mostly idle machine stay small.
+        """
+        if not self.mpu:
+            raise RuntimeError("MPU not initialized")
+
+        mpu = self.mpu
+        snapshot = capture_snapshot(
+            self.memory,
+            (mpu.pc, mpu.a, mpu.x, mpu.y, mpu.sp, mpu.p, mpu.processorCycles),
+            parent=self.last_snapshot,
+            basic_state=self.basic_vm.save_state(),
+            devices=self._device_state(),
+        )
+        self.last_snapshot = snapshot
+        return snapshot
+
+    def restore(self, snapshot: EmulatorSnapshot, reset_devices: bool = False) -> bool:
+        """Restore registers and memory from a snapshot.
+
+        Device state captured with the snapshot (queued keys, undrained
+        output, the timer and the ROM BASIC boot) replaces the current one.
+        With ``reset_devices`` everything else a user of the machine may have
+        changed is reset too: device buffers, the ROM BASIC boot, breakpoints
+        and watchpoints and the speed settings, and any trace, profiling or
+        recording is stopped.
+        """
+        try:
+            if not self.mpu:
+                raise RuntimeError("MPU not initialized")
+
+            if reset_devices:
+                self._reset_session_state()
+            if snapshot.devices is not None:
+                # Before memory, which holds the latched key and timer bytes
+                self._load_device_state(snapshot.devices)
+            restore_snapshot(self.memory, snapshot)
+            mpu = self.mpu
+            (
+                mpu.pc,
+                mpu.a,
+                mpu.x,
+                mpu.y,
+                mpu.sp,
+                mpu.p,
+                mpu.processorCycles,
+            ) = snapshot.registers
+            if snapshot.basic_state is not None:
+                self.basic_vm.load_state(snapshot.basic_state)
+            else:
+                self.basic_vm.clear()
+            self.last_snapshot = snapshot
+            self.is_running = False
+            return True
 
-    def get_cpu_state(self) -> Dict[str, Any]:
-        """Get current CPU state."""
+        except Exception as e:
+            logger.error(f"Failed to restore snapshot: {e}")
+            return False
+
+    def _reset_session_state(self):
+        """Reset device state, the debugger, speed settings and running tools."""
+        if self.trace_recorder:
+            self.stop_trace()
+        if self.profiling:
+            self.stop_profiling()
+        if self.recorder:
+            self.stop_recording()
+        self.memory.reset_devices()
+        self.basic_booted = False
+        self.debugger.clear()
+        self.speed_controller.reset_speed()
+
+    def start_trace(
+        self,
+        path: str,
+        record_writes: bool = False,
+        chunk_records: int = DEFAULT_CHUNK_RECORDS,
+    ) -> Dict[str, Any]:
+        """Record every instruction executed from now on into ``path``.
+
+        While tracing, turbo runs step the MPU instead of using the block
+        cache. With ``record_writes`` each record also holds the instruction's
+        memory write.
+        """
         if not self.mpu:
-            return {"error": "MPU not initialized"}
+            return {"error": "Emulator not initialized"}
+        if self.trace_recorder:
+            return {"error": f"Already tracing to {self.trace_recorder.path}"}
+        if self.profiling:
+            return {"error": "Stop profiling before tracing"}
 
-        return {
-            "pc": self.mpu.pc,
-            "a": self.mpu.a,
-            "x": self.mpu.x,
-            "y": self.mpu.y,
-            "sp": self.mpu.sp,
-            "status": self.mpu.p,
-            "flags": {
-                "carry": bool(self.mpu.p & 0x01),
-                "zero": bool(self.mpu.p & 0x02),
-                "interrupt": bool(self.mpu.p & 0x04),
-                "decimal": bool(self.mpu.p & 0x08),
-                "break": bool(self.mpu.p & 0x10),
-                "overflow": bool(self.mpu.p & 0x40),
-                "negative": bool(self.mpu.p & 0x80),
-            },
-        }
+        try:
+            self.trace_recorder = TraceRecorder(
+                self.mpu, self.memory, path, record_writes, chunk_records
+            )
+        except OSError as e:
+            logger.error(f"Failed to start trace: {e}")
+            return {"error": str(e)}
 
-    def get_memory_dump(
-        self, start_addr: int = 0x8000, length: int = 256
+        logger.info(f"Tracing instructions to {path}")
+        return {"error": None, **self.trace_recorder.get_trace_info()}
+
+    def stop_trace(self) -> Dict[str, Any]:
+        """Stop tracing and finish the trace file."""
+        if not self.trace_recorder:
+            return {"error": "Not tracing"}
+
+        recorder, self.trace_recorder = self.trace_recorder, None
+        try:
+            return {"error": None, **recorder.close()}
+        except OSError as e:
+            logger.error(f"Failed to finish trace: {e}")
+            return {"error": str(e)}
+
+    def start_profiling(self, reset: bool = True) -> Dict[str, Any]:
+        """Count executions and cycles per PC from now on.
+
+        Counters carry over from earlier profiling unless ``reset`` is set.
+        """
+        if not self.mpu:
+            return {"error": "Emulator not initialized"}
+        if self.trace_recorder:
+            return {"error": "Stop tracing before profiling"}
+
+        if self.profiler is None or self.profiler.mpu is not self.mpu:
+            self.profiler = Profiler(self.mpu, self.memory)
+        elif reset:
+            self.profiler.reset()
+        self.profiling = True
+        logger.info("Profiling started")
+        return {"error": None, "profiling": True}
+
+    def stop_profiling(self) -> Dict[str, Any]:
+        """Stop counting; the counters stay available for reports."""
+        if not self.profiling:
+            return {"error": "Not profiling"}
+
+        self.profiling = False
+        logger.info(
+            f"Profiling stopped after {self.profiler.instructions} instructions"
+        )
+        return {"error": None, "profiling": False}
+
+    def get_profile_report(self, top: int = 20, text: bool = False) -> Dict[str, Any]:
+        """Top addresses and subroutines by cycles, named from the ROM labels."""
+        if self.profiler is None:
+            return {"error": "No profile recorded"}
+
+        labels = (
+            {name: self.rom.symbols[name] for name in self.rom.labels}
+            if self.rom
+            else None
+        )
+        report = self.profiler.get_report(top, labels)
+        report["profiling"] = self.profiling
+        if text:
+            report["text"] = format_report(report)
+        return report
+
+    def run_until(
+        self, condition: Optional[str] = None, max_cycles: int = 1000000
     ) -> Dict[str, Any]:
-        """Get a memory dump from specified address."""
+        """Run at full speed until a breakpoint, watchpoint or ``condition`` hits.
+
+        Breakpoints and watchpoints are set on ``self.debugger``. Execution is
+        not paced; devices are ticked once per pacing slice of cycles.
+        """
         if not self.mpu:
-            return {"error": "MPU not initialized"}
+            return {"error": "Emulator not initialized"}
+        self._record("run_until", condition, max_cycles)
+
+        hook = self._instruction_hook()
+        step = hook.step if hook else None
+        slice_cycles = max(1, self.speed_controller.get_slice_cycles())
+        output_mark = self.display.total_written
+        start_cycles = self.mpu.processorCycles
+        steps = 0
+        results = {"stop_reason": "cycle_limit", "pc": self.mpu.pc, "error": None}
+
+        self.is_running = True
+        with self.performance_monitor.time_operation("run_until"):
+            while True:
+                remaining = max_cycles - (self.mpu.processorCycles - start_cycles)
+                if remaining <= 0:
+                    break
+                slice_start = time.perf_counter()
+                results = self.debugger.run_until(
+                    condition, min(slice_cycles, remaining), step
+                )
+                self._log_slice(results["steps_executed"], slice_start)
+                steps += results["steps_executed"]
+                self.memory.tick(self.mpu.processorCycles)
+                if results["stop_reason"] != "cycle_limit":
+                    break
+        self.is_running = False
+
+        results["steps_executed"] = steps
+        results["cycles_executed"] = self.mpu.processorCycles - start_cycles
+        results["output"] = self.display.read_since(output_mark)
+        if results["stop_reason"] in ("breakpoint", "watchpoint", "condition"):
+            logger.info(f"Stopped on {results['stop_reason']} at 0x{results['pc']:04X}")
+        return results
+
+    def start_recording(self, path: str) -> Dict[str, Any]:
+        """Record the current state and every input event from now on.
 
-        dump = {}
-        for i in range(length):
-            addr = start_addr + i
-            dump[f"0x{addr:04X}"] = self.mpu.memory[addr]
+        Inputs are BASIC commands and programs, keys, program runs, memory
+        loads and speed changes made through this class; registers or memory
+        changed directly are not recorded.
+        """
+        if not self.mpu:
+            return {"error": "Emulator not initialized"}
+        if self.recorder:
+            return {"error": f"Already recording to {self.recorder.path}"}
+
+        try:
+            self.recorder = SessionRecorder(path, self.snapshot(), self._device_state())
+        except OSError as e:
+            logger.error(f"Failed to start recording: {e}")
+            return {"error": str(e)}
+
+        logger.info(f"Recording session to {path}")
+        return {"error": None, **self.recorder.get_recording_info()}
+
+    def stop_recording(self) -> Dict[str, Any]:
+        """Stop recording and seal the file with the final state digest."""
+        if not self.recorder:
+            return {"error": "Not recording"}
 
-        return dump
+        recorder, self.recorder = self.recorder, None
+        try:
+            return {"error": None, **recorder.close(state_digest(self))}
+        except OSError as e:
+            logger.error(f"Failed to finish recording: {e}")
+            return {"error": str(e)}
+
+    def replay_recording(self, path: str) -> Dict[str, Any]:
+        """Replay a recording on this emulator at maximum speed.
+
+        ``deterministic`` in the result says whether the final state matches
+        the one the recording was sealed with.
+        """
+        if not self.mpu:
+            return {"error": "Emulator not initialized"}
+        if self.recorder:
+            return {"error": "Stop recording before replaying"}
+
+        try:
+            recording = SessionRecording(path)
+        except (OSError, ValueError) as e:
+            return {"error": str(e)}
+
+        logger.info(f"Replaying {len(recording)} events from {path}")
+        return replay_session(self, recording)
+
+    def restore_recording_state(self, snapshot: EmulatorSnapshot, devices) -> bool:
+        """Restore a recording's starting snapshot and device state."""
+        return self.restore(replace(snapshot, devices=devices))
+
+    def _device_state(self) -> Dict[str, Any]:
+        """Device state kept outside memory, as snapshots and recordings hold it."""
+        display = self.display
+        return {
+            "keys": list(self.keyboard.keys),
+            "output": display.read_since(display.read_cursor),
+            "timer_base_cycles": self.timer.base_cycles,
+            "timer_last_cycles": self.timer.last_cycles,
+            "basic_booted": self.basic_booted,
+        }
+
+    def _load_device_state(self, devices: Dict[str, Any]):
+        """Reset the devices to the state ``_device_state`` returned."""
+        self.memory.reset_devices()
+        self.keyboard.keys.extend(devices.get("keys", ()))
+        self.display.load_pending(devices.get("output", ""))
+        self.timer.base_cycles = devices.get("timer_base_cycles", 0)
+        self.timer.last_cycles = devices.get("timer_last_cycles", 0)
+        self.basic_booted = devices.get("basic_booted", False)
+
+    def _record(self, method: str, *args):
+        """Append an input event to the recording, if one is running."""
+        if self.recorder:
+            self.recorder.record(method, *args)
+
+    def _log_slice(self, steps: int, start_time: float):
+        """Record the instruction time of a slice or batch started at ``start_time``."""
+        self.emulator_logger.log_instructions(
+            steps, (time.perf_counter() - start_time) * 1000
+        )
+
+    def _instruction_hook(self):
+        """The trace recorder or profiler that must step every instruction."""
+        if self.trace_recorder:
+            return self.trace_recorder
+        if self.profiling:
+            return self.profiler
+        return None
 
     def reset_emulator(self) -> bool:
         """Reset the emulator to initial state."""
+        self._record("reset_emulator")
         try:
             if self.mpu:
                 self.mpu.reset()
+                self.memory.reset_devices()
             self.is_running = False
+            self.basic_booted = False
             logger.info("Emulator reset successfully")
             return True
         except Exception as e:
@@ -437,6 +1230,17 @@ class M6502Emulator:
             "is_running": self.is_running,
             "cpu_initialized": self.mpu is not None,
             "memory_initialized": self.mpu is not None,
+            "devices": self.memory.get_bus_info()["devices"] if self.mpu else [],
+            "rom": self.rom.get_image_info() if self.rom else None,
+            "basic_booted": self.basic_booted,
+            "trace": (
+                self.trace_recorder.get_trace_info() if self.trace_recorder else None
+            ),
+            "profiling": self.profiling,
+            "recording": (
+                self.recorder.get_recording_info() if self.recorder else None
+            ),
+            "debugger": self.debugger.get_debugger_info() if self.debugger else None,
         }
 
     def get_performance_stats(self) -> Dict[str, Any]:
@@ -449,17 +1253,30 @@ class M6502Emulator:
                 "current_multiplier": self.speed_controller.current_multiplier,
                 "cycle_delay_ms": self.speed_controller.cycle_delay_ms,
                 "step_delay_ms": self.speed_controller.step_delay_ms,
+                **self.speed_controller.get_pacing_stats(),
             },
+            "block_cache": (
+                self.block_cache.get_cache_stats() if self.block_cache else None
+            ),
         }
 
     def set_speed_multiplier(self, multiplier: float):
         """Set the speed multiplier."""
+        self._record("set_speed_multiplier", multiplier)
         self.speed_controller.set_speed_multiplier(multiplier)
 
+    def set_throttled(self, throttled: bool):
+        """Enable or disable real-time pacing to the target CPU speed."""
+        self._record("set_throttled", throttled)
+        self.speed_controller.set_throttled(throttled)
+
     def reset_performance_stats(self):
         """Reset performance statistics."""
         self.emulator_logger.reset_performance_stats()
         self.performance_monitor.reset_performance_data()
+        self.speed_controller.reset_pacing_stats()
+        if self.block_cache:
+            self.block_cache.reset_stats()
         logger.info("Performance statistics reset")
 
     def get_logging_config(self) -> Dict[str, Any]:
@@ -0,0 +1,434 @@
+"""
+Memory Bus Module
+
+This module provides the emulator's memory-mapped I/O bus. The bus is the flat
+64K memory handed to the Py65 MPU; reads stay native bytearray operations while
+CPU writes landing on a device's address range are forwarded to that device as
+they happen. The standard devices are a display at $2000-$20FF that feeds an
+output ring buffer, a keyboard at $2100-$2101 and a jiffy timer at $2110-$2112.
+A ROM device write-protects a loaded image such as the BASIC interpreter.
+
+Pages can also be tracked for changes: every write to a tracked page bumps
+that page's version, so a memory viewer only has to compare the pages whose
+version moved since it last looked.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+PAGE_SHIFT = 8
+PAGE_COUNT = 0x100
+
+# Default device addresses
+DISPLAY_START = 0x2000
+DISPLAY_END = 0x20FF
+KEYBOARD_DATA = 0x2100
+KEYBOARD_STATUS = 0x2101
+TIMER_START = 0x2110
+
+# Keyboard status bit set while a key is waiting in the data register
+KEY_READY = 0x80
+
+# Control characters the display passes through besides printable ASCII
+DISPLAY_CONTROL_CHARACTERS = frozenset({0x0A, 0x0D})
+
+
+class BusDevice:
+    """Base class for devices mapped into an address range on the bus."""
+
+    name = "device"
+
+    def __init__(self, start: int, end: int):
+        """Map the device to ``start``..``end`` inclusive."""
+        self.start = start
+        self.end = end
+        self.bus: Optional["MemoryBus"] = None
+
+    def attach(self, bus: "MemoryBus"):
+        """Called when the device is attached to a bus."""
+        self.bus = bus
+
+    def on_write(self, address: int, value: int):
+        """Handle a CPU write to one of the device's addresses."""
+
+    def tick(self, cycles: int):
+        """Advance device time to the CPU's ``processorCycles``."""
+
+    def reset(self):
+        """Reset device state."""
+
+    def get_device_info(self) -> Dict[str, Any]:
+        """Get information about the device."""
+        return {
+            "name": self.name,
+            "start": f"0x{self.start:04X}",
+            "end": f"0x{self.end:04X}",
+        }
+
+
+class MemoryBus(bytearray):
+    """Flat 64K memory that dispatches CPU writes to mapped devices.
+
+    Only single-byte writes (the ones the MPU performs) reach devices. Slice
+    writes such as image loads, fills and snapshot restores update memory
+    without device side effects. Either kind of write to a page holding cached
+    code is reported through ``on_code_write``. Slice writes bump the version
+    of every page they touch, tracked or not.
+    """
+
+    def __init__(self, size: int):
+        """Create zeroed memory with no devices attached."""
+        super().__init__(size)
+        self.devices: List[BusDevice] = []
+        self.device_pages = bytearray(PAGE_COUNT)
+        self.page_devices: List[List[BusDevice]] = [[] for _ in range(PAGE_COUNT)]
+
+        # Write observer for pages holding cached basic blocks
+        self.code_pages = bytearray(PAGE_COUNT)
+        self.on_code_write: Optional[Callable[[int], None]] = None
+
+        # Observer for CPU writes to chosen pages (tracing, watchpoints)
+        self.on_write: Optional[Callable[[int, int], None]] = None
+        self.observed_pages = bytearray(PAGE_COUNT)
+
+        # Change tracking: trackers per page and a write version per page
+        self.page_trackers = [0] * PAGE_COUNT
+        self.tracked_pages = bytearray(PAGE_COUNT)
+        self.page_versions = [0] * PAGE_COUNT
+
+        # Pages with a device, cached code, an observer or a tracker, so a CPU
+        # write to ordinary RAM costs a single lookup
+        self.watched_pages = bytearray(PAGE_COUNT)
+
+    def __setitem__(self, index, value):
+        """Write memory and notify devices and the code observer."""
+        bytearray.__setitem__(self, index, value)
+
+        if type(index) is int:
+            if self.watched_pages[index >> PAGE_SHIFT]:
+                self._notify_write(index, value)
+            return
+
+        # Slice writes (bulk loads, fills, snapshot restores)
+        start, stop, _ = index.indices(len(self))
+        if stop <= start:
+            return
+        pages = range(start >> PAGE_SHIFT, ((stop - 1) >> PAGE_SHIFT) + 1)
+        versions = self.page_versions
+        for page in pages:
+            versions[page] += 1
+        if not self.on_code_write:
+            return
+        for page in pages:
+            if self.code_pages[page]:
+                self.on_code_write(page)
+
+    def _notify_write(self, address: int, value: int):
+        """Dispatch a CPU write on a watched page."""
+        page = address >> PAGE_SHIFT
+        if self.tracked_pages[page]:
+            self.page_versions[page] += 1
+        if self.observed_pages[page]:
+            self.on_write(address, value)
+        if self.device_pages[page]:
+            for device in self.page_devices[page]:
+                if device.start <= address <= device.end:
+                    device.on_write(address, value)
+        if self.code_pages[page] and self.on_code_write:
+            self.on_code_write(page)
+
+    def set_code_page(self, page: int, cached: bool):
+        """Mark whether ``page`` holds cached code."""
+        self.code_pages[page] = 1 if cached else 0
+        self._update_watched_page(page)
+
+    def clear_code_pages(self):
+        """Mark every page as free of cached code."""
+        self.code_pages[:] = bytes(PAGE_COUNT)
+        for page in range(PAGE_COUNT):
+            self._update_watched_page(page)
+
+    def set_write_observer(
+        self,
+        observer: Optional[Callable[[int, int], None]],
+        pages: Optional[Iterable[int]] = None,
+    ):
+        """Report CPU writes to ``observer``, or stop with ``None``.
+
+        Only writes to ``pages`` are reported, every page by default. Writes
+        to an observed page take the slower notification path.
+        """
+        self.on_write = observer
+        self.observed_pages[:] = bytes(PAGE_COUNT)
+        if observer:
+            for page in range(PAGE_COUNT) if pages is None else pages:
+                self.observed_pages[page] = 1
+        for page in range(PAGE_COUNT):
+            self._update_watched_page(page)
+
+    def track_pages(self, pages: Iterable[int]):
+        """Start counting writes to ``pages`` in ``page_versions``."""
+        for page in pages:
+            self.page_trackers[page] += 1
+            self.tracked_pages[page] = 1
+            self._update_watched_page(page)
+
+    def untrack_pages(self, pages: Iterable[int]):
+        """Undo one ``track_pages`` call for ``pages``."""
+        for page in pages:
+            self.page_trackers[page] = max(0, self.page_trackers[page] - 1)
+            self.tracked_pages[page] = 1 if self.page_trackers[page] else 0
+            self._update_watched_page(page)
+
+    def _update_watched_page(self, page: int):
+        """Recompute whether writes to ``page`` need notification."""
+        self.watched_pages[page] = (
+            self.device_pages[page]
+            | self.code_pages[page]
+            | self.observed_pages[page]
+            | self.tracked_pages[page]
+        )
+
+    def poke(self, address: int, value: int):
+        """Write a device register without triggering observers."""
+        bytearray.__setitem__(self, address, value)
+        if self.tracked_pages[address >> PAGE_SHIFT]:
+            self.page_versions[address >> PAGE_SHIFT] += 1
+
+    def attach(self, device: BusDevice) -> BusDevice:
+        """Map a device into its address range."""
+        self.devices.append(device)
+        for page in range(device.start >> PAGE_SHIFT, (device.end >> PAGE_SHIFT) + 1):
+            self.page_devices[page].append(device)
+            self.device_pages[page] = 1
+            self._update_watched_page(page)
+        device.attach(self)
+        return device
+
+    def detach(self, device: BusDevice):
+        """Unmap a device."""
+        self.devices.remove(device)
+        for page in range(device.start >> PAGE_SHIFT, (device.end >> PAGE_SHIFT) + 1):
+            self.page_devices[page].remove(device)
+            self.device_pages[page] = 1 if self.page_devices[page] else 0
+            self._update_watched_page(page)
+        device.bus = None
+
+    def tick(self, cycles: int):
+        """Advance every device to ``cycles``."""
+        for device in self.devices:
+            device.tick(cycles)
+
+    def reset_devices(self):
+        """Reset every attached device."""
+        for device in self.devices:
+            device.reset()
+
+    def get_bus_info(self) -> Dict[str, Any]:
+        """Get information about the attached devices."""
+        return {
+            "devices": [device.get_device_info() for device in self.devices],
+            "code_pages": sum(self.code_pages),
+            "tracked_pages": sum(self.tracked_pages),
+        }
+
+
+class DisplayDevice(BusDevice):
+    """Character display; each write to the region emits one character."""
+
+    name = "display"
+
+    def __init__(
+        self,
+        start: int = DISPLAY_START,
+        end: int = DISPLAY_END,
+        buffer_size: int = 4096,
+    ):
+        """Create a display with an output ring of ``buffer_size`` characters."""
+        super().__init__(start, end)
+        self.output = deque(maxlen=buffer_size)
+        self.total_written = 0
+        self.read_cursor = 0
+        self.listeners: List[Callable[[], None]] = []
+
+    def on_write(self, address: int, value: int):
+        """Append printable characters to the output ring."""
+        if 32 <= value <= 126 or value in DISPLAY_CONTROL_CHARACTERS:
+            self.output.append(chr(value))
+            self.total_written += 1
+
+            # Wake listeners only when output becomes available
+            if self.total_written - self.read_cursor == 1:
+                for listener in self.listeners:
+                    listener()
+
+    def read_since(self, mark: int) -> str:
+        """Characters written since ``total_written`` was ``mark``."""
+        oldest = self.total_written - len(self.output)
+        skip = max(mark, oldest) - oldest
+        return "".join(list(self.output)[skip:])
+
+    def drain(self) -> str:
+        """Return the characters not yet drained and advance the read cursor."""
+        text = self.read_since(self.read_cursor)
+        self.read_cursor = self.total_written
+        return text
+
+    def pending(self) -> int:
+        """Number of characters waiting to be drained."""
+        return min(self.total_written - self.read_cursor, len(self.output))
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Call ``listener`` whenever undrained output becomes available."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]):
+        """Stop notifying ``listener``."""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def reset(self):
+        """Clear the output ring."""
+        self.output.clear()
+        self.read_cursor = self.total_written
+
+    def load_pending(self, text: str):
+        """Queue ``text`` as undrained output, as if it had just been written."""
+        self.output.extend(text)
+        self.total_written += len(text)
+
+    def get_device_info(self) -> Dict[str, Any]:
+        """Get display buffer information."""
+        return {
+            **super().get_device_info(),
+            "buffer_size": self.output.maxlen,
+            "total_written": self.total_written,
+            "pending": self.pending(),
+        }
+
+
+class KeyboardDevice(BusDevice):
+    """Keyboard with a data register and a status register.
+
+    While a key is waiting, the status register has ``KEY_READY`` set and the
+    data register holds its code. Writing the status register acknowledges
+    the key and loads the next one.
+    """
+
+    name = "keyboard"
+
+    def __init__(self, data: int = KEYBOARD_DATA, status: int = KEYBOARD_STATUS):
+        """Map the keyboard's data and status registers."""
+        super().__init__(data, status)
+        self.data_address = data
+        self.status_address = status
+        self.keys = deque()
+
+    def push_keys(self, text: str) -> int:
+        """Queue key presses; returns the number of keys waiting."""
+        for char in text.replace("\n", "\r"):
+            self.keys.append(ord(char) & 0x7F)
+        if self.bus is not None and not self.bus[self.status_address] & KEY_READY:
+            self._load_next_key()
+        return len(self.keys)
+
+    def on_write(self, address: int, value: int):
+        """Acknowledge the current key on a status register write."""
+        if address == self.status_address:
+            self._load_next_key()
+
+    def _load_next_key(self):
+        """Move the next queued key into the data register."""
+        if self.keys:
+            self.bus.poke(self.data_address, self.keys.popleft())
+            self.bus.poke(self.status_address, KEY_READY)
+        else:
+            self.bus.poke(self.status_address, 0)
+
+    def reset(self):
+        """Drop queued keys."""
+        self.keys.clear()
+        if self.bus is not None:
+            self.bus.poke(self.data_address, 0)
+            self.bus.poke(self.status_address, 0)
+
+    def get_device_info(self) -> Dict[str, Any]:
+        """Get keyboard queue information."""
+        return {**super().get_device_info(), "queued_keys": len(self.keys)}
+
+
+class TimerDevice(BusDevice):
+    """24-bit jiffy clock counting 1/60 s of emulated time.
+
+    The count is refreshed whenever the bus is ticked (at time slice and turbo
+    batch boundaries). Writing any timer register restarts the count at zero.
+    """
+
+    name = "timer"
+
+    def __init__(self, start: int = TIMER_START, cpu_speed: int = 1000000):
+        """Map the three counter bytes (little endian) at ``start``."""
+        super().__init__(start, start + 2)
+        self.cycles_per_jiffy = max(1, cpu_speed // 60)
+        self.base_cycles = 0
+        self.last_cycles = 0
+
+    def on_write(self, address: int, value: int):
+        """Restart the count from the last observed cycle."""
+        self.base_cycles = self.last_cycles
+        self._store(0)
+
+    def tick(self, cycles: int):
+        """Refresh the counter registers from the CPU cycle count."""
+        self.last_cycles = cycles
+        self._store((cycles - self.base_cycles) // self.cycles_per_jiffy)
+
+    def _store(self, jiffies: int):
+        """Write the jiffy count into the counter registers."""
+        for offset in range(3):
+            self.bus.poke(self.start + offset, (jiffies >> (8 * offset)) & 0xFF)
+
+    def reset(self):
+        """Restart the count."""
+        self.base_cycles = self.last_cycles
+        if self.bus is not None:
+            self._store(0)
+
+
+class RomDevice(BusDevice):
+    """Read-only memory holding an image; CPU writes to it are discarded.
+
+    The image is copied onto the bus with a single slice write when the
+    device is attached and again on reset.
+    """
+
+    name = "rom"
+
+    def __init__(self, start: int, image: bytes):
+        """Map ``image`` read-only at ``start``."""
+        super().__init__(start, start + len(image) - 1)
+        self.image = bytes(image)
+        self.discarded_writes = 0
+
+    def attach(self, bus: "MemoryBus"):
+        """Copy the image onto the bus."""
+        super().attach(bus)
+        bus[self.start : self.end + 1] = self.image
+
+    def on_write(self, address: int, value: int):
+        """Put back the byte the CPU overwrote."""
+        self.bus.poke(address, self.image[address - self.start])
+        self.discarded_writes += 1
+
+    def reset(self):
+        """Restore the image over anything written with bulk writes."""
+        if self.bus is not None:
+            self.bus[self.start : self.end + 1] = self.image
+
+    def get_device_info(self) -> Dict[str, Any]:
+        """Get ROM information."""
+        return {
+            **super().get_device_info(),
+            "size": len(self.image),
+            "discarded_writes": self.discarded_writes,
+        }
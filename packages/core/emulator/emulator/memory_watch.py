@@ -0,0 +1,126 @@
+"""
+Memory Watch Module
+
+This module reports what changed in a region of emulator memory. A watcher
+tracks the pages of its region on the memory bus and keeps a shadow copy of
+the region. Asking for changes only compares the pages whose write version
+moved since the last call, and returns the changed bytes as (address, bytes)
+runs. Runs separated by a few unchanged bytes are merged, since a short gap
+costs less to resend than a new run.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from engine.emulator.memory_bus import PAGE_SHIFT, MemoryBus
+
+# Unchanged bytes a run may span before it is split in two
+DEFAULT_RUN_GAP = 8
+
+
+def changed_spans(
+    old: bytes, new: bytes, base: int = 0, gap: int = DEFAULT_RUN_GAP
+) -> List[List[int]]:
+    """Address spans ``[start, end)`` where ``new`` differs from ``old``."""
+    spans: List[List[int]] = []
+    for offset, (before, after) in enumerate(zip(old, new)):
+        if before == after:
+            continue
+        address = base + offset
+        if spans and address - spans[-1][1] <= gap:
+            spans[-1][1] = address + 1
+        else:
+            spans.append([address, address + 1])
+    return spans
+
+
+class MemoryWatcher:
+    """Tracks changes to one address range of a memory bus."""
+
+    def __init__(
+        self, memory: MemoryBus, start: int, length: int, gap: int = DEFAULT_RUN_GAP
+    ):
+        """Watch ``length`` bytes at ``start``, starting from their current value."""
+        if start < 0 or length <= 0 or start + length > len(memory):
+            raise ValueError(f"Memory range 0x{start:04X}+{length} outside memory")
+        self.memory = memory
+        self.start = start
+        self.end = start + length
+        self.gap = gap
+        self.pages = range(start >> PAGE_SHIFT, ((self.end - 1) >> PAGE_SHIFT) + 1)
+        self.shadow = bytearray(memory[start : self.end])
+        self.versions = [memory.page_versions[page] for page in self.pages]
+        self.closed = False
+        memory.track_pages(self.pages)
+
+        self.stats = {
+            "polls": 0,
+            "pages_compared": 0,
+            "changes": 0,
+            "runs": 0,
+            "bytes_changed": 0,
+        }
+
+    @property
+    def length(self) -> int:
+        """Size of the watched range in bytes."""
+        return self.end - self.start
+
+    def changes(self) -> List[Tuple[int, bytes]]:
+        """Runs of bytes written since the last call, as (address, bytes)."""
+        self.stats["polls"] += 1
+        memory = self.memory
+        versions = memory.page_versions
+        spans: List[List[int]] = []
+
+        for index, page in enumerate(self.pages):
+            version = versions[page]
+            if version == self.versions[index]:
+                continue
+            self.versions[index] = version
+            self.stats["pages_compared"] += 1
+
+            low = max(self.start, page << PAGE_SHIFT)
+            high = min(self.end, (page + 1) << PAGE_SHIFT)
+            current = memory[low:high]
+            offset = low - self.start
+            previous = self.shadow[offset : offset + high - low]
+            if current == previous:
+                continue
+            self.shadow[offset : offset + high - low] = current
+
+            for span in changed_spans(previous, current, low, self.gap):
+                # Join runs across page boundaries as well
+                if spans and span[0] - spans[-1][1] <= self.gap:
+                    spans[-1][1] = span[1]
+                else:
+                    spans.append(span)
+
+        if not spans:
+            return []
+        runs = [(low, bytes(memory[low:high])) for low, high in spans]
+        self.stats["changes"] += 1
+        self.stats["runs"] += len(runs)
+        self.stats["bytes_changed"] += sum(len(data) for _, data in runs)
+        return runs
+
+    def read(self) -> bytes:
+        """The whole watched range as it is now, resynchronizing the shadow."""
+        data = bytes(self.memory[self.start : self.end])
+        self.shadow[:] = data
+        self.versions = [self.memory.page_versions[page] for page in self.pages]
+        return data
+
+    def close(self):
+        """Stop tracking the range's pages."""
+        if not self.closed:
+            self.memory.untrack_pages(self.pages)
+            self.closed = True
+
+    def get_watch_info(self) -> Dict[str, Any]:
+        """Get information about the watched range."""
+        return {
+            "start": f"0x{self.start:04X}",
+            "length": self.length,
+            "pages": len(self.pages),
+            **self.stats,
+        }
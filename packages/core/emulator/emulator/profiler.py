@@ -0,0 +1,212 @@
+"""
+Emulator Profiler Module
+
+This module finds the hot spots in emulated 6502 code. While profiling, every
+instruction is stepped through the profiler, which adds one execution and the
+instruction's cycles to flat 64K-entry counters indexed by PC. JSR targets get
+their own counters for calls and inclusive cycles, measured from the JSR to
+the RTS that returns past it. Reports resolve addresses to the nearest label
+from the assembled ROM's symbol table.
+"""
+
+import heapq
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+ADDRESS_SPACE = 0x10000
+
+JSR_OPCODE = 0x20
+RTS_OPCODE = 0x60
+
+# Labels further than this before an address are not used to name it
+MAX_SYMBOL_OFFSET = 0x100
+
+
+def _counters() -> array:
+    """A zeroed 64K-entry counter array."""
+    return array("Q", bytes(8 * ADDRESS_SPACE))
+
+
+class SymbolTable:
+    """Resolves addresses to ``LABEL`` or ``LABEL+offset``."""
+
+    def __init__(self, symbols: Optional[Dict[str, int]] = None):
+        """Index ``symbols`` by address; the first name in order wins."""
+        by_address: Dict[int, str] = {}
+        for name in sorted(symbols or {}):
+            address = symbols[name]
+            if 0 <= address < ADDRESS_SPACE:
+                by_address.setdefault(address, name)
+        self.addresses = sorted(by_address)
+        self.names = [by_address[address] for address in self.addresses]
+
+    def resolve(self, address: int) -> Optional[str]:
+        """Name of the label at or before ``address``, if one is close enough."""
+        index = bisect_right(self.addresses, address) - 1
+        if index < 0:
+            return None
+        offset = address - self.addresses[index]
+        if offset > MAX_SYMBOL_OFFSET:
+            return None
+        name = self.names[index]
+        return f"{name}+{offset}" if offset else name
+
+
+class Profiler:
+    """Counts executions and cycles per PC and per JSR target."""
+
+    def __init__(self, mpu, memory):
+        """Create empty counters for ``mpu``."""
+        self.mpu = mpu
+        self.memory = memory
+        self.executions = _counters()
+        self.cycles = _counters()
+        self.calls = _counters()
+        self.call_cycles = _counters()
+        # Open subroutine calls: (target, cycles at the JSR, SP before the JSR)
+        self.frames: List[Tuple[int, int, int]] = []
+        self.instructions = 0
+        self.total_cycles = 0
+        self.last_steps = 0
+        self.start_time = time.time()
+
+    def reset(self):
+        """Clear all counters."""
+        self.executions = _counters()
+        self.cycles = _counters()
+        self.calls = _counters()
+        self.call_cycles = _counters()
+        self.frames = []
+        self.instructions = 0
+        self.total_cycles = 0
+        self.start_time = time.time()
+
+    def step(self):
+        """Execute and count one instruction."""
+        self.run(1)
+
+    def run(self, max_steps: int) -> int:
+        """Execute and count ``max_steps`` instructions.
+
+        If an instruction raises, the instructions completed before it are
+        counted and left in ``last_steps``.
+        """
+        mpu = self.mpu
+        memory = self.memory
+        step = mpu.step
+        executions = self.executions
+        cycles = self.cycles
+        calls = self.calls
+        call_cycles = self.call_cycles
+        frames = self.frames
+        start_cycles = mpu.processorCycles
+        steps = 0
+
+        try:
+            while steps < max_steps:
+                pc = mpu.pc
+                before = mpu.processorCycles
+                opcode = memory[pc]
+                if opcode == JSR_OPCODE:
+                    target = memory[(pc + 1) & 0xFFFF] | memory[(pc + 2) & 0xFFFF] << 8
+                    # Close calls whose return address is no longer on the
+                    # stack, so code that resets SP cannot grow the frames
+                    sp = mpu.sp
+                    while frames and frames[-1][2] <= sp:
+                        stale, entered, _ = frames.pop()
+                        call_cycles[stale] += before - entered
+                    frames.append((target, before, sp))
+                    calls[target] += 1
+
+                step()
+                after = mpu.processorCycles
+                executions[pc] += 1
+                cycles[pc] += after - before
+                steps += 1
+
+                # Close every call the RTS returned past, including frames the
+                # routine dropped from the stack itself
+                if opcode == RTS_OPCODE:
+                    sp = mpu.sp
+                    while frames and frames[-1][2] <= sp:
+                        target, entered, _ = frames.pop()
+                        call_cycles[target] += after - entered
+        finally:
+            self.last_steps = steps
+            self.instructions += steps
+            self.total_cycles += mpu.processorCycles - start_cycles
+
+        return steps
+
+    def get_report(
+        self, top: int = 20, symbols: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Top ``top`` addresses by cycles, and top subroutines by inclusive cycles."""
+        table = SymbolTable(symbols)
+        total = self.total_cycles or 1
+
+        hot_spots = [
+            {
+                "address": f"0x{address:04X}",
+                "symbol": table.resolve(address),
+                "executions": self.executions[address],
+                "cycles": self.cycles[address],
+                "percent": round(100.0 * self.cycles[address] / total, 2),
+            }
+            for address in self._top(self.cycles, top)
+        ]
+        routines = [
+            {
+                "address": f"0x{address:04X}",
+                "symbol": table.resolve(address),
+                "calls": self.calls[address],
+                "cycles": self.call_cycles[address],
+                "percent": round(100.0 * self.call_cycles[address] / total, 2),
+            }
+            for address in self._top(self.call_cycles, top)
+        ]
+
+        return {
+            "instructions": self.instructions,
+            "cycles": self.total_cycles,
+            "hot_spots": hot_spots,
+            "routines": routines,
+            "open_calls": len(self.frames),
+            "duration": time.time() - self.start_time,
+        }
+
+    @staticmethod
+    def _top(counters: array, count: int) -> List[int]:
+        """Addresses of the ``count`` largest non-zero counters."""
+        return heapq.nlargest(
+            count,
+            (address for address in range(ADDRESS_SPACE) if counters[address]),
+            key=counters.__getitem__,
+        )
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a profile report as text tables."""
+    lines = [
+        f"{report['instructions']} instructions, {report['cycles']} cycles",
+        "",
+        f"{'ADDRESS':<8} {'SYMBOL':<16} {'EXECUTIONS':>12} {'CYCLES':>12} {'%':>7}",
+    ]
+    for row in report["hot_spots"]:
+        lines.append(
+            f"{row['address']:<8} {row['symbol'] or '':<16} {row['executions']:>12} "
+            f"{row['cycles']:>12} {row['percent']:>7.2f}"
+        )
+
+    lines += [
+        "",
+        f"{'ROUTINE':<8} {'SYMBOL':<16} {'CALLS':>12} {'CYCLES':>12} {'%':>7}",
+    ]
+    for row in report["routines"]:
+        lines.append(
+            f"{row['address']:<8} {row['symbol'] or '':<16} {row['calls']:>12} "
+            f"{row['cycles']:>12} {row['percent']:>7.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,294 @@
+"""
+Session Recording Module
+
+This module records an emulator session so it can be replayed exactly. A
+recording is an append-only file that starts with a snapshot of the machine
+(registers, paged memory, BASIC interpreter state and device state) followed
+by the ordered input events: BASIC commands and programs, key presses,
+program runs, memory loads and speed changes. Each event is a 13-byte header
+and a short JSON argument list, written and flushed as it happens, so a
+recording cut short by a crash still replays up to its last event. Replay
+restores the snapshot and re-issues the events unthrottled; because emulated
+time is derived from the cycle count the machine ends in the same state,
+which the final state digest confirms.
+
+Recordings contain pickled interpreter state and must only be loaded from
+trusted sources.
+"""
+
+import base64
+import hashlib
+import json
+import pickle
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from loguru import logger
+
+RECORDING_MAGIC = b"6502RPLY"
+RECORDING_VERSION = 1
+
+# File header: magic, version, reserved
+FILE_HEADER = struct.Struct("<8sHH")
+
+# Event header: kind, seconds since recording started, payload length
+EVENT_HEADER = struct.Struct("<BdI")
+
+EVENT_SNAPSHOT = 0
+EVENT_END = 1
+
+# Recorded calls; an event's kind is CALL_KIND_BASE plus the method's index,
+# so new methods go at the end.
+RECORDED_METHODS = (
+    "execute_basic_command",
+    "send_keys",
+    "send_basic_input",
+    "execute_program",
+    "run_until",
+    "load_memory_image",
+    "fill_memory",
+    "copy_memory",
+    "set_speed_multiplier",
+    "set_throttled",
+    "reset_emulator",
+    "load_basic_program",
+)
+CALL_KIND_BASE = 16
+
+
+class RecordedEvent(NamedTuple):
+    """One recorded input event."""
+
+    offset: float
+    method: str
+    args: Tuple[Any, ...]
+
+
+def _encode_arg(value: Any) -> Any:
+    """Make bytes arguments JSON-safe."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def _decode_arg(value: Any) -> Any:
+    """Undo ``_encode_arg``."""
+    if isinstance(value, dict) and "$bytes" in value:
+        return base64.b64decode(value["$bytes"])
+    return value
+
+
+def state_digest(emulator) -> str:
+    """Hash of the registers, memory and BASIC variables of ``emulator``."""
+    mpu = emulator.mpu
+    digest = hashlib.sha256()
+    digest.update(
+        struct.pack(
+            "<HBBBBBQ", mpu.pc, mpu.a, mpu.x, mpu.y, mpu.sp, mpu.p, mpu.processorCycles
+        )
+    )
+    digest.update(emulator.memory)
+    variables = emulator.basic_vm.variables
+    digest.update(repr(sorted(variables.items())).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SessionRecorder:
+    """Appends a session's starting state and input events to a file."""
+
+    def __init__(self, path: Union[str, Path], snapshot, devices: Dict[str, Any]):
+        """Create the recording and write the starting state."""
+        self.path = Path(path)
+        self.events = 0
+        self.bytes_written = 0
+        self.closed = False
+        self.start_time = time.perf_counter()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "wb")
+        self._write(FILE_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, 0))
+        state = pickle.dumps(
+            {"snapshot": snapshot, "devices": devices},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self._write_event(EVENT_SNAPSHOT, zlib.compress(state))
+
+    def record(self, method: str, *args):
+        """Append a call of ``method`` with ``args`` and flush it."""
+        if self.closed:
+            return
+        payload = json.dumps(
+            [_encode_arg(arg) for arg in args], separators=(",", ":")
+        ).encode("utf-8")
+        self._write_event(CALL_KIND_BASE + RECORDED_METHODS.index(method), payload)
+        self.events += 1
+
+    def close(self, digest: Optional[str] = None) -> Dict[str, Any]:
+        """Write the end marker with the final state digest and close."""
+        if not self.closed:
+            end = json.dumps({"digest": digest, "events": self.events})
+            self._write_event(EVENT_END, end.encode("utf-8"))
+            self.file.close()
+            self.closed = True
+            logger.info(f"Recording written: {self.events} events to {self.path}")
+        return self.get_recording_info()
+
+    def _write_event(self, kind: int, payload: bytes):
+        """Append one event and flush it to the file."""
+        offset = time.perf_counter() - self.start_time
+        self._write(EVENT_HEADER.pack(kind, offset, len(payload)) + payload)
+        self.file.flush()
+
+    def _write(self, data: bytes):
+        """Write to the file, counting the bytes."""
+        self.file.write(data)
+        self.bytes_written += len(data)
+
+    def get_recording_info(self) -> Dict[str, Any]:
+        """Get information about the recording."""
+        return {
+            "path": str(self.path),
+            "events": self.events,
+            "bytes": self.bytes_written,
+            "duration": time.perf_counter() - self.start_time,
+            "closed": self.closed,
+        }
+
+
+class SessionRecording:
+    """A recording loaded back from its file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Read the starting state and every complete event."""
+        self.path = Path(path)
+        data = self.path.read_bytes()
+        if len(data) < FILE_HEADER.size:
+            raise ValueError(f"Not a recording: {self.path}")
+        magic, version, _ = FILE_HEADER.unpack_from(data, 0)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"Not a recording: {self.path}")
+        if version != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {version}: {self.path}")
+
+        self.snapshot = None
+        self.devices: Dict[str, Any] = {}
+        self.events: List[RecordedEvent] = []
+        self.end: Optional[Dict[str, Any]] = None
+
+        position = FILE_HEADER.size
+        while position + EVENT_HEADER.size <= len(data):
+            kind, offset, length = EVENT_HEADER.unpack_from(data, position)
+            start = position + EVENT_HEADER.size
+            payload = data[start : start + length]
+            if len(payload) < length:
+                # Last event was cut off mid-write
+                break
+            position = start + length
+
+            if kind == EVENT_SNAPSHOT:
+                state = pickle.loads(zlib.decompress(payload))
+                self.snapshot = state["snapshot"]
+                self.devices = state["devices"]
+            elif kind == EVENT_END:
+                self.end = json.loads(payload)
+            else:
+                method = RECORDED_METHODS[kind - CALL_KIND_BASE]
+                args = tuple(_decode_arg(arg) for arg in json.loads(payload))
+                self.events.append(RecordedEvent(offset, method, args))
+
+        if self.snapshot is None:
+            raise ValueError(f"Recording has no starting state: {self.path}")
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def get_recording_info(self) -> Dict[str, Any]:
+        """Get information about the recording."""
+        return {
+            "path": str(self.path),
+            "events": len(self.events),
+            "duration": self.events[-1].offset if self.events else 0.0,
+            "complete": self.end is not None,
+            "methods": sorted({event.method for event in self.events}),
+        }
+
+
+class SessionReplay:
+    """Re-issues a recording's events on an emulator, one at a time.
+
+    ``start`` restores the starting state and turns pacing off, ``apply``
+    runs one event and ``finish`` restores pacing and compares the final
+    state with the recorded digest. Callers that replay some events their
+    own way (the bridge sends its commands back through its pipeline) call
+    ``apply`` only for the rest and ``add_result`` for theirs.
+    """
+
+    def __init__(self, emulator, recording: SessionRecording):
+        """Prepare to replay ``recording`` on ``emulator``."""
+        self.emulator = emulator
+        self.recording = recording
+        self.results: List[Dict[str, Any]] = []
+        self.was_throttled = emulator.speed_controller.throttled
+        self.start_time = 0.0
+
+    def start(self) -> bool:
+        """Restore the starting state and run unthrottled."""
+        recording = self.recording
+        if not self.emulator.restore_recording_state(
+            recording.snapshot, recording.devices
+        ):
+            return False
+        self.emulator.set_throttled(False)
+        self.start_time = time.perf_counter()
+        return True
+
+    def apply(self, event: RecordedEvent) -> Any:
+        """Apply one event to the emulator; throttling stays off."""
+        if event.method == "set_throttled":
+            result = None
+        else:
+            result = getattr(self.emulator, event.method)(*event.args)
+        return self.add_result(event, result)
+
+    def add_result(self, event: RecordedEvent, result: Any) -> Any:
+        """Record the result of a replayed event."""
+        self.results.append({"method": event.method, "result": result})
+        return result
+
+    def finish(self, error: Optional[str] = None) -> Dict[str, Any]:
+        """Restore pacing and report how the replay compares."""
+        duration = time.perf_counter() - self.start_time
+        self.emulator.set_throttled(self.was_throttled)
+
+        events = self.recording.events
+        digest = state_digest(self.emulator)
+        expected = self.recording.end["digest"] if self.recording.end else None
+        return {
+            "error": error,
+            "events_replayed": len(self.results),
+            "duration": duration,
+            "recorded_duration": events[-1].offset if events else 0.0,
+            "digest": digest,
+            "expected_digest": expected,
+            "deterministic": None if expected is None else digest == expected,
+            "results": self.results,
+        }
+
+
+def replay_session(emulator, recording: SessionRecording) -> Dict[str, Any]:
+    """Replay every event of ``recording`` on ``emulator`` back to back."""
+    replay = SessionReplay(emulator, recording)
+    if not replay.start():
+        return {"error": "Failed to restore the recorded starting state"}
+
+    error = None
+    try:
+        for event in recording.events:
+            replay.apply(event)
+    except Exception as e:
+        error = str(e)
+        logger.error(f"Replay failed at event {len(replay.results)}: {e}")
+    return replay.finish(error)
@@ -0,0 +1,166 @@
+"""
+Emulator Snapshot Module
+
+This module provides checkpointing for the 6502 emulator. A snapshot captures
+the CPU registers plus the full 64K address space stored as 256-byte pages,
+and optionally the interpreter and device state kept outside memory.
+Pages are immutable and shared copy-on-write between snapshots, so a snapshot
+of a mostly-unchanged machine only costs the pages that actually differ.
+
+Snapshots can be encoded to bytes relative to a base snapshot, storing only
+the pages that differ from it. The encoding records a digest of the base, and
+decoding against any other base is refused rather than splicing the stored
+pages into the wrong machine. Encoded snapshots contain pickled interpreter
+state and must only be decoded from trusted sources.
+"""
+
+import hashlib
+import pickle
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+PAGE_SIZE = 0x100
+PAGE_COUNT = 0x100
+
+# Shared all-zero page; most of a freshly initialized machine points here
+ZERO_PAGE_BYTES = bytes(PAGE_SIZE)
+
+# Register order used in EmulatorSnapshot.registers
+REGISTER_NAMES = ("pc", "a", "x", "y", "sp", "p", "processorCycles")
+
+SNAPSHOT_ENCODING_VERSION = 2
+
+
+@dataclass(frozen=True)
+class EmulatorSnapshot:
+    """Immutable checkpoint of CPU registers and paged memory."""
+
+    registers: Tuple[int, ...]
+    pages: Tuple[bytes, ...]
+    new_pages: int = 0
+    # BASIC interpreter program and variables, if captured
+    basic_state: Optional[Dict[str, Any]] = None
+    # Queued keys, undrained output, timer and boot state, if captured
+    devices: Optional[Dict[str, Any]] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def memory_bytes(self) -> bytes:
+        """Reassemble the full 64K memory image."""
+        return b"".join(self.pages)
+
+    def get_register(self, name: str) -> int:
+        """Get a register value by name."""
+        return self.registers[REGISTER_NAMES.index(name)]
+
+    def shared_pages(self, other: "EmulatorSnapshot") -> int:
+        """Count pages physically shared with another snapshot."""
+        return sum(1 for a, b in zip(self.pages, other.pages) if a is b)
+
+    def get_snapshot_info(self) -> Dict[str, Any]:
+        """Get size and sharing information about this snapshot."""
+        return {
+            "registers": dict(zip(REGISTER_NAMES, self.registers)),
+            "new_pages": self.new_pages,
+            "new_bytes": self.new_pages * PAGE_SIZE,
+            "zero_pages": sum(1 for page in self.pages if page is ZERO_PAGE_BYTES),
+            "timestamp": self.timestamp,
+        }
+
+
+def capture_snapshot(
+    memory: bytearray,
+    registers: Tuple[int, ...],
+    parent: Optional[EmulatorSnapshot] = None,
+    basic_state: Optional[Dict[str, Any]] = None,
+    devices: Optional[Dict[str, Any]] = None,
+) -> EmulatorSnapshot:
+    """Capture memory and registers, sharing unchanged pages with ``parent``."""
+    view = memoryview(memory)
+    parent_pages = parent.pages if parent is not None else None
+    pages = []
+    new_pages = 0
+
+    for index in range(PAGE_COUNT):
+        start = index * PAGE_SIZE
+        chunk = view[start : start + PAGE_SIZE]
+
+        if parent_pages is not None and parent_pages[index] == chunk:
+            pages.append(parent_pages[index])
+        elif chunk == ZERO_PAGE_BYTES:
+            pages.append(ZERO_PAGE_BYTES)
+        else:
+            pages.append(bytes(chunk))
+            new_pages += 1
+
+    view.release()
+    return EmulatorSnapshot(
+        registers=tuple(registers),
+        pages=tuple(pages),
+        new_pages=new_pages,
+        basic_state=basic_state,
+        devices=devices,
+    )
+
+
+def restore_snapshot(memory: bytearray, snapshot: EmulatorSnapshot):
+    """Copy a snapshot's pages back into memory in one bulk assignment."""
+    memory[:] = snapshot.memory_bytes()
+
+
+def base_digest(base: Optional[EmulatorSnapshot] = None) -> str:
+    """Fingerprint of the base pages an encoded snapshot is relative to."""
+    digest = hashlib.sha256(f"snapshot-v{SNAPSHOT_ENCODING_VERSION}".encode())
+    if base is not None:
+        for page in base.pages:
+            digest.update(page)
+    return digest.hexdigest()
+
+
+def encode_snapshot(
+    snapshot: EmulatorSnapshot, base: Optional[EmulatorSnapshot] = None
+) -> bytes:
+    """Encode a snapshot, keeping only the pages that differ from ``base``."""
+    base_pages = base.pages if base is not None else (ZERO_PAGE_BYTES,) * PAGE_COUNT
+    pages = {
+        index: page
+        for index, (page, base_page) in enumerate(zip(snapshot.pages, base_pages))
+        if page is not base_page and page != base_page
+    }
+    state = {
+        "version": SNAPSHOT_ENCODING_VERSION,
+        "base_digest": base_digest(base),
+        "registers": snapshot.registers,
+        "pages": pages,
+        "basic_state": snapshot.basic_state,
+        "devices": snapshot.devices,
+        "timestamp": snapshot.timestamp,
+    }
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def decode_snapshot(
+    data: bytes, base: Optional[EmulatorSnapshot] = None
+) -> EmulatorSnapshot:
+    """Decode ``encode_snapshot`` output against the same base snapshot.
+
+    Pages not stored in the data are shared with ``base``. Raises ValueError
+    if the data was encoded against a different base or encoding version.
+    """
+    state = pickle.loads(zlib.decompress(data))
+    if state.get("version") != SNAPSHOT_ENCODING_VERSION:
+        raise ValueError(f"Unsupported snapshot encoding: {state.get('version')}")
+    if state.get("base_digest") != base_digest(base):
+        raise ValueError("Snapshot was encoded against a different base")
+
+    base_pages = base.pages if base is not None else (ZERO_PAGE_BYTES,) * PAGE_COUNT
+    stored = state["pages"]
+    return EmulatorSnapshot(
+        registers=tuple(state["registers"]),
+        pages=tuple(stored.get(index, page) for index, page in enumerate(base_pages)),
+        new_pages=len(stored),
+        basic_state=state["basic_state"],
+        devices=state.get("devices"),
+        timestamp=state["timestamp"],
+    )
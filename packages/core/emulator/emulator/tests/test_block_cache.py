@@ -0,0 +1,150 @@
+"""
+Block Cache Tests
+
+Test suite for the cached basic-block execution engine.
+"""
+
+import pytest
+from py65.devices import mpu6502
+
+from engine.emulator.block_cache import BlockCache
+from engine.emulator.memory_bus import MemoryBus
+from engine.emulator.m6502_emulator import M6502Emulator
+
+# Loop with a backward branch, indexed stores and a subroutine call
+LOOP_PROGRAM = bytes(
+    [
+        0xA2, 0x20,  # $0600 LDX #$20
+        0xA9, 0x00,  # $0602 LDA #$00
+        0x18,  # $0604 CLC
+        0x69, 0x03,  # $0605 ADC #$03
+        0x9D, 0x00, 0x03,  # $0607 STA $0300,X
+        0xCA,  # $060A DEX
+        0xD0, 0xF8,  # $060B BNE $0605
+        0x20, 0x13, 0x06,  # $060D JSR $0613
+        0x4C, 0x00, 0x06,  # $0610 JMP $0600
+        0xE8,  # $0613 INX
+        0x60,  # $0614 RTS
+    ]
+)  # fmt: skip
+
+# Stores an INX opcode over the NOP later in its own block
+SELF_MODIFYING_PROGRAM = bytes(
+    [
+        0xA9, 0xE8,  # $0700 LDA #$E8
+        0x8D, 0x06, 0x07,  # $0702 STA $0706
+        0xC8,  # $0705 INY
+        0xEA,  # $0706 NOP (patched to INX)
+        0x4C, 0x00, 0x07,  # $0707 JMP $0700
+    ]
+)  # fmt: skip
+
+
+def make_machine(program: bytes, start: int, cached: bool):
+    """Create an MPU with ``program`` loaded at ``start``."""
+    memory = MemoryBus(0x10000) if cached else bytearray(0x10000)
+    memory[start : start + len(program)] = program
+    mpu = mpu6502.MPU(memory=memory, pc=start)
+    cache = BlockCache(mpu, memory) if cached else None
+    return mpu, memory, cache
+
+
+def machine_state(mpu, memory):
+    """Registers, cycle count and memory of a machine."""
+    registers = (mpu.pc, mpu.a, mpu.x, mpu.y, mpu.sp, mpu.p)
+    return registers, mpu.processorCycles, bytes(memory)
+
+
+class TestBlockCacheParity:
+    """Cached execution must match MPU.step() exactly."""
+
+    @pytest.mark.parametrize(
+        "program,start",
+        [(LOOP_PROGRAM, 0x0600), (SELF_MODIFYING_PROGRAM, 0x0700)],
+    )
+    def test_matches_step(self, program, start):
+        """Test registers, cycles and memory match plain stepping."""
+        mpu, memory, _ = make_machine(program, start, cached=False)
+        for _ in range(5000):
+            mpu.step()
+
+        cached_mpu, cached_memory, cache = make_machine(program, start, cached=True)
+        assert cache.run(5000) == 5000
+
+        assert machine_state(cached_mpu, cached_memory) == machine_state(mpu, memory)
+
+    def test_self_modifying_code_invalidates(self):
+        """Test a write into a cached block takes effect immediately."""
+        mpu, _, cache = make_machine(SELF_MODIFYING_PROGRAM, 0x0700, cached=True)
+
+        cache.run(5)
+
+        assert mpu.x == 1
+        assert cache.stats["invalidations"] >= 1
+
+
+class TestBlockCache:
+    """Test cache bookkeeping."""
+
+    def test_hot_loop_hits(self):
+        """Test re-executing a loop is served from the cache."""
+        _, _, cache = make_machine(LOOP_PROGRAM, 0x0600, cached=True)
+
+        cache.run(10000)
+
+        stats = cache.get_cache_stats()
+        assert stats["blocks"] == 5
+        assert stats["misses"] == 5
+        assert cache.get_hit_rate() > 0.99
+
+    def test_run_stops_mid_block(self):
+        """Test a step budget ending inside a block is honoured."""
+        mpu, _, cache = make_machine(LOOP_PROGRAM, 0x0600, cached=True)
+
+        assert cache.run(3) == 3
+        assert mpu.pc == 0x0605
+
+    def test_bulk_write_invalidates_page(self):
+        """Test slice writes drop blocks on the written pages."""
+        _, memory, cache = make_machine(LOOP_PROGRAM, 0x0600, cached=True)
+        cache.run(100)
+        assert cache.blocks
+
+        memory[0x0600:0x0602] = b"\xa2\x10"
+
+        assert not cache.blocks
+        assert memory.code_pages[0x06] == 0
+
+    def test_data_writes_elsewhere_keep_cache(self):
+        """Test writes outside code pages leave blocks intact."""
+        _, memory, cache = make_machine(LOOP_PROGRAM, 0x0600, cached=True)
+        cache.run(100)
+        blocks = len(cache.blocks)
+
+        memory[0x0300] = 0x42
+
+        assert len(cache.blocks) == blocks
+
+
+class TestEmulatorBlockCache:
+    """Test the block cache through M6502Emulator turbo mode."""
+
+    def test_turbo_with_block_cache(self):
+        """Test turbo execution with the cache matches plain turbo."""
+        plain = M6502Emulator()
+        plain.initialize_emulator()
+        plain.load_basic_program("")
+        expected = plain.execute_program(1000, turbo=True)
+
+        emulator = M6502Emulator()
+        emulator.block_cache_enabled = True
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+        result = emulator.execute_program(1000, turbo=True)
+
+        assert result["steps_executed"] == 1000
+        assert result["cpu_state"] == expected["cpu_state"]
+        assert emulator.read_memory(0x2000, 5) == b"Hello"
+
+        stats = emulator.get_performance_stats()["block_cache"]
+        assert stats["hit_rate"] > 0.9
@@ -0,0 +1,123 @@
+"""
+CPU State Tests
+
+Test suite for compact CPU states and their delta encoding.
+"""
+
+import asyncio
+
+from bridge.translators.emulator_integration import EmulatorIntegration
+from engine.emulator.cpu_state import (
+    CpuState,
+    decode_cpu_state_deltas,
+    encode_cpu_state_deltas,
+    expand_cpu_states,
+)
+from engine.emulator.m6502_emulator import M6502Emulator
+
+
+class TestCpuState:
+    """Test capturing and encoding CPU states."""
+
+    def test_to_dict_matches_get_cpu_state(self):
+        """Test the expanded form is the one get_cpu_state returns."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.mpu.p = 0x83
+
+        state = emulator.capture_cpu_state()
+
+        assert state.to_dict() == emulator.get_cpu_state()
+        assert state.to_dict()["flags"]["negative"] is True
+        assert "flags" not in state.to_dict(flags=False)
+
+    def test_deltas_round_trip(self):
+        """Test deltas list only changed registers and decode to the states."""
+        states = [
+            CpuState(0x0600, 0, 0, 0, 0xFF, 0x20),
+            CpuState(0x0602, 0, 3, 0, 0xFF, 0x20),
+            CpuState(0x0602, 0, 3, 0, 0xFF, 0x20),
+        ]
+
+        deltas = encode_cpu_state_deltas(states)
+
+        assert deltas[0] == states[0]._asdict()
+        assert deltas[1] == {"pc": 0x0602, "x": 3}
+        assert deltas[2] == {}
+        assert decode_cpu_state_deltas(deltas) == states
+        assert expand_cpu_states(states[:1]) == [states[0].to_dict()]
+
+
+class TestCommandSequenceStates:
+    """Test CPU states in command sequence results."""
+
+    def test_states_are_delta_encoded_unless_included(self):
+        """Test full states are only built when asked for."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        integration = EmulatorIntegration(emulator)
+        commands = ["LET X = 1", "LET Y = 2", "PRINT X + Y"]
+
+        compact = asyncio.run(integration.execute_command_sequence(commands))
+        full = asyncio.run(
+            integration.execute_command_sequence(commands, include=("cpu_states",))
+        )
+
+        assert "cpu_states" not in compact
+        assert len(compact["cpu_state_deltas"]) == 3
+        assert compact["cpu_state_deltas"][1] == {}
+        assert full["cpu_states"] == [emulator.get_cpu_state()] * 3
+        assert integration.last_cpu_state == emulator.capture_cpu_state()
+
+    def test_command_state_dict_only_when_included(self):
+        """Test a single command builds its state dict only when asked for."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        integration = EmulatorIntegration(emulator)
+
+        plain = asyncio.run(integration._execute_single_command("LET X = 1", 1))
+        full = asyncio.run(
+            integration._execute_single_command("LET X = 1", 2, ("cpu_states",))
+        )
+
+        assert "cpu_state" not in plain
+        assert full["cpu_state"] == integration.last_cpu_state._asdict()
+
+
+class TestExecutionStates:
+    """Test CPU states requested from program and command execution."""
+
+    def test_program_states(self):
+        """Test a run returns a delta per step, or per batch in turbo mode."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        # $0600 LDX #$00; $0602 INX; JMP $0602
+        emulator.load_memory_image(bytes([0xA2, 0x00, 0xE8, 0x4C, 0x02, 0x06]), 0x0600)
+        emulator.mpu.pc = 0x0600
+
+        plain = emulator.execute_program(3, turbo=False)
+        stepped = emulator.execute_program(4, turbo=False, include=("cpu_states",))
+        turbo = emulator.execute_program(
+            40, turbo=True, batch_size=10, include=("cpu_states",)
+        )
+
+        assert "cpu_state_deltas" not in plain
+        states = decode_cpu_state_deltas(stepped["cpu_state_deltas"])
+        assert [state.x for state in states] == [2, 2, 3, 3]
+        batches = decode_cpu_state_deltas(turbo["cpu_state_deltas"])
+        assert len(batches) == turbo["batches"]
+        assert batches[-1]._asdict() == turbo["cpu_state"]
+
+    def test_command_states(self):
+        """Test commands report the state after each one when asked."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        single = emulator.execute_basic_command("LET X = 1", include=("cpu_states",))
+        batch = emulator.execute_basic_commands(
+            ["LET X = 1", "PRINT 1/0", "PRINT X"], include=("cpu_states",)
+        )
+
+        assert single["cpu_state"] == emulator.get_cpu_state()
+        assert len(batch["cpu_state_deltas"]) == batch["executed"] == 2
+        assert "cpu_state_deltas" not in emulator.execute_basic_commands(["PRINT X"])
@@ -0,0 +1,149 @@
+"""
+Debugger Tests
+
+Test suite for breakpoints, watchpoints, conditions and run-until execution.
+"""
+
+import pytest
+from py65.devices import mpu6502
+
+from engine.emulator.debugger import ConditionError, Debugger, compile_condition
+from engine.emulator.memory_bus import MemoryBus
+from engine.emulator.m6502_emulator import M6502Emulator
+
+# Counts X down from 3, storing it and reading it back, then loops forever
+COUNT_PROGRAM = bytes(
+    [
+        0xA2, 0x03,  # $0600 LDX #$03
+        0x86, 0x10,  # $0602 STX $10
+        0xA5, 0x10,  # $0604 LDA $10
+        0xCA,  # $0606 DEX
+        0xD0, 0xF9,  # $0607 BNE $0602
+        0x4C, 0x09, 0x06,  # $0609 JMP $0609
+    ]
+)  # fmt: skip
+
+
+def make_debugger():
+    """A debugger on an MPU about to run the count program."""
+    memory = MemoryBus(0x10000)
+    memory[0x0600 : 0x0600 + len(COUNT_PROGRAM)] = COUNT_PROGRAM
+    mpu = mpu6502.MPU(memory=memory, pc=0x0600)
+    return Debugger(mpu, memory)
+
+
+class TestConditions:
+    """Test compiling condition expressions."""
+
+    def test_registers_flags_and_memory(self):
+        """Test conditions see registers, flags and memory."""
+        memory = MemoryBus(0x10000)
+        memory[0x1234] = 0x42
+        mpu = mpu6502.MPU(memory=memory, pc=0x0600)
+        mpu.a = 0xFF
+        mpu.p |= mpu.ZERO
+
+        assert compile_condition("a == $FF and z")(mpu, memory)
+        assert compile_condition("mem[$1234] == 0x42")(mpu, memory)
+        assert not compile_condition("PC > $0600 or not z")(mpu, memory)
+
+    def test_rejects_unsafe_syntax(self):
+        """Test anything but the expression language is refused."""
+        for text in ("__import__('os')", "a.real", "foo == 1", "a ==", "'x'"):
+            with pytest.raises(ConditionError):
+                compile_condition(text)
+
+
+class TestDebugger:
+    """Test stopping execution on breakpoints and watchpoints."""
+
+    def test_breakpoint_and_continue(self):
+        """Test a run stops at a breakpoint and the next run moves past it."""
+        debugger = make_debugger()
+        debugger.add_breakpoint(0x0606)
+
+        first = debugger.run_until()
+        second = debugger.run_until()
+
+        assert first["stop_reason"] == "breakpoint"
+        assert first["pc"] == 0x0606
+        assert first["steps_executed"] == 3
+        assert second["steps_executed"] == 4
+        assert debugger.breakpoint_info[0x0606]["hits"] == 2
+
+    def test_conditional_breakpoint(self):
+        """Test a conditional breakpoint only stops when its condition holds."""
+        debugger = make_debugger()
+        debugger.add_breakpoint(0x0606, "x == 1")
+
+        result = debugger.run_until()
+
+        assert result["stop_reason"] == "breakpoint"
+        assert debugger.mpu.x == 1
+        assert debugger.add_breakpoint(0x0606, "q == 1")["error"]
+
+    def test_write_watchpoint(self):
+        """Test a write stops after the writing instruction."""
+        debugger = make_debugger()
+        debugger.add_watchpoint(0x10, kind="write")
+
+        result = debugger.run_until()
+
+        assert result["stop_reason"] == "watchpoint"
+        assert result["hit"] == {"access": "write", "address": "0x0010", "value": 3}
+        assert result["pc"] == 0x0604
+        assert debugger.memory.on_write is None
+        assert not any(debugger.memory.watched_pages)
+
+    def test_read_watchpoint(self):
+        """Test a read stops after the reading instruction, not the store."""
+        debugger = make_debugger()
+        debugger.add_watchpoint(0x0F, 0x10, kind="read")
+
+        result = debugger.run_until()
+
+        assert result["hit"]["access"] == "read"
+        assert result["pc"] == 0x0606
+        assert debugger.remove_watchpoint(0x0F, 0x10, kind="read")
+        assert not any(debugger.read_watch)
+
+    def test_condition_and_cycle_limit(self):
+        """Test a run-until condition and the cycle budget."""
+        debugger = make_debugger()
+
+        hit = debugger.run_until("x == 0")
+        spin = debugger.run_until(max_cycles=30)
+
+        assert hit["stop_reason"] == "condition"
+        assert hit["pc"] == 0x0607
+        assert spin["stop_reason"] == "cycle_limit"
+        assert spin["cycles_executed"] >= 30
+
+
+class TestEmulatorRunUntil:
+    """Test run-until through the emulator."""
+
+    def test_run_until_breakpoint(self):
+        """Test the emulator stops on a breakpoint and reports its output."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_memory_image(COUNT_PROGRAM, 0x0600)
+        emulator.mpu.pc = 0x0600
+        emulator.debugger.add_breakpoint(0x0609)
+
+        result = emulator.run_until(max_cycles=10000)
+
+        assert result["stop_reason"] == "breakpoint"
+        assert result["output"] == ""
+        assert emulator.mpu.x == 0
+        assert emulator.get_emulator_info()["debugger"]["breakpoints"][0]["hits"] == 1
+
+    def test_write_watch_conflicts_with_write_trace(self, tmp_path):
+        """Test write watchpoints need the bus observer a write trace holds."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.debugger.add_watchpoint(0x10)
+        emulator.start_trace(str(tmp_path / "t.trc"), record_writes=True)
+
+        assert emulator.run_until(max_cycles=100)["stop_reason"] == "error"
+        emulator.stop_trace()
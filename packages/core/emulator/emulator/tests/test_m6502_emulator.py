@@ -74,6 +74,47 @@ class TestM6502Emulator:
         assert result["steps_executed"] > 0
         assert result["steps_executed"] <= 10
 
+    def test_execute_program_turbo(self):
+        """Test batched turbo execution."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+
+        result = emulator.execute_program(1000, turbo=True, batch_size=300)
+
+        assert result["turbo"] is True
+        assert result["steps_executed"] == 1000
+        assert result["batches"] == 4
+        assert result["error"] is None
+        assert result["cpu_state"]["pc"] == emulator.mpu.pc
+
+    def test_turbo_matches_normal_execution(self):
+        """Test turbo mode ends in the same CPU state as normal mode."""
+        normal = M6502Emulator()
+        normal.initialize_emulator()
+        normal.load_basic_program("")
+        normal.execute_program(37)
+
+        turbo = M6502Emulator()
+        turbo.initialize_emulator()
+        turbo.load_basic_program("")
+        turbo.execute_program(37, turbo=True, batch_size=10)
+
+        assert turbo.get_cpu_state() == normal.get_cpu_state()
+
+    def test_execution_records_instruction_times(self):
+        """Test normal and turbo runs feed the instruction latency histogram."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+
+        emulator.execute_program(10)
+        emulator.execute_program(1000, turbo=True, batch_size=300)
+
+        stats = emulator.get_performance_stats()["emulator_logger"]
+        assert stats["instruction_count"] == 1010
+        assert stats["latency"]["instruction"]["p50_ms"] > 0
+
     def test_execute_print_command(self):
         """Test PRINT command execution."""
         emulator = M6502Emulator()
@@ -83,7 +124,7 @@ class TestM6502Emulator:
         result = emulator.execute_basic_command('PRINT "Hello World"')
 
         assert result["type"] == "print"
-        assert result["output"] == "HELLO WORLD"
+        assert result["output"] == "Hello World"
         assert result["success"] is True
 
     def test_execute_let_command(self):
@@ -112,6 +153,30 @@ class TestM6502Emulator:
         assert result["message"] == "Program ended"
         assert emulator.is_running is False
 
+    def test_execute_basic_commands(self):
+        """Test executing commands in order, stopping at the first error."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        result = emulator.execute_basic_commands(
+            ["LET X = 2", "PRINT X * 3", "PRINT 1/0", "LET X = 9"]
+        )
+
+        assert result["success"] is False
+        assert result["executed"] == 3
+        assert result["failed_index"] == 2
+        assert result["results"][1]["output"] == " 6"
+        assert result["results"][2]["error"] == "DIVISION BY ZERO ERROR"
+        assert emulator.execute_basic_command("PRINT X")["output"] == " 2"
+
+        result = emulator.execute_basic_commands(
+            ["FOO", "LET X = 9"], stop_on_error=False
+        )
+
+        assert result["executed"] == 2
+        assert result["failed_index"] == 0
+        assert emulator.execute_basic_command("PRINT X")["output"] == " 9"
+
     def test_parse_basic_command(self):
         """Test BASIC command parsing."""
         emulator = M6502Emulator()
@@ -177,6 +242,46 @@ class TestM6502Emulator:
         for addr, value in dump.items():
             assert 0 <= value <= 255
 
+    def test_bulk_memory_operations(self):
+        """Test bulk load, fill, copy and read of memory regions."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        assert emulator.load_memory_image(b"\x01\x02\x03\x04", 0x3000) == 4
+        emulator.fill_memory(0x3004, 4, 0xEE)
+        emulator.copy_memory(0x3000, 0x3002, 6)
+
+        assert emulator.read_memory(0x3000, 8) == b"\x01\x02\x01\x02\x03\x04\xee\xee"
+        assert emulator.mpu.memory[0x3007] == 0xEE
+
+    def test_memory_dump_encodings(self):
+        """Test hex and base64 memory dumps."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_memory_image(b"Hello", 0x2000)
+
+        hex_dump = emulator.get_memory_dump(0x2000, 5, encoding="hex")
+        assert hex_dump["data"] == "48656c6c6f"
+        assert hex_dump["start"] == 0x2000
+        assert hex_dump["length"] == 5
+
+        b64_dump = emulator.get_memory_dump(0x2000, 5, encoding="base64")
+        assert b64_dump["data"] == "SGVsbG8="
+
+        raw_dump = emulator.dump_memory(0x2000, 5, encoding="raw")
+        assert raw_dump["data"] == b"Hello"
+
+    def test_memory_range_validation(self):
+        """Test out-of-range memory access is rejected."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        with pytest.raises(ValueError):
+            emulator.load_memory_image(b"\x00\x00", 0xFFFF)
+
+        dump = emulator.get_memory_dump(0xFFF0, 32)
+        assert "error" in dump
+
     def test_reset_emulator(self):
         """Test emulator reset."""
         emulator = M6502Emulator()
@@ -258,7 +363,7 @@ class TestM6502Emulator:
         # Test with whitespace
         result = emulator.execute_basic_command('  PRINT "Hello"  ')
         assert result["success"] is True
-        assert result["output"] == "HELLO"
+        assert result["output"] == "Hello"
 
     def test_complex_command_execution(self):
         """Test complex command execution."""
@@ -268,13 +373,13 @@ class TestM6502Emulator:
         # Test complex PRINT command
         result = emulator.execute_basic_command('PRINT "Value: "; X; " units"')
         assert result["success"] is True
-        assert result["output"] == 'VALUE: "; X; " UNITS'
+        assert result["output"] == "Value:  0  units"
 
         # Test complex LET command
         result = emulator.execute_basic_command("LET Y = X * 2 + 1")
         assert result["success"] is True
         assert result["variable"] == "Y"
-        assert result["value"] == 0  # Non-numeric value defaults to 0
+        assert result["value"] == 1  # Unset X evaluates to 0
 
     def test_emulator_settings_integration(self):
         """Test integration with settings system."""
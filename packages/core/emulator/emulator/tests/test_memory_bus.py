@@ -0,0 +1,234 @@
+"""
+Memory Bus Tests
+
+Test suite for the memory-mapped I/O bus and its standard devices.
+"""
+
+import asyncio
+import threading
+
+from py65.devices import mpu6502
+
+from bridge.translators.emulator_integration import EmulatorIntegration
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.memory_bus import (
+    KEY_READY,
+    DisplayDevice,
+    KeyboardDevice,
+    MemoryBus,
+    RomDevice,
+    TimerDevice,
+)
+
+# Echoes keyboard input to the display until RETURN is typed
+ECHO_PROGRAM = bytes(
+    [
+        0xAD, 0x01, 0x21,  # $0600 LDA $2101
+        0x10, 0xFB,  # $0603 BPL $0600
+        0xAD, 0x00, 0x21,  # $0605 LDA $2100
+        0x8D, 0x01, 0x21,  # $0608 STA $2101 (acknowledge)
+        0xC9, 0x0D,  # $060B CMP #$0D
+        0xF0, 0x06,  # $060D BEQ $0615
+        0x8D, 0x00, 0x20,  # $060F STA $2000
+        0x4C, 0x00, 0x06,  # $0612 JMP $0600
+        0x4C, 0x15, 0x06,  # $0615 JMP $0615
+    ]
+)  # fmt: skip
+
+
+def make_bus():
+    """Create a bus with the standard devices attached."""
+    bus = MemoryBus(0x10000)
+    display = bus.attach(DisplayDevice())
+    keyboard = bus.attach(KeyboardDevice())
+    timer = bus.attach(TimerDevice(cpu_speed=60000))
+    return bus, display, keyboard, timer
+
+
+class TestDisplayDevice:
+    """Test the write-trapped display buffer."""
+
+    def test_cpu_writes_reach_display(self):
+        """Test single-byte writes to the display region emit characters."""
+        bus, display, _, _ = make_bus()
+
+        bus[0x2000] = ord("H")
+        bus[0x20FF] = ord("i")
+        bus[0x2100] = ord("!")  # Keyboard register, not display
+
+        assert display.drain() == "Hi"
+        assert display.drain() == ""
+
+    def test_bulk_writes_bypass_display(self):
+        """Test slice writes update memory without emitting output."""
+        bus, display, _, _ = make_bus()
+
+        bus[0x2000:0x2005] = b"Hello"
+
+        assert bytes(bus[0x2000:0x2005]) == b"Hello"
+        assert display.pending() == 0
+
+    def test_non_printable_bytes_are_dropped(self):
+        """Test control bytes other than CR/LF are not emitted."""
+        bus, display, _, _ = make_bus()
+
+        for value in (0x00, 0x41, 0x07, 0x0D):
+            bus[0x2000] = value
+
+        assert display.drain() == "A\r"
+
+    def test_ring_buffer_keeps_latest_output(self):
+        """Test an overflowing ring keeps the newest characters."""
+        bus = MemoryBus(0x10000)
+        display = bus.attach(DisplayDevice(buffer_size=4))
+
+        for char in "abcdef":
+            bus[0x2000] = ord(char)
+
+        assert display.read_since(0) == "cdef"
+        assert display.read_since(4) == "ef"
+
+    def test_listener_wakes_once_per_drain(self):
+        """Test listeners fire only when output becomes available."""
+        bus, display, _, _ = make_bus()
+        calls = []
+        display.add_listener(lambda: calls.append(1))
+
+        bus[0x2000] = ord("a")
+        bus[0x2000] = ord("b")
+        display.drain()
+        bus[0x2000] = ord("c")
+
+        assert len(calls) == 2
+
+
+class TestKeyboardDevice:
+    """Test the keyboard registers."""
+
+    def test_program_echoes_keys(self):
+        """Test a 6502 program can poll, read and acknowledge keys."""
+        bus, display, keyboard, _ = make_bus()
+        bus[0x0600 : 0x0600 + len(ECHO_PROGRAM)] = ECHO_PROGRAM
+        mpu = mpu6502.MPU(memory=bus, pc=0x0600)
+
+        keyboard.push_keys("HI\n")
+        for _ in range(200):
+            mpu.step()
+
+        assert display.drain() == "HI"
+        assert mpu.pc == 0x0615
+        assert bus[0x2101] & KEY_READY == 0
+
+    def test_reset_drops_keys(self):
+        """Test a reset clears queued keys and the status register."""
+        bus, _, keyboard, _ = make_bus()
+
+        keyboard.push_keys("abc")
+        keyboard.reset()
+
+        assert bus[0x2101] == 0
+        assert not keyboard.keys
+
+
+class TestTimerDevice:
+    """Test the jiffy timer."""
+
+    def test_counts_jiffies_on_tick(self):
+        """Test the counter advances with emulated cycles."""
+        bus, _, _, _ = make_bus()
+
+        bus.tick(1000 * 300)
+
+        assert bus[0x2110] | (bus[0x2111] << 8) == 300
+
+    def test_write_restarts_count(self):
+        """Test writing a timer register restarts the count."""
+        bus, _, _, _ = make_bus()
+        bus.tick(1000 * 50)
+
+        bus[0x2110] = 0
+        bus.tick(1000 * 60)
+
+        assert bus[0x2110] == 10
+
+
+class TestRomDevice:
+    """Test the write-protected ROM."""
+
+    def test_attach_copies_image(self):
+        """Test attaching the ROM loads its image onto the bus."""
+        bus = MemoryBus(0x10000)
+
+        bus.attach(RomDevice(0xC000, b"BASIC"))
+
+        assert bytes(bus[0xC000:0xC005]) == b"BASIC"
+
+    def test_cpu_writes_are_discarded(self):
+        """Test CPU writes leave the image intact and are counted."""
+        bus = MemoryBus(0x10000)
+        rom = bus.attach(RomDevice(0xC000, b"BASIC"))
+
+        bus[0xC001] = 0
+        bus[0xC005] = 1  # Past the end of the image
+
+        assert bytes(bus[0xC000:0xC005]) == b"BASIC"
+        assert bus[0xC005] == 1
+        assert rom.discarded_writes == 1
+
+    def test_reset_restores_bulk_writes(self):
+        """Test a reset undoes slice writes over the image."""
+        bus = MemoryBus(0x10000)
+        bus.attach(RomDevice(0xC000, b"BASIC"))
+        bus[0xC000:0xC005] = bytes(5)
+
+        bus.reset_devices()
+
+        assert bytes(bus[0xC000:0xC005]) == b"BASIC"
+
+
+class TestEmulatorDevices:
+    """Test the devices through M6502Emulator."""
+
+    def test_execute_program_collects_output(self):
+        """Test both execution paths report display writes as output."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+
+        normal = emulator.execute_program(11)
+        turbo = emulator.execute_program(11, turbo=True)
+
+        assert normal["output"] == "Hello"
+        assert turbo["output"] == "Hello"
+        assert emulator.get_display_output() == "HelloHello"
+
+    def test_send_keys(self):
+        """Test keys sent to the emulator reach the keyboard registers."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        emulator.send_keys("A")
+
+        assert emulator.read_memory(0x2100, 2) == bytes([ord("A"), KEY_READY])
+
+    def test_capture_is_woken_by_output(self):
+        """Test output capture drains writes made on another thread."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+        integration = EmulatorIntegration(emulator)
+
+        async def capture():
+            task = asyncio.create_task(integration.capture_emulator_output(0.2))
+            await asyncio.sleep(0.02)
+            worker = threading.Thread(target=emulator.execute_program, args=(22,))
+            worker.start()
+            captured = await task
+            worker.join()
+            return captured
+
+        captured = asyncio.run(capture())
+
+        assert "".join(captured) == "HelloHello"
+        assert integration.output_buffer[-1] == "HelloHello"
+        assert not emulator.display.listeners
@@ -0,0 +1,119 @@
+"""
+Memory Watch Tests
+
+Test suite for page change tracking and memory region watchers.
+"""
+
+import pytest
+from py65.devices import mpu6502
+
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.memory_bus import MemoryBus
+from engine.emulator.memory_watch import MemoryWatcher, changed_spans
+
+# Stores X at $0300,X for X = 0..3, then loops forever
+STORE_PROGRAM = bytes(
+    [
+        0xA2, 0x00,  # $0600 LDX #$00
+        0x8A,  # $0602 TXA
+        0x9D, 0x00, 0x03,  # $0603 STA $0300,X
+        0xE8,  # $0606 INX
+        0xE0, 0x04,  # $0607 CPX #$04
+        0xD0, 0xF7,  # $0609 BNE $0602
+        0x4C, 0x0B, 0x06,  # $060B JMP $060B
+    ]
+)  # fmt: skip
+
+
+class TestPageTracking:
+    """Test page versions on the memory bus."""
+
+    def test_tracked_writes_bump_versions(self):
+        """Test CPU writes bump tracked pages only, slice writes bump any page."""
+        memory = MemoryBus(0x10000)
+        memory.track_pages([0x03])
+
+        memory[0x0300] = 1
+        memory[0x0400] = 1
+        memory[0x0500:0x0502] = b"\x01\x02"
+
+        assert memory.page_versions[0x03] == 1
+        assert memory.page_versions[0x04] == 0
+        assert memory.page_versions[0x05] == 1
+
+    def test_tracking_is_counted(self):
+        """Test a page stays tracked until every tracker lets go."""
+        memory = MemoryBus(0x10000)
+        memory.track_pages([0x03])
+        memory.track_pages([0x03])
+
+        memory.untrack_pages([0x03])
+        assert memory.watched_pages[0x03]
+        memory.untrack_pages([0x03])
+        assert not memory.watched_pages[0x03]
+
+
+class TestMemoryWatcher:
+    """Test reporting changed runs of a watched region."""
+
+    def test_changed_spans_merge_short_gaps(self):
+        """Test differences closer than the gap share a span."""
+        old = bytes(32)
+        new = bytearray(32)
+        new[2] = new[5] = new[30] = 1
+
+        assert changed_spans(old, new, 0x1000, gap=4) == [
+            [0x1002, 0x1006],
+            [0x101E, 0x101F],
+        ]
+
+    def test_cpu_writes_reported_as_runs(self):
+        """Test a program's stores come back as one run, then nothing."""
+        memory = MemoryBus(0x10000)
+        memory[0x0600 : 0x0600 + len(STORE_PROGRAM)] = STORE_PROGRAM
+        memory[0x0300:0x0304] = b"\xff\xff\xff\xff"
+        watcher = MemoryWatcher(memory, 0x0200, 0x200)
+        mpu = mpu6502.MPU(memory=memory, pc=0x0600)
+
+        for _ in range(30):
+            mpu.step()
+
+        assert watcher.changes() == [(0x0300, bytes([0, 1, 2, 3]))]
+        assert watcher.changes() == []
+        assert watcher.stats["pages_compared"] == 1
+
+    def test_runs_join_across_pages(self):
+        """Test a write straddling a page boundary is a single run."""
+        memory = MemoryBus(0x10000)
+        watcher = MemoryWatcher(memory, 0x02F0, 0x20)
+
+        memory[0x02FE] = 7
+        memory[0x0301] = 9
+
+        assert watcher.changes() == [(0x02FE, bytes([7, 0, 0, 9]))]
+
+    def test_unchanged_rewrites_and_close(self):
+        """Test rewriting the same values reports nothing and close untracks."""
+        memory = MemoryBus(0x10000)
+        memory[0x0300] = 5
+        watcher = MemoryWatcher(memory, 0x0300, 16)
+
+        memory[0x0300] = 5
+        assert watcher.changes() == []
+
+        watcher.close()
+        assert not memory.tracked_pages[0x03]
+        with pytest.raises(ValueError):
+            MemoryWatcher(memory, 0xFFF0, 32)
+
+    def test_emulator_watch_memory(self):
+        """Test watching through the emulator sees fills and loads."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        watcher = emulator.watch_memory(0x2000, 64)
+
+        emulator.fill_memory(0x2010, 4, 0x41)
+
+        assert watcher.changes() == [(0x2010, b"AAAA")]
+        with pytest.raises(ValueError):
+            emulator.watch_memory(0xFFFF, 2)
@@ -0,0 +1,130 @@
+"""
+Profiler Tests
+
+Test suite for the hot-spot profiler and its symbol resolution.
+"""
+
+from py65.devices import mpu6502
+
+from engine.emulator.memory_bus import MemoryBus
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.profiler import Profiler, SymbolTable, format_report
+
+# Calls a three-iteration delay loop, then spins
+CALL_PROGRAM = bytes(
+    [
+        0x20, 0x06, 0x06,  # $0600 JSR $0606
+        0x4C, 0x03, 0x06,  # $0603 JMP $0603
+        0xA2, 0x03,  # $0606 LDX #$03
+        0xCA,  # $0608 DEX
+        0xD0, 0xFD,  # $0609 BNE $0608
+        0x60,  # $060B RTS
+    ]
+)  # fmt: skip
+
+
+# Calls a routine that never returns but resets the stack and starts over
+RESTART_PROGRAM = bytes(
+    [
+        0xA2, 0xFF,  # $0600 LDX #$FF
+        0x9A,  # $0602 TXS
+        0x20, 0x06, 0x06,  # $0603 JSR $0606
+        0x4C, 0x00, 0x06,  # $0606 JMP $0600
+    ]
+)  # fmt: skip
+
+
+def profile(steps, program=CALL_PROGRAM):
+    """Profile ``steps`` instructions of ``program`` loaded at $0600."""
+    memory = MemoryBus(0x10000)
+    memory[0x0600 : 0x0600 + len(program)] = program
+    mpu = mpu6502.MPU(memory=memory, pc=0x0600)
+    profiler = Profiler(mpu, memory)
+    profiler.run(steps)
+    return profiler
+
+
+class TestProfiler:
+    """Test per-PC and per-subroutine counters."""
+
+    def test_counts_per_pc(self):
+        """Test each address counts its executions and cycles."""
+        profiler = profile(12)
+
+        assert profiler.executions[0x0608] == 3
+        assert profiler.executions[0x0603] == 3
+        assert profiler.cycles[0x0606] == 2
+        assert profiler.instructions == 12
+        assert profiler.total_cycles == sum(profiler.cycles)
+
+    def test_subroutine_inclusive_cycles(self):
+        """Test a JSR target is charged from the call to its RTS."""
+        profiler = profile(10)
+
+        assert profiler.calls[0x0606] == 1
+        # JSR 6 + LDX 2 + DEX 2x3 + BNE 3+3+2 + RTS 6
+        assert profiler.call_cycles[0x0606] == 28
+        assert not profiler.frames
+
+    def test_abandoned_calls_are_closed(self):
+        """Test a JSR closes open calls whose stack space was reused."""
+        profiler = profile(400, RESTART_PROGRAM)
+
+        assert profiler.calls[0x0606] == 100
+        assert len(profiler.frames) == 1
+        # Each abandoned call ran JSR 6 + JMP 3 + LDX 2 + TXS 2
+        assert profiler.call_cycles[0x0606] == 99 * 13
+
+    def test_report_and_symbols(self):
+        """Test reports rank addresses by cycles and name them from labels."""
+        profiler = profile(10)
+
+        report = profiler.get_report(top=2, symbols={"DELAY": 0x0606, "MAIN": 0x0600})
+
+        assert report["hot_spots"][0]["address"] == "0x0609"
+        assert report["hot_spots"][0]["symbol"] == "DELAY+3"
+        assert report["routines"][0]["symbol"] == "DELAY"
+        assert "DELAY+3" in format_report(report)
+
+    def test_symbol_table_range(self):
+        """Test labels too far before an address are not used."""
+        table = SymbolTable({"START": 0x1000, "ALIAS": 0x1000})
+
+        assert table.resolve(0x1000) == "ALIAS"
+        assert table.resolve(0x1010) == "ALIAS+16"
+        assert table.resolve(0x2000) is None
+        assert table.resolve(0x0FFF) is None
+
+
+class TestEmulatorProfiling:
+    """Test profiling through the emulator."""
+
+    def test_toggle_profiling(self):
+        """Test counters only advance while profiling is on."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.set_throttled(False)
+        emulator.load_memory_image(CALL_PROGRAM, 0x0600)
+        emulator.mpu.pc = 0x0600
+
+        assert emulator.get_profile_report()["error"] == "No profile recorded"
+        assert emulator.start_profiling()["error"] is None
+        emulator.execute_program(steps=20, turbo=True)
+        emulator.stop_profiling()
+        emulator.execute_program(steps=20, turbo=True)
+
+        report = emulator.get_profile_report(text=True)
+        assert report["instructions"] == 20
+        assert report["profiling"] is False
+        assert "ROUTINE" in report["text"]
+
+    def test_profiling_and_tracing_exclusive(self, tmp_path):
+        """Test a trace and the profiler cannot both step instructions."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        emulator.start_profiling()
+
+        assert emulator.start_trace(str(tmp_path / "t.trc"))["error"]
+        assert emulator.stop_profiling()["error"] is None
+        assert emulator.stop_profiling()["error"] == "Not profiling"
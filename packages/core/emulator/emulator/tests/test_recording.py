@@ -0,0 +1,150 @@
+"""
+Recording Tests
+
+Test suite for recording emulator sessions and replaying them.
+"""
+
+import pytest
+
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.recording import (
+    EVENT_HEADER,
+    SessionRecording,
+    replay_session,
+)
+
+# Counts X down from 3, storing it, then loops forever
+COUNT_PROGRAM = bytes(
+    [
+        0xA2, 0x03,  # $0600 LDX #$03
+        0x86, 0x10,  # $0602 STX $10
+        0xCA,  # $0604 DEX
+        0xD0, 0xFB,  # $0605 BNE $0602
+        0x4C, 0x07, 0x06,  # $0607 JMP $0607
+    ]
+)  # fmt: skip
+
+
+def make_emulator():
+    """An initialized, unthrottled emulator."""
+    emulator = M6502Emulator()
+    emulator.initialize_emulator()
+    emulator.set_throttled(False)
+    return emulator
+
+
+def record_session(path):
+    """Record a short session mixing BASIC and machine code."""
+    emulator = make_emulator()
+    emulator.load_memory_image(COUNT_PROGRAM, 0x0700)
+    emulator.mpu.pc = 0x0600
+
+    assert emulator.start_recording(str(path))["error"] is None
+    emulator.execute_basic_command("X = 7")
+    emulator.load_memory_image(COUNT_PROGRAM, 0x0600)
+    emulator.execute_program(steps=20, turbo=True)
+    emulator.send_keys("A")
+    emulator.set_throttled(True)
+    info = emulator.stop_recording()
+    return emulator, info
+
+
+class TestSessionRecording:
+    """Test the recording file."""
+
+    def test_events_in_order(self, tmp_path):
+        """Test inputs are recorded in order with their arguments."""
+        _, info = record_session(tmp_path / "s.rec")
+
+        recording = SessionRecording(tmp_path / "s.rec")
+
+        assert info["events"] == 5
+        assert [event.method for event in recording.events] == [
+            "execute_basic_command",
+            "load_memory_image",
+            "execute_program",
+            "send_keys",
+            "set_throttled",
+        ]
+        assert recording.events[1].args == (COUNT_PROGRAM, 0x0600)
+        assert recording.snapshot.get_register("pc") == 0x0600
+        assert recording.end["events"] == 5
+
+    def test_truncated_recording(self, tmp_path):
+        """Test a recording cut off mid-event keeps its complete events."""
+        path = tmp_path / "s.rec"
+        record_session(path)
+        data = path.read_bytes()
+        path.write_bytes(data[: len(data) - EVENT_HEADER.size - 10])
+
+        recording = SessionRecording(path)
+
+        assert len(recording) == 5
+        assert recording.end is None
+
+    def test_not_a_recording(self, tmp_path):
+        """Test other files are rejected."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(bytes(64))
+
+        with pytest.raises(ValueError):
+            SessionRecording(path)
+
+
+class TestReplay:
+    """Test replaying recordings."""
+
+    def test_replay_is_deterministic(self, tmp_path):
+        """Test a replay on a fresh emulator ends in the recorded state."""
+        original, _ = record_session(tmp_path / "s.rec")
+        emulator = make_emulator()
+
+        result = emulator.replay_recording(str(tmp_path / "s.rec"))
+
+        assert result["error"] is None
+        assert result["deterministic"] is True
+        assert result["events_replayed"] == 5
+        assert emulator.mpu.x == original.mpu.x == 0
+        assert emulator.basic_vm.variables["X"] == 7
+        assert list(emulator.keyboard.keys) == list(original.keyboard.keys)
+        # Throttling changes are not replayed and pacing is restored afterwards
+        assert emulator.speed_controller.throttled is False
+
+    def test_replay_loaded_program(self, tmp_path):
+        """Test a loaded program and its run replay to the same state."""
+        original = make_emulator()
+        original.start_recording(str(tmp_path / "s.rec"))
+        original.load_basic_program("")
+        original.execute_program(steps=12)
+        original.stop_recording()
+        emulator = make_emulator()
+
+        result = emulator.replay_recording(str(tmp_path / "s.rec"))
+
+        assert [entry["method"] for entry in result["results"]] == [
+            "load_basic_program",
+            "execute_program",
+        ]
+        assert result["deterministic"] is True
+        assert emulator.get_display_output() == original.get_display_output()
+
+    def test_replay_detects_divergence(self, tmp_path):
+        """Test a recording whose end state differs is reported."""
+        record_session(tmp_path / "s.rec")
+        recording = SessionRecording(tmp_path / "s.rec")
+        recording.events.pop(2)
+
+        result = replay_session(make_emulator(), recording)
+
+        assert result["deterministic"] is False
+
+    def test_recording_guards(self, tmp_path):
+        """Test recording twice, stopping idle and replaying while recording."""
+        emulator = make_emulator()
+
+        assert emulator.stop_recording()["error"] == "Not recording"
+        emulator.start_recording(str(tmp_path / "a.rec"))
+        assert emulator.start_recording(str(tmp_path / "b.rec"))["error"]
+        assert emulator.replay_recording(str(tmp_path / "a.rec"))["error"]
+        assert emulator.get_emulator_info()["recording"]["events"] == 0
+        emulator.stop_recording()
@@ -0,0 +1,185 @@
+"""
+Emulator Snapshot Tests
+
+Test suite for copy-on-write emulator snapshots.
+"""
+
+import pickle
+import zlib
+
+import pytest
+
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.snapshot import (
+    PAGE_SIZE,
+    ZERO_PAGE_BYTES,
+    capture_snapshot,
+    decode_snapshot,
+    encode_snapshot,
+    restore_snapshot,
+)
+
+
+class TestSnapshotPages:
+    """Test page-level snapshot capture and restore."""
+
+    def test_zero_pages_are_shared(self):
+        """Test untouched pages all reference the shared zero page."""
+        memory = bytearray(0x10000)
+        memory[0x8000] = 0xA9
+
+        snapshot = capture_snapshot(memory, (0, 0, 0, 0, 0xFF, 0x30, 0))
+
+        assert snapshot.new_pages == 1
+        assert snapshot.pages[0x00] is ZERO_PAGE_BYTES
+        assert snapshot.pages[0x80] is not ZERO_PAGE_BYTES
+        assert snapshot.get_snapshot_info()["zero_pages"] == 255
+
+    def test_unchanged_pages_shared_with_parent(self):
+        """Test only modified pages are copied relative to the parent."""
+        memory = bytearray(b"\x11" * 0x10000)
+        parent = capture_snapshot(memory, (0,) * 7)
+
+        memory[0x1234] = 0x99
+        child = capture_snapshot(memory, (0,) * 7, parent=parent)
+
+        assert child.new_pages == 1
+        assert child.shared_pages(parent) == 255
+        assert child.pages[0x12] is not parent.pages[0x12]
+
+    def test_restore_memory(self):
+        """Test restoring copies every page back."""
+        memory = bytearray(0x10000)
+        memory[0x0200 : 0x0200 + PAGE_SIZE] = bytes(range(256))
+        snapshot = capture_snapshot(memory, (0,) * 7)
+
+        memory[:] = b"\xff" * 0x10000
+        restore_snapshot(memory, snapshot)
+
+        assert memory[0x0200:0x0300] == bytes(range(256))
+        assert memory[0xFFFF] == 0
+
+
+class TestEmulatorSnapshot:
+    """Test snapshot/restore on the emulator."""
+
+    def test_snapshot_and_restore(self):
+        """Test restoring rolls back registers and memory."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+
+        snapshot = emulator.snapshot()
+        assert snapshot.get_register("pc") == 0x8000
+
+        emulator.execute_program(20, turbo=True)
+        emulator.fill_memory(0x3000, 16, 0x55)
+        assert emulator.mpu.pc != 0x8000
+
+        assert emulator.restore(snapshot) is True
+        assert emulator.mpu.pc == 0x8000
+        assert emulator.mpu.a == 0
+        assert emulator.read_memory(0x3000, 16) == bytes(16)
+        assert emulator.read_memory(0x8000, 2) == b"\xa9\x48"
+
+    def test_successive_snapshots_share_pages(self):
+        """Test successive emulator snapshots share unchanged pages."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.load_basic_program("")
+
+        first = emulator.snapshot()
+        emulator.execute_program(5, turbo=True)
+        second = emulator.snapshot()
+
+        assert second.shared_pages(first) >= 254
+
+    def test_encoded_snapshot_round_trip(self):
+        """Test an encoded snapshot stores only pages that differ from its base."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        base = emulator.snapshot()
+
+        emulator.execute_basic_command("LET X = 42")
+        emulator.fill_memory(0x3000, 300, 0x55)
+        snapshot = emulator.snapshot()
+        data = encode_snapshot(snapshot, base)
+        decoded = decode_snapshot(data, base)
+
+        assert len(data) < 1024
+        assert decoded.new_pages == 2
+        assert decoded.shared_pages(base) == 254
+        assert decoded.registers == snapshot.registers
+        assert decoded.memory_bytes() == snapshot.memory_bytes()
+
+        other = M6502Emulator()
+        other.initialize_emulator()
+        assert other.restore(decoded) is True
+        assert other.read_memory(0x312B, 2) == b"\x55\x00"
+        assert other.execute_basic_command("PRINT X")["output"] == " 42"
+
+    def test_snapshot_keeps_devices(self):
+        """Test queued keys, undrained output and the boot state are restored."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        base = emulator.snapshot()
+        emulator.memory[0x2000] = ord("H")
+        emulator.memory[0x2000] = ord("i")
+        emulator.send_keys("AB")
+        emulator.basic_booted = True
+        snapshot = decode_snapshot(encode_snapshot(emulator.snapshot(), base), base)
+
+        other = M6502Emulator()
+        other.initialize_emulator()
+        other.send_keys("XYZ")
+        assert other.restore(snapshot) is True
+
+        # "A" is latched in the data register, "B" still queued
+        assert other.read_memory(0x2100, 2) == bytes([ord("A"), 0x80])
+        assert list(other.keyboard.keys) == [ord("B")]
+        assert other.get_display_output() == "Hi"
+        assert other.basic_booted is True
+
+        assert other.restore(base) is True
+        assert not other.keyboard.keys and other.get_display_output() == ""
+        assert other.basic_booted is False
+
+    def test_decode_rejects_unknown_encoding(self):
+        """Test decoding data from another encoding version raises."""
+        data = zlib.compress(pickle.dumps({"version": 99}))
+
+        with pytest.raises(ValueError):
+            decode_snapshot(data)
+
+    def test_decode_rejects_other_base(self):
+        """Test data decoded against a base it was not encoded with raises."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        base = emulator.snapshot()
+        emulator.fill_memory(0x3000, 16, 0x55)
+        data = encode_snapshot(emulator.snapshot(), base)
+
+        # A clean machine that differs by one byte
+        other = M6502Emulator()
+        other.initialize_emulator()
+        other.fill_memory(0x3FF0, 1, 0xA5)
+        other_base = other.snapshot()
+
+        with pytest.raises(ValueError, match="different base"):
+            decode_snapshot(data, other_base)
+        with pytest.raises(ValueError, match="different base"):
+            decode_snapshot(data)
+        assert decode_snapshot(data, base).memory_bytes()[0x3000] == 0x55
+
+    def test_snapshot_requires_initialization(self):
+        """Test snapshot before initialization raises."""
+        emulator = M6502Emulator()
+
+        with pytest.raises(RuntimeError):
+            emulator.snapshot()
+
+        assert emulator.restore(None) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
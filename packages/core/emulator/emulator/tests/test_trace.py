@@ -0,0 +1,156 @@
+"""
+Trace Tests
+
+Test suite for the instruction trace recorder and reader.
+"""
+
+import pytest
+from py65.devices import mpu6502
+
+from engine.emulator.memory_bus import MemoryBus
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.trace import (
+    HEADER_SIZE,
+    RECORD_SIZE,
+    TraceReader,
+    TraceRecorder,
+    diff_traces,
+)
+
+# Counts X down from 3, storing it, then loops forever
+COUNT_PROGRAM = bytes(
+    [
+        0xA2, 0x03,  # $0600 LDX #$03
+        0x86, 0x10,  # $0602 STX $10
+        0xCA,  # $0604 DEX
+        0xD0, 0xFB,  # $0605 BNE $0602
+        0x4C, 0x07, 0x06,  # $0607 JMP $0607
+    ]
+)  # fmt: skip
+
+
+def record(path, steps, record_writes=False, chunk_records=4, program=COUNT_PROGRAM):
+    """Trace ``steps`` instructions of ``program`` into ``path``."""
+    memory = MemoryBus(0x10000)
+    memory[0x0600 : 0x0600 + len(program)] = program
+    mpu = mpu6502.MPU(memory=memory, pc=0x0600)
+    recorder = TraceRecorder(mpu, memory, path, record_writes, chunk_records)
+    recorder.run(steps)
+    recorder.close()
+    return memory
+
+
+class TestTraceRecorder:
+    """Test recording instructions to a trace file."""
+
+    def test_records_registers_after_each_instruction(self, tmp_path):
+        """Test records hold the instruction's PC and the registers it left."""
+        record(tmp_path / "count.trc", 5)
+
+        with TraceReader(tmp_path / "count.trc") as trace:
+            assert [r.pc for r in trace] == [0x0600, 0x0602, 0x0604, 0x0605, 0x0602]
+            assert trace[0].x == 3
+            assert trace[2].x == 2
+            assert trace[-1].cycles > trace[0].cycles
+
+    def test_chunks_flush_to_file(self, tmp_path):
+        """Test records spanning several chunks are all written, in order."""
+        path = tmp_path / "long.trc"
+        record(path, 13, chunk_records=4)
+
+        assert path.stat().st_size == HEADER_SIZE + 13 * RECORD_SIZE
+        with TraceReader(path) as trace:
+            assert len(trace) == 13
+            assert [r.pc for r in trace[10:]] == [0x0607] * 3
+
+    def test_memory_writes(self, tmp_path):
+        """Test writes are recorded and the bus observer is removed on close."""
+        memory = record(tmp_path / "writes.trc", 4, record_writes=True)
+
+        with TraceReader(tmp_path / "writes.trc") as trace:
+            assert trace[0].memory_write is None
+            assert trace[1].memory_write == (0x10, 3)
+            assert [index for index, _ in trace.writes_to(0x10)] == [1]
+        assert memory.on_write is None
+        assert not any(memory.watched_pages)
+
+    def test_unclosed_trace_is_readable(self, tmp_path):
+        """Test flushed chunks can be read while recording continues."""
+        memory = MemoryBus(0x10000)
+        memory[0x0600 : 0x0600 + len(COUNT_PROGRAM)] = COUNT_PROGRAM
+        mpu = mpu6502.MPU(memory=memory, pc=0x0600)
+        recorder = TraceRecorder(mpu, memory, tmp_path / "live.trc", chunk_records=4)
+
+        recorder.run(6)
+
+        with TraceReader(tmp_path / "live.trc") as trace:
+            assert len(trace) == 4
+        recorder.close()
+
+
+class TestTraceReader:
+    """Test slicing, filtering and diffing traces."""
+
+    def test_filter_pc(self, tmp_path):
+        """Test filtering keeps only instructions inside the PC range."""
+        record(tmp_path / "count.trc", 12)
+
+        with TraceReader(tmp_path / "count.trc") as trace:
+            matches = list(trace.filter_pc(0x0604, 0x0605))
+
+        assert [index for index, _ in matches] == [2, 3, 5, 6, 8, 9]
+        assert all(0x0604 <= r.pc <= 0x0605 for _, r in matches)
+
+    def test_not_a_trace(self, tmp_path):
+        """Test other files are rejected."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(bytes(64))
+
+        with pytest.raises(ValueError):
+            TraceReader(path)
+
+    def test_diff_identical_and_divergent(self, tmp_path):
+        """Test diffing reports the first record where two runs disagree."""
+        record(tmp_path / "a.trc", 9)
+        record(tmp_path / "b.trc", 9)
+        record(tmp_path / "c.trc", 9, program=bytes([0xA2, 0x04]) + COUNT_PROGRAM[2:])
+
+        with TraceReader(tmp_path / "a.trc") as a, TraceReader(
+            tmp_path / "b.trc"
+        ) as b, TraceReader(tmp_path / "c.trc") as c:
+            assert diff_traces(a, b)["identical"] is True
+
+            result = diff_traces(a, c, fields=("pc", "x"))
+
+        assert result["first_difference"] == 0
+        assert result["differences"][0]["fields"] == {"x": (3, 4)}
+        assert diff_traces(a, c, fields=("bogus",))["error"]
+
+
+class TestEmulatorTracing:
+    """Test tracing through the emulator."""
+
+    def test_turbo_run_is_traced(self, tmp_path):
+        """Test every turbo-mode instruction is recorded, block cache or not."""
+        emulator = M6502Emulator()
+        emulator.block_cache_enabled = True
+        emulator.initialize_emulator()
+        emulator.set_throttled(False)
+        emulator.load_memory_image(COUNT_PROGRAM, 0x0600)
+        emulator.mpu.pc = 0x0600
+
+        assert emulator.start_trace(str(tmp_path / "run.trc"))["error"] is None
+        emulator.execute_program(steps=50, turbo=True)
+        info = emulator.stop_trace()
+
+        assert info["records"] == 50
+        assert emulator.get_emulator_info()["trace"] is None
+        with TraceReader(tmp_path / "run.trc") as trace:
+            assert trace[49].pc == 0x0607
+
+    def test_stop_without_trace(self):
+        """Test stopping when no trace is running is an error result."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+
+        assert emulator.stop_trace()["error"] == "Not tracing"
@@ -0,0 +1,31 @@
+"""
+Worker Emulator Tests
+
+Test suite for the emulator and baseline snapshot of worker processes.
+"""
+
+from engine.emulator import worker
+
+
+class TestInitWorkerEmulator:
+    """Test creating a worker's emulator."""
+
+    def test_baseline_is_clean_machine(self):
+        """Test the baseline restores the machine as it was created."""
+        emulator = worker.init_worker_emulator()
+
+        assert worker.emulator is emulator
+        assert emulator.speed_controller.throttled is True
+        emulator.execute_basic_command("LET X = 5")
+        emulator.fill_memory(0x3000, 4, 0xEA)
+
+        assert emulator.restore(worker.baseline) is True
+        assert emulator.read_memory(0x3000, 4) == bytes(4)
+        assert emulator.execute_basic_command("PRINT X")["output"] == " 0"
+
+    def test_unthrottled_rom_basic(self):
+        """Test the baseline can be taken after booting ROM BASIC."""
+        emulator = worker.init_worker_emulator(throttled=False, boot_basic=True)
+
+        assert emulator.speed_controller.throttled is False
+        assert worker.baseline.devices["basic_booted"] is True
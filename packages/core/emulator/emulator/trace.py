@@ -0,0 +1,396 @@
+"""
+Instruction Trace Module
+
+This module records an instruction-level trace of the 6502 and reads it back.
+Each executed instruction becomes one fixed-width binary record holding its
+PC, the registers and cycle count after it ran and, optionally, the last byte
+it wrote to memory. Records are packed into a preallocated chunk buffer and
+copied into a memory-mapped trace file whenever the chunk fills, so recording
+costs one ``pack_into`` per instruction instead of a formatted log line.
+"""
+
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from loguru import logger
+
+TRACE_MAGIC = b"6502TRAC"
+TRACE_VERSION = 1
+
+# Header: magic, version, record size, record count
+HEADER = struct.Struct("<8sHHQ")
+HEADER_SIZE = 32
+
+# Record: pc, a, x, y, sp, p, flags, cycles, write address, write value, pad
+RECORD = struct.Struct("<HBBBBBBQHBx")
+RECORD_SIZE = RECORD.size
+
+# Record flag set when the instruction wrote memory
+FLAG_WRITE = 0x01
+
+DEFAULT_CHUNK_RECORDS = 65536
+
+TRACE_FIELDS = (
+    "pc",
+    "a",
+    "x",
+    "y",
+    "sp",
+    "p",
+    "flags",
+    "cycles",
+    "write_address",
+    "write_value",
+)
+
+
+class TraceRecord(NamedTuple):
+    """One executed instruction; registers are as it left them."""
+
+    pc: int
+    a: int
+    x: int
+    y: int
+    sp: int
+    p: int
+    flags: int
+    cycles: int
+    write_address: int
+    write_value: int
+
+    @property
+    def memory_write(self) -> Optional[Tuple[int, int]]:
+        """``(address, value)`` of the instruction's write, if recorded."""
+        if self.flags & FLAG_WRITE:
+            return self.write_address, self.write_value
+        return None
+
+
+class TraceRecorder:
+    """Records every instruction the MPU executes into a trace file.
+
+    With ``record_writes`` the memory bus reports CPU writes to the recorder;
+    an instruction that writes several bytes (JSR, BRK) keeps the last one.
+    """
+
+    def __init__(
+        self,
+        mpu,
+        memory,
+        path: Union[str, Path],
+        record_writes: bool = False,
+        chunk_records: int = DEFAULT_CHUNK_RECORDS,
+    ):
+        """Create the trace file and the chunk buffer."""
+        self.mpu = mpu
+        self.memory = memory
+        self.path = Path(path)
+        self.record_writes = record_writes
+        self.chunk_records = max(1, chunk_records)
+
+        self.buffer = bytearray(self.chunk_records * RECORD_SIZE)
+        self.buffered = 0
+        self.record_count = 0
+        self.last_steps = 0
+        self.chunks_flushed = 0
+        self.pending_write = 0
+        self.closed = False
+        self.start_time = time.time()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "w+b")
+        self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, RECORD_SIZE, 0))
+        self.file.truncate(HEADER_SIZE + len(self.buffer))
+        self.map = mmap.mmap(self.file.fileno(), HEADER_SIZE + len(self.buffer))
+
+        if record_writes:
+            memory.set_write_observer(self._on_write)
+
+    def _on_write(self, address: int, value: int):
+        """Remember the CPU write made by the instruction being recorded."""
+        self.pending_write = 0x1000000 | (value << 16) | address
+
+    def step(self):
+        """Execute and record one instruction."""
+        self.run(1)
+
+    def run(self, max_steps: int) -> int:
+        """Execute and record ``max_steps`` instructions.
+
+        If an instruction raises, the instructions completed before it are
+        recorded and counted in ``last_steps``.
+        """
+        mpu = self.mpu
+        step = mpu.step
+        pack = RECORD.pack_into
+        buffer = self.buffer
+        capacity = self.chunk_records
+        buffered = self.buffered
+        steps = 0
+
+        try:
+            if self.record_writes:
+                while steps < max_steps:
+                    pc = mpu.pc
+                    self.pending_write = 0
+                    step()
+                    write = self.pending_write
+                    pack(
+                        buffer,
+                        buffered * RECORD_SIZE,
+                        pc,
+                        mpu.a,
+                        mpu.x,
+                        mpu.y,
+                        mpu.sp,
+                        mpu.p,
+                        write >> 24,
+                        mpu.processorCycles,
+                        write & 0xFFFF,
+                        (write >> 16) & 0xFF,
+                    )
+                    steps += 1
+                    buffered += 1
+                    if buffered == capacity:
+                        self.buffered = buffered
+                        self.flush()
+                        buffered = 0
+            else:
+                while steps < max_steps:
+                    pc = mpu.pc
+                    step()
+                    pack(
+                        buffer,
+                        buffered * RECORD_SIZE,
+                        pc,
+                        mpu.a,
+                        mpu.x,
+                        mpu.y,
+                        mpu.sp,
+                        mpu.p,
+                        0,
+                        mpu.processorCycles,
+                        0,
+                        0,
+                    )
+                    steps += 1
+                    buffered += 1
+                    if buffered == capacity:
+                        self.buffered = buffered
+                        self.flush()
+                        buffered = 0
+        finally:
+            self.buffered = buffered
+            self.last_steps = steps
+
+        return steps
+
+    def flush(self):
+        """Copy buffered records into the mapped file."""
+        if not self.buffered or self.closed:
+            return
+
+        offset = HEADER_SIZE + self.record_count * RECORD_SIZE
+        size = self.buffered * RECORD_SIZE
+        if offset + size > len(self.map):
+            # Grow the file a chunk at a time and map the new length
+            new_length = offset + len(self.buffer)
+            self.map.close()
+            self.file.truncate(new_length)
+            self.map = mmap.mmap(self.file.fileno(), new_length)
+
+        self.map[offset : offset + size] = memoryview(self.buffer)[:size]
+        self.record_count += self.buffered
+        self.buffered = 0
+        self.chunks_flushed += 1
+
+        # Keep the header current so a trace is readable before it is closed
+        HEADER.pack_into(
+            self.map, 0, TRACE_MAGIC, TRACE_VERSION, RECORD_SIZE, self.record_count
+        )
+
+    def close(self) -> Dict[str, Any]:
+        """Flush, write the final header and trim the file to its records."""
+        if self.closed:
+            return self.get_trace_info()
+
+        self.flush()
+        if self.record_writes:
+            self.memory.set_write_observer(None)
+
+        self.map.flush()
+        self.map.close()
+        self.file.truncate(HEADER_SIZE + self.record_count * RECORD_SIZE)
+        self.file.close()
+        self.closed = True
+
+        logger.info(f"Trace written: {self.record_count} records to {self.path}")
+        return self.get_trace_info()
+
+    def get_trace_info(self) -> Dict[str, Any]:
+        """Get information about the recording."""
+        records = self.record_count + self.buffered
+        return {
+            "path": str(self.path),
+            "records": records,
+            "bytes": HEADER_SIZE + records * RECORD_SIZE,
+            "record_writes": self.record_writes,
+            "chunk_records": self.chunk_records,
+            "chunks_flushed": self.chunks_flushed,
+            "closed": self.closed,
+        }
+
+
+class TraceReader:
+    """Read-only view of a trace file.
+
+    Indexing and slicing return ``TraceRecord`` values decoded straight from
+    the mapped file, so only the records asked for are unpacked.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Map a trace file for reading."""
+        self.path = Path(path)
+        with open(self.path, "rb") as trace_file:
+            size = os.fstat(trace_file.fileno()).st_size
+            if size < HEADER_SIZE:
+                raise ValueError(f"Not a trace file: {self.path}")
+            self.map = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, count = HEADER.unpack_from(self.map, 0)
+        if magic != TRACE_MAGIC or record_size != RECORD_SIZE:
+            self.map.close()
+            raise ValueError(f"Not a trace file: {self.path}")
+        if version != TRACE_VERSION:
+            self.map.close()
+            raise ValueError(f"Unsupported trace version {version}: {self.path}")
+
+        # The file of a recording still in progress has preallocated space
+        self.record_count = min(count, (size - HEADER_SIZE) // RECORD_SIZE)
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(self.record_count)
+            records = list(self.iter_records(start, stop))
+            return records[::stride] if stride != 1 else records
+
+        if index < 0:
+            index += self.record_count
+        if not 0 <= index < self.record_count:
+            raise IndexError("trace record index out of range")
+        return TraceRecord._make(
+            RECORD.unpack_from(self.map, HEADER_SIZE + index * RECORD_SIZE)
+        )
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        return self.iter_records()
+
+    def iter_records(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[TraceRecord]:
+        """Iterate over records ``start``..``stop``."""
+        stop = self.record_count if stop is None else min(stop, self.record_count)
+        if start >= stop:
+            return
+        view = memoryview(self.map)[
+            HEADER_SIZE + start * RECORD_SIZE : HEADER_SIZE + stop * RECORD_SIZE
+        ]
+        try:
+            for values in RECORD.iter_unpack(view):
+                yield TraceRecord._make(values)
+        finally:
+            view.release()
+
+    def filter_pc(
+        self, low: int, high: int, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, TraceRecord]]:
+        """Yield ``(index, record)`` for instructions at ``low``..``high``."""
+        for index, record in enumerate(self.iter_records(start, stop), start):
+            if low <= record.pc <= high:
+                yield index, record
+
+    def writes_to(self, address: int) -> Iterator[Tuple[int, TraceRecord]]:
+        """Yield ``(index, record)`` for instructions that wrote ``address``."""
+        for index, record in enumerate(self.iter_records()):
+            if record.flags & FLAG_WRITE and record.write_address == address:
+                yield index, record
+
+    def raw_records(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        """Packed bytes of records ``start``..``stop``."""
+        stop = self.record_count if stop is None else min(stop, self.record_count)
+        return self.map[
+            HEADER_SIZE + start * RECORD_SIZE : HEADER_SIZE + stop * RECORD_SIZE
+        ]
+
+    def close(self):
+        """Unmap the file."""
+        self.map.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_trace_info(self) -> Dict[str, Any]:
+        """Get information about the trace."""
+        return {
+            "path": str(self.path),
+            "records": self.record_count,
+            "record_size": RECORD_SIZE,
+            "version": TRACE_VERSION,
+        }
+
+
+def diff_traces(
+    left: TraceReader,
+    right: TraceReader,
+    fields: Optional[Tuple[str, ...]] = None,
+    max_differences: int = 100,
+    block_records: int = 4096,
+) -> Dict[str, Any]:
+    """Compare two traces record by record.
+
+    ``fields`` limits the comparison (for example to leave out ``cycles``);
+    by default whole records are compared. Blocks of records that match byte
+    for byte are skipped without decoding them.
+    """
+    compared = fields or TRACE_FIELDS
+    unknown = set(compared) - set(TRACE_FIELDS)
+    if unknown:
+        return {"error": f"Unknown trace fields: {', '.join(sorted(unknown))}"}
+    positions = [TRACE_FIELDS.index(name) for name in compared]
+
+    common = min(len(left), len(right))
+    differences: List[Dict[str, Any]] = []
+
+    for start in range(0, common, block_records):
+        stop = min(start + block_records, common)
+        if left.raw_records(start, stop) == right.raw_records(start, stop):
+            continue
+
+        pairs = zip(left.iter_records(start, stop), right.iter_records(start, stop))
+        for index, (a, b) in enumerate(pairs, start):
+            changed = {TRACE_FIELDS[i]: (a[i], b[i]) for i in positions if a[i] != b[i]}
+            if changed:
+                differences.append({"index": index, "pc": a.pc, "fields": changed})
+                if len(differences) >= max_differences:
+                    break
+        if len(differences) >= max_differences:
+            break
+
+    return {
+        "left_records": len(left),
+        "right_records": len(right),
+        "compared_records": common,
+        "first_difference": differences[0]["index"] if differences else None,
+        "differences": differences,
+        "identical": not differences and len(left) == len(right),
+    }
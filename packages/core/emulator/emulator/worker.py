@@ -0,0 +1,61 @@
+"""
+Worker Emulator Module
+
+This module holds the emulator of a worker process. Process pools call
+``init_worker_emulator`` from their initializer to create the worker's one
+emulator and capture its clean baseline snapshot; jobs then restore the
+baseline, or state saved from it, before they run so that they never see
+each other's variables or memory.
+"""
+
+import contextlib
+import sys
+from typing import Optional
+
+from loguru import logger
+
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.emulator.snapshot import EmulatorSnapshot
+
+# The worker's emulator and clean baseline, set by init_worker_emulator
+emulator: Optional[M6502Emulator] = None
+baseline: Optional[EmulatorSnapshot] = None
+
+
+def init_worker_emulator(
+    log_level: Optional[str] = None,
+    throttled: bool = True,
+    boot_basic: bool = False,
+) -> M6502Emulator:
+    """Create the worker's emulator and its clean baseline snapshot.
+
+    ``log_level`` replaces the inherited log handlers and the emulator's own
+    console and file sinks with one stderr handler, ``throttled=False`` runs
+    at full speed and ``boot_basic`` starts ROM BASIC before the baseline is
+    taken.
+    """
+    global emulator, baseline
+
+    if log_level:
+        # The emulator installs its console and file sinks as it is created;
+        # keep its startup lines off stdout, then replace them
+        with contextlib.redirect_stdout(sys.stderr):
+            machine = M6502Emulator()
+        logger.remove()
+        logger.add(sys.stderr, level=log_level)
+    else:
+        machine = M6502Emulator()
+
+    if not machine.initialize_emulator():
+        raise RuntimeError("Failed to initialize worker emulator")
+    if not throttled:
+        machine.set_throttled(False)
+
+    if boot_basic:
+        boot = machine.boot_basic()
+        if boot["error"]:
+            raise RuntimeError(f"Failed to start ROM BASIC: {boot['error']}")
+
+    emulator = machine
+    baseline = machine.snapshot()
+    return machine
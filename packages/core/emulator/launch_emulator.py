@@ -10,7 +10,7 @@ import argparse
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
@@ -18,6 +18,7 @@ from loguru import logger
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from bridge.core.settings import get_settings  # noqa: E402
+from engine.basic_compiler import BasicSyntaxError  # noqa: E402
 from engine.basic_m6502 import BASICM6502Engine  # noqa: E402
 from engine.emulator.m6502_emulator import M6502Emulator  # noqa: E402
 
@@ -88,11 +89,19 @@ class EmulatorLauncher:
                 logger.error("No valid BASIC commands found in program")
                 return False
 
+            # Compile once; reloading unchanged source hits the compiler cache
+            try:
+                compiled = self.basic_engine.compile_program(program_content)
+            except BasicSyntaxError as e:
+                logger.error(f"Failed to compile program: {e}")
+                return False
+
             # Store current program
             self.current_program = {
                 "path": program_path,
                 "content": program_content,
                 "commands": commands,
+                "compiled": compiled,
             }
 
             logger.info(f"✅ Program loaded successfully ({len(commands)} commands)")
@@ -121,8 +130,13 @@ class EmulatorLauncher:
 
         return commands
 
-    def run_program(self, steps: int = 100) -> Dict[str, Any]:
-        """Run the loaded BASIC program."""
+    def run_program(self, steps: Optional[int] = None) -> Dict[str, Any]:
+        """Run the loaded BASIC program on the interpreter.
+
+        The program runs to completion, or for at most ``steps`` statements
+        (status ``budget_exhausted`` when it is cut short). The interpreter
+        does not execute on the 6502, so no CPU states are reported.
+        """
         if not self.current_program:
             logger.error("No program loaded")
             return {"error": "No program loaded"}
@@ -131,46 +145,37 @@ class EmulatorLauncher:
             logger.info("Starting program execution...")
             self.is_running = True
 
+            # Programs compiled at load time skip straight to the interpreter
+            compiled = self.current_program.get("compiled")
+            if not compiled:
+                compiled = self.basic_engine.compile_program(
+                    self.current_program["content"]
+                )
+
+            run = self.emulator.run_basic_program(compiled, max_statements=steps)
+            self.is_running = False
+
             results = {
-                "commands_executed": 0,
-                "output": [],
+                "commands_executed": run["statements_executed"],
+                "output": run["output"],
                 "errors": [],
-                "cpu_states": [],
+                "status": run["status"],
+                "execution_time": run["execution_time"],
             }
+            for line in run["output"]:
+                logger.info(f"Output: {line}")
 
-            # Execute each BASIC command
-            for i, command in enumerate(self.current_program["commands"]):
-                if not self.is_running:
-                    break
-
-                logger.info(f"Executing command {i+1}: {command}")
-
-                # Execute command through emulator
-                result = self.emulator.execute_basic_command(command)
-
-                if result.get("success"):
-                    results["commands_executed"] += 1
-
-                    # Capture output
-                    if "output" in result:
-                        results["output"].append(result["output"])
-                        logger.info(f"Output: {result['output']}")
-
-                    # Capture CPU state
-                    cpu_state = self.emulator.get_cpu_state()
-                    results["cpu_states"].append(cpu_state)
-
-                else:
-                    error_msg = result.get("error", "Unknown error")
-                    results["errors"].append(f"Command {i+1}: {error_msg}")
-                    logger.error(f"Command failed: {error_msg}")
-
-                # Small delay for readability
-                time.sleep(0.1)
+            if run["error"]:
+                error_msg = f"{run['error']} ERROR"
+                if run["line"] is not None:
+                    error_msg += f" IN {run['line']}"
+                results["errors"].append(error_msg)
+                logger.error(f"Program failed: {error_msg}")
 
             logger.info(
-                f"✅ Program execution completed "
-                f"({results['commands_executed']} commands)"
+                f"✅ Program execution {run['status']} "
+                f"({results['commands_executed']} statements in "
+                f"{run['execution_time']:.3f}s)"
             )
             return results
 
@@ -196,6 +201,127 @@ class EmulatorLauncher:
             logger.error(f"Step execution failed: {e}")
             return {"error": str(e)}
 
+    def run_until_break(
+        self, condition: Optional[str] = None, max_cycles: int = 1000000
+    ) -> Dict[str, Any]:
+        """Run at full speed until a breakpoint, watchpoint or condition hits."""
+        try:
+            result = self.emulator.run_until(condition, max_cycles)
+
+            if result.get("error"):
+                logger.error(f"Run error: {result['error']}")
+            elif result["stop_reason"] == "cycle_limit":
+                logger.info(
+                    f"No stop within {max_cycles} cycles "
+                    f"({result['steps_executed']} steps)"
+                )
+            else:
+                logger.info(
+                    f"✅ Stopped on {result['stop_reason']} at "
+                    f"0x{result['pc']:04X} after {result['steps_executed']} steps"
+                )
+                if result.get("hit"):
+                    print(f"  {result['hit']}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Run until failed: {e}")
+            return {"error": str(e)}
+
+    def show_breakpoints(self) -> None:
+        """Display the breakpoints and watchpoints."""
+        info = self.emulator.debugger.get_debugger_info()
+        if not info["breakpoints"] and not info["watchpoints"]:
+            print("No breakpoints or watchpoints")
+            return
+
+        for point in info["breakpoints"]:
+            condition = f" if {point['condition']}" if point["condition"] else ""
+            print(f"  break {point['address']}{condition}  hits={point['hits']}")
+        for point in info["watchpoints"]:
+            print(
+                f"  watch {point['start']}-{point['end']} {point['kind']}  "
+                f"hits={point['hits']}"
+            )
+
+    def benchmark_execution(
+        self, steps: int = 10000, batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Compare instructions/second of normal and turbo execution.
+
+        When the emulator has a block cache, turbo is measured both with plain
+        stepping and with cached basic blocks. Every mode runs unthrottled, so
+        real-time pacing does not cap the rates being compared.
+        """
+        try:
+            logger.info(f"Benchmarking execution over {steps} instruction(s)...")
+
+            block_cache = self.emulator.block_cache
+            modes = [("normal", False, None), ("turbo", True, None)]
+            if block_cache:
+                modes.append(("block_cache", True, block_cache))
+
+            results = {}
+            for mode, turbo, cache in modes:
+                self.emulator.load_basic_program("")
+                self.emulator.block_cache = cache
+                if cache:
+                    cache.reset_stats()
+
+                start_time = time.perf_counter()
+                try:
+                    with self.emulator.speed_controller.unthrottled():
+                        result = self.emulator.execute_program(
+                            steps, turbo=turbo, batch_size=batch_size
+                        )
+                finally:
+                    self.emulator.block_cache = block_cache
+                duration = time.perf_counter() - start_time
+
+                if result.get("error"):
+                    return {"error": f"{mode} run failed: {result['error']}"}
+
+                executed = result["steps_executed"]
+                results[mode] = {
+                    "steps_executed": executed,
+                    "duration": duration,
+                    "instructions_per_second": (
+                        executed / duration if duration > 0 else 0.0
+                    ),
+                }
+
+            normal_ips = results["normal"]["instructions_per_second"]
+            results["speedup"] = (
+                results["turbo"]["instructions_per_second"] / normal_ips
+                if normal_ips > 0
+                else 0.0
+            )
+
+            if block_cache:
+                turbo_ips = results["turbo"]["instructions_per_second"]
+                results["block_cache"]["hit_rate"] = block_cache.get_hit_rate()
+                results["block_cache_speedup"] = (
+                    results["block_cache"]["instructions_per_second"] / turbo_ips
+                    if turbo_ips > 0
+                    else 0.0
+                )
+                logger.info(
+                    f"✅ Block cache: {results['block_cache_speedup']:.2f}x over "
+                    f"turbo, hit rate {block_cache.get_hit_rate():.1%}"
+                )
+
+            logger.info(
+                f"✅ Normal: {normal_ips:,.0f} instr/s, "
+                f"turbo: {results['turbo']['instructions_per_second']:,.0f} instr/s "
+                f"({results['speedup']:.1f}x)"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Benchmark failed: {e}")
+            return {"error": str(e)}
+
     def show_cpu_state(self) -> None:
         """Display current CPU state."""
         try:
@@ -292,8 +418,15 @@ AI Vintage OS - Emulator Launcher Help
 
 Commands:
   load <file>     Load a BASIC program from file
-  run [steps]     Run the loaded program (default: 100 steps)
+  run [steps]     Run the loaded program (default: to completion)
   step [count]    Step through execution (default: 1 step)
+  turbo [steps]   Run loaded machine code in turbo batch mode
+  bench [steps]   Benchmark normal vs turbo execution speed
+  break <addr> [if <expr>]  Set a breakpoint (hex address)
+  watch <addr> [r|w|rw]     Watch memory reads and/or writes (default: w)
+  delete <addr>   Remove breakpoints and watchpoints at an address
+  until [expr]    Run at full speed until a break, watch or condition hits
+  breaks          List breakpoints and watchpoints
   cpu            Show current CPU state
   memory [addr] [len]  Show memory dump (default: 0x8000, 16 bytes)
   reset          Reset emulator to initial state
@@ -305,6 +438,9 @@ Examples:
   run 50
   step 5
   memory 0x8000 32
+  break 0x0610 if x == 0
+  watch 0x10 rw
+  until a == $FF and c
   cpu
   reset
 
@@ -352,13 +488,72 @@ Settings:
                         self.load_program(parts[1])
 
                 elif cmd == "run":
-                    steps = int(parts[1]) if len(parts) > 1 else 100
+                    steps = int(parts[1]) if len(parts) > 1 else None
                     self.run_program(steps)
 
                 elif cmd == "step":
                     count = int(parts[1]) if len(parts) > 1 else 1
                     self.step_execution(count)
 
+                elif cmd == "turbo":
+                    steps = int(parts[1]) if len(parts) > 1 else 100000
+                    result = self.emulator.execute_program(steps, turbo=True)
+                    if result.get("error"):
+                        logger.error(f"Turbo execution error: {result['error']}")
+                    else:
+                        logger.info(f"✅ Executed {result['steps_executed']} steps")
+
+                elif cmd == "bench":
+                    steps = int(parts[1]) if len(parts) > 1 else 10000
+                    self.benchmark_execution(steps)
+
+                elif cmd == "break":
+                    if len(parts) < 2:
+                        print("Usage: break <addr> [if <expr>]")
+                    else:
+                        condition = None
+                        if len(parts) > 3 and parts[2].lower() == "if":
+                            condition = " ".join(parts[3:])
+                        result = self.emulator.debugger.add_breakpoint(
+                            int(parts[1], 16), condition
+                        )
+                        if result["error"]:
+                            print(result["error"])
+
+                elif cmd == "watch":
+                    if len(parts) < 2:
+                        print("Usage: watch <addr> [r|w|rw]")
+                    else:
+                        kinds = {"r": "read", "w": "write", "rw": "access"}
+                        kind = kinds.get(parts[2].lower() if len(parts) > 2 else "w")
+                        if kind is None:
+                            print("Usage: watch <addr> [r|w|rw]")
+                        else:
+                            result = self.emulator.debugger.add_watchpoint(
+                                int(parts[1], 16), kind=kind
+                            )
+                            if result["error"]:
+                                print(result["error"])
+
+                elif cmd == "delete":
+                    if len(parts) < 2:
+                        print("Usage: delete <addr>")
+                    else:
+                        address = int(parts[1], 16)
+                        debugger = self.emulator.debugger
+                        removed = debugger.remove_breakpoint(address)
+                        for kind in ("read", "write", "access"):
+                            removed |= debugger.remove_watchpoint(address, kind=kind)
+                        if not removed:
+                            print(f"Nothing set at 0x{address:04X}")
+
+                elif cmd in ("until", "cont"):
+                    condition = " ".join(parts[1:]) or None
+                    self.run_until_break(condition)
+
+                elif cmd == "breaks":
+                    self.show_breakpoints()
+
                 elif cmd == "cpu":
                     self.show_cpu_state()
 
@@ -391,6 +586,7 @@ Examples:
   python launch_emulator.py --interactive
   python launch_emulator.py --load sample.bas --run
   python launch_emulator.py --load program.bas --step 10 --cpu
+  python launch_emulator.py --benchmark --steps 20000
         """,
     )
 
@@ -408,14 +604,29 @@ Examples:
         "--steps",
         "-s",
         type=int,
-        default=100,
-        help="Number of steps to execute (default: 100)",
+        help=(
+            "Statements to run with --run (default: to completion) or "
+            "instructions to benchmark (default: 10000)"
+        ),
     )
 
     parser.add_argument(
         "--cpu", action="store_true", help="Show CPU state after execution"
     )
 
+    parser.add_argument(
+        "--benchmark",
+        "-b",
+        action="store_true",
+        help="Benchmark normal vs turbo execution (uses --steps)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Instructions per batch in turbo mode",
+    )
+
     parser.add_argument(
         "--memory",
         "-m",
@@ -436,6 +647,18 @@ Examples:
         "--speed", "-sp", type=float, help="Set speed multiplier (0.1 to 10.0)"
     )
 
+    parser.add_argument(
+        "--unthrottled",
+        action="store_true",
+        help="Run as fast as possible instead of pacing to the target CPU speed",
+    )
+
+    parser.add_argument(
+        "--block-cache",
+        action="store_true",
+        help="Run turbo mode on cached, compiled basic blocks",
+    )
+
     parser.add_argument(
         "--log-level",
         "-ll",
@@ -455,6 +678,8 @@ Examples:
 
     # Create launcher
     launcher = EmulatorLauncher()
+    if args.block_cache:
+        launcher.emulator.block_cache_enabled = True
 
     # Set verbose logging if requested
     if args.verbose:
@@ -476,6 +701,9 @@ Examples:
             if args.speed:
                 launcher.emulator.set_speed_multiplier(args.speed)
 
+            if args.unthrottled:
+                launcher.emulator.set_throttled(False)
+
             if args.log_level:
                 launcher.emulator.set_logging_level(args.log_level)
 
@@ -492,6 +720,32 @@ Examples:
             if args.run:
                 launcher.run_program(args.steps)
 
+            if args.benchmark:
+                bench = launcher.benchmark_execution(
+                    args.steps or 10000, args.batch_size
+                )
+                if "error" in bench:
+                    sys.exit(1)
+                print("\n" + "=" * 60)
+                print("EXECUTION BENCHMARK")
+                print("=" * 60)
+                for mode in ("normal", "turbo", "block_cache"):
+                    if mode not in bench:
+                        continue
+                    print(
+                        f"{mode.capitalize():<11}: "
+                        f"{bench[mode]['instructions_per_second']:>14,.0f} instr/s "
+                        f"({bench[mode]['steps_executed']} steps in "
+                        f"{bench[mode]['duration']:.3f}s)"
+                    )
+                print(f"Speedup    : {bench['speedup']:.1f}x")
+                if "block_cache" in bench:
+                    print(
+                        f"Block cache: {bench['block_cache_speedup']:.2f}x over "
+                        f"turbo, hit rate {bench['block_cache']['hit_rate']:.1%}"
+                    )
+                print("=" * 60)
+
             if args.cpu:
                 launcher.show_cpu_state()
 
@@ -513,6 +767,15 @@ Examples:
                     f"Cycle Delay: {stats['speed_controller']['cycle_delay_ms']:.3f}ms"
                 )
                 print(f"Step Delay: {stats['speed_controller']['step_delay_ms']:.3f}ms")
+                print(
+                    f"Clock: {stats['speed_controller']['achieved_mhz']:.3f} MHz achieved / "
+                    f"{stats['speed_controller']['target_mhz']:.3f} MHz target "
+                    f"({'paced' if stats['speed_controller']['pacing'] else 'unthrottled'})"
+                )
+                print(
+                    f"Pacing Jitter: {stats['speed_controller']['avg_jitter_ms']:.3f}ms avg, "
+                    f"{stats['speed_controller']['max_jitter_ms']:.3f}ms max"
+                )
 
                 if stats["emulator_logger"]["instruction_count"] > 0:
                     print(
@@ -0,0 +1,225 @@
+"""
+ROM Image Module
+
+This module builds the BASIC-M6502 ROM image from src/m6502.asm and caches it
+on disk. The source is assembled for its KIM-1 configuration with BASIC at
+$C000 and program text from $2200; a small monitor stub, assembled alongside,
+answers the KIM-1 entry points BASIC calls (GETCH, OUTCH and the break-key
+port) with the emulator's keyboard and display registers. Images are keyed by
+a hash of the source, the configuration and the assembler version, so only
+the first start-up after the source changes pays for assembly.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Union
+
+from loguru import logger
+
+from engine.assembler import assemble
+from engine.emulator.memory_bus import DISPLAY_START, KEYBOARD_DATA, KEYBOARD_STATUS
+
+ROM_SOURCE = Path(__file__).parent / "src" / "m6502.asm"
+DEFAULT_CACHE_DIR = Path(__file__).parent / "build" / "rom"
+
+# Bump when an assembler change can alter the assembled bytes
+ASSEMBLER_VERSION = 1
+
+# Switches locked before assembly; the source's own assignments are ignored
+ROM_CONFIG = {
+    "REALIO": 1,  # KIM-1 terminal I/O
+    "RORSW": 1,  # The CPU has a working ROR instruction
+    "KIMROM": 0,  # Keep SIN, COS, TAN and ATN
+    "DISKO": 0,  # No cassette SAVE and LOAD
+    "ROMLOC": 0xC000,
+    "RAMLOC": 0x2200,
+}
+
+# KIM-1 monitor routines BASIC calls, mapped onto the emulator's devices
+MONITOR_SOURCE = """
+	ORG	^O13500		;1740: KEYBOARD PORT, BIT 7 SET MEANS NO BREAK
+	^O377
+	ORG	^O17132		;1E5A: GETCH, WAIT FOR A KEY
+GETCH:	LDA	KBDSTS
+	BPL	GETCH
+GETKEY:	LDA	KBDDAT
+	STA	KBDSTS		;ACKNOWLEDGE IT
+	CMPI	13		;BASIC ECHOES THE CARRIAGE RETURN ITSELF
+	BEQ	GETRTS
+	STA	DISPLY		;ECHO IT
+GETRTS:	RTS
+	ORG	^O17240		;1EA0: OUTCH, TYPE THE CHARACTER IN A
+OUTCH:	PHA
+	ANDI	^O177		;TERMINALS IGNORE THE PARITY BIT
+	STA	DISPLY
+	PLA
+	RTS
+	END
+"""
+MONITOR_CONFIG = {
+    "KBDDAT": KEYBOARD_DATA,
+    "KBDSTS": KEYBOARD_STATUS,
+    "DISPLY": DISPLAY_START,
+}
+
+# Images built or loaded by this process, by cache key
+_rom_images: Dict[str, "RomImage"] = {}
+
+
+@dataclass(frozen=True)
+class RomImage:
+    """An assembled BASIC ROM plus the RAM it expects at start-up."""
+
+    cache_key: str
+    rom_start: int
+    rom: bytes
+    ram_segments: Tuple[Tuple[int, bytes], ...]
+    entry_point: int
+    symbols: Dict[str, int]
+    # Names in ``symbols`` that label code or data rather than constants
+    labels: FrozenSet[str] = frozenset()
+    build_time: float = 0.0
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def rom_end(self) -> int:
+        """Last address of the ROM."""
+        return self.rom_start + len(self.rom) - 1
+
+    def get_image_info(self) -> Dict[str, Any]:
+        """Get information about the image."""
+        return {
+            "cache_key": self.cache_key,
+            "rom_start": f"0x{self.rom_start:04X}",
+            "rom_end": f"0x{self.rom_end:04X}",
+            "rom_size": len(self.rom),
+            "ram_segments": len(self.ram_segments),
+            "entry_point": f"0x{self.entry_point:04X}",
+            "labels": len(self.labels),
+            "build_time": self.build_time,
+        }
+
+
+def rom_cache_key(source: str) -> str:
+    """Cache key for the image built from ``source``."""
+    config = json.dumps(
+        {"rom": ROM_CONFIG, "monitor": MONITOR_SOURCE, "version": ASSEMBLER_VERSION},
+        sort_keys=True,
+    )
+    return hashlib.sha256((source + config).encode("utf-8")).hexdigest()
+
+
+def build_rom_image(source: str) -> RomImage:
+    """Assemble ``source`` and the monitor stub into a ROM image."""
+    start_time = time.perf_counter()
+    basic = assemble(source, ROM_CONFIG)
+    monitor = assemble(MONITOR_SOURCE, MONITOR_CONFIG)
+
+    rom_start = ROM_CONFIG["ROMLOC"]
+    rom_end = max(
+        start + len(data) for start, data in basic.segments if start >= rom_start
+    )
+    ram_segments = tuple(
+        segment
+        for segment in basic.segments + monitor.segments
+        if segment[0] < rom_start
+    )
+    symbols = {**monitor.symbols, **basic.symbols}
+
+    return RomImage(
+        cache_key=rom_cache_key(source),
+        rom_start=rom_start,
+        rom=basic.image(rom_start, rom_end),
+        ram_segments=ram_segments,
+        entry_point=symbols["INIT"],
+        symbols=symbols,
+        labels=basic.labels | monitor.labels,
+        build_time=time.perf_counter() - start_time,
+    )
+
+
+def load_rom_image(
+    source_path: Optional[Union[str, Path]] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> RomImage:
+    """Get the ROM image for ``source_path``, assembling it only on a cache miss.
+
+    Images are looked up in this process first, then in ``cache_dir`` as a
+    ``.bin`` ROM with a ``.json`` sidecar holding the RAM segments and symbols.
+    """
+    source = Path(source_path or ROM_SOURCE).read_text(encoding="latin-1")
+    key = rom_cache_key(source)
+    image = _rom_images.get(key)
+    if image is not None:
+        return image
+
+    cache_path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"basic-m6502-{key[:16]}"
+    image = _read_cache(cache_path, key)
+    if image is None:
+        image = build_rom_image(source)
+        logger.info(
+            f"BASIC ROM assembled: {len(image.rom)} bytes at "
+            f"0x{image.rom_start:04X} in {image.build_time:.3f}s"
+        )
+        _write_cache(cache_path, image)
+
+    _rom_images[key] = image
+    return image
+
+
+def _read_cache(cache_path: Path, key: str) -> Optional[RomImage]:
+    """Load a cached image, or ``None`` when it is missing or stale."""
+    rom_path = cache_path.with_suffix(".bin")
+    info_path = cache_path.with_suffix(".json")
+    try:
+        info = json.loads(info_path.read_text())
+        rom = rom_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+    if info.get("cache_key") != key or len(rom) != info.get("rom_size"):
+        return None
+    if "labels" not in info:
+        return None
+
+    return RomImage(
+        cache_key=key,
+        rom_start=info["rom_start"],
+        rom=rom,
+        ram_segments=tuple(
+            (start, bytes.fromhex(data)) for start, data in info["ram_segments"]
+        ),
+        entry_point=info["entry_point"],
+        symbols=info["symbols"],
+        labels=frozenset(info["labels"]),
+        build_time=info["build_time"],
+    )
+
+
+def _write_cache(cache_path: Path, image: RomImage):
+    """Store an image; a cache that cannot be written is only logged."""
+    info = {
+        "cache_key": image.cache_key,
+        "rom_start": image.rom_start,
+        "rom_size": len(image.rom),
+        "ram_segments": [[start, data.hex()] for start, data in image.ram_segments],
+        "entry_point": image.entry_point,
+        "symbols": image.symbols,
+        "labels": sorted(image.labels),
+        "build_time": image.build_time,
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent emulators never read a partial file
+        for suffix, data in (
+            (".bin", image.rom),
+            (".json", json.dumps(info).encode("utf-8")),
+        ):
+            temporary = cache_path.with_suffix(f"{suffix}.{os.getpid()}.tmp")
+            temporary.write_bytes(data)
+            os.replace(temporary, cache_path.with_suffix(suffix))
+    except OSError as e:
+        logger.warning(f"Could not cache BASIC ROM in {cache_path.parent}: {e}")
@@ -28,6 +28,7 @@ class EmulatorTestRunner:
         self.launcher = EmulatorLauncher()
         self.test_results = []
         self.performance_metrics = {}
+        self.baseline_snapshot = None
 
         # Configure logging
         logger.remove()
@@ -41,20 +42,23 @@ class EmulatorTestRunner:
             ),
         )
 
-    def run_test(self, test_name: str, test_file: str, expected_output: List[str] = None) -> Dict[str, Any]:
+    def run_test(
+        self, test_name: str, test_file: str, expected_output: List[str] = None
+    ) -> Dict[str, Any]:
         """Run a single test and return results."""
         logger.info(f"Running test: {test_name}")
 
         start_time = time.perf_counter()
 
         try:
-            # Initialize emulator
-            if not self.launcher.initialize():
+            # Initialize the emulator once, then fork each test from a
+            # snapshot of the warm machine
+            if not self._prepare_emulator():
                 return {
                     "test_name": test_name,
                     "status": "FAILED",
                     "error": "Failed to initialize emulator",
-                    "duration": 0
+                    "duration": 0,
                 }
 
             # Load test program
@@ -63,7 +67,7 @@ class EmulatorTestRunner:
                     "test_name": test_name,
                     "status": "FAILED",
                     "error": "Failed to load test program",
-                    "duration": 0
+                    "duration": 0,
                 }
 
             # Run program
@@ -78,7 +82,7 @@ class EmulatorTestRunner:
                     "status": "FAILED",
                     "error": result["error"],
                     "duration": duration,
-                    "commands_executed": result.get("commands_executed", 0)
+                    "commands_executed": result.get("commands_executed", 0),
                 }
 
             # Validate output if expected output provided
@@ -91,7 +95,7 @@ class EmulatorTestRunner:
                         "error": "Output validation failed",
                         "duration": duration,
                         "expected": expected_output,
-                        "actual": actual_output
+                        "actual": actual_output,
                     }
 
             return {
@@ -100,7 +104,7 @@ class EmulatorTestRunner:
                 "duration": duration,
                 "commands_executed": result.get("commands_executed", 0),
                 "output": result.get("output", []),
-                "errors": result.get("errors", [])
+                "errors": result.get("errors", []),
             }
 
         except Exception as e:
@@ -109,9 +113,19 @@ class EmulatorTestRunner:
                 "test_name": test_name,
                 "status": "FAILED",
                 "error": str(e),
-                "duration": duration
+                "duration": duration,
             }
 
+    def _prepare_emulator(self) -> bool:
+        """Initialize once, then restore the warm baseline for each test."""
+        if self.baseline_snapshot is None:
+            if not self.launcher.initialize():
+                return False
+            self.baseline_snapshot = self.launcher.emulator.snapshot()
+            return True
+
+        return self.launcher.emulator.restore(self.baseline_snapshot)
+
     def _validate_output(self, actual: List[str], expected: List[str]) -> bool:
         """Validate that actual output contains expected strings."""
         actual_str = " ".join(actual).upper()
@@ -148,7 +162,7 @@ class EmulatorTestRunner:
                 "duration": duration,
                 "emulator_info": emulator_info,
                 "cpu_state": cpu_state,
-                "memory_dump_size": len(memory_dump)
+                "memory_dump_size": len(memory_dump),
             }
 
         except Exception as e:
@@ -163,7 +177,7 @@ class EmulatorTestRunner:
             "Testing PRINT command",
             "Hello, AI Vintage OS!",
             "Testing LET command",
-            "Testing END command"
+            "Testing END command",
         ]
 
         return self.run_test("Basic Functionality", test_file, expected_output)
@@ -175,7 +189,7 @@ class EmulatorTestRunner:
             "MEMORY MANAGEMENT TEST",
             "Testing variable assignments",
             "Testing arithmetic operations",
-            "Memory test completed successfully"
+            "Memory test completed successfully",
         ]
 
         return self.run_test("Memory Management", test_file, expected_output)
@@ -188,7 +202,7 @@ class EmulatorTestRunner:
             "Testing FOR loop",
             "Testing IF-THEN",
             "Testing nested operations",
-            "Control flow test completed"
+            "Control flow test completed",
         ]
 
         return self.run_test("Control Flow", test_file, expected_output)
@@ -202,7 +216,7 @@ class EmulatorTestRunner:
             "Testing empty commands",
             "Testing malformed commands",
             "Testing boundary conditions",
-            "Error handling test completed"
+            "Error handling test completed",
         ]
 
         return self.run_test("Error Handling", test_file, expected_output)
@@ -214,7 +228,7 @@ class EmulatorTestRunner:
             "PERFORMANCE TEST",
             "Testing rapid operations",
             "Testing string operations",
-            "Performance test completed"
+            "Performance test completed",
         ]
 
         return self.run_test("Performance", test_file, expected_output)
@@ -249,7 +263,7 @@ class EmulatorTestRunner:
                 results[speed] = {
                     "duration": duration,
                     "commands_executed": result.get("commands_executed", 0),
-                    "success": "error" not in result
+                    "success": "error" not in result,
                 }
 
             return {"status": "PASSED", "speed_results": results}
@@ -283,7 +297,7 @@ class EmulatorTestRunner:
 
                 results[level] = {
                     "success": "error" not in result,
-                    "commands_executed": result.get("commands_executed", 0)
+                    "commands_executed": result.get("commands_executed", 0),
                 }
 
             return {"status": "PASSED", "logging_results": results}
@@ -323,7 +337,9 @@ class EmulatorTestRunner:
                 logger.info(f"✅ {test_name} test PASSED")
             else:
                 failed += 1
-                logger.error(f"❌ {test_name} test FAILED: {result.get('error', 'Unknown error')}")
+                logger.error(
+                    f"❌ {test_name} test FAILED: {result.get('error', 'Unknown error')}"
+                )
 
         total_duration = time.perf_counter() - start_time
 
@@ -334,25 +350,25 @@ class EmulatorTestRunner:
             "failed": failed,
             "success_rate": (passed / len(tests)) * 100,
             "total_duration": total_duration,
-            "results": results
+            "results": results,
         }
 
         return summary
 
     def print_summary(self, summary: Dict[str, Any]):
         """Print a formatted test summary."""
-        print("\n" + "="*80)
+        print("\n" + "=" * 80)
         print("AI VINTAGE OS - EMULATOR TEST SUMMARY")
-        print("="*80)
+        print("=" * 80)
         print(f"Total Tests: {summary['total_tests']}")
         print(f"Passed: {summary['passed']}")
         print(f"Failed: {summary['failed']}")
         print(f"Success Rate: {summary['success_rate']:.1f}%")
         print(f"Total Duration: {summary['total_duration']:.3f}s")
-        print("="*80)
+        print("=" * 80)
 
         print("\nDETAILED RESULTS:")
-        print("-"*80)
+        print("-" * 80)
 
         for test_name, result in summary["results"].items():
             status_icon = "✅" if result["status"] == "PASSED" else "❌"
@@ -366,7 +382,7 @@ class EmulatorTestRunner:
             if "commands_executed" in result:
                 print(f"   Commands Executed: {result['commands_executed']}")
 
-        print("-"*80)
+        print("-" * 80)
 
         # Performance metrics
         if "Performance" in summary["results"]:
@@ -376,13 +392,13 @@ class EmulatorTestRunner:
                 print(f"Commands Executed: {perf_result.get('commands_executed', 0)}")
                 print(f"Duration: {perf_result.get('duration', 0):.3f}s")
 
-        print("="*80)
+        print("=" * 80)
 
 
 def main():
     """Main entry point for the test runner."""
     print("AI Vintage OS - Emulator Test Runner")
-    print("="*50)
+    print("=" * 50)
 
     # Create test runner
     runner = EmulatorTestRunner()
@@ -0,0 +1,131 @@
+"""
+Assembler Tests
+
+Test suite for the MACRO-10 style 6502 cross-assembler: addressing modes,
+expressions, macros, conditionals and multi-pass symbol resolution.
+"""
+
+import pytest
+
+from engine.assembler import AssemblyError, assemble
+
+
+def code(source, **predefined):
+    """Assemble ``source`` and return the bytes of its first segment."""
+    result = assemble(source, predefined)
+    return result.segments[0][1]
+
+
+class TestInstructions:
+    """Test instruction encoding."""
+
+    def test_mode_suffixes(self):
+        """Test I, DY and D suffixes select immediate, (zp),Y and indirect."""
+        assert code("LDAI 5\nLDADY 16\nJMPD 512\n") == bytes(
+            [0xA9, 0x05, 0xB1, 0x10, 0x6C, 0x00, 0x02]
+        )
+
+    def test_zero_page_and_absolute(self):
+        """Test operands below 256 use zero-page forms."""
+        assert code("LDA 16\nLDA 4096\nSTA 16,X\nLDA 4096,Y,\n") == bytes(
+            [0xA5, 0x10, 0xAD, 0x00, 0x10, 0x95, 0x10, 0xB9, 0x00, 0x10]
+        )
+
+    def test_accumulator_and_implied(self):
+        """Test shifts of A and instructions without operands."""
+        assert code("ASL A\nROL A,\nLSR\nRTS\n") == bytes([0x0A, 0x2A, 0x4A, 0x60])
+
+    def test_relative_branches(self):
+        """Test branch offsets, including . for the current location."""
+        assert code("LOOP: DEX\nBNE LOOP\nBEQ .+4\n") == bytes(
+            [0xCA, 0xD0, 0xFD, 0xF0, 0x02]
+        )
+
+    def test_branch_out_of_range(self):
+        """Test a branch further than 127 bytes is rejected."""
+        with pytest.raises(AssemblyError):
+            assemble("BNE FAR\nBLOCK 200\nFAR: RTS\n")
+
+    def test_unsupported_mode(self):
+        """Test an addressing mode the instruction lacks is an error."""
+        with pytest.raises(AssemblyError):
+            assemble("STAI 1\n")
+
+
+class TestExpressionsAndData:
+    """Test expressions, radix handling and data pseudo-ops."""
+
+    def test_radix_and_prefixes(self):
+        """Test RADIX, ^O/^D prefixes and decimal points."""
+        assert code("RADIX 8\n10\n^D10\n10.\n^O377\n") == bytes([8, 10, 10, 255])
+
+    def test_operators(self):
+        """Test & and ! bind tighter than * and /."""
+        assert code('<3+4>*2\n1+6&3\n"A"\n1!2*2\n') == bytes([14, 3, 65, 6])
+
+    def test_adr_and_dc(self):
+        """Test ADR emits little-endian words and DC sets bit 7 on the end."""
+        assert code('ADR(4660)\nDC"OK"\n') == bytes([0x34, 0x12, ord("O"), 0xCB])
+
+    def test_org_and_block(self):
+        """Test ORG and BLOCK move the location counter."""
+        result = assemble("ORG 512\nX: BLOCK 2\nY: 1\n")
+
+        assert result.symbols["X"] == 512
+        assert result.labels == {"X", "Y"}
+        assert result.segments == ((514, bytes([1])),)
+
+    def test_six_character_symbols(self):
+        """Test symbols are significant to six characters."""
+        assert code("ZSTORDO=7\nZSTORD\n") == bytes([7])
+
+    def test_undefined_symbol(self):
+        """Test an undefined symbol reports its line."""
+        with pytest.raises(AssemblyError) as error:
+            assemble("NOP\nLDA NOWHERE\n")
+
+        assert error.value.line == 2
+
+
+class TestMacrosAndConditionals:
+    """Test macros, repetition and conditional assembly."""
+
+    def test_define_with_arguments(self):
+        """Test dummy arguments are substituted, including bracketed ones."""
+        source = "DEFINE LDWD (WD),<\n\tLDA\tWD\n\tLDY\t<WD>+1>\nLDWD <16>\n"
+
+        assert code(source) == bytes([0xA5, 0x10, 0xA4, 0x11])
+
+    def test_irpc_text_macro(self):
+        """Test the DT macro emits a string one character at a time."""
+        source = 'DEFINE DT(Q),<\nIRPC Q,<IFDIF <Q><">,<EXP "Q">>>\nDT"HI Q"\n'
+
+        assert code(source) == b"HI Q"
+
+    def test_repeat(self):
+        """Test REPEAT assembles its body count times."""
+        assert code("REPEAT 3,<INX>\n") == bytes([0xE8] * 3)
+
+    def test_conditionals_and_predefined(self):
+        """Test IFE/IFN bodies and locked predefined symbols."""
+        source = "REALIO=4\nIFE REALIO-1,<1>\nIFN REALIO-1,<2\n3>\n"
+
+        assert code(source) == bytes([2, 3])
+        assert code(source, REALIO=1) == bytes([1])
+
+    def test_pass_conditionals(self):
+        """Test IF1 bodies only assemble in the first pass."""
+        result = assemble("IF1,<X=1>\nIF2,<X=2>\nIFNDEF Y,<Y==X>\nY\n")
+
+        assert result.segments[0][1] == bytes([2])
+
+    def test_comment_block(self):
+        """Test COMMENT skips text up to its delimiter."""
+        assert code("COMMENT *\nLDA <\n*\nNOP\n") == bytes([0xEA])
+
+    def test_forward_zero_page_reference(self):
+        """Test forward references settle over extra passes."""
+        result = assemble("LDA ZP\nJMP DONE\nDONE: RTS\nZP=16\n")
+
+        assert result.segments[0][1] == bytes([0xA5, 0x10, 0x4C, 0x05, 0x00, 0x60])
+        assert result.passes >= 2
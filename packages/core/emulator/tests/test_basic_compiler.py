@@ -0,0 +1,238 @@
+"""
+BASIC Compiler Tests
+
+Test suite for the BASIC tokenizer, compiler and compilation cache.
+"""
+
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from engine.basic_compiler import (
+    BasicCompiler,
+    BasicSyntaxError,
+    compile_program,
+    compile_statement,
+    tokenize,
+)
+from engine.basic_m6502 import BASICM6502Engine
+
+TEST_PROGRAMS = Path(__file__).parent.parent / "test_programs"
+
+
+class TestTokenizer:
+    """Test BASIC tokenization."""
+
+    def test_keywords_and_names_uppercased(self):
+        """Test keywords and names are normalized but strings keep case."""
+        tokens = tokenize('print "Hi there"; x')
+
+        assert [(kind, value) for kind, value, _ in tokens] == [
+            ("kw", "PRINT"),
+            ("str", "Hi there"),
+            ("op", ";"),
+            ("id", "X"),
+        ]
+
+    def test_numbers(self):
+        """Test integer and floating point literals."""
+        values = [value for _, value, _ in tokenize("10 2.5 .5 1E3")]
+
+        assert values == [10, 2.5, 0.5, 1000.0]
+        assert isinstance(values[0], int)
+
+    def test_rem_swallows_rest_of_line(self):
+        """Test REM text, including colons, is a single token."""
+        tokens = tokenize("REM a: b")
+
+        assert tokens[1][:2] == ("rem", "a: b")
+
+    def test_unexpected_character(self):
+        """Test characters outside the BASIC alphabet are rejected."""
+        with pytest.raises(BasicSyntaxError):
+            tokenize("PRINT @")
+
+
+class TestCompiler:
+    """Test statement and program compilation."""
+
+    def test_expression_precedence(self):
+        """Test operators bind with BASIC precedence."""
+        (statement,) = compile_statement("LET Y = X + 2 * Z ^ 2")
+
+        assert statement.op == "LET"
+        assert statement.args == (
+            ("var", "Y"),
+            (
+                "binop",
+                "+",
+                ("var", "X"),
+                ("binop", "*", ("num", 2), ("binop", "^", ("var", "Z"), ("num", 2))),
+            ),
+        )
+
+    def test_constant_folding(self):
+        """Test arithmetic on literals is folded at compile time."""
+        (statement,) = compile_statement("X = 3 * 4 - -1")
+
+        assert statement.args[1] == ("num", 13)
+
+    def test_implicit_let_and_print_shorthand(self):
+        """Test implicit assignments and ? compile to LET and PRINT."""
+        statements = compile_statement('A = 1 : ? "A"; A')
+
+        assert [s.op for s in statements] == ["LET", "PRINT"]
+        assert statements[1].args == ((("str", "A"), ";", ("var", "A")),)
+
+    def test_if_then_branch(self):
+        """Test everything after THEN belongs to the conditional branch."""
+        (statement,) = compile_statement("IF X > 1 THEN Y = 2 : GOTO 100")
+
+        condition, branch = statement.args
+        assert condition == ("binop", ">", ("var", "X"), ("num", 1))
+        assert [s.op for s in branch] == ["LET", "GOTO"]
+
+    def test_if_then_line_number(self):
+        """Test THEN followed by a line number compiles to a GOTO."""
+        (statement,) = compile_statement("IF X THEN 50")
+
+        assert statement.args[1][0].op == "GOTO"
+        assert statement.args[1][0].args == (50,)
+
+    def test_program_layout(self):
+        """Test lines are ordered and indexed, with DATA collected."""
+        program = compile_program(
+            '30 DATA 1, "A,B", C\n10 FOR I = 1 TO 3 : NEXT I\n20 READ X\n10 END\n'
+        )
+
+        assert program.line_numbers == (10, 20, 30)
+        assert [s.op for s in program.statements] == ["END", "READ", "DATA"]
+        assert program.line_index == {10: 0, 20: 1, 30: 2}
+        assert program.data == (1, "A,B", "C")
+        assert program.data_index[30] == 0
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "PRINT (",
+            "FOR I 1 TO 2",
+            "GOTO X",
+            "X = = 2",
+            "UNKNOWN COMMAND",
+            "NOT 5",
+            "AND 5",
+            "TO 5",
+        ],
+    )
+    def test_syntax_errors(self, source):
+        """Test malformed statements raise BasicSyntaxError."""
+        with pytest.raises(BasicSyntaxError):
+            compile_statement(source)
+
+    def test_syntax_error_reports_line(self):
+        """Test program errors carry the offending line number."""
+        with pytest.raises(BasicSyntaxError) as error:
+            compile_program("10 PRINT 1\n20 FOR\n")
+
+        assert error.value.line == 20
+
+    @pytest.mark.parametrize("path", sorted(TEST_PROGRAMS.glob("*.bas")))
+    def test_compiles_test_programs(self, path):
+        """Test every bundled test program compiles."""
+        program = compile_program(path.read_text())
+
+        assert program.statements
+
+
+class TestCompilerCache:
+    """Test the content-hash compilation cache."""
+
+    def test_program_cache_hit(self):
+        """Test recompiling identical source returns the cached program."""
+        compiler = BasicCompiler()
+        source = '10 PRINT "A"\n20 END\n'
+
+        first = compiler.compile_program(source)
+        second = compiler.compile_program(source)
+
+        assert second is first
+        stats = compiler.get_cache_stats()
+        assert stats["program_misses"] == 1
+        assert stats["program_hits"] == 1
+
+    def test_statement_cache_includes_errors(self):
+        """Test invalid commands are cached rather than re-parsed."""
+        compiler = BasicCompiler()
+
+        for _ in range(3):
+            with pytest.raises(BasicSyntaxError):
+                compiler.compile_statement("NOT A COMMAND")
+
+        assert compiler.stats["statement_misses"] == 1
+        assert compiler.stats["statement_hits"] == 2
+
+    def test_cached_errors_are_raised_fresh(self):
+        """Test each cached failure raises a new error with the same details."""
+        compiler = BasicCompiler()
+        errors = []
+
+        for _ in range(3):
+            with pytest.raises(BasicSyntaxError) as error:
+                compiler.compile_statement("FOO BAR")
+            errors.append(error.value)
+
+        assert errors[0] is not errors[2]
+        assert str(errors[2]) == str(errors[0])
+        assert len(traceback.extract_tb(errors[2].__traceback__)) == len(
+            traceback.extract_tb(errors[0].__traceback__)
+        )
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used program is evicted."""
+        compiler = BasicCompiler(cache_size=2)
+
+        for value in range(3):
+            compiler.compile_program(f"10 PRINT {value}\n")
+
+        assert len(compiler.program_cache) == 2
+
+    def test_concurrent_lookups(self):
+        """Test threads sharing a small cache keep it bounded and counted."""
+        compiler = BasicCompiler(cache_size=4)
+
+        def compile_many(offset):
+            for value in range(200):
+                compiler.compile_program(f"10 PRINT {(value + offset) % 8}\n")
+                compiler.compile_statement(f"PRINT {(value + offset) % 8}")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(compile_many, range(8)))
+
+        stats = compiler.get_cache_stats()
+        assert stats["program_hits"] + stats["program_misses"] == 1600
+        assert stats["statement_hits"] + stats["statement_misses"] == 1600
+        assert len(compiler.program_cache) <= 4
+
+
+class TestEngineCompilation:
+    """Test compilation through BASICM6502Engine."""
+
+    def test_validate_program(self):
+        """Test program validation reports errors with line numbers."""
+        engine = BASICM6502Engine()
+
+        assert engine.validate_program("10 PRINT 1\n")["valid"] is True
+        invalid = engine.validate_program("10 PRINT 1\n20 GOTO\n")
+        assert invalid["valid"] is False
+        assert invalid["line"] == 20
+
+    def test_parse_implicit_assignment(self):
+        """Test commands without LET parse as assignments."""
+        engine = BASICM6502Engine()
+
+        parsed = engine.parse_basic_command("X = 10")
+
+        assert parsed["type"] == "assignment"
+        assert parsed["args"] == {"variable": "X", "value": "10"}
@@ -0,0 +1,248 @@
+"""
+BASIC VM Tests
+
+Test suite for the BASIC interpreter: control flow, variables, DATA handling,
+budgets and error reporting.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from engine.basic_compiler import compile_program, compile_statement
+from engine.basic_vm import BasicVM, format_number
+from engine.emulator.m6502_emulator import M6502Emulator
+
+TEST_PROGRAMS = Path(__file__).parent.parent / "test_programs"
+
+
+def run(source, **kwargs):
+    """Compile and run a program on a fresh VM."""
+    vm = BasicVM()
+    vm.load(compile_program(source))
+    return vm, vm.run(**kwargs)
+
+
+class TestControlFlow:
+    """Test loops, jumps and subroutines."""
+
+    def test_for_loop_with_step(self):
+        """Test FOR/NEXT runs the body for every value of the loop variable."""
+        _, result = run("10 FOR I = 10 TO 1 STEP -3\n20 PRINT I;\n30 NEXT I\n")
+
+        assert result["output"] == [" 10  7  4  1"]
+        assert result["status"] == "completed"
+
+    def test_nested_loops(self):
+        """Test NEXT without a name closes the innermost loop."""
+        vm, _ = run(
+            "10 FOR I = 1 TO 3\n20 FOR J = 1 TO 4\n30 C = C + 1\n"
+            "40 NEXT\n50 NEXT I\n"
+        )
+
+        assert vm.variables["C"] == 12
+
+    def test_gosub_return(self):
+        """Test RETURN resumes after the calling GOSUB."""
+        _, result = run(
+            '10 GOSUB 100 : PRINT "BACK"\n20 END\n100 PRINT "SUB"\n110 RETURN\n'
+        )
+
+        assert result["output"] == ["SUB", "BACK"]
+        assert result["status"] == "ended"
+
+    def test_if_then_goto(self):
+        """Test a false condition skips the rest of the line."""
+        _, result = run(
+            '10 I = I + 1\n20 IF I < 3 THEN PRINT I : GOTO 10\n30 PRINT "DONE"\n'
+        )
+
+        assert result["output"] == [" 1", " 2", "DONE"]
+
+    def test_on_goto(self):
+        """Test ON GOTO selects a target by index and falls through otherwise."""
+        _, result = run(
+            '10 ON X GOTO 30, 40\n20 PRINT "NONE" : X = 2 : GOTO 10\n'
+            '30 PRINT "ONE" : END\n40 PRINT "TWO"\n'
+        )
+
+        assert result["output"] == ["NONE", "TWO"]
+
+    def test_performance_test_program_loops(self):
+        """Test the bundled performance test runs every loop iteration."""
+        source = (TEST_PROGRAMS / "performance_test.bas").read_text()
+
+        _, result = run(source)
+
+        assert result["status"] == "ended"
+        assert len(result["output"]) == 2 + 10 + 1 + 50 + 1
+        assert result["output"][2] == "Progress:  10"
+        assert result["output"][-1] == "Performance test completed!"
+
+
+class TestData:
+    """Test variables, arrays and DATA/READ."""
+
+    def test_read_restore(self):
+        """Test READ walks DATA in line order and RESTORE rewinds it."""
+        vm, _ = run(
+            "10 READ A, B$\n20 RESTORE 50\n30 READ C\n40 END\n"
+            '45 DATA 1, "X"\n50 DATA 7\n'
+        )
+
+        assert vm.variables == {"A": 1, "B$": "X", "C": 7}
+
+    def test_out_of_data(self):
+        """Test reading past the last DATA item is an error."""
+        _, result = run("10 DATA 1\n20 READ A, B\n")
+
+        assert result["error"] == "OUT OF DATA"
+        assert result["line"] == 20
+
+    def test_arrays(self):
+        """Test DIM and multi-dimensional element access."""
+        vm, _ = run(
+            "10 DIM A(2, 3)\n20 FOR I = 0 TO 2\n30 A(I, 3) = I * 10\n40 NEXT\n"
+            "50 T = A(1, 3) + A(2, 3)\n"
+        )
+
+        assert vm.variables["T"] == 30
+
+    def test_strings_and_functions(self):
+        """Test string concatenation and built-in functions."""
+        vm, _ = run('10 A$ = "HELLO" + "!"\n20 L = LEN(A$)\n30 B$ = LEFT$(A$, 2)\n')
+
+        assert vm.variables["L"] == 6
+        assert vm.variables["B$"] == "HE"
+
+    def test_substrings(self):
+        """Test LEFT$, RIGHT$ and MID$ at the edges of their ranges."""
+        vm, _ = run(
+            '10 A$ = "HELLO"\n20 B$ = MID$(A$, 2, 3) + MID$(A$, 5) + MID$(A$, 9)\n'
+            '30 C$ = LEFT$(A$, 0) + RIGHT$(A$, 2) + RIGHT$(A$, 0) + LEFT$(A$, 9)\n'
+            '40 E = "A" < "B"\n'
+        )
+
+        assert vm.variables["B$"] == "ELLO"
+        assert vm.variables["C$"] == "LOHELLO"
+        assert vm.variables["E"] == -1
+
+    def test_format_number(self):
+        """Test numbers print with a sign position."""
+        assert format_number(5) == " 5"
+        assert format_number(-2.5) == "-2.5"
+        assert format_number(4.0) == " 4"
+
+
+class TestErrorsAndBudgets:
+    """Test runtime errors and execution limits."""
+
+    @pytest.mark.parametrize(
+        "source, error",
+        [
+            ("10 PRINT 1 / 0\n", "DIVISION BY ZERO"),
+            ("10 GOTO 99\n", "UNDEF'D STATEMENT"),
+            ("10 RETURN\n", "RETURN WITHOUT GOSUB"),
+            ('10 A = "X"\n', "TYPE MISMATCH"),
+            ("10 DIM A(2)\n20 A(3) = 1\n", "BAD SUBSCRIPT"),
+            ("10 PRINT 10 ^ 400\n", "OVERFLOW"),
+            ("10 PRINT (-8) ^ 0.5\n", "ILLEGAL QUANTITY"),
+            ('10 PRINT MID$("HELLO", 0, 2)\n', "ILLEGAL QUANTITY"),
+            ('10 PRINT LEFT$("HELLO", -1)\n', "ILLEGAL QUANTITY"),
+            ('10 PRINT RIGHT$("HELLO", 256)\n', "ILLEGAL QUANTITY"),
+            ('10 PRINT MID$("HELLO", "2")\n', "TYPE MISMATCH"),
+            ('10 PRINT "A" = 1\n', "TYPE MISMATCH"),
+            ('10 IF 1 < "B" THEN 10\n', "TYPE MISMATCH"),
+            ('10 A$ = "XX"\n20 A$ = A$ + A$\n30 GOTO 20\n', "STRING TOO LONG"),
+            ('10 PRINT "X" * 1000\n', "TYPE MISMATCH"),
+            ("10 DIM A(20000)\n", "OUT OF MEMORY"),
+            ("10 DIM A(100, 100, 100)\n", "OUT OF MEMORY"),
+            (
+                "10 DIM A(9999), B(9999), C(9999)\n20 DIM D(9999), E(9999), F(9999)\n"
+                "30 DIM G(9999)\n",
+                "OUT OF MEMORY",
+            ),
+            ("10 GOSUB 10\n", "OUT OF MEMORY"),
+        ],
+    )
+    def test_runtime_errors(self, source, error):
+        """Test Python failures surface as BASIC errors with a line number."""
+        _, result = run(source)
+
+        assert result["status"] == "error"
+        assert result["error"] == error
+        assert result["line"] is not None
+
+    def test_string_length_limit(self):
+        """Test INPUT and READ reject strings longer than 255 characters."""
+        vm = BasicVM()
+        vm.load(compile_program("10 INPUT A$\n"))
+        vm.push_input("X" * 256)
+        assert vm.run()["error"] == "STRING TOO LONG"
+
+        vm.load(compile_program(f'10 READ A$\n20 DATA "{"X" * 256}"\n'))
+        assert vm.run()["error"] == "STRING TOO LONG"
+
+        _, result = run(f'10 A$ = "{"X" * 255}"\n20 PRINT LEN(A$)\n')
+        assert result["output"] == [" 255"]
+
+    def test_long_print_line_wraps(self):
+        """Test a print line that never ends wraps instead of growing."""
+        _, result = run('10 PRINT "XXXXX";\n20 GOTO 10\n', max_statements=400)
+
+        assert result["output"] == ["X" * 255] * 3 + ["X" * 235]
+
+    def test_power_is_floating_point(self):
+        """Test ``^`` computes in floating point rather than exact integers."""
+        _, result = run("10 PRINT 2 ^ 10\n20 PRINT 10 ^ 20\n30 PRINT 4 ^ 0.5\n")
+
+        assert result["output"] == [" 1024", " 1E+20", " 2"]
+
+    def test_statement_budget(self):
+        """Test an endless loop stops when its statement budget runs out."""
+        vm, result = run("10 I = I + 1\n20 GOTO 10\n", max_statements=1000)
+
+        assert result["status"] == "budget_exhausted"
+        assert result["statements_executed"] == 1000
+        assert vm.variables["I"] == 500
+
+    def test_time_limit(self):
+        """Test an endless loop stops at its time limit."""
+        _, result = run("10 GOTO 10\n", time_limit=0.05)
+
+        assert result["status"] == "timeout"
+        assert result["execution_time"] < 1
+
+
+class TestDirectMode:
+    """Test direct-mode statements and state handling."""
+
+    def test_variables_persist_between_commands(self):
+        """Test direct commands share the variable table."""
+        vm = BasicVM()
+
+        vm.execute(compile_statement("X = 20"))
+        result = vm.execute(compile_statement("PRINT X * 2"))
+
+        assert result["output"] == [" 40"]
+
+    def test_goto_continues_program(self):
+        """Test a direct GOTO runs the loaded program from that line."""
+        vm = BasicVM()
+        vm.load(compile_program('10 PRINT "A"\n20 PRINT "B"\n'))
+
+        result = vm.execute(compile_statement("GOTO 20"))
+
+        assert result["output"] == ["B"]
+
+    def test_emulator_snapshot_restores_variables(self):
+        """Test emulator snapshots include BASIC variables."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        emulator.execute_basic_command("X = 1")
+        snapshot = emulator.snapshot()
+
+        emulator.execute_basic_command("X = 2")
+        emulator.restore(snapshot)
+
+        assert emulator.execute_basic_command("PRINT X")["output"] == " 1"
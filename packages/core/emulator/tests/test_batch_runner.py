@@ -0,0 +1,150 @@
+"""
+Batch Runner Tests
+
+Test suite for the headless batch runner: program discovery, isolation
+between programs, budgets, the worker pool and the command line.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from engine import batch_runner
+from engine.batch_runner import BatchRunner, collect_programs
+
+TEST_PROGRAMS = Path(__file__).parent.parent / "test_programs"
+
+
+@pytest.fixture
+def programs(tmp_path):
+    """Write named BASIC programs into ``tmp_path`` and return their paths."""
+
+    def write(**sources):
+        paths = []
+        for name, source in sources.items():
+            path = tmp_path / f"{name}.bas"
+            path.write_text(source)
+            paths.append(str(path))
+        return paths
+
+    return write
+
+
+def by_name(results):
+    """Index results by program file name."""
+    return {Path(result["path"]).stem: result for result in results}
+
+
+class TestCollectPrograms:
+    """Test expanding paths into program files."""
+
+    def test_directory_and_glob(self, tmp_path):
+        """Test directories are searched recursively and globs are expanded."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.bas").write_text("10 END\n")
+        (tmp_path / "sub" / "b.bas").write_text("10 END\n")
+        (tmp_path / "notes.txt").write_text("")
+
+        assert [Path(p).name for p in collect_programs([str(tmp_path)])] == [
+            "a.bas",
+            "b.bas",
+        ]
+        assert collect_programs([str(tmp_path / "*.bas")]) == [str(tmp_path / "a.bas")]
+
+    def test_duplicates_run_once(self):
+        """Test a file named twice is only collected once."""
+        path = str(TEST_PROGRAMS / "control_flow.bas")
+
+        assert collect_programs([path, path]) == [path]
+
+
+class TestInterpreterBatch:
+    """Test batches run on the BASIC interpreter."""
+
+    def test_bundled_programs(self):
+        """Test every bundled test program runs to completion."""
+        runner = BatchRunner(workers=0)
+
+        results = list(runner.run(collect_programs([str(TEST_PROGRAMS)])))
+
+        assert len(results) == 5
+        assert all(result["status"] == "ended" for result in results)
+        assert runner.stats["passed"] == 5
+
+    def test_programs_are_isolated(self, programs):
+        """Test variables from one program are not visible to the next."""
+        paths = programs(first="10 X = 42\n", second="10 PRINT X\n")
+
+        results = by_name(BatchRunner(workers=0).run(paths))
+
+        assert results["second"]["output"] == [" 0"]
+
+    def test_errors_and_budgets(self, programs):
+        """Test failures are reported per program without stopping the batch."""
+        paths = programs(
+            bad="10 PRINT (\n",
+            divide="10 PRINT 1 / 0\n",
+            endless="10 GOTO 10\n",
+        )
+        runner = BatchRunner(workers=0, max_instructions=500)
+
+        results = by_name(runner.run(paths))
+
+        assert results["bad"]["status"] == "syntax_error"
+        assert results["divide"]["error"] == "DIVISION BY ZERO"
+        assert results["divide"]["line"] == 10
+        assert results["endless"]["status"] == "budget_exhausted"
+        assert results["endless"]["instructions"] == 500
+        assert runner.stats["failed"] == 3
+
+    def test_worker_pool(self, programs):
+        """Test programs run on worker processes give the same results."""
+        paths = programs(**{f"p{i}": f"10 PRINT {i} * 2\n" for i in range(6)})
+
+        results = by_name(BatchRunner(workers=2).run(paths))
+
+        assert len(results) == 6
+        assert results["p3"]["output"] == [" 6"]
+        assert results["p5"]["status"] == "completed"
+
+
+class TestRomBatch:
+    """Test batches run on ROM BASIC."""
+
+    def test_rom_programs(self, programs):
+        """Test output, errors and instruction budgets on ROM BASIC."""
+        paths = programs(
+            hello='10 PRINT "HELLO"\n20 END\n',
+            divide="10 PRINT 1 / 0\n",
+            endless="10 GOTO 10\n",
+        )
+        runner = BatchRunner(engine="rom", workers=0, max_instructions=20000)
+
+        results = by_name(runner.run(paths))
+
+        assert results["hello"]["status"] == "completed"
+        assert results["hello"]["output"] == ["HELLO"]
+        assert results["divide"]["error"] == "?/0 ERROR"
+        assert results["divide"]["line"] == 10
+        assert results["endless"]["status"] == "budget_exhausted"
+        assert results["endless"]["instructions"] == 20000
+
+
+class TestCommandLine:
+    """Test the batch runner's command line."""
+
+    def test_inline_stdout_is_json_lines(self, programs, monkeypatch, capsys):
+        """Test an in-process run writes only JSON lines to stdout."""
+        paths = programs(hello='10 PRINT "HELLO"\n')
+        monkeypatch.setattr(sys, "argv", ["batch_runner.py", *paths, "-w", "0"])
+        # Start from a fresh emulator, as the command line would
+        monkeypatch.setattr(batch_runner.worker, "emulator", None)
+
+        with pytest.raises(SystemExit) as exit_info:
+            batch_runner.main()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert exit_info.value.code == 0
+        assert [json.loads(line)["output"] for line in lines] == [["HELLO"]]
@@ -161,32 +161,54 @@ class TestEmulatorLauncher:
                 assert len(result["errors"]) == 0
 
     def test_run_program_with_errors(self):
-        """Test running a program with command errors."""
+        """Test running a program that fails at runtime."""
         launcher = EmulatorLauncher()
 
         # Mock current program
         launcher.current_program = {
             "path": "test.bas",
-            "content": '10 PRINT "Hello"\n20 INVALID COMMAND',
-            "commands": ['PRINT "Hello"', "INVALID COMMAND"],
+            "content": '10 PRINT "Hello"\n20 PRINT 1 / X\n30 END',
+            "commands": ['PRINT "Hello"', "PRINT 1 / X", "END"],
         }
 
-        # Mock emulator command execution
-        with patch.object(launcher.emulator, "execute_basic_command") as mock_execute:
-            mock_execute.side_effect = [
-                {"success": True, "output": "Hello"},
-                {"success": False, "error": "Unknown command"},
-            ]
+        result = launcher.run_program()
 
-            with patch.object(
-                launcher.emulator, "get_cpu_state", return_value={"pc": 0x8000}
-            ):
-                result = launcher.run_program()
+        assert result["commands_executed"] == 2
+        assert result["output"] == ["Hello"]
+        assert result["status"] == "error"
+        assert result["errors"] == ["DIVISION BY ZERO ERROR IN 20"]
 
-                assert result["commands_executed"] == 1
-                assert len(result["output"]) == 1
-                assert len(result["errors"]) == 1
-                assert "Unknown command" in result["errors"][0]
+    def test_run_program_loops(self):
+        """Test loops run to completion without per-line delays."""
+        launcher = EmulatorLauncher()
+        launcher.current_program = {
+            "path": "loop.bas",
+            "content": (
+                "10 S = 0\n20 FOR I = 1 TO 1000\n30 S = S + I\n40 NEXT I\n"
+                "50 PRINT S\n60 END"
+            ),
+            "commands": [],
+        }
+
+        result = launcher.run_program()
+
+        assert result["output"] == [" 500500"]
+        assert result["commands_executed"] == 2004
+        assert result["status"] == "ended"
+
+    def test_run_program_step_budget(self):
+        """Test steps caps the statements a run executes."""
+        launcher = EmulatorLauncher()
+        launcher.current_program = {
+            "path": "forever.bas",
+            "content": "10 I = I + 1\n20 GOTO 10",
+            "commands": [],
+        }
+
+        result = launcher.run_program(steps=50)
+
+        assert result["commands_executed"] == 50
+        assert result["status"] == "budget_exhausted"
 
     def test_step_execution(self):
         """Test step execution."""
@@ -219,6 +241,26 @@ class TestEmulatorLauncher:
             assert "error" in result
             assert result["error"] == "Execution failed"
 
+    def test_benchmark_runs_unthrottled(self):
+        """Test every benchmarked mode runs without real-time pacing."""
+        launcher = EmulatorLauncher()
+        speed = launcher.emulator.speed_controller
+        speed.set_throttled(True)
+        throttled_during = []
+
+        def execute_program(steps, turbo=False, batch_size=None):
+            throttled_during.append(speed.throttled)
+            return {"steps_executed": steps, "error": None}
+
+        with patch.object(
+            launcher.emulator, "execute_program", side_effect=execute_program
+        ):
+            result = launcher.benchmark_execution(100)
+
+        assert "error" not in result
+        assert throttled_during and not any(throttled_during)
+        assert speed.throttled
+
     def test_show_cpu_state(self):
         """Test displaying CPU state."""
         launcher = EmulatorLauncher()
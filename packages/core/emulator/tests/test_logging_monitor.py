@@ -11,6 +11,7 @@ import pytest
 
 from engine.emulator.logging_monitor import (
     EmulatorLogger,
+    LatencyHistogram,
     PerformanceMonitor,
     SpeedController,
     create_emulator_logger,
@@ -143,9 +144,9 @@ class TestEmulatorLogger:
         logger = EmulatorLogger(settings)
 
         # Add some test data
-        logger.instruction_times = [1.0, 2.0, 3.0]
-        logger.memory_access_times = [0.5, 1.5]
-        logger.basic_command_times = [2.5, 3.5, 4.5]
+        logger.instruction_times = LatencyHistogram([1.0, 2.0, 3.0])
+        logger.memory_access_times = LatencyHistogram([0.5, 1.5])
+        logger.basic_command_times = LatencyHistogram([2.5, 3.5, 4.5])
 
         stats = logger.get_performance_stats()
 
@@ -162,9 +163,9 @@ class TestEmulatorLogger:
         logger = EmulatorLogger(settings)
 
         # Add some test data
-        logger.instruction_times = [1.0, 2.0]
-        logger.memory_access_times = [0.5]
-        logger.basic_command_times = [2.5]
+        logger.instruction_times = LatencyHistogram([1.0, 2.0])
+        logger.memory_access_times = LatencyHistogram([0.5])
+        logger.basic_command_times = LatencyHistogram([2.5])
 
         logger.reset_performance_stats()
 
@@ -172,6 +173,71 @@ class TestEmulatorLogger:
         assert len(logger.memory_access_times) == 0
         assert len(logger.basic_command_times) == 0
 
+    def test_log_instructions(self):
+        """Test a timed run records each instruction at the run's mean."""
+        logger = EmulatorLogger({})
+
+        logger.log_instructions(4, 2.0)
+        logger.log_instructions(0, 1.0)
+
+        stats = logger.get_performance_stats()
+        assert stats["instruction_count"] == 4
+        assert stats["avg_instruction_time_ms"] == 0.5
+
+    def test_time_memory_access(self):
+        """Test memory operations are only timed when enabled."""
+        disabled = EmulatorLogger({})
+        enabled = EmulatorLogger({"performance": {"memory_access_timing": True}})
+
+        for logger in (disabled, enabled):
+            with logger.time_memory_access():
+                pass
+
+        assert len(disabled.memory_access_times) == 0
+        assert len(enabled.memory_access_times) == 1
+
+
+class TestLatencyHistogram:
+    """Test streaming latency histograms."""
+
+    def test_exact_summary_values(self):
+        """Test count, mean, minimum and maximum are exact."""
+        histogram = LatencyHistogram([1.0, 2.0, 6.0])
+
+        stats = histogram.get_stats()
+
+        assert stats["count"] == 3
+        assert stats["mean_ms"] == 3.0
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 6.0
+
+    def test_percentiles_within_bucket_error(self):
+        """Test percentiles of a uniform spread land within a few percent."""
+        histogram = LatencyHistogram(i / 100 for i in range(1, 10001))
+
+        assert histogram.percentile(50) == pytest.approx(50.0, rel=0.04)
+        assert histogram.percentile(90) == pytest.approx(90.0, rel=0.04)
+        assert histogram.percentile(99) == pytest.approx(99.0, rel=0.04)
+
+    def test_constant_memory(self):
+        """Test memory depends on the value range, not the sample count."""
+        histogram = LatencyHistogram()
+
+        for i in range(100000):
+            histogram.record(0.5 + (i % 1000) / 1000)
+
+        assert len(histogram) == 100000
+        assert len(histogram.buckets) <= 2 * 16 + 1
+
+    def test_zero_and_reset(self):
+        """Test zero durations are counted and reset empties the histogram."""
+        histogram = LatencyHistogram([0.0, 0.0, 4.0])
+
+        assert histogram.percentile(50) == 0.0
+        histogram.reset()
+        assert histogram.get_stats()["p99_ms"] == 0.0
+        assert len(histogram) == 0
+
 
 class TestSpeedController:
     """Test speed controller functionality."""
@@ -339,6 +405,85 @@ class TestSpeedController:
             controller.delay_step()
             mock_sleep.assert_not_called()
 
+    def test_slice_cycles(self):
+        """Test pacing slice size follows the target clock and multiplier."""
+        settings = {
+            "cpu_speed": 1000000,
+            "speed_control": {"enabled": True, "slice_ms": 10.0},
+        }
+        controller = SpeedController(settings)
+
+        assert controller.get_slice_cycles() == 10000
+
+        controller.set_speed_multiplier(2.0)
+        assert controller.get_effective_hz() == 2000000
+        assert controller.get_slice_cycles() == 20000
+
+    def test_pace_sleeps_until_deadline(self):
+        """Test pacing sleeps once against the cycle-derived deadline."""
+        settings = {"cpu_speed": 1000000, "speed_control": {"enabled": True}}
+        controller = SpeedController(settings)
+
+        with patch("time.monotonic", side_effect=[100.0, 100.002, 100.010]):
+            with patch("time.sleep") as mock_sleep:
+                controller.start_pacing(0)
+                controller.pace(10000)  # 10ms worth of cycles
+
+                mock_sleep.assert_called_once()
+                assert mock_sleep.call_args[0][0] == pytest.approx(0.008)
+
+        stats = controller.get_pacing_stats()
+        assert stats["sleeps"] == 1
+        assert stats["target_mhz"] == 1.0
+        assert stats["achieved_mhz"] == pytest.approx(1.0)
+
+    def test_pace_resyncs_when_lagging(self):
+        """Test pacing re-anchors instead of bursting when far behind."""
+        settings = {
+            "cpu_speed": 1000000,
+            "speed_control": {"enabled": True, "max_lag_ms": 50.0},
+        }
+        controller = SpeedController(settings)
+
+        with patch("time.monotonic", side_effect=[0.0, 1.0]):
+            with patch("time.sleep") as mock_sleep:
+                controller.start_pacing(0)
+                controller.pace(10000)
+
+                mock_sleep.assert_not_called()
+
+        assert controller.get_pacing_stats()["resyncs"] == 1
+
+    def test_unthrottled_never_sleeps(self):
+        """Test unthrottled mode measures speed without sleeping."""
+        settings = {"cpu_speed": 1000000, "speed_control": {"enabled": True}}
+        controller = SpeedController(settings)
+        controller.set_throttled(False)
+
+        with patch("time.monotonic", side_effect=[0.0, 0.001]):
+            with patch("time.sleep") as mock_sleep:
+                controller.start_pacing(0)
+                controller.pace(10000)
+
+                mock_sleep.assert_not_called()
+
+        stats = controller.get_pacing_stats()
+        assert stats["pacing"] is False
+        assert stats["achieved_mhz"] == pytest.approx(10.0)
+
+    def test_unthrottled_block_restores_setting(self):
+        """Test throttling is suspended inside the block and restored after it."""
+        settings = {"speed_control": {"enabled": True}}
+        controller = SpeedController(settings)
+
+        with pytest.raises(RuntimeError):
+            with controller.unthrottled():
+                assert controller.is_pacing() is False
+                raise RuntimeError("step failed")
+
+        assert controller.throttled is True
+        assert controller.is_pacing() is True
+
 
 class TestPerformanceMonitor:
     """Test performance monitor functionality."""
@@ -429,6 +574,20 @@ class TestPerformanceMonitor:
         assert summary["operation_times"]["op1"] == 10.0
         assert summary["operation_times"]["op2"] == 20.0
 
+    def test_operation_percentiles(self):
+        """Test timed operations report a latency distribution."""
+        settings = {"performance": {"monitoring_enabled": True}}
+        monitor = PerformanceMonitor(settings)
+
+        for _ in range(20):
+            with monitor.time_operation("step"):
+                pass
+
+        stats = monitor.get_performance_summary()["operations"]["step"]
+        assert stats["count"] == 20
+        assert stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["rate_per_sec"] > 0
+
     def test_get_performance_summary_disabled(self):
         """Test getting performance summary when disabled."""
         settings = {"performance": {"monitoring_enabled": False}}
@@ -0,0 +1,118 @@
+"""
+ROM Image Tests
+
+Test suite for the assembled BASIC-M6502 ROM: the disk cache, mapping into
+the emulator and running real ROM BASIC.
+"""
+
+import pytest
+
+import engine.rom_image as rom_image
+from engine.emulator.m6502_emulator import M6502Emulator
+from engine.rom_image import ROM_CONFIG, load_rom_image
+
+
+@pytest.fixture
+def basic():
+    """An unthrottled emulator with ROM BASIC started."""
+    emulator = M6502Emulator()
+    emulator.initialize_emulator()
+    emulator.set_throttled(False)
+    assert emulator.boot_basic()["error"] is None
+    return emulator
+
+
+class TestRomImage:
+    """Test building and caching the ROM image."""
+
+    def test_image_layout(self):
+        """Test the ROM starts with BASIC's dispatch table at ROMLOC."""
+        image = load_rom_image()
+
+        assert image.rom_start == ROM_CONFIG["ROMLOC"]
+        assert image.symbols["STMDSP"] == image.rom_start
+        assert {"STMDSP", "INIT", "GETCH"} <= image.labels
+        assert "ROMLOC" not in image.labels
+        assert image.rom_start < image.entry_point <= image.rom_end
+        assert all(start < image.rom_start for start, _ in image.ram_segments)
+
+    def test_disk_cache(self, tmp_path, monkeypatch):
+        """Test a second load reads the cached image instead of assembling."""
+        monkeypatch.setattr(rom_image, "_rom_images", {})
+        built = load_rom_image(cache_dir=tmp_path)
+        assert len(list(tmp_path.glob("*.bin"))) == 1
+
+        def fail(source):
+            raise AssertionError("image was reassembled")
+
+        monkeypatch.setattr(rom_image, "_rom_images", {})
+        monkeypatch.setattr(rom_image, "build_rom_image", fail)
+        cached = load_rom_image(cache_dir=tmp_path)
+
+        assert cached.rom == built.rom
+        assert cached.ram_segments == built.ram_segments
+        assert cached.symbols == built.symbols
+        assert cached.labels == built.labels
+
+    def test_source_change_misses_cache(self, tmp_path, monkeypatch):
+        """Test an edited source gets its own cache entry."""
+        source = tmp_path / "m6502.asm"
+        source.write_text(rom_image.ROM_SOURCE.read_text(encoding="latin-1") + "\n")
+        monkeypatch.setattr(rom_image, "_rom_images", {})
+
+        load_rom_image(cache_dir=tmp_path)
+        load_rom_image(source, cache_dir=tmp_path)
+
+        assert len(list(tmp_path.glob("*.bin"))) == 2
+
+
+class TestRomBasic:
+    """Test ROM BASIC running on the emulated CPU."""
+
+    def test_rom_is_mapped_read_only(self):
+        """Test the ROM is mapped at start-up and ignores CPU writes."""
+        emulator = M6502Emulator()
+        emulator.initialize_emulator()
+        start = emulator.rom.rom_start
+        original = emulator.memory[start]
+
+        emulator.memory[start] = original ^ 0xFF
+
+        assert emulator.memory[start] == original
+        assert emulator.get_emulator_info()["rom"]["rom_size"] == len(emulator.rom.rom)
+
+    def test_boot_banner(self, basic):
+        """Test cold start prints the free memory and the OK prompt."""
+        output = basic.get_display_output()
+
+        assert "BYTES FREE" in output
+        assert "KIM BASIC V1.1" in output
+        assert output.endswith("OK\r\n")
+
+    def test_run_program(self, basic):
+        """Test a typed program runs with BASIC's floating point."""
+        assert basic.load_basic_program(
+            '10 FOR I = 1 TO 10 : S = S + I * I : NEXT\n20 PRINT "SUM"; S; SQR(16)\n'
+        )
+
+        result = basic.send_basic_input("RUN\n")
+
+        assert "SUM 385  4" in result["output"]
+        assert result["waiting_for_input"] is True
+
+    def test_runtime_error(self, basic):
+        """Test errors are reported by the ROM's own error handler."""
+        basic.load_basic_program("10 PRINT 1 / 0\n")
+
+        result = basic.send_basic_input("RUN\n")
+
+        assert "?/0 ERROR IN  10" in result["output"]
+
+    def test_step_budget(self, basic):
+        """Test an endless loop stops when its step budget runs out."""
+        basic.load_basic_program("10 GOTO 10\n")
+
+        result = basic.send_basic_input("RUN\n", max_steps=5000)
+
+        assert result["waiting_for_input"] is False
+        assert result["steps_executed"] == 5000